@@ -177,8 +177,19 @@ async def handle_core_commands(args):
                 if args.jar:
                     server_jar = str(Path(args.jar).absolute())
 
+                # 控制台客户端队列设置
+                from aetherius.core.config import ConfigManager, FileConfigSource
+                config = ConfigManager()
+                if args.config.exists():
+                    config.add_source(FileConfigSource(args.config))
+
                 # 启动持久化控制台守护进程（包含服务器）
-                await start_persistent_console(server_jar, server_dir)
+                await start_persistent_console(
+                    server_jar,
+                    server_dir,
+                    client_queue_size=config.get("server.console_client_queue_size", 1000),
+                    slow_client_policy=config.get("server.console_slow_client_policy", "skip"),
+                )
 
             elif args.server_action == 'stop':
                 print("🛑 停止 Minecraft 服务器...")
@@ -230,10 +241,11 @@ async def handle_core_commands(args):
                         print("🎮 重新启动服务器...")
                         # 重新调用启动逻辑
                         from aetherius.core.config_models import ServerConfig
+                        from aetherius.core.monitoring.collectors import get_metrics_collector
                         from aetherius.core.server import ServerController
 
                         server_config = ServerConfig()
-                        server = ServerController(server_config)
+                        server = ServerController(server_config, metrics=get_metrics_collector())
                         success = await server.start()
                         if success:
                             print("✅ Minecraft 服务器重启成功!")
@@ -245,10 +257,11 @@ async def handle_core_commands(args):
                     print("⚠️  服务器未运行，直接启动...")
                     # 直接启动服务器
                     from aetherius.core.config_models import ServerConfig
+                    from aetherius.core.monitoring.collectors import get_metrics_collector
                     from aetherius.core.server import ServerController
 
                     server_config = ServerConfig()
-                    server = ServerController(server_config)
+                    server = ServerController(server_config, metrics=get_metrics_collector())
                     success = await server.start()
                     if success:
                         print("✅ Minecraft 服务器启动成功!")
@@ -279,8 +292,19 @@ async def handle_core_commands(args):
                         server_jar = str(Path("server/server.jar").absolute())
                         server_dir = str(Path("server").absolute())
 
+                        # 控制台客户端队列设置
+                        from aetherius.core.config import ConfigManager, FileConfigSource
+                        config = ConfigManager()
+                        if args.config.exists():
+                            config.add_source(FileConfigSource(args.config))
+
                         # 启动持久化控制台守护进程（包含服务器）
-                        await start_persistent_console(server_jar, server_dir)
+                        await start_persistent_console(
+                            server_jar,
+                            server_dir,
+                            client_queue_size=config.get("server.console_client_queue_size", 1000),
+                            slow_client_policy=config.get("server.console_slow_client_policy", "skip"),
+                        )
                     else:
                         print("❌ 无法连接到持久化控制台")
                         return
@@ -15,6 +15,7 @@ from contextlib import asynccontextmanager
 from abc import ABC, abstractmethod
 from dataclasses import asdict
 
+from ..core.monitoring.collectors import get_metrics_collector
 from ..core.server import ServerController, ServerState
 from ..core.config import ConfigManager
 from ..core.config import get_config_manager
@@ -273,7 +274,7 @@ class PlayerAPI(APIModule):
     
     async def cleanup(self) -> None:
         """Cleanup player API."""
-        pass
+        await self._manager.shutdown()
     
     async def list(self, online_only: bool = False) -> List[Dict[str, Any]]:
         """Get list of players."""
@@ -448,11 +449,12 @@ class MonitoringAPI(APIModule):
             metrics = await self.core._server.get_performance_metrics()
             
             # Add system information
-            import psutil
+            from ..core.monitoring.sampler import get_system_sampler
+            system = get_system_sampler().snapshot()
             system_metrics = {
-                "system_cpu_percent": psutil.cpu_percent(),
-                "system_memory_percent": psutil.virtual_memory().percent,
-                "system_disk_percent": psutil.disk_usage('/').percent,
+                "system_cpu_percent": system["cpu_percent"],
+                "system_memory_percent": system["memory_percent"],
+                "system_disk_percent": system["disk_percent"],
                 "java_version": self._get_java_version(),
                 "max_memory_mb": self._parse_max_memory_mb(self.core.config.server.jvm_args),
             }
@@ -750,7 +752,7 @@ class AetheriusCoreAPI:
     async def _initialize_server(self) -> None:
         """Initialize server instance."""
         if not self._server:
-            self._server = ServerController(self.config.server)
+            self._server = ServerController(self.config.server, metrics=get_metrics_collector())
             self.logger.debug("Created new ServerController instance")
     
     @asynccontextmanager
@@ -7,10 +7,15 @@ from pathlib import Path
 from datetime import datetime
 from enum import Enum
 
-from ..core.server import ServerController
+from ..core.server import ServerController, ServerState
 from ..core.config import get_config_manager, ConfigManager
 from ..core.player_data import get_player_data_manager, PlayerDataManager
 from ..core.event_manager import get_event_manager, EventManager
+from ..core.backup_store import get_backup_store
+from ..core.file_index import directory_size, find_file_index
+from ..core.monitoring.sampler import SamplerSubscription, get_metrics_sampler, get_system_sampler
+from ..core.stream_broadcast import OverflowPolicy, StreamBroadcaster
+from ..core.world_capture import get_world_capture
 # Import these dynamically to avoid circular imports
 # from ..plugins.loader import PluginManager
 # from ..components.loader import ComponentManager as ComponentLoader
@@ -66,13 +71,27 @@ class AetheriusManagementAPI:
         
         # Information stream management
         self._info_streams: Dict[str, Dict[str, Any]] = {}
-        self._stream_callbacks: Dict[InfoStreamType, List[Callable]] = {}
+        self._streams: Dict[InfoStreamType, StreamBroadcaster] = {}
         self._stream_filters: Dict[InfoStreamType, List[Callable]] = {}
         
-        # Initialize stream types
+        # Initialize stream types; console and log lines may be dropped under
+        # backpressure, other streams disconnect subscribers that stay stalled
         for stream_type in InfoStreamType:
-            self._stream_callbacks[stream_type] = []
+            lossy = stream_type in (InfoStreamType.CONSOLE_OUTPUT, InfoStreamType.SERVER_LOGS)
+            self._streams[stream_type] = StreamBroadcaster(
+                policy=OverflowPolicy.DROP_OLDEST if lossy else OverflowPolicy.DISCONNECT
+            )
             self._stream_filters[stream_type] = []
+        
+        # Shared sampler: one sampling loop regardless of how many dashboards subscribe
+        self._metrics_sampler = get_metrics_sampler()
+        self._metrics_sampler.register_family("server", self.server.get_performance_metrics)
+        
+        # Deduplicated world backup snapshots and the point-in-time world mirror
+        # they are taken from, shared with every other user of this server directory
+        self._server_directory = Path(self.server.config.jar_path).parent
+        self._backup_store = get_backup_store(self._server_directory)
+        self._world_capture = get_world_capture(self._server_directory)
     
     def _check_permission(self, required_level: ControlLevel) -> bool:
         """Check if current access level permits the operation."""
@@ -588,30 +607,34 @@ class AetheriusManagementAPI:
             return {"success": False, "error": "Insufficient permissions"}
         
         try:
-            import shutil
-            from pathlib import Path
-            
-            # Save world first if server is running
-            if self.server.is_alive:
-                await self.send_command("save-all")
-                await asyncio.sleep(3)  # Wait for save completion
-            
-            # Create backup
-            world_path = Path(self.get_config_value("server.working_directory", "server")) / "world"
-            backup_dir = Path("backups")
-            backup_dir.mkdir(exist_ok=True)
+            world_path = self._server_directory / "world"
             
             if not backup_name:
                 backup_name = f"world_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             
-            backup_path = backup_dir / backup_name
-            shutil.copytree(world_path, backup_path)
+            async with self._world_capture.lock:
+                # Freeze saving only while the world is mirrored, then snapshot the mirror
+                if self.server.state == ServerState.RUNNING:
+                    capture = await self._world_capture.capture_frozen(self.server, world_path)
+                else:
+                    capture = await asyncio.to_thread(self._world_capture.capture, world_path)
+                
+                # Create an incremental snapshot; only changed chunks are written
+                info = await asyncio.to_thread(
+                    self._backup_store.create_snapshot,
+                    self._world_capture.staging_path(world_path),
+                    backup_name,
+                )
             
             return {
                 "success": True,
                 "message": f"World backup created: {backup_name}",
-                "backup_path": str(backup_path),
-                "backup_size": self._get_directory_size(backup_path),
+                "backup_path": str(self._backup_store.root),
+                "backup_size": info.stats.bytes_written,
+                "world_size": info.stats.total_size,
+                "new_chunks": info.stats.new_chunks,
+                "save_paused_seconds": capture.frozen_seconds,
+                "save_confirmed": capture.save_confirmed,
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -623,17 +646,56 @@ class AetheriusManagementAPI:
                 "timestamp": datetime.now().isoformat()
             }
     
-    # Information Stream Management API
+    def get_jvm_metrics(self) -> Dict[str, Any]:
+        """
+        Get current JVM heap, GC and thread telemetry.
+        
+        Returns:
+            JVM metrics, or an error if telemetry is not attached
+        """
+        telemetry = getattr(self.server, "jvm_telemetry", None)
+        if telemetry is None or self.server.state != ServerState.RUNNING:
+            return {
+                "error": "JVM telemetry not available",
+                "timestamp": datetime.now().isoformat()
+            }
+        return {**telemetry.get_jvm_metrics(), "timestamp": datetime.now().isoformat()}
     
-    def register_stream_callback(self, stream_type: InfoStreamType, callback: Callable) -> None:
+    def analyze_performance_trends(self, window_seconds: float = 3600.0) -> Dict[str, Any]:
+        """
+        Analyze JVM heap, GC and thread trends over a time window.
+        
+        Args:
+            window_seconds: How far back to analyze
+        
+        Returns:
+            Trend statistics and detected issues
+        """
+        telemetry = getattr(self.server, "jvm_telemetry", None)
+        if telemetry is None:
+            return {
+                "error": "JVM telemetry not available",
+                "timestamp": datetime.now().isoformat()
+            }
+        return {**telemetry.analyze_trends(window_seconds), "timestamp": datetime.now().isoformat()}
+    
+    # Information Stream Management API
+
+    def register_stream_callback(self, stream_type: InfoStreamType, callback: Callable,
+                                 encoded: bool = False) -> None:
         """
         Register a callback for information stream.
         
+        Each callback gets its own bounded queue and writer task, so a slow
+        callback never delays the broadcaster or other subscribers.
+        
         Args:
             stream_type: Type of information stream
             callback: Callback function to receive stream data
+            encoded: Receive the data as a JSON string, serialized once per
+                broadcast and shared by all encoded subscribers
         """
-        self._stream_callbacks[stream_type].append(callback)
+        self._streams[stream_type].subscribe(callback, encoded=encoded)
         logger.info(f"Registered callback for {stream_type.value} stream")
     
     def unregister_stream_callback(self, stream_type: InfoStreamType, callback: Callable) -> None:
@@ -644,8 +706,7 @@ class AetheriusManagementAPI:
             stream_type: Type of information stream
             callback: Callback function to remove
         """
-        if callback in self._stream_callbacks[stream_type]:
-            self._stream_callbacks[stream_type].remove(callback)
+        if self._streams[stream_type].unsubscribe(callback):
             logger.info(f"Unregistered callback for {stream_type.value} stream")
     
     def add_stream_filter(self, stream_type: InfoStreamType, filter_func: Callable) -> None:
@@ -687,15 +748,8 @@ class AetheriusManagementAPI:
             except Exception as e:
                 logger.error(f"Error in stream filter: {e}")
         
-        # Send to all callbacks
-        for callback in self._stream_callbacks[stream_type]:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(data)
-                else:
-                    callback(data)
-            except Exception as e:
-                logger.error(f"Error in stream callback: {e}")
+        # Queue for all callbacks; delivery happens in their writer tasks
+        self._streams[stream_type].publish(data)
     
     def get_stream_info(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -706,13 +760,52 @@ class AetheriusManagementAPI:
         """
         stream_info = {}
         for stream_type in InfoStreamType:
+            broadcaster = self._streams[stream_type]
             stream_info[stream_type.value] = {
-                "callback_count": len(self._stream_callbacks[stream_type]),
+                "callback_count": broadcaster.subscriber_count,
                 "filter_count": len(self._stream_filters[stream_type]),
-                "active": len(self._stream_callbacks[stream_type]) > 0
+                "active": broadcaster.subscriber_count > 0,
+                **broadcaster.get_stats()
             }
         return stream_info
     
+    def subscribe_metrics(self, callback: Callable, families: Optional[List[str]] = None,
+                          interval: float = 5.0) -> SamplerSubscription:
+        """
+        Subscribe to periodic metric updates from the shared sampler.
+        
+        Each metric family is sampled once per interval at the shortest
+        interval any subscriber asked for; subscribers receive only the
+        fields that changed since their previous update.
+        
+        Args:
+            callback: Function receiving {"timestamp", "full", "families"}
+            families: Metric families to receive ("system", "server"); all if None
+            interval: Seconds between updates
+            
+        Returns:
+            Subscription handle for unsubscribe_metrics()
+        """
+        return self._metrics_sampler.subscribe(callback, families, interval)
+    
+    def unsubscribe_metrics(self, subscription: SamplerSubscription) -> None:
+        """
+        Cancel a metrics subscription.
+        
+        Args:
+            subscription: Handle returned by subscribe_metrics()
+        """
+        self._metrics_sampler.unsubscribe(subscription)
+    
+    async def close_streams(self) -> None:
+        """
+        Stop the writer tasks of all information streams.
+        
+        Call this when the API instance is discarded, before the event loop
+        shuts down; registered stream callbacks are dropped.
+        """
+        await asyncio.gather(*(broadcaster.aclose() for broadcaster in self._streams.values()))
+    
     # Utility Methods
     
     def _get_file_modified_time(self, file_path: Path) -> Optional[str]:
@@ -728,7 +821,12 @@ class AetheriusManagementAPI:
     def _get_directory_size(self, directory: Path) -> int:
         """Get total size of directory in bytes."""
         try:
-            return sum(f.stat().st_size for f in directory.rglob('*') if f.is_file())
+            index = find_file_index(directory, sizes=True)
+            if index:
+                usage = index.usage(index.relative(directory))
+                if usage is not None:
+                    return usage["total_size"]
+            return directory_size(directory)["total_size"]
         except Exception:
             return 0
     
@@ -833,13 +931,10 @@ class AetheriusManagementAPI:
             System health data
         """
         try:
-            import psutil
             import sys
             
-            # Get system information
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # Read the background sampler's snapshot instead of blocking on psutil
+            system = get_system_sampler().snapshot()
             
             # Get Aetherius-specific info
             performance = await self.get_server_performance()
@@ -849,9 +944,9 @@ class AetheriusManagementAPI:
             return {
                 "timestamp": datetime.now().isoformat(),
                 "system": {
-                    "cpu_percent": cpu_percent,
-                    "memory_percent": memory.percent,
-                    "disk_percent": (disk.used / disk.total) * 100,
+                    "cpu_percent": system["cpu_percent"],
+                    "memory_percent": system["memory_percent"],
+                    "disk_percent": system["disk_percent"],
                     "python_version": sys.version,
                     "platform": sys.platform
                 },
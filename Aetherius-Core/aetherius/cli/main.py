@@ -29,6 +29,7 @@ from ..core import (
     on_event,
 )
 from ..core.config import get_config_manager
+from ..core.monitoring.collectors import get_metrics_collector
 from ..core.server import ServerController, ServerState
 from ..plugins import PluginManager
 
@@ -87,7 +88,7 @@ def get_server_wrapper() -> ServerController:
         # Create a simple server config for now
         from ..core.config_models import ServerConfig
         server_config = ServerConfig()
-        _server_wrapper = ServerController(server_config)
+        _server_wrapper = ServerController(server_config, metrics=get_metrics_collector())
 
         # Set the global server wrapper for plugins
         # from ..core import set_server_wrapper
@@ -581,8 +582,7 @@ def send_command(
             command_queue = get_command_queue()
 
             console.print(f"[blue]Sending command:[/blue] {command}")
-            command_id = command_queue.add_command(command, timeout=30.0)
-            result = await command_queue.wait_for_completion(command_id, timeout=30.0)
+            result = await command_queue.submit(command, timeout=30.0)
 
             if result["status"] == "completed" and result["success"]:
                 console.print("[green]✓ Command executed successfully[/green]")
@@ -655,10 +655,7 @@ def console_mode(
 
                     command_queue = get_command_queue()
 
-                    command_id = command_queue.add_command(command, timeout=10.0)
-                    result = await command_queue.wait_for_completion(
-                        command_id, timeout=10.0
-                    )
+                    result = await command_queue.submit(command, timeout=10.0)
 
                     if result["status"] != "completed" or not result["success"]:
                         error_msg = result.get("error", "Unknown error")
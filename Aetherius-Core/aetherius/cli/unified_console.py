@@ -78,6 +78,9 @@ class SimpleConsole:
         self.enhanced_console: EnhancedConsoleInterface | None = None
         self._console_initialized = False
 
+        # 日志文件监听订阅
+        self._log_file_watch = None
+
         # 设置readline
         try:
             readline.parse_and_bind("tab: complete")
@@ -163,58 +166,65 @@ class SimpleConsole:
     def _start_log_file_monitoring(self):
         """启动日志文件监控，持续显示服务器日志"""
         import os
-        import threading
-        import time
 
-        def monitor_log_file():
-            # 常见的日志文件路径
-            log_paths = [
-                "/workspaces/aetheriusmc.github.io/Aetherius-Core/server/logs/latest.log",
-                "server/logs/latest.log",
-                "logs/latest.log",
-            ]
-
-            log_file = None
-            for path in log_paths:
-                if os.path.exists(path):
-                    log_file = path
-                    break
+        from ..core.file_watcher import get_file_watcher
 
-            if not log_file:
-                print(f"{Fore.YELLOW}⚠ 未找到服务器日志文件{Style.RESET_ALL}")
-                return
+        # 常见的日志文件路径
+        log_paths = [
+            "/workspaces/aetheriusmc.github.io/Aetherius-Core/server/logs/latest.log",
+            "server/logs/latest.log",
+            "logs/latest.log",
+        ]
 
-            print(f"{Fore.GREEN}✓ 监控日志文件: {log_file}{Style.RESET_ALL}")
+        log_file = None
+        for path in log_paths:
+            if os.path.exists(path):
+                log_file = path
+                break
+
+        if not log_file:
+            print(f"{Fore.YELLOW}⚠ 未找到服务器日志文件{Style.RESET_ALL}")
+            return
+
+        print(f"{Fore.GREEN}✓ 监控日志文件: {log_file}{Style.RESET_ALL}")
+
+        # 从当前末尾开始，只显示新写入的日志
+        state = {"offset": 0, "partial": b""}
+        try:
+            state["offset"] = os.path.getsize(log_file)
+        except OSError:
+            pass
 
-            # 监控日志文件变化
-            last_size = 0
+        def on_log_changed(path):
+            # 在共享文件监听线程中运行，文件有变化时才会被调用
             try:
-                if os.path.exists(log_file):
-                    last_size = os.path.getsize(log_file)
-            except:
-                pass
+                size = os.path.getsize(path)
+            except OSError:
+                return
+            if size < state["offset"]:
+                # 日志轮转或被截断，从头读取
+                state["offset"] = 0
+                state["partial"] = b""
+            if size == state["offset"]:
+                return
 
-            while True:
-                try:
-                    if os.path.exists(log_file):
-                        current_size = os.path.getsize(log_file)
-                        if current_size > last_size:
-                            with open(log_file, encoding="utf-8", errors="ignore") as f:
-                                f.seek(last_size)
-                                new_lines = f.read()
-                                if new_lines:
-                                    for line in new_lines.strip().split("\n"):
-                                        if line.strip():
-                                            self._handle_server_log(line.strip())
-                            last_size = current_size
-                    time.sleep(0.5)  # 每0.5秒检查一次
-                except Exception:
-                    # 静默处理文件访问错误
-                    time.sleep(1)
+            try:
+                with open(path, "rb") as f:
+                    f.seek(state["offset"])
+                    data = f.read()
+            except OSError:
+                # 静默处理文件访问错误
+                return
+            state["offset"] += len(data)
+
+            # 保留未写完的最后一行，等下次变更时再处理
+            *lines, state["partial"] = (state["partial"] + data).split(b"\n")
+            for raw_line in lines:
+                line = raw_line.decode("utf-8", errors="ignore").strip()
+                if line:
+                    self._handle_server_log(line)
 
-        # 在后台线程中运行日志监控
-        log_monitor_thread = threading.Thread(target=monitor_log_file, daemon=True)
-        log_monitor_thread.start()
+        self._log_file_watch = get_file_watcher().watch(log_file, on_log_changed, debounce=0.05)
 
     def _handle_server_log(self, line: str):
         """处理服务器日志行"""
@@ -421,11 +431,10 @@ class SimpleConsole:
                         async def run_command():
                             try:
                                 command_queue = self.server_manager.command_queue
-                                command_id = command_queue.add_command(command)
 
                                 # 缩短超时时间，更快反馈
-                                result = await command_queue.wait_for_completion(
-                                    command_id, timeout=10.0
+                                result = await command_queue.submit(
+                                    command, timeout=10.0
                                 )
 
                                 # 显示结果
@@ -1902,6 +1911,13 @@ class SimpleConsole:
     def cleanup(self):
         """清理控制台资源"""
         try:
+            # 停止日志文件监听
+            if self._log_file_watch is not None:
+                from ..core.file_watcher import get_file_watcher
+
+                get_file_watcher().unwatch(self._log_file_watch)
+                self._log_file_watch = None
+
             # 清理增强控制台接口
             if HAS_ENHANCED_CONSOLE and self.enhanced_console:
                 import asyncio
@@ -339,7 +339,7 @@ class AetheriusCore:
         
         from .monitoring.collectors import (
             InMemoryMetricsCollector, HealthCheckManager, SimpleAlertManager,
-            SystemMetricsCollector, SystemHealthChecks
+            SystemMetricsCollector, SystemHealthChecks, set_metrics_collector
         )
         
         # 创建监控上下文
@@ -352,8 +352,10 @@ class AetheriusCore:
         
         # 创建指标收集器
         self.metrics_collector = InMemoryMetricsCollector(
-            max_metrics=self.config.get("monitoring.max_metrics", 10000)
+            max_metrics=self.config.get("monitoring.max_metrics", 10000),
+            max_series_per_name=self.config.get("monitoring.max_series_per_name", 100)
         )
+        set_metrics_collector(self.metrics_collector)
         
         # 创建健康检查管理器
         self.health_checker = HealthCheckManager()
@@ -0,0 +1,474 @@
+"""Multi-core streaming archive writers (zip, tar.gz and tar.zst)."""
+
+import logging
+import os
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+# Inputs that are already compressed; stored instead of recompressed
+STORED_SUFFIXES = {
+    ".mca", ".mcr", ".mcc", ".jar", ".zip", ".gz", ".tgz", ".xz", ".bz2",
+    ".zst", ".7z", ".png", ".jpg", ".jpeg", ".ogg",
+}
+
+BLOCK_SIZE = 1024 * 1024
+_WINDOW = 32 * 1024
+# Small files are cheaper to deflate inline than to hand to the pool
+_INLINE_LIMIT = 64 * 1024
+
+ProgressCallback = Callable[[int, int, int, int], None]
+
+
+def default_workers() -> int:
+    """Number of compression threads to use by default."""
+    return max(1, os.cpu_count() or 1)
+
+
+def _deflate_block(data: bytes, level: int, zdict: bytes, final: bool) -> bytes:
+    """
+    Compress one block as part of a raw deflate stream.
+
+    Blocks are primed with the previous 32 KiB of input and end on a sync
+    flush, so independently compressed blocks concatenate into one valid
+    stream (the pigz technique). zlib releases the GIL while compressing,
+    which lets a thread pool use every core.
+    """
+    if zdict and level:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+    )
+
+
+@dataclass
+class ArchiveStats:
+    """Result counters of one archive run."""
+
+    files: int = 0
+    directories: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    stored_files: int = 0
+    workers: int = 1
+    duration: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _OrderedPipeline:
+    """
+    Ordered queue of output pieces whose compression runs in a thread pool.
+
+    Items are written strictly in submission order. At most max_pending
+    blocks are in flight, which bounds memory no matter how large the input.
+    """
+
+    def __init__(self, pool: ThreadPoolExecutor, sink: Callable[[Any, Any], None], max_pending: int):
+        self._pool = pool
+        self._sink = sink
+        self._max_pending = max_pending
+        self._items: deque[tuple[Any, Future | bytes | None]] = deque()
+        self._in_flight = 0
+
+    def compress(self, tag: Any, data: bytes, level: int, zdict: bytes, final: bool) -> None:
+        future = self._pool.submit(_deflate_block, data, level, zdict, final)
+        self._items.append((tag, future))
+        self._in_flight += 1
+        self.drain(wait=self._in_flight > self._max_pending)
+
+    def put(self, tag: Any, payload: bytes | None) -> None:
+        self._items.append((tag, payload))
+        self.drain()
+
+    def drain(self, wait: bool = False) -> None:
+        """Write finished items from the front; with wait, block on the first one."""
+        while self._items:
+            tag, payload = self._items[0]
+            if isinstance(payload, Future):
+                if not (wait or payload.done()):
+                    return
+                payload = payload.result()
+                self._in_flight -= 1
+                wait = self._in_flight > self._max_pending
+            self._items.popleft()
+            self._sink(tag, payload)
+
+    def finish(self) -> None:
+        while self._items:
+            self.drain(wait=True)
+
+
+class _ZipEntry:
+    __slots__ = ("name", "method", "mtime", "mode", "is_dir", "offset", "crc", "size", "compressed_size")
+
+    def __init__(self, name: str, method: int, mtime: float, mode: int, is_dir: bool):
+        self.name = name
+        self.method = method
+        self.mtime = mtime
+        self.mode = mode
+        self.is_dir = is_dir
+        self.offset = 0
+        self.crc = 0
+        self.size = 0
+        self.compressed_size = 0
+
+
+class ParallelZipWriter:
+    """
+    Zip writer that deflates file blocks in parallel and streams them in order.
+
+    Entries are written with data descriptors and ZIP64 size fields, so file
+    and archive sizes are unbounded and no entry has to be buffered whole.
+    Files with an already-compressed suffix are stored.
+    """
+
+    _LOCAL = struct.Struct("<4s2B4HL2L2H")
+    _CENTRAL = struct.Struct("<4s4B4HL2L5H2L")
+    _DESCRIPTOR = struct.Struct("<4sLQQ")
+    _FLAG_DESCRIPTOR = 0x08
+    _FLAG_UTF8 = 0x800
+    _ZIP64_VERSION = 45
+
+    def __init__(self, fileobj: BinaryIO, pool: ThreadPoolExecutor, level: int = 6, max_pending: int = 8):
+        self._out = fileobj
+        self._level = level
+        self._pos = 0
+        self._entries: list[_ZipEntry] = []
+        self._pipeline = _OrderedPipeline(pool, self._sink, max_pending)
+
+    @staticmethod
+    def _dos_time(mtime: float) -> tuple[int, int]:
+        t = time.localtime(mtime)
+        year = max(t.tm_year, 1980)
+        return (
+            (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+        )
+
+    def _write(self, data: bytes) -> None:
+        self._out.write(data)
+        self._pos += len(data)
+
+    def _sink(self, tag: tuple[str, _ZipEntry], payload: bytes | None) -> None:
+        kind, entry = tag
+        if kind == "header":
+            entry.offset = self._pos
+            self._write(self._local_header(entry))
+        elif kind == "data":
+            entry.compressed_size += len(payload)
+            self._write(payload)
+        elif kind == "end" and not entry.is_dir:
+            self._write(
+                self._DESCRIPTOR.pack(b"PK\x07\x08", entry.crc, entry.compressed_size, entry.size)
+            )
+
+    def _local_header(self, entry: _ZipEntry) -> bytes:
+        name = entry.name.encode("utf-8")
+        dos_time, dos_date = self._dos_time(entry.mtime)
+        if entry.is_dir:
+            flags, extra, sizes = self._FLAG_UTF8, b"", 0
+        else:
+            # Sizes follow in the data descriptor; the ZIP64 extra marks them as 64-bit
+            flags = self._FLAG_UTF8 | self._FLAG_DESCRIPTOR
+            extra = struct.pack("<HHQQ", 1, 16, 0, 0)
+            sizes = 0xFFFFFFFF
+        return self._LOCAL.pack(
+            b"PK\x03\x04", self._ZIP64_VERSION, 0, flags, entry.method,
+            dos_time, dos_date, 0, sizes, sizes, len(name), len(extra),
+        ) + name + extra
+
+    def add_directory(self, arcname: str, st: os.stat_result) -> None:
+        entry = _ZipEntry(arcname.rstrip("/") + "/", zipfile.ZIP_STORED, st.st_mtime, st.st_mode, True)
+        self._entries.append(entry)
+        self._pipeline.put(("header", entry), None)
+
+    def add_file(self, path: Path, arcname: str, st: os.stat_result) -> int:
+        """Queue a file; returns the number of bytes read."""
+        store = path.suffix.lower() in STORED_SUFFIXES or self._level == 0
+        entry = _ZipEntry(arcname, zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED, st.st_mtime, st.st_mode, False)
+        self._entries.append(entry)
+        self._pipeline.put(("header", entry), None)
+
+        zdict = b""
+        with open(path, "rb") as f:
+            data = f.read(BLOCK_SIZE)
+            while True:
+                next_data = f.read(BLOCK_SIZE) if data else b""
+                entry.crc = zlib.crc32(data, entry.crc)
+                entry.size += len(data)
+                if store:
+                    if data:
+                        self._pipeline.put(("data", entry), data)
+                elif not next_data and entry.size < _INLINE_LIMIT:
+                    self._pipeline.put(("data", entry), _deflate_block(data, self._level, b"", True))
+                else:
+                    self._pipeline.compress(("data", entry), data, self._level, zdict, not next_data)
+                    zdict = data[-_WINDOW:]
+                if not next_data:
+                    break
+                data = next_data
+
+        self._pipeline.put(("end", entry), None)
+        return entry.size
+
+    def close(self) -> None:
+        """Finish pending entries and write the central directory."""
+        self._pipeline.finish()
+        cd_offset = self._pos
+        for entry in self._entries:
+            self._write(self._central_header(entry))
+        cd_size = self._pos - cd_offset
+        count = len(self._entries)
+
+        if count >= 0xFFFF or cd_size >= 0xFFFFFFFF or cd_offset >= 0xFFFFFFFF:
+            eocd64_offset = self._pos
+            self._write(struct.pack(
+                "<4sQ2H2L4Q", b"PK\x06\x06", 44, self._ZIP64_VERSION, self._ZIP64_VERSION,
+                0, 0, count, count, cd_size, cd_offset,
+            ))
+            self._write(struct.pack("<4sLQL", b"PK\x06\x07", 0, eocd64_offset, 1))
+        self._write(struct.pack(
+            "<4s4H2LH", b"PK\x05\x06", 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+            min(cd_size, 0xFFFFFFFF), min(cd_offset, 0xFFFFFFFF), 0,
+        ))
+
+    def _central_header(self, entry: _ZipEntry) -> bytes:
+        name = entry.name.encode("utf-8")
+        dos_time, dos_date = self._dos_time(entry.mtime)
+        flags = self._FLAG_UTF8 if entry.is_dir else self._FLAG_UTF8 | self._FLAG_DESCRIPTOR
+
+        zip64_fields = []
+        size, compressed_size, offset = entry.size, entry.compressed_size, entry.offset
+        if size >= 0xFFFFFFFF:
+            zip64_fields.append(size)
+            size = 0xFFFFFFFF
+        if compressed_size >= 0xFFFFFFFF:
+            zip64_fields.append(compressed_size)
+            compressed_size = 0xFFFFFFFF
+        if offset >= 0xFFFFFFFF:
+            zip64_fields.append(offset)
+            offset = 0xFFFFFFFF
+        extra = (
+            struct.pack(f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields)
+            if zip64_fields else b""
+        )
+
+        external_attr = (entry.mode & 0xFFFF) << 16 | (0x10 if entry.is_dir else 0)
+        return self._CENTRAL.pack(
+            b"PK\x01\x02", self._ZIP64_VERSION, 3, self._ZIP64_VERSION, 0, flags,
+            entry.method, dos_time, dos_date, entry.crc, compressed_size, size,
+            len(name), len(extra), 0, 0, 0, external_attr, offset,
+        ) + name + extra
+
+
+class ParallelGzipWriter:
+    """
+    Write-only file object producing a single gzip member, compressed in parallel.
+
+    Input is cut into 1 MiB blocks that are deflated concurrently and written
+    in order. While store_only is set (e.g. while a tar member holds region
+    data) blocks are emitted as stored deflate blocks instead of recompressed.
+    """
+
+    def __init__(self, fileobj: BinaryIO, pool: ThreadPoolExecutor, level: int = 6, max_pending: int = 8):
+        self._out = fileobj
+        self._level = level
+        self._store_only = False
+        self._buffer = bytearray()
+        self._zdict = b""
+        self._crc = 0
+        self._size = 0
+        self.bytes_written = 0
+        self._pipeline = _OrderedPipeline(pool, self._sink, max_pending)
+        self._emit(b"\x1f\x8b\x08\x00" + struct.pack("<L", int(time.time())) + b"\x00\xff")
+
+    @property
+    def store_only(self) -> bool:
+        return self._store_only
+
+    @store_only.setter
+    def store_only(self, value: bool) -> None:
+        # Cut the block at the switch so buffered data keeps its own mode
+        if value != self._store_only and self._buffer:
+            self._submit(bytes(self._buffer), False)
+            self._buffer.clear()
+        self._store_only = value
+
+    def _emit(self, data: bytes) -> None:
+        self._out.write(data)
+        self.bytes_written += len(data)
+
+    def _sink(self, tag: Any, payload: bytes) -> None:
+        self._emit(payload)
+
+    def _submit(self, data: bytes, final: bool) -> None:
+        level = 0 if self._store_only else self._level
+        self._pipeline.compress(None, data, level, self._zdict, final)
+        self._zdict = data[-_WINDOW:]
+
+    def write(self, data: bytes) -> int:
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer += data
+        while len(self._buffer) >= BLOCK_SIZE:
+            block = bytes(self._buffer[:BLOCK_SIZE])
+            del self._buffer[:BLOCK_SIZE]
+            self._submit(block, False)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._submit(bytes(self._buffer), True)
+        self._buffer.clear()
+        self._pipeline.finish()
+        self._emit(struct.pack("<LL", self._crc, self._size & 0xFFFFFFFF))
+
+
+def _collect(source: Path) -> tuple[list[tuple[Path, str, os.stat_result]], list[tuple[Path, str, os.stat_result]]]:
+    """Walk source once; returns (directories, files) as (path, arcname, stat)."""
+    base = source.parent
+    directories, files = [], []
+    if source.is_file():
+        return directories, [(source, source.name, source.stat())]
+
+    pending = [source]
+    directories.append((source, source.name, source.stat()))
+    while pending:
+        current = pending.pop()
+        with os.scandir(current) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                path = Path(entry.path)
+                arcname = path.relative_to(base).as_posix()
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append((path, arcname, entry.stat(follow_symlinks=False)))
+                    pending.append(path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((path, arcname, entry.stat(follow_symlinks=False)))
+    return directories, files
+
+
+def write_archive(
+    source: str | Path,
+    archive_path: str | Path,
+    format: str = "zip",
+    level: int = 6,
+    workers: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> ArchiveStats:
+    """
+    Archive a file or directory using all cores.
+
+    Args:
+        source: File or directory to archive (stored under its own name)
+        archive_path: Archive file to write
+        format: "zip", "tar", "gztar" or "zsttar" (needs the zstandard package)
+        level: Compression level, 0-9 (0 stores without compression); zsttar
+            uses it as the zstd level, with 0 treated as 1
+        workers: Compression threads (CPU count by default)
+        progress: Called as progress(files_done, total_files, bytes_done, total_bytes)
+
+    Returns:
+        Archive statistics
+    """
+    source = Path(source)
+    archive_path = Path(archive_path)
+    if format == "zsttar" and not HAS_ZSTD:
+        raise ValueError("zsttar format requires the zstandard package")
+    if format not in ("zip", "tar", "gztar", "zsttar"):
+        raise ValueError(f"Unsupported archive format: {format}")
+
+    start = time.perf_counter()
+    stats = ArchiveStats(workers=workers or default_workers())
+    directories, files = _collect(source)
+    total_bytes = sum(st.st_size for _, _, st in files)
+    stats.directories = len(directories)
+    done_bytes = 0
+
+    def report(path: Path, size: int) -> None:
+        nonlocal done_bytes
+        stats.files += 1
+        done_bytes += size
+        if path.suffix.lower() in STORED_SUFFIXES:
+            stats.stored_files += 1
+        if progress:
+            progress(stats.files, len(files), done_bytes, total_bytes)
+
+    tmp_path = archive_path.with_name(f".{archive_path.name}.tmp")
+    try:
+        _write_to(tmp_path, format, level, stats.workers, directories, files, report)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp_path, archive_path)
+    stats.input_bytes = total_bytes
+    stats.output_bytes = archive_path.stat().st_size
+    stats.duration = time.perf_counter() - start
+    logger.debug(f"Archived {source} -> {archive_path}: {stats}")
+    return stats
+
+
+def _write_to(
+    tmp_path: Path,
+    format: str,
+    level: int,
+    workers: int,
+    directories: list[tuple[Path, str, os.stat_result]],
+    files: list[tuple[Path, str, os.stat_result]],
+    report: Callable[[Path, int], None],
+) -> None:
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aetherius-archive") as pool, \
+            open(tmp_path, "wb") as raw:
+        max_pending = workers * 2
+        if format == "zip":
+            writer = ParallelZipWriter(raw, pool, level, max_pending)
+            for _, arcname, st in directories:
+                writer.add_directory(arcname, st)
+            for path, arcname, st in files:
+                report(path, writer.add_file(path, arcname, st))
+            writer.close()
+        else:
+            if format == "gztar":
+                stream = ParallelGzipWriter(raw, pool, level, max_pending)
+            elif format == "zsttar":
+                # zstd has no store-only level; 0 would select its default
+                stream = zstandard.ZstdCompressor(level=max(1, level), threads=workers).stream_writer(
+                    raw, closefd=False
+                )
+            else:
+                stream = raw
+
+            with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                for path, arcname, _ in directories:
+                    tar.add(path, arcname, recursive=False)
+                for path, arcname, st in files:
+                    if isinstance(stream, ParallelGzipWriter):
+                        stream.store_only = path.suffix.lower() in STORED_SUFFIXES
+                    tar.add(path, arcname, recursive=False)
+                    report(path, st.st_size)
+            if stream is not raw:
+                stream.close()
+
@@ -0,0 +1,569 @@
+"""Content-addressed, deduplicated snapshot storage for world backups."""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Region files are laid out in 4 KiB sectors; a chunk rewrite touches few of them
+REGION_SUFFIXES = {".mca", ".mcr", ".mcc"}
+REGION_CHUNK_SIZE = 128 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_RAW = b"R"
+_ZLIB = b"Z"
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+@dataclass
+class SnapshotStats:
+    """Counters for one snapshot run."""
+
+    files: int = 0
+    directories: int = 0
+    total_size: int = 0
+    unchanged_files: int = 0
+    hashed_bytes: int = 0
+    chunks: int = 0
+    new_chunks: int = 0
+    bytes_written: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class SnapshotInfo:
+    """Summary of a stored snapshot."""
+
+    name: str
+    created_at: str
+    source: str
+    stats: SnapshotStats = field(default_factory=SnapshotStats)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class BackupStore:
+    """
+    Snapshot store that keeps every unique chunk of file data once.
+
+    Files are split into fixed-size chunks (sector-aligned 128 KiB for region
+    files, 1 MiB otherwise) and each chunk is stored under its BLAKE2b digest.
+    Region data is already compressed by the game and is stored as is; other
+    chunks are zlib-compressed when that helps. A snapshot is a manifest listing each
+    file with its chunk digests, so a new snapshot only writes chunks that
+    changed. Files whose size and mtime match the previous snapshot reuse its
+    chunk list without being read at all.
+
+    Every manifest is complete on its own: restoring a snapshot reads only
+    that manifest and its chunks. Deleting snapshots leaves chunks behind
+    until garbage_collect() removes those no manifest refers to.
+
+    Layout below the store root::
+
+        chunks/ab/abcdef...      chunk data
+        snapshots/<name>.json    snapshot summary
+        snapshots/<name>.files   gzip JSON list of files and chunk digests
+    """
+
+    def __init__(self, root: str | Path, max_workers: int = 4):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (created on first write)
+            max_workers: Threads used to hash and store files in parallel
+        """
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.snapshots_dir = self.root / "snapshots"
+        self.max_workers = max(1, max_workers)
+        # Snapshot, prune and garbage collection must not interleave
+        self._lock = threading.Lock()
+
+    # Snapshots
+
+    def create_snapshot(
+        self, source: str | Path, name: str | None = None, verify: bool = False
+    ) -> SnapshotInfo:
+        """
+        Store a snapshot of a directory.
+
+        Args:
+            source: Directory to snapshot
+            name: Snapshot name (timestamp based by default)
+            verify: Re-read files even if size and mtime are unchanged, and
+                check stored chunks against the data instead of only their size
+
+        Returns:
+            Summary of the new snapshot
+        """
+        source = Path(source).resolve()
+        if not source.is_dir():
+            raise FileNotFoundError(f"Snapshot source {source} is not a directory")
+
+        name = name or f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._check_name(name)
+
+        with self._lock:
+            if self._summary_path(name).exists():
+                raise FileExistsError(f"Snapshot {name} already exists")
+
+            start = time.perf_counter()
+            stats = SnapshotStats()
+            previous = {} if verify else self._latest_files()
+
+            directories, files = self._walk(source)
+            stats.directories = len(directories)
+
+            entries = []
+            chunk_dirs: set[Path] = set()
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="aetherius-backup"
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        self._store_file, source, rel_path, st, previous.get(rel_path),
+                        verify, chunk_dirs,
+                    )
+                    for rel_path, st in files
+                ]
+                for future in futures:
+                    entry, file_stats = future.result()
+                    entries.append(entry)
+                    stats.files += 1
+                    stats.total_size += entry["size"]
+                    stats.unchanged_files += file_stats["unchanged"]
+                    stats.hashed_bytes += file_stats["hashed_bytes"]
+                    stats.chunks += len(entry["chunks"])
+                    stats.new_chunks += file_stats["new_chunks"]
+                    stats.bytes_written += file_stats["bytes_written"]
+
+            # New chunks are fsynced as written; their directory entries must
+            # be durable too before a manifest refers to them
+            if chunk_dirs:
+                for chunk_dir in chunk_dirs | {self.chunks_dir}:
+                    self._fsync_dir(chunk_dir)
+
+            stats.duration = time.perf_counter() - start
+            info = SnapshotInfo(
+                name=name,
+                created_at=datetime.now().isoformat(),
+                source=str(source),
+                stats=stats,
+            )
+            self._write_manifest(info, directories, entries)
+
+        logger.info(
+            f"Snapshot {name}: {stats.files} files, {stats.total_size} bytes, "
+            f"{stats.new_chunks}/{stats.chunks} new chunks, "
+            f"{stats.bytes_written} bytes written in {stats.duration:.2f}s"
+        )
+        return info
+
+    def restore_snapshot(self, name: str, destination: str | Path) -> int:
+        """
+        Recreate a snapshot's files in a directory.
+
+        The snapshot is written to a temporary directory next to the
+        destination and moved into place once complete, so a failed restore
+        leaves no partial world behind. The destination must not exist.
+
+        Args:
+            name: Snapshot name
+            destination: Directory to create
+
+        Returns:
+            Number of files restored
+        """
+        destination = Path(destination)
+        if destination.exists():
+            raise FileExistsError(f"Restore destination {destination} already exists")
+
+        directories, entries = self._read_files(name)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{destination.name}.restore-", dir=destination.parent))
+        try:
+            for rel_dir in directories:
+                (staging / rel_dir).mkdir(parents=True, exist_ok=True)
+
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="aetherius-restore"
+            ) as pool:
+                for future in [pool.submit(self._restore_file, staging, e) for e in entries]:
+                    future.result()
+
+            os.replace(staging, destination)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Restored snapshot {name} to {destination} ({len(entries)} files)")
+        return len(entries)
+
+    def list_snapshots(self) -> list[SnapshotInfo]:
+        """List stored snapshots, newest first."""
+        snapshots = []
+        if not self.snapshots_dir.exists():
+            return snapshots
+        for summary_path in self.snapshots_dir.glob("*.json"):
+            try:
+                data = json.loads(summary_path.read_text(encoding="utf-8"))
+                data["stats"] = SnapshotStats(**data.get("stats", {}))
+                snapshots.append(SnapshotInfo(**data))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable snapshot summary {summary_path}: {e}")
+        snapshots.sort(key=lambda info: info.created_at, reverse=True)
+        return snapshots
+
+    def has_snapshot(self, name: str) -> bool:
+        """Whether a snapshot with this name exists."""
+        return bool(_NAME_PATTERN.match(name)) and self._summary_path(name).exists()
+
+    def delete_snapshot(self, name: str) -> bool:
+        """
+        Delete a snapshot's manifest. Its chunks stay until garbage_collect().
+
+        Returns:
+            True if the snapshot existed
+        """
+        self._check_name(name)
+        with self._lock:
+            existed = self._summary_path(name).exists()
+            self._files_path(name).unlink(missing_ok=True)
+            self._summary_path(name).unlink(missing_ok=True)
+        return existed
+
+    def prune(self, keep_last: int) -> list[str]:
+        """
+        Delete all but the newest snapshots and collect unreferenced chunks.
+
+        Args:
+            keep_last: Number of snapshots to keep
+
+        Returns:
+            Names of the deleted snapshots
+        """
+        deleted = [info.name for info in self.list_snapshots()[max(0, keep_last):]]
+        for name in deleted:
+            self.delete_snapshot(name)
+        if deleted:
+            self.garbage_collect()
+        return deleted
+
+    def garbage_collect(self) -> dict[str, int]:
+        """
+        Remove chunks that no snapshot refers to.
+
+        References are read from every file list on disk, including those of
+        snapshots whose summary is unreadable. If any file list cannot be
+        read, nothing is removed.
+
+        Returns:
+            Dictionary with removed chunk count and freed bytes
+
+        Raises:
+            RuntimeError: If a snapshot file list cannot be read
+        """
+        removed = freed = 0
+        with self._lock:
+            referenced: set[str] = set()
+            for files_path in self.snapshots_dir.glob("*.files"):
+                if files_path.name.startswith("."):
+                    continue
+                try:
+                    data = json.loads(gzip.decompress(files_path.read_bytes()))
+                    for entry in data["files"]:
+                        referenced.update(entry["chunks"])
+                except (OSError, EOFError, zlib.error, ValueError, KeyError, TypeError) as e:
+                    logger.error(f"Garbage collection aborted: cannot read {files_path}: {e}")
+                    raise RuntimeError(
+                        f"Cannot read snapshot file list {files_path.name}; "
+                        f"garbage collection aborted"
+                    ) from e
+
+            for chunk_path in self._iter_chunk_paths():
+                if chunk_path.name in referenced:
+                    continue
+                try:
+                    freed += chunk_path.stat().st_size
+                    chunk_path.unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Could not remove chunk {chunk_path}: {e}")
+
+        logger.info(f"Backup store garbage collection removed {removed} chunks ({freed} bytes)")
+        return {"removed_chunks": removed, "freed_bytes": freed}
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with snapshot count, stored chunk count and sizes
+        """
+        chunk_count = stored_bytes = 0
+        for chunk_path in self._iter_chunk_paths():
+            chunk_count += 1
+            stored_bytes += chunk_path.stat().st_size
+        snapshots = self.list_snapshots()
+        return {
+            "root": str(self.root),
+            "snapshots": len(snapshots),
+            "chunks": chunk_count,
+            "stored_bytes": stored_bytes,
+            "logical_bytes": sum(info.stats.total_size for info in snapshots),
+        }
+
+    # Internals
+
+    @staticmethod
+    def _check_name(name: str) -> None:
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid snapshot name: {name!r}")
+
+    def _summary_path(self, name: str) -> Path:
+        return self.snapshots_dir / f"{name}.json"
+
+    def _files_path(self, name: str) -> Path:
+        return self.snapshots_dir / f"{name}.files"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _iter_chunk_paths(self) -> Iterator[Path]:
+        if not self.chunks_dir.exists():
+            return
+        for prefix_dir in self.chunks_dir.iterdir():
+            if prefix_dir.is_dir():
+                yield from (p for p in prefix_dir.iterdir() if not p.name.startswith("."))
+
+    @staticmethod
+    def _walk(source: Path) -> tuple[list[str], list[tuple[str, os.stat_result]]]:
+        """Collect relative directories and regular files below source."""
+        directories, files = [], []
+        pending = [("", str(source))]
+        while pending:
+            rel_dir, abs_dir = pending.pop()
+            with os.scandir(abs_dir) as it:
+                for entry in it:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(rel_path)
+                        pending.append((rel_path, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((rel_path, entry.stat(follow_symlinks=False)))
+        directories.sort()
+        return directories, files
+
+    def _latest_files(self) -> dict[str, dict[str, Any]]:
+        """File entries of the newest snapshot, for the unchanged-file shortcut."""
+        for info in self.list_snapshots():
+            try:
+                _, entries = self._read_files(info.name)
+            except Exception as e:
+                logger.warning(f"Cannot read snapshot {info.name}, hashing all files: {e}")
+                return {}
+            return {entry["path"]: entry for entry in entries}
+        return {}
+
+    def _store_file(
+        self,
+        source: Path,
+        rel_path: str,
+        st: os.stat_result,
+        previous: dict[str, Any] | None,
+        verify: bool,
+        chunk_dirs: set[Path],
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        """
+        Chunk, hash and store one file (runs in a worker thread).
+
+        Directories that received new chunks are added to chunk_dirs.
+        """
+        file_stats = {"unchanged": 0, "hashed_bytes": 0, "new_chunks": 0, "bytes_written": 0}
+        entry = {
+            "path": rel_path,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "mode": st.st_mode & 0o7777,
+        }
+
+        if (
+            previous
+            and previous["size"] == st.st_size
+            and previous["mtime_ns"] == st.st_mtime_ns
+        ):
+            entry["chunks"] = previous["chunks"]
+            file_stats["unchanged"] = 1
+            return entry, file_stats
+
+        # Region chunks are already compressed by the game; store them raw
+        is_region = os.path.splitext(rel_path)[1].lower() in REGION_SUFFIXES
+        chunk_size = REGION_CHUNK_SIZE if is_region else DEFAULT_CHUNK_SIZE
+        digests = []
+        with open(source / rel_path, "rb") as f:
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                file_stats["hashed_bytes"] += len(data)
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                written = self._put_chunk(digest, data, compress=not is_region, verify=verify)
+                if written:
+                    file_stats["new_chunks"] += 1
+                    file_stats["bytes_written"] += written
+                    chunk_dirs.add(self._chunk_path(digest).parent)
+                digests.append(digest)
+
+        entry["chunks"] = digests
+        return entry, file_stats
+
+    def _put_chunk(
+        self, digest: str, data: bytes, compress: bool = True, verify: bool = False
+    ) -> int:
+        """Store a chunk unless a valid copy exists; returns bytes written (0 if it existed)."""
+        chunk_path = self._chunk_path(digest)
+        if self._has_chunk(chunk_path, digest, data, verify):
+            return 0
+
+        payload = _RAW + data
+        if compress:
+            compressed = zlib.compress(data, 1)
+            if len(compressed) < len(data) * 0.9:
+                payload = _ZLIB + compressed
+
+        chunk_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".", dir=chunk_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, chunk_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return len(payload)
+
+    def _has_chunk(self, chunk_path: Path, digest: str, data: bytes, verify: bool) -> bool:
+        """
+        Whether a usable copy of the chunk is stored.
+
+        A stored payload is a tag byte plus the data, raw or smaller once
+        compressed, so any other size is a torn write. With verify the
+        payload is decoded and compared. Damaged chunks are rewritten.
+        """
+        try:
+            size = chunk_path.stat().st_size
+        except FileNotFoundError:
+            return False
+        valid = 1 < size <= len(data) + 1
+        if valid and verify:
+            try:
+                valid = self._decode_chunk(chunk_path.read_bytes()) == data
+            except (OSError, zlib.error):
+                valid = False
+        if not valid:
+            logger.warning(f"Backup chunk {digest} is damaged; storing it again")
+        return valid
+
+    @staticmethod
+    def _decode_chunk(payload: bytes) -> bytes:
+        return zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+
+    def _read_chunk(self, digest: str) -> bytes:
+        data = self._decode_chunk(self._chunk_path(digest).read_bytes())
+        if hashlib.blake2b(data, digest_size=16).hexdigest() != digest:
+            raise ValueError(f"Backup chunk {digest} is corrupt")
+        return data
+
+    def _restore_file(self, staging: Path, entry: dict[str, Any]) -> None:
+        target = staging / entry["path"]
+        with open(target, "wb") as f:
+            for digest in entry["chunks"]:
+                f.write(self._read_chunk(digest))
+        os.chmod(target, entry["mode"])
+        os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+    def _write_manifest(
+        self, info: SnapshotInfo, directories: list[str], entries: list[dict[str, Any]]
+    ) -> None:
+        """Write the file list, then the summary that makes the snapshot visible."""
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        files_data = gzip.compress(
+            json.dumps({"directories": directories, "files": entries}).encode("utf-8"), 6
+        )
+        self._write_atomic(self._files_path(info.name), files_data)
+        self._write_atomic(
+            self._summary_path(info.name),
+            json.dumps(info.to_dict(), indent=2).encode("utf-8"),
+        )
+
+    def _read_files(self, name: str) -> tuple[list[str], list[dict[str, Any]]]:
+        self._check_name(name)
+        files_path = self._files_path(name)
+        if not files_path.exists():
+            raise FileNotFoundError(f"Snapshot {name} not found")
+        data = json.loads(gzip.decompress(files_path.read_bytes()))
+        return data["directories"], data["files"]
+
+    @staticmethod
+    def _fsync_dir(path: Path) -> None:
+        """Make renames into a directory durable (not possible on Windows)."""
+        if os.name == "nt":
+            return
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+# One store per server directory, shared by every API that creates or lists backups
+_backup_stores: dict[Path, BackupStore] = {}
+_backup_stores_lock = threading.Lock()
+
+
+def get_backup_store(server_directory: str | Path) -> BackupStore:
+    """Get the snapshot store under <server_directory>/backups/store."""
+    root = (Path(server_directory) / "backups" / "store").resolve()
+    with _backup_stores_lock:
+        store = _backup_stores.get(root)
+        if store is None:
+            store = _backup_stores[root] = BackupStore(root)
+        return store
@@ -1,28 +1,277 @@
-"""Command queue system for cross-process server command execution."""
+"""Command queue system for cross-process server command execution.
+
+Commands travel over a Unix domain socket next to the queue directory when
+the server process is listening on it: each request and response is a
+length-prefixed JSON frame carrying the command ID, and the result is pushed
+back as soon as the command has run. When the socket is unavailable, the
+original one-JSON-file-per-command queue is used instead.
+"""
 
 import asyncio
+import errno
 import json
 import logging
+import os
+import struct
 import time
 import uuid
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Executes a command in the server process within the given timeout (seconds)
+# and returns a dict with "success", "output" and "error" keys
+CommandExecutor = Callable[[str, float], Awaitable[dict[str, Any]]]
+
+DEFAULT_TIMEOUT = 30.0
+# Extra time the client waits beyond the command timeout, so that the result
+# of a command that used its whole timeout still reaches it
+_RESPONSE_GRACE = 2.0
+
+_FRAME_HEADER = struct.Struct("!I")
+_MAX_FRAME_SIZE = 1024 * 1024
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """Read one length-prefixed JSON frame."""
+    header = await reader.readexactly(_FRAME_HEADER.size)
+    (length,) = _FRAME_HEADER.unpack(header)
+    if length > _MAX_FRAME_SIZE:
+        raise ValueError(f"Command frame too large: {length} bytes")
+    return json.loads(await reader.readexactly(length))
+
+
+def _encode_frame(data: dict[str, Any]) -> bytes:
+    """Encode a dict as a length-prefixed JSON frame."""
+    payload = json.dumps(data).encode("utf-8")
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
 
 class CommandQueue:
     """Manages a command queue for cross-process server command execution."""
 
-    def __init__(self, queue_dir: Path = None):
+    def __init__(self, queue_dir: Path = None, socket_path: Optional[Path] = None):
         self.queue_dir = queue_dir or Path("server/.command_queue")
         self.pending_dir = self.queue_dir / "pending"
         self.completed_dir = self.queue_dir / "completed"
+        self.socket_path = socket_path or self.queue_dir / "command.sock"
+
+        self._socket_server: Optional[asyncio.AbstractServer] = None
+        self._executor: Optional[CommandExecutor] = None
 
         # Ensure directories exist
         self.pending_dir.mkdir(parents=True, exist_ok=True)
         self.completed_dir.mkdir(parents=True, exist_ok=True)
 
+    async def submit(self, command: str, timeout: float = DEFAULT_TIMEOUT) -> dict[str, Any]:
+        """
+        Execute a command in the server process and wait for its result.
+
+        Uses the command socket when the server is listening on it and falls
+        back to the file queue otherwise.
+
+        Args:
+            command: The command to execute
+            timeout: Timeout in seconds
+
+        Returns:
+            dict: Command result data, in the same format as
+            wait_for_completion()
+        """
+        command_id = str(uuid.uuid4())
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        except (FileNotFoundError, ConnectionRefusedError, OSError) as e:
+            logger.debug(f"Command socket unavailable ({e}), using file queue")
+            command_id = self.add_command(command, timeout)
+            return await self.wait_for_completion(command_id, timeout)
+
+        try:
+            writer.write(
+                _encode_frame({"id": command_id, "command": command, "timeout": timeout})
+            )
+            await writer.drain()
+            return await asyncio.wait_for(_read_frame(reader), timeout + _RESPONSE_GRACE)
+        except asyncio.TimeoutError:
+            return {
+                "id": command_id,
+                "status": "timeout",
+                "success": False,
+                "error": "Command execution timed out",
+            }
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            return {
+                "id": command_id,
+                "status": "failed",
+                "success": False,
+                "error": f"Command socket error: {e}",
+            }
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def start_server(self, executor: CommandExecutor) -> None:
+        """
+        Start accepting commands on the command socket.
+
+        Args:
+            executor: Coroutine function that runs a command in this process
+        """
+        if self._socket_server is not None:
+            return
+
+        socket_path = str(self.socket_path)
+        if os.path.exists(socket_path):
+            await self._remove_stale_socket(socket_path)
+        self._executor = executor
+        self._socket_server = await asyncio.start_unix_server(
+            self._handle_connection, path=socket_path
+        )
+        logger.debug(f"Command socket listening on {socket_path}")
+
+    @staticmethod
+    async def _remove_stale_socket(socket_path: str) -> None:
+        """
+        Remove a socket file left behind by a process that exited.
+
+        Raises:
+            OSError: If another process is still listening on the socket
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(socket_path), timeout=1.0
+            )
+        except ConnectionRefusedError:
+            logger.debug(f"Removing stale command socket {socket_path}")
+            try:
+                os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+            return
+        except FileNotFoundError:
+            return
+        except asyncio.TimeoutError:
+            pass
+        else:
+            writer.close()
+        raise OSError(
+            errno.EADDRINUSE, f"Command socket {socket_path} is in use by another process"
+        )
+
+    async def stop_server(self) -> None:
+        """Stop accepting commands on the command socket."""
+        if self._socket_server is None:
+            return
+
+        self._socket_server.close()
+        try:
+            await self._socket_server.wait_closed()
+        except Exception:
+            pass
+        self._socket_server = None
+        self._executor = None
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve command requests from one client connection."""
+        write_lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+
+        async def run(request: dict[str, Any]) -> None:
+            result = await self._execute(
+                request.get("id", ""),
+                request.get("command", ""),
+                float(request.get("timeout") or DEFAULT_TIMEOUT),
+            )
+            async with write_lock:
+                writer.write(_encode_frame(result))
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    request = await _read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                # Requests on one connection may complete out of order; the
+                # client matches responses by ID
+                task = asyncio.create_task(run(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except Exception as e:
+            logger.error(f"Error serving command socket client: {e}")
+        finally:
+            writer.close()
+
+    async def _execute(
+        self, command_id: str, command: str, timeout: float
+    ) -> dict[str, Any]:
+        """Run a command through the executor and build its result record."""
+        try:
+            if self._executor is None:
+                raise RuntimeError("No command executor registered")
+            outcome = await self._executor(command, timeout)
+            success = bool(outcome.get("success"))
+            error = outcome.get("error")
+            output = outcome.get("output")
+        except Exception as e:
+            logger.error(f"Error executing command {command}: {e}")
+            success, error, output = False, str(e), None
+
+        return {
+            "id": command_id,
+            "status": "completed",
+            "success": success,
+            "timestamp": time.time(),
+            "error": error,
+            "output": output,
+        }
+
+    async def process_pending(self, executor: CommandExecutor) -> int:
+        """
+        Execute all commands currently waiting in the file queue.
+
+        Args:
+            executor: Coroutine function that runs a command in this process
+
+        Returns:
+            int: Number of commands processed
+        """
+        pending_commands = self.get_pending_commands()
+        for command_data in pending_commands:
+            command_id = command_data["id"]
+            command = command_data["command"]
+            timeout = command_data.get("timeout", DEFAULT_TIMEOUT)
+            logger.info(f"处理队列命令: {command} (ID: {command_id})")
+
+            try:
+                outcome = await executor(command, timeout)
+                self.mark_command_completed(
+                    command_id,
+                    success=bool(outcome.get("success")),
+                    error=outcome.get("error"),
+                    output=outcome.get("output"),
+                )
+            except Exception as e:
+                logger.error(f"执行队列命令 {command} 失败: {e}")
+                self.mark_command_completed(command_id, success=False, error=str(e))
+
+        return len(pending_commands)
+
     def add_command(self, command: str, timeout: float = 30.0) -> str:
         """
         Add a command to the queue.
@@ -9,7 +9,8 @@ import re
 import threading
 import json
 import yaml
-from typing import Any, Dict, List, Optional, Union, Callable, Pattern, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union, Callable, Pattern, Set
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass, field
@@ -17,6 +18,7 @@ import logging
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
+from ..file_watcher import FileWatch, get_file_watcher
 from .interfaces import (
     IConfigManager, IConfigSource, IConfigValidator, IConfigWatcher,
     IConfigEncryption, IConfigTemplate, ConfigPriority, ConfigFormat,
@@ -25,9 +27,16 @@ from .interfaces import (
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 class ConfigManager(IConfigManager):
-    """配置管理器实现"""
+    """配置管理器实现
+
+    每个配置源只解析一次，展开为预先计算好点分键的扁平快照；所有源按优先级
+    合并为一张只读查找表，仅在配置源报告变更、重载或写入时重建。
+    解密、模板渲染和验证后的值按快照版本缓存，命中时 get() 只需一次字典查找。
+    """
     
     def __init__(self, 
                  enable_watching: bool = True,
@@ -36,7 +45,7 @@ class ConfigManager(IConfigManager):
         self._sources: List[IConfigSource] = []
         self._validators: Dict[Pattern, IConfigValidator] = {}
         self._watchers: Dict[Pattern, List[IConfigWatcher]] = defaultdict(list)
-        self._config_cache: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}  # 运行时设置的值，优先于所有配置源
         self._descriptors: Dict[str, ConfigDescriptor] = {}
         self._lock = threading.RLock()
         self._enable_watching = enable_watching
@@ -44,22 +53,38 @@ class ConfigManager(IConfigManager):
         self._template_engine = template_engine
         self._watch_tasks: Set[asyncio.Task] = set()
         
+        # 配置快照
+        self._source_configs: Dict[int, Dict[str, Any]] = {}  # 各配置源解析结果
+        self._source_snapshots: Dict[int, Dict[str, Any]] = {}  # 各配置源扁平快照
+        self._stale_sources: Set[int] = set()
+        self._table: Optional[Mapping[str, Any]] = None  # 合并后的查找表
+        self._tree: Dict[str, Any] = {}  # 合并后的嵌套配置（模板和验证上下文）
+        self._merged: Dict[str, Any] = {}
+        self._resolved: Dict[str, Any] = {}  # 当前版本已解析的值
+        self._version = 0
+        self._snapshot_builds = 0
+        
         # 配置变更历史
         self._change_history: List[ConfigChange] = []
         self._max_history_size = 1000
     
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
+        # 快速路径：当前版本已解析过的键无需加锁
+        value = self._resolved.get(key, _MISSING)
+        if value is not _MISSING:
+            return default if value is None else value
+        
         with self._lock:
-            # 检查缓存
-            if key in self._config_cache:
-                value = self._config_cache[key]
-            else:
-                value = self._load_value(key)
-                if value is not None:
-                    self._config_cache[key] = value
+            self._ensure_snapshot()
+            resolved = self._resolved
+            
+            value = self._overrides.get(key, _MISSING)
+            if value is _MISSING:
+                value = self._table.get(key)
             
             if value is None:
+                resolved[key] = None
                 return default
             
             # 解密敏感配置
@@ -74,22 +99,20 @@ class ConfigManager(IConfigManager):
             # 模板渲染
             if self._template_engine and isinstance(value, str):
                 try:
-                    value = self._template_engine.render(value, self._config_cache)
+                    value = self._template_engine.render(value, self._tree)
                 except Exception as e:
                     logger.warning(f"Failed to render template for {key}: {e}")
             
             # 验证
-            validated_value = self._validate_value(key, value)
-            if validated_value != value:
-                self._config_cache[key] = validated_value
-                value = validated_value
+            value = self._validate_value(key, value)
             
+            resolved[key] = value
             return value
     
     def set(self, key: str, value: Any, priority: ConfigPriority = ConfigPriority.RUNTIME):
         """设置配置值"""
         with self._lock:
-            old_value = self._config_cache.get(key)
+            old_value = self._raw_value(key)
             
             # 验证新值
             validated_value = self._validate_value(key, value)
@@ -99,12 +122,15 @@ class ConfigManager(IConfigManager):
                 if not self._encryption.is_encrypted(validated_value):
                     validated_value = self._encryption.encrypt(validated_value)
             
-            # 更新缓存
-            self._config_cache[key] = validated_value
+            # 更新运行时值
+            self._overrides[key] = validated_value
             
             # 尝试保存到可写的配置源
             self._save_to_source(key, validated_value, priority)
             
+            # 其他值的模板可能引用了该键
+            self._resolved = {}
+            
             # 记录变更
             change = ConfigChange(
                 key=key,
@@ -125,9 +151,9 @@ class ConfigManager(IConfigManager):
     def delete(self, key: str) -> bool:
         """删除配置"""
         with self._lock:
-            if key in self._config_cache:
-                old_value = self._config_cache[key]
-                del self._config_cache[key]
+            if key in self._overrides:
+                old_value = self._overrides.pop(key)
+                self._resolved = {}
                 
                 # 记录变更
                 change = ConfigChange(
@@ -163,11 +189,14 @@ class ConfigManager(IConfigManager):
         with self._lock:
             logger.info("Reloading configuration...")
             
-            old_config = self._config_cache.copy()
-            self._config_cache.clear()
+            self._ensure_snapshot()
+            old_config = self._merged
+            self._overrides.clear()
             
             # 重新加载所有源
-            new_config = self._load_all_config()
+            self._invalidate()
+            self._ensure_snapshot()
+            new_config = self._merged
             
             # 检测变更
             all_keys = set(old_config.keys()) | set(new_config.keys())
@@ -194,6 +223,7 @@ class ConfigManager(IConfigManager):
             self._sources.append(source)
             # 按优先级排序
             self._sources.sort(key=lambda s: s.priority.value)
+            self._invalidate(source)
             
             # 如果启用监听且源支持，则设置监听
             if self._enable_watching and hasattr(source, 'watch'):
@@ -201,13 +231,19 @@ class ConfigManager(IConfigManager):
                     source.watch(self._on_source_changed)
                 except Exception as e:
                     logger.warning(f"Failed to setup watching for source {source.name}: {e}")
+            elif self._enable_watching and hasattr(source, 'add_change_callback'):
+                source.add_change_callback(
+                    lambda change, source=source: self._on_source_key_changed(source, change)
+                )
         
         logger.info(f"Added config source: {source.name} (priority: {source.priority.value})")
     
     def add_validator(self, key_pattern: str, validator: IConfigValidator):
         """添加验证器"""
         pattern = re.compile(key_pattern)
-        self._validators[pattern] = validator
+        with self._lock:
+            self._validators[pattern] = validator
+            self._resolved = {}
         logger.info(f"Added validator for pattern: {key_pattern}")
     
     def add_watcher(self, key_pattern: str, watcher: IConfigWatcher):
@@ -271,37 +307,122 @@ class ConfigManager(IConfigManager):
                 return self._change_history[-limit:]
             return self._change_history.copy()
     
+    def get_snapshot_stats(self) -> Dict[str, Any]:
+        """获取配置快照统计"""
+        with self._lock:
+            return {
+                'version': self._version,
+                'snapshot_builds': self._snapshot_builds,
+                'sources': len(self._sources),
+                'keys': len(self._table) if self._table is not None else 0,
+                'resolved_keys': len(self._resolved),
+                'overrides': len(self._overrides),
+            }
+    
     def _load_value(self, key: str) -> Any:
-        """从配置源加载值"""
-        # 按优先级从高到低查找
-        for source in reversed(self._sources):
-            try:
-                config = source.load()
-                if key in config:
-                    return config[key]
-                
-                # 支持嵌套键查找 (e.g., "database.host")
-                value = self._get_nested_value(config, key)
-                if value is not None:
-                    return value
-            except Exception as e:
-                logger.warning(f"Error loading from source {source.name}: {e}")
-        
-        return None
+        """从配置快照加载值"""
+        with self._lock:
+            self._ensure_snapshot()
+            return self._table.get(key)
     
     def _load_all_config(self) -> Dict[str, Any]:
         """加载所有配置"""
-        merged_config = {}
+        with self._lock:
+            self._ensure_snapshot()
+            return dict(self._merged)
+    
+    def _raw_value(self, key: str) -> Any:
+        """获取未经解析的当前值"""
+        value = self._overrides.get(key, _MISSING)
+        if value is _MISSING:
+            self._ensure_snapshot()
+            value = self._table.get(key)
+        return value
+    
+    def _invalidate(self, source: Optional[IConfigSource] = None):
+        """使配置源快照失效（未指定时为全部配置源），下次读取时重建"""
+        with self._lock:
+            if source is None:
+                self._stale_sources.update(id(s) for s in self._sources)
+            else:
+                self._stale_sources.add(id(source))
+            self._table = None
+            self._resolved = {}
+            self._version += 1
+    
+    def _ensure_snapshot(self):
+        """重新解析失效的配置源并重建合并查找表"""
+        if self._table is not None:
+            return
         
-        # 按优先级从低到高合并
         for source in self._sources:
+            source_id = id(source)
+            if source_id in self._source_snapshots and source_id not in self._stale_sources:
+                continue
             try:
-                config = source.load()
-                self._merge_config(merged_config, config)
+                config = source.load() or {}
             except Exception as e:
                 logger.warning(f"Error loading from source {source.name}: {e}")
+                config = {}
+            self._source_configs[source_id] = config
+            self._source_snapshots[source_id] = self._flatten(config)
+        self._stale_sources.clear()
+        
+        # 移除已不存在的配置源
+        live_ids = {id(s) for s in self._sources}
+        for source_id in set(self._source_snapshots) - live_ids:
+            self._source_snapshots.pop(source_id, None)
+            self._source_configs.pop(source_id, None)
         
-        return merged_config
+        # 按优先级从低到高合并
+        table: Dict[str, Any] = {}
+        tree: Dict[str, Any] = {}
+        merged: Dict[str, Any] = {}
+        for source in self._sources:
+            source_id = id(source)
+            table.update(self._source_snapshots[source_id])
+            self._deep_merge(tree, self._source_configs[source_id])
+            self._merge_config(merged, self._source_configs[source_id])
+        
+        self._tree = tree
+        self._merged = merged
+        self._resolved = {}
+        self._table = MappingProxyType(table)
+        self._snapshot_builds += 1
+    
+    @staticmethod
+    def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+        """展开配置为点分键到值的映射（包括中间层的字典）"""
+        flat: Dict[str, Any] = {}
+        
+        def walk(node: Dict[str, Any], prefix: str):
+            for k, v in node.items():
+                full_key = f"{prefix}.{k}" if prefix else str(k)
+                if v is None:
+                    continue
+                flat[full_key] = v
+                if isinstance(v, dict):
+                    walk(v, full_key)
+        
+        walk(config, "")
+        
+        # 字面上的顶层键优先于同名的嵌套路径
+        for k, v in config.items():
+            if v is not None:
+                flat[str(k)] = v
+        
+        return flat
+    
+    def _deep_merge(self, target: Dict[str, Any], source: Dict[str, Any]):
+        """将配置递归合并到嵌套字典"""
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                self._deep_merge(target[key], value)
+            elif isinstance(value, dict):
+                target[key] = {}
+                self._deep_merge(target[key], value)
+            else:
+                target[key] = value
     
     def _get_nested_value(self, config: Dict[str, Any], key: str) -> Any:
         """获取嵌套配置值"""
@@ -337,7 +458,7 @@ class ConfigManager(IConfigManager):
         for pattern, validator in self._validators.items():
             if pattern.match(key):
                 try:
-                    return validator.validate(key, value, self._config_cache)
+                    return validator.validate(key, value, self._tree)
                 except Exception as e:
                     raise ConfigValidationError(f"Validation failed for {key}: {e}")
         
@@ -352,6 +473,7 @@ class ConfigManager(IConfigManager):
                     config = source.load()
                     config[key] = value
                     source.save(config)
+                    self._invalidate(source)
                     logger.debug(f"Saved {key} to source {source.name}")
                     return
                 except Exception as e:
@@ -393,6 +515,13 @@ class ConfigManager(IConfigManager):
             self.reload()
         except Exception as e:
             logger.error(f"Error during config reload: {e}")
+    
+    def _on_source_key_changed(self, source: IConfigSource, change: ConfigChange):
+        """配置源单个键变更回调（可能来自监听线程）"""
+        self._invalidate(source)
+        with self._lock:
+            self._add_change_history(change)
+        self._notify_watchers(change)
 
 
 class FileConfigSource(IConfigSource):
@@ -410,7 +539,7 @@ class FileConfigSource(IConfigSource):
         self._writable = writable
         self._watch = watch
         self._watch_callback: Optional[Callable] = None
-        self._watch_task: Optional[asyncio.Task] = None
+        self._file_watch: Optional[FileWatch] = None
     
     @property
     def priority(self) -> ConfigPriority:
@@ -474,39 +603,32 @@ class FileConfigSource(IConfigSource):
         
         self._watch_callback = callback
         
-        # 启动文件监听任务
-        if self._watch_task is None or self._watch_task.done():
-            loop = asyncio.get_event_loop()
-            self._watch_task = loop.create_task(self._watch_file())
+        # 订阅共享文件监听器（inotify 或自适应轮询）
+        if self._file_watch is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            self._file_watch = get_file_watcher().watch(
+                self.file_path, self._on_file_changed, debounce=0.2, loop=loop
+            )
         
         return True
     
+    def stop_watching(self):
+        """停止监听文件变化"""
+        if self._file_watch is not None:
+            get_file_watcher().unwatch(self._file_watch)
+            self._file_watch = None
+    
     def is_writable(self) -> bool:
         return self._writable
     
-    async def _watch_file(self):
-        """文件监听任务"""
-        import time
-        
-        last_mtime = 0
-        
-        while True:
-            try:
-                if self.file_path.exists():
-                    current_mtime = self.file_path.stat().st_mtime
-                    if current_mtime != last_mtime:
-                        last_mtime = current_mtime
-                        if self._watch_callback:
-                            config = self.load()
-                            self._watch_callback(config)
-                
-                await asyncio.sleep(1)  # 检查间隔
-            
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in file watcher: {e}")
-                await asyncio.sleep(5)
+    def _on_file_changed(self, path: Path):
+        """文件变更回调"""
+        if self._watch_callback:
+            config = self.load()
+            self._watch_callback(config)
 
 
 class EnvironmentConfigSource(IConfigSource):
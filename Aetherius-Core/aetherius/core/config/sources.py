@@ -23,6 +23,7 @@ import fnmatch
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from ..file_watcher import FileWatch, get_file_watcher
 from .interfaces import IConfigSource, ConfigPriority, ConfigChange
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ logger = logging.getLogger(__name__)
 class WatcherConfig:
     """文件监听配置"""
     enabled: bool = True
-    poll_interval: float = 1.0  # 秒
+    poll_interval: float = 1.0  # 秒（已弃用，轮询回退由共享文件监听器自适应调整）
     debounce_delay: float = 0.5  # 去抖延迟
     recursive: bool = True
     exclude_patterns: List[str] = field(default_factory=lambda: ['*.swp', '*.tmp', '*~'])
@@ -152,8 +153,7 @@ class FileConfigSource(BaseConfigSource):
         self.watcher_config = watcher_config or WatcherConfig()
         
         # 文件监听
-        self._watcher_task: Optional[asyncio.Task] = None
-        self._stop_watching = threading.Event()
+        self._file_watch: Optional[FileWatch] = None
         self._executor = ThreadPoolExecutor(max_workers=1)
         
         # 确定文件格式
@@ -235,50 +235,30 @@ class FileConfigSource(BaseConfigSource):
         if not self.auto_reload or not self.watcher_config.enabled:
             return
             
-        if self._watcher_task and not self._watcher_task.done():
+        if self._file_watch is not None:
             return  # 已在监听
             
-        self._stop_watching.clear()
-        self._watcher_task = asyncio.create_task(self._watch_file())
+        # 订阅共享文件监听器，由其负责 inotify/轮询及去抖
+        self._file_watch = get_file_watcher().watch(
+            self.file_path,
+            self._on_file_changed,
+            debounce=self.watcher_config.debounce_delay,
+        )
         logger.debug(f"Started watching config file: {self.file_path}")
         
     async def stop_watching(self):
         """停止监听文件变更"""
-        self._stop_watching.set()
-        if self._watcher_task:
-            self._watcher_task.cancel()
-            try:
-                await self._watcher_task
-            except asyncio.CancelledError:
-                pass
+        if self._file_watch is not None:
+            get_file_watcher().unwatch(self._file_watch)
+            self._file_watch = None
         logger.debug(f"Stopped watching config file: {self.file_path}")
         
-    async def _watch_file(self):
-        """文件监听循环"""
-        last_check = 0
-        
-        while not self._stop_watching.is_set():
-            try:
-                await asyncio.sleep(self.watcher_config.poll_interval)
-                
-                if not self.file_path.exists():
-                    continue
-                    
-                current_mtime = self.file_path.stat().st_mtime
-                if current_mtime > last_check:
-                    # 等待去抖延迟
-                    await asyncio.sleep(self.watcher_config.debounce_delay)
-                    
-                    # 重新检查，确保文件稳定
-                    if self.file_path.exists() and self.file_path.stat().st_mtime >= current_mtime:
-                        await asyncio.get_event_loop().run_in_executor(
-                            self._executor, self.reload
-                        )
-                        last_check = current_mtime
-                        
-            except Exception as e:
-                logger.error(f"Error watching config file {self.file_path}: {e}")
-                await asyncio.sleep(5)  # 出错时等待更长时间
+    async def _on_file_changed(self, path: Path):
+        """文件变更回调（在事件循环中运行）"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.reload)
+        except Exception as e:
+            logger.error(f"Error reloading config file {self.file_path}: {e}")
 
 
 class EnvironmentConfigSource(BaseConfigSource):
@@ -14,6 +14,13 @@ class ServerConfig(BaseModel):
     eula_accepted: bool = Field(False, description="Must be true to start the server.")
     jvm_args: List[str] = Field(default_factory=lambda: ["-Xms2G", "-Xmx4G"], description="JVM arguments for running the server.")
     properties: Dict[str, str] = Field(default_factory=dict, description="Server properties to be written to server.properties.")
+    log_buffer_size: int = Field(10000, ge=1, description="Maximum number of server output lines buffered for event dispatch.")
+    log_batch_size: int = Field(256, ge=1, description="Maximum number of buffered output lines dispatched per batch.")
+    log_overflow_policy: Literal["drop", "coalesce"] = Field("drop", description="When the output buffer is full, drop the oldest lines or coalesce new ones into a summary line.")
+    jvm_telemetry: bool = Field(True, description="Collect JVM heap, GC pause and thread telemetry (adds -Xlog:gc on Java 9+ unless GC logging is already configured).")
+    jvm_telemetry_interval: float = Field(10.0, gt=0, description="Seconds between JVM heap and thread samples.")
+    console_client_queue_size: int = Field(1000, ge=1, description="Maximum number of log lines queued per persistent console client.")
+    console_slow_client_policy: Literal["skip", "disconnect"] = Field("skip", description="When a console client's queue is full, skip its oldest lines (with a lag notice) or disconnect it.")
 
 class LoggingConfig(BaseModel):
     """Configuration for logging."""
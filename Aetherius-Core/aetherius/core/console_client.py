@@ -92,6 +92,11 @@ class ConsoleClient:
                                 print(f"[错误] {content}")
                             else:
                                 print(f"[日志] {content}")
+
+                        elif msg_type == "lag":
+                            # 客户端读取过慢，守护进程跳过了部分日志
+                            dropped = message.get("dropped", 0)
+                            print(f"[提示] 输出过快，已跳过 {dropped} 条日志")
                         
                         elif msg_type == "response":
                             # 处理命令响应
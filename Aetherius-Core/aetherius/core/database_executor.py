@@ -0,0 +1,162 @@
+"""Pooled SQLite access that keeps blocking database work off the event loop."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    """
+    Runs SQLite work on a small pool of worker threads.
+
+    Each worker thread owns one long-lived connection in WAL mode, so readers
+    do not block the writer and connections are not reopened per query.
+    SQLite's per-connection statement cache keeps recently used statements
+    prepared. Every call runs in a transaction that is committed on success
+    and rolled back on error.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        pool_size: int = 2,
+        statement_cache_size: int = 128,
+        busy_timeout: float = 5.0,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            db_path: Path to the SQLite database file
+            pool_size: Number of worker threads (and connections)
+            statement_cache_size: Prepared statements cached per connection
+            busy_timeout: Seconds to wait for a lock held by another connection
+        """
+        self.db_path = str(db_path)
+        self.pool_size = max(1, pool_size)
+        self.statement_cache_size = statement_cache_size
+        self.busy_timeout = busy_timeout
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="aetherius-db"
+        )
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+
+        # Statistics
+        self._calls = 0
+        self._errors = 0
+        self._total_time = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling worker thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout,
+                cached_statements=self.statement_cache_size,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _call(self, fn: Callable[..., T], args: tuple) -> T:
+        """Run fn(conn, *args) in one transaction on the worker's connection."""
+        conn = self._connection()
+        start = time.perf_counter()
+        try:
+            with conn:
+                return fn(conn, *args)
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._calls += 1
+            self._total_time += time.perf_counter() - start
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run a function against a pooled connection in a worker thread.
+
+        Use this to group several statements into one transaction and one
+        thread hop.
+
+        Args:
+            fn: Called as fn(connection, *args) in a worker thread
+            *args: Extra arguments for fn
+
+        Returns:
+            The return value of fn
+        """
+        if self._closed:
+            raise RuntimeError("Database executor is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._call, fn, args)
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Execute a statement and return the number of affected rows."""
+        return await self.run(lambda conn: conn.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        """Execute a statement for each parameter set in one transaction."""
+        seq_of_params = list(seq_of_params)
+        return await self.run(lambda conn: conn.executemany(sql, seq_of_params).rowcount)
+
+    async def fetchone(
+        self, sql: str, params: Sequence[Any] = ()
+    ) -> sqlite3.Row | None:
+        """Execute a query and return its first row, or None."""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        """Execute a query and return all rows."""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    def close(self) -> None:
+        """Wait for queued work to finish and close all connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.debug(f"Error closing database connection: {e}")
+            self._connections.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dictionary with pool size, open connections and call timings
+        """
+        return {
+            "db_path": self.db_path,
+            "pool_size": self.pool_size,
+            "connections": len(self._connections),
+            "calls": self._calls,
+            "errors": self._errors,
+            "avg_call_time": self._total_time / self._calls if self._calls else 0.0,
+        }
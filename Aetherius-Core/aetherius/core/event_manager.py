@@ -2,12 +2,14 @@
 
 import asyncio
 import logging
+import time
 from collections import defaultdict, deque
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any, Optional, TypeVar
 
 from .events_base import BaseEvent, EventPriority
+from .latency_histogram import LatencyHistogram, WindowedLatencyHistogram
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +25,26 @@ class EventListener:
         event_type: type[BaseEvent],
         priority: EventPriority = EventPriority.NORMAL,
         ignore_cancelled: bool = False,
+        concurrent: bool = False,
     ):
         self.callback = callback
         self.event_type = event_type
         self.priority = priority
         self.ignore_cancelled = ignore_cancelled
+        self.concurrent = concurrent
         self.is_async = asyncio.iscoroutinefunction(callback)
 
+        # Filled in only when concurrent dispatch is enabled
+        self.latency = LatencyHistogram()
+        self.timeouts = 0
+
+    @property
+    def name(self) -> str:
+        """Qualified name of the callback, used in statistics."""
+        module = getattr(self.callback, "__module__", None) or ""
+        qualname = getattr(self.callback, "__qualname__", None) or repr(self.callback)
+        return f"{module}.{qualname}" if module else qualname
+
     async def call(self, event: BaseEvent) -> Any:
         """Call the listener with the given event."""
         if event.is_cancelled() and not self.ignore_cancelled:
@@ -56,23 +71,52 @@ class EventManager:
     - Event cancellation
     - Decorator-based listener registration
     - Async and sync listener support
+    - Optional concurrent execution of same-priority listeners
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrent_dispatch: bool = False,
+        listener_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the event manager.
+
+        Args:
+            concurrent_dispatch: Run same-priority listeners registered with
+                concurrent=True together instead of one after another
+            listener_timeout: Time budget in seconds for each async listener
+                call while concurrent dispatch is enabled
+        """
         # 原有初始化
         self._listeners: dict[type[BaseEvent], list[EventListener]] = defaultdict(list)
         self._global_listeners: list[EventListener] = []
         self._event_stats: dict[str, int] = defaultdict(int)
         self._running = True
 
+        # Merged, priority-sorted listeners per concrete event class, rebuilt
+        # lazily after any registration change
+        self._dispatch_cache: dict[type[BaseEvent], tuple[EventListener, ...]] = {}
+        self._group_cache: dict[
+            type[BaseEvent], tuple[tuple[EventListener, ...], ...]
+        ] = {}
+
+        # Concurrent dispatch mode (opt-in)
+        self._concurrent_dispatch = concurrent_dispatch
+        self._listener_timeout = listener_timeout
+
         # Web组件扩展
         self._event_history: deque = deque(maxlen=1000)  # 事件历史记录
         self._web_subscribers: dict[str, set[str]] = defaultdict(set)  # Web订阅者
         self._real_time_events: set[str] = set()  # 实时事件类型
         self._event_filters: dict[str, Callable] = {}  # 事件过滤器
 
-        # 性能监控
-        self._event_timing: dict[str, list[float]] = defaultdict(list)
+        # 性能监控（固定内存的流式统计，含1分钟/5分钟滚动窗口）
+        self._event_timing: dict[str, WindowedLatencyHistogram] = defaultdict(
+            WindowedLatencyHistogram
+        )
+        self._slow_event_counts: dict[str, int] = defaultdict(int)
+        self._slow_event_time: dict[str, float] = defaultdict(float)
         self._slow_event_threshold = 1.0  # 慢事件阈值（秒）
 
     def register_listener(
@@ -81,6 +125,7 @@ class EventManager:
         callback: Callable[[T], Any],
         priority: EventPriority = EventPriority.NORMAL,
         ignore_cancelled: bool = False,
+        concurrent: bool = False,
     ) -> EventListener:
         """
         Register an event listener.
@@ -90,11 +135,16 @@ class EventManager:
             callback: The callback function to call when the event is fired
             priority: Priority level for the listener
             ignore_cancelled: Whether to call this listener even if the event is cancelled
+            concurrent: Declare that the listener never cancels the event, so it
+                may run alongside other same-priority listeners when concurrent
+                dispatch is enabled
 
         Returns:
             EventListener: The created listener object
         """
-        listener = EventListener(callback, event_type, priority, ignore_cancelled)
+        listener = EventListener(
+            callback, event_type, priority, ignore_cancelled, concurrent
+        )
 
         # Insert listener in priority order (highest first)
         listeners = self._listeners[event_type]
@@ -109,6 +159,7 @@ class EventManager:
         if not inserted:
             listeners.append(listener)
 
+        self._invalidate_dispatch_cache()
         logger.debug(
             f"Registered event listener for {event_type.__name__} with priority {priority.name}"
         )
@@ -127,11 +178,13 @@ class EventManager:
         for event_type, listeners in self._listeners.items():
             if listener in listeners:
                 listeners.remove(listener)
+                self._invalidate_dispatch_cache()
                 logger.debug(f"Unregistered event listener for {event_type.__name__}")
                 return True
 
         if listener in self._global_listeners:
             self._global_listeners.remove(listener)
+            self._invalidate_dispatch_cache()
             logger.debug("Unregistered global event listener")
             return True
 
@@ -142,6 +195,7 @@ class EventManager:
         callback: Callable[[BaseEvent], Any],
         priority: EventPriority = EventPriority.NORMAL,
         ignore_cancelled: bool = False,
+        concurrent: bool = False,
     ) -> EventListener:
         """
         Register a global event listener that receives all events.
@@ -150,11 +204,14 @@ class EventManager:
             callback: The callback function to call for any event
             priority: Priority level for the listener
             ignore_cancelled: Whether to call this listener even if the event is cancelled
+            concurrent: Declare that the listener never cancels the event
 
         Returns:
             EventListener: The created listener object
         """
-        listener = EventListener(callback, BaseEvent, priority, ignore_cancelled)
+        listener = EventListener(
+            callback, BaseEvent, priority, ignore_cancelled, concurrent
+        )
 
         # Insert in priority order
         inserted = False
@@ -167,27 +224,45 @@ class EventManager:
         if not inserted:
             self._global_listeners.append(listener)
 
+        self._invalidate_dispatch_cache()
         logger.debug(f"Registered global event listener with priority {priority.name}")
         return listener
 
-    async def fire_event(self, event: BaseEvent) -> BaseEvent:
+    def _invalidate_dispatch_cache(self) -> None:
+        """Drop all cached dispatch tables after a registration change."""
+        self._dispatch_cache.clear()
+        self._group_cache.clear()
+
+    def configure_dispatch(
+        self, concurrent: bool, listener_timeout: Optional[float] = None
+    ) -> None:
         """
-        Fire an event to all registered listeners.
+        Enable or disable concurrent dispatch.
 
         Args:
-            event: The event to fire
+            concurrent: Run same-priority concurrent listeners together
+            listener_timeout: Time budget in seconds for each async listener
+        """
+        self._concurrent_dispatch = concurrent
+        self._listener_timeout = listener_timeout
+        logger.info(
+            f"Event dispatch mode: {'concurrent' if concurrent else 'sequential'}"
+            f" (listener timeout: {listener_timeout})"
+        )
 
-        Returns:
-            BaseEvent: The event object (potentially modified by listeners)
+    def _get_dispatch_table(
+        self, event_type: type[BaseEvent]
+    ) -> tuple[EventListener, ...]:
         """
-        if not self._running:
-            return event
-
-        event_type = type(event)
-        event_name = event_type.__name__
+        Get the listeners applicable to an event class, highest priority first.
 
-        logger.debug(f"Firing event: {event_name}")
-        self._event_stats[event_name] += 1
+        The table merges listeners for the class itself, its BaseEvent parent
+        classes and global listeners, and is cached until the next
+        registration change.
+        """
+        table = self._dispatch_cache.get(event_type)
+        if table is not None:
+            return table
 
         # Collect all applicable listeners
         applicable_listeners: list[EventListener] = []
@@ -203,11 +278,69 @@ class EventManager:
         # Add global listeners
         applicable_listeners.extend(self._global_listeners)
 
-        # Sort by priority (highest first)
+        # Sort by priority (highest first); the sort is stable so listeners of
+        # equal priority keep their specific -> parent -> global order
         applicable_listeners.sort(key=lambda l: l.priority.value, reverse=True)
 
+        table = tuple(applicable_listeners)
+        self._dispatch_cache[event_type] = table
+        return table
+
+    def _get_dispatch_groups(
+        self, event_type: type[BaseEvent]
+    ) -> tuple[tuple[EventListener, ...], ...]:
+        """
+        Split the dispatch table into groups that may run together.
+
+        Adjacent concurrent listeners of the same priority form one group;
+        every other listener is a group of its own.
+        """
+        groups = self._group_cache.get(event_type)
+        if groups is not None:
+            return groups
+
+        grouped: list[list[EventListener]] = []
+        for listener in self._get_dispatch_table(event_type):
+            previous = grouped[-1] if grouped else None
+            if (
+                previous is not None
+                and listener.concurrent
+                and previous[-1].concurrent
+                and previous[-1].priority == listener.priority
+            ):
+                previous.append(listener)
+            else:
+                grouped.append([listener])
+
+        groups = tuple(tuple(group) for group in grouped)
+        self._group_cache[event_type] = groups
+        return groups
+
+    async def fire_event(self, event: BaseEvent) -> BaseEvent:
+        """
+        Fire an event to all registered listeners.
+
+        Args:
+            event: The event to fire
+
+        Returns:
+            BaseEvent: The event object (potentially modified by listeners)
+        """
+        if not self._running:
+            return event
+
+        event_type = type(event)
+        event_name = event_type.__name__
+
+        logger.debug(f"Firing event: {event_name}")
+        self._event_stats[event_name] += 1
+
+        if self._concurrent_dispatch:
+            await self._fire_grouped(event, event_type)
+            return event
+
         # Call all listeners
-        for listener in applicable_listeners:
+        for listener in self._get_dispatch_table(event_type):
             if not self._running:
                 break
 
@@ -224,6 +357,54 @@ class EventManager:
 
         return event
 
+    async def _fire_grouped(self, event: BaseEvent, event_type: type[BaseEvent]) -> None:
+        """
+        Call listeners group by group, running each group concurrently.
+
+        Groups are still processed in priority order and cancellation is
+        checked after every group, so a cancelling listener stops all
+        lower-priority listeners exactly as in sequential dispatch.
+        """
+        for group in self._get_dispatch_groups(event_type):
+            if not self._running:
+                break
+
+            if len(group) == 1:
+                await self._call_listener_timed(group[0], event)
+            else:
+                await asyncio.gather(
+                    *(self._call_listener_timed(listener, event) for listener in group)
+                )
+
+            if event.is_cancelled() and any(
+                not listener.ignore_cancelled for listener in group
+            ):
+                logger.debug(
+                    f"Event {event_type.__name__} was cancelled, stopping propagation"
+                )
+                break
+
+    async def _call_listener_timed(
+        self, listener: EventListener, event: BaseEvent
+    ) -> None:
+        """Call a listener within its time budget and record its latency."""
+        start = time.perf_counter()
+        try:
+            if self._listener_timeout and listener.is_async:
+                await asyncio.wait_for(listener.call(event), self._listener_timeout)
+            else:
+                await listener.call(event)
+        except asyncio.TimeoutError:
+            listener.timeouts += 1
+            logger.warning(
+                f"Event listener {listener.name} exceeded its "
+                f"{self._listener_timeout}s budget for {type(event).__name__}"
+            )
+        except Exception as e:
+            logger.error(f"Error calling event listener: {e}", exc_info=True)
+        finally:
+            listener.latency.record(time.perf_counter() - start)
+
     def get_listeners(
         self, event_type: Optional[type[BaseEvent]] = None
     ) -> list[EventListener]:
@@ -279,10 +460,13 @@ class EventManager:
 
         # 记录处理时间
         if processing_time is not None:
-            self._event_timing[event.__class__.__name__].append(processing_time)
+            event_name = event.__class__.__name__
+            self._event_timing[event_name].record(processing_time)
 
             # 检查慢事件
             if processing_time > self._slow_event_threshold:
+                self._slow_event_counts[event_name] += 1
+                self._slow_event_time[event_name] += processing_time
                 logger.warning(
                     f"Slow event detected: {event.__class__.__name__} took {processing_time:.3f}s"
                 )
@@ -490,34 +674,50 @@ class EventManager:
                 event_type: len(subscribers)
                 for event_type, subscribers in self._web_subscribers.items()
             },
+            "concurrent_dispatch": self._concurrent_dispatch,
+            "listener_timeout": self._listener_timeout,
+            "listener_latency": self._get_listener_latency_stats(),
         }
 
-        # 计算时间统计
-        for event_type, times in self._event_timing.items():
-            if times:
-                stats["timing_stats"][event_type] = {
-                    "count": len(times),
-                    "avg_time": sum(times) / len(times),
-                    "max_time": max(times),
-                    "min_time": min(times),
+        # 计算时间统计（精确的次数/总和，近似的p50/p95/p99）
+        for event_type, timing in self._event_timing.items():
+            if timing.count:
+                stats["timing_stats"][event_type] = timing.snapshot()
+
+        # 慢事件
+        for event_type, slow_count in self._slow_event_counts.items():
+            stats["slow_events"].append(
+                {
+                    "event_type": event_type,
+                    "slow_count": slow_count,
+                    "avg_slow_time": self._slow_event_time[event_type] / slow_count,
                 }
-
-                # 检查慢事件
-                slow_times = [t for t in times if t > self._slow_event_threshold]
-                if slow_times:
-                    stats["slow_events"].append(
-                        {
-                            "event_type": event_type,
-                            "slow_count": len(slow_times),
-                            "avg_slow_time": sum(slow_times) / len(slow_times),
-                        }
-                    )
+            )
 
         return stats
 
+    def _get_listener_latency_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-listener latency summaries recorded by concurrent dispatch."""
+        listener_stats: dict[str, dict[str, Any]] = {}
+        for listener in self.get_listeners():
+            if not listener.latency.count and not listener.timeouts:
+                continue
+            key = f"{listener.event_type.__name__}:{listener.name}"
+            if key in listener_stats:
+                # Same callback registered more than once for one event type
+                key = f"{key}#{id(listener)}"
+            listener_stats[key] = listener.latency.snapshot()
+            listener_stats[key]["timeouts"] = listener.timeouts
+        return listener_stats
+
     def clear_performance_data(self):
         """清除性能数据"""
+        for listener in self.get_listeners():
+            listener.latency.reset()
+            listener.timeouts = 0
         self._event_timing.clear()
+        self._slow_event_counts.clear()
+        self._slow_event_time.clear()
         self._event_history.clear()
         self.clear_stats()
         logger.info("Performance data cleared")
@@ -621,6 +821,7 @@ def on_event(
     event_type: type[T],
     priority: EventPriority = EventPriority.NORMAL,
     ignore_cancelled: bool = False,
+    concurrent: bool = False,
 ) -> Callable[[Callable[[T], Any]], Callable[[T], Any]]:
     """
     Decorator to register a function as an event listener.
@@ -629,6 +830,7 @@ def on_event(
         event_type: The type of event to listen for
         priority: Priority level for the listener
         ignore_cancelled: Whether to call this listener even if the event is cancelled
+        concurrent: Whether the listener may run alongside same-priority listeners
 
     Example:
         @on_event(PlayerJoinEvent)
@@ -639,7 +841,7 @@ def on_event(
     def decorator(func: Callable[[T], Any]) -> Callable[[T], Any]:
         # Register the listener immediately
         get_event_manager().register_listener(
-            event_type, func, priority, ignore_cancelled
+            event_type, func, priority, ignore_cancelled, concurrent
         )
 
         # Add metadata to the function for introspection
@@ -647,6 +849,7 @@ def on_event(
         func._event_type = event_type
         func._event_priority = priority
         func._ignore_cancelled = ignore_cancelled
+        func._event_concurrent = concurrent
 
         return func
 
@@ -654,7 +857,9 @@ def on_event(
 
 
 def on_any_event(
-    priority: EventPriority = EventPriority.NORMAL, ignore_cancelled: bool = False
+    priority: EventPriority = EventPriority.NORMAL,
+    ignore_cancelled: bool = False,
+    concurrent: bool = False,
 ) -> Callable[[Callable[[BaseEvent], Any]], Callable[[BaseEvent], Any]]:
     """
     Decorator to register a function as a global event listener.
@@ -662,6 +867,7 @@ def on_any_event(
     Args:
         priority: Priority level for the listener
         ignore_cancelled: Whether to call this listener even if the event is cancelled
+        concurrent: Whether the listener may run alongside same-priority listeners
 
     Example:
         @on_any_event()
@@ -671,12 +877,15 @@ def on_any_event(
 
     def decorator(func: Callable[[BaseEvent], Any]) -> Callable[[BaseEvent], Any]:
         # Register the listener immediately
-        get_event_manager().register_global_listener(func, priority, ignore_cancelled)
+        get_event_manager().register_global_listener(
+            func, priority, ignore_cancelled, concurrent
+        )
 
         # Add metadata to the function for introspection
         func._global_event_listener = True
         func._event_priority = priority
         func._ignore_cancelled = ignore_cancelled
+        func._event_concurrent = concurrent
 
         return func
 
@@ -694,8 +903,9 @@ def register_listener(
     callback: Callable[[T], Any],
     priority: EventPriority = EventPriority.NORMAL,
     ignore_cancelled: bool = False,
+    concurrent: bool = False,
 ) -> EventListener:
     """Register an event listener using the global event manager."""
     return get_event_manager().register_listener(
-        event_type, callback, priority, ignore_cancelled
+        event_type, callback, priority, ignore_cancelled, concurrent
     )
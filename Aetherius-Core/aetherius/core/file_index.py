@@ -0,0 +1,486 @@
+"""In-memory index of a directory tree, kept current from file change notifications."""
+
+import heapq
+import logging
+import os
+import queue
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .file_watcher import FileWatch, FileWatcher, get_file_watcher
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedStat(NamedTuple):
+    """The stat fields kept per indexed entry (attribute names match os.stat_result)."""
+
+    st_mode: int
+    st_size: int
+    st_mtime: float
+    st_ctime: float
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}{os.sep}{name}" if rel_dir else name
+
+
+def _parent(rel_path: str) -> str | None:
+    if not rel_path:
+        return None
+    head, _, _ = rel_path.rpartition(os.sep)
+    return head
+
+
+def directory_size(path: str | Path) -> dict[str, int]:
+    """
+    Walk a directory with os.scandir and total it up without an index.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Dictionary with total_size, file_count and directory_count
+    """
+    total_size = file_count = dir_count = 0
+    pending = [str(path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dir_count += 1
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                            file_count += 1
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return {"total_size": total_size, "file_count": file_count, "directory_count": dir_count}
+
+
+class FileIndex:
+    """
+    Name, size and type index of every entry below a root directory.
+
+    The tree is walked once in a background thread. After that each directory
+    is watched through the shared FileWatcher, and a change triggers a rescan
+    of only that directory; the difference is applied to the index and to
+    recursive size totals kept for every directory. Name searches, directory
+    usage and largest-file queries then read memory instead of the disk.
+
+    A directory the watcher has to poll (no inotify, or the watch limit was
+    reached) is only rescanned when entries are added, removed or renamed, so
+    sizes inside it can go stale; sizes_current tells callers whether size
+    queries can be answered from the index.
+
+    Symbolic links are indexed but not followed.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        watcher: FileWatcher | None = None,
+        debounce: float = 0.5,
+    ):
+        """
+        Initialize the index. Call start() to build it.
+
+        Args:
+            root: Directory to index
+            watcher: File watcher for change notifications (shared one by default)
+            debounce: Quiet period before a changed directory is rescanned
+        """
+        self.root = Path(root).resolve()
+        self.debounce = debounce
+        self._watcher = watcher or get_file_watcher()
+
+        self._lock = threading.RLock()
+        # Relative directory path ("" for the root) -> entry name -> stat
+        self._dirs: dict[str, dict[str, IndexedStat]] = {}
+        # Relative directory path -> [total size, file count, directory count] below it
+        self._totals: dict[str, list[int]] = {}
+        self._watches: dict[str, FileWatch] = {}
+
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._queued: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._stopped = False
+
+        # Statistics
+        self._build_time: float | None = None
+        self._rescans = 0
+        self._last_update: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the initial build has finished."""
+        return self._ready.is_set()
+
+    @property
+    def sizes_current(self) -> bool:
+        """Whether sizes and mtimes are kept current (no directory watch is polled)."""
+        with self._lock:
+            return not any(self._watcher.is_polled(watch) for watch in self._watches.values())
+
+    def start(self) -> None:
+        """Build the index in the background and keep it updated."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"aetherius-file-index:{self.root.name}", daemon=True
+        )
+        self._thread.start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the initial build finishes. Returns False on timeout."""
+        return self._ready.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop watching and discard the index."""
+        self._stopped = True
+        self._queue.put(None)
+        with self._lock:
+            for watch in self._watches.values():
+                self._watcher.unwatch(watch)
+            self._watches.clear()
+            self._dirs.clear()
+            self._totals.clear()
+        self._ready.clear()
+
+    def relative(self, path: str | Path) -> str | None:
+        """Path relative to the index root, or None if it lies outside."""
+        try:
+            rel = Path(path).resolve().relative_to(self.root)
+        except ValueError:
+            return None
+        return "" if rel == Path(".") else str(rel)
+
+    def search(
+        self,
+        pattern: str,
+        path: str = "",
+        case_sensitive: bool = False,
+        limit: int | None = None,
+    ) -> list[tuple[str, IndexedStat]]:
+        """
+        Find entries whose name contains a substring.
+
+        Names are always current; sizes and mtimes only while sizes_current.
+
+        Args:
+            pattern: Substring to look for
+            path: Relative directory to search below ("" for the root)
+            case_sensitive: Match case exactly
+            limit: Maximum number of results
+
+        Returns:
+            List of (relative path, stat) tuples
+        """
+        if not case_sensitive:
+            pattern = pattern.lower()
+        prefix = path + os.sep if path else ""
+
+        matches = []
+        with self._lock:
+            for rel_dir, entries in self._dirs.items():
+                if path and rel_dir != path and not rel_dir.startswith(prefix):
+                    continue
+                for name, st in entries.items():
+                    if pattern in (name if case_sensitive else name.lower()):
+                        matches.append((_join(rel_dir, name), st))
+                        if limit is not None and len(matches) >= limit:
+                            return matches
+        return matches
+
+    def usage(self, path: str = "") -> dict[str, int] | None:
+        """
+        Recursive size totals of a directory (stale unless sizes_current).
+
+        Args:
+            path: Relative directory path ("" for the root)
+
+        Returns:
+            Dictionary with total_size, file_count and directory_count, or
+            None if the directory is not indexed
+        """
+        with self._lock:
+            totals = self._totals.get(path)
+            if totals is None:
+                return None
+            return {
+                "total_size": totals[0],
+                "file_count": totals[1],
+                "directory_count": totals[2],
+            }
+
+    def largest_files(self, count: int = 10, path: str = "") -> list[tuple[str, IndexedStat]]:
+        """
+        The largest regular files below a directory (stale unless sizes_current).
+
+        Args:
+            count: Number of files to return
+            path: Relative directory path ("" for the root)
+
+        Returns:
+            List of (relative path, stat) tuples, largest first
+        """
+        prefix = path + os.sep if path else ""
+        with self._lock:
+            candidates = (
+                (_join(rel_dir, name), st)
+                for rel_dir, entries in self._dirs.items()
+                if not path or rel_dir == path or rel_dir.startswith(prefix)
+                for name, st in entries.items()
+                if stat.S_ISREG(st.st_mode)
+            )
+            return heapq.nlargest(count, candidates, key=lambda item: item[1].st_size)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with entry counts, build time and rescan counters
+        """
+        with self._lock:
+            return {
+                "root": str(self.root),
+                "ready": self.ready,
+                "directories": len(self._dirs),
+                "entries": sum(len(entries) for entries in self._dirs.values()),
+                "watched_directories": len(self._watches),
+                "polled_directories": sum(
+                    self._watcher.is_polled(watch) for watch in self._watches.values()
+                ),
+                "build_time": self._build_time,
+                "rescans": self._rescans,
+                "pending_rescans": len(self._queued),
+                "last_update": self._last_update,
+            }
+
+    # Index maintenance (runs on the index thread)
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        self._build()
+        self._build_time = time.perf_counter() - start
+        self._ready.set()
+        logger.info(
+            f"Indexed {self.root} in {self._build_time:.2f}s "
+            f"({self._totals.get('', [0, 0, 0])[1]} files)"
+        )
+
+        while not self._stopped:
+            rel_dir = self._queue.get()
+            if rel_dir is None:
+                break
+            with self._lock:
+                self._queued.discard(rel_dir)
+            try:
+                self._rescan(rel_dir)
+            except Exception as e:
+                logger.error(f"Error updating file index for {rel_dir or self.root}: {e}")
+
+    def _read_dir(self, rel_dir: str) -> dict[str, IndexedStat] | None:
+        """Read one directory's entries, or None if it cannot be read."""
+        entries = {}
+        try:
+            with os.scandir(self.root / rel_dir if rel_dir else self.root) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries[entry.name] = IndexedStat(
+                        st.st_mode, st.st_size, st.st_mtime, st.st_ctime
+                    )
+        except OSError:
+            return None
+        return entries
+
+    def _watch_dir(self, rel_dir: str) -> None:
+        if rel_dir in self._watches or self._stopped:
+            return
+        self._watches[rel_dir] = self._watcher.watch(
+            self.root / rel_dir if rel_dir else self.root,
+            lambda path, rel_dir=rel_dir: self._schedule(rel_dir),
+            debounce=self.debounce,
+        )
+
+    def _schedule(self, rel_dir: str) -> None:
+        """Queue a directory for rescanning (called from the watcher thread)."""
+        with self._lock:
+            if rel_dir in self._queued:
+                return
+            self._queued.add(rel_dir)
+        self._queue.put(rel_dir)
+
+    def _build(self) -> None:
+        """Walk the whole tree and compute the directory totals."""
+        dirs: dict[str, dict[str, IndexedStat]] = {}
+        pending = [""]
+        while pending and not self._stopped:
+            rel_dir = pending.pop()
+            # Watch before reading so no change between the two is missed
+            with self._lock:
+                self._watch_dir(rel_dir)
+            entries = self._read_dir(rel_dir)
+            if entries is None:
+                continue
+            dirs[rel_dir] = entries
+            for name, st in entries.items():
+                if stat.S_ISDIR(st.st_mode):
+                    pending.append(_join(rel_dir, name))
+
+        totals = {rel_dir: [0, 0, 0] for rel_dir in dirs}
+        # Deepest directories first so children are complete before parents
+        for rel_dir in sorted(dirs, key=lambda d: d.count(os.sep) + bool(d), reverse=True):
+            dir_totals = totals[rel_dir]
+            for name, st in dirs[rel_dir].items():
+                contribution = self._contribution(totals, _join(rel_dir, name), st)
+                for i in range(3):
+                    dir_totals[i] += contribution[i]
+
+        with self._lock:
+            self._dirs = dirs
+            self._totals = totals
+            self._last_update = time.time()
+
+    @staticmethod
+    def _contribution(
+        totals: dict[str, list[int]], rel_path: str, st: IndexedStat
+    ) -> tuple[int, int, int]:
+        """What one entry adds to its parent's [size, files, directories]."""
+        if stat.S_ISDIR(st.st_mode):
+            child = totals.get(rel_path, (0, 0, 0))
+            return (child[0], child[1], child[2] + 1)
+        if stat.S_ISREG(st.st_mode):
+            return (st.st_size, 1, 0)
+        return (0, 0, 0)
+
+    def _rescan(self, rel_dir: str) -> None:
+        """Re-read one directory and apply the difference to the index."""
+        new_entries = self._read_dir(rel_dir)
+        added_dirs = []
+
+        with self._lock:
+            old_entries = self._dirs.get(rel_dir)
+            if old_entries is None or new_entries is None:
+                # Not indexed yet, or removed; the parent's rescan handles it
+                return
+            self._rescans += 1
+
+            delta = [0, 0, 0]
+            for name in old_entries.keys() - new_entries.keys():
+                rel_path = _join(rel_dir, name)
+                contribution = self._contribution(self._totals, rel_path, old_entries[name])
+                for i in range(3):
+                    delta[i] -= contribution[i]
+                if stat.S_ISDIR(old_entries[name].st_mode):
+                    self._remove_subtree(rel_path)
+
+            for name, st in new_entries.items():
+                rel_path = _join(rel_dir, name)
+                old = old_entries.get(name)
+                if old is not None and stat.S_ISDIR(old.st_mode) == stat.S_ISDIR(st.st_mode):
+                    if stat.S_ISREG(st.st_mode) or stat.S_ISREG(old.st_mode):
+                        old_size = old.st_size if stat.S_ISREG(old.st_mode) else 0
+                        new_size = st.st_size if stat.S_ISREG(st.st_mode) else 0
+                        delta[0] += new_size - old_size
+                        delta[1] += stat.S_ISREG(st.st_mode) - stat.S_ISREG(old.st_mode)
+                    continue
+
+                if old is not None:
+                    # Type changed between file and directory
+                    contribution = self._contribution(self._totals, rel_path, old)
+                    for i in range(3):
+                        delta[i] -= contribution[i]
+                    if stat.S_ISDIR(old.st_mode):
+                        self._remove_subtree(rel_path)
+
+                if stat.S_ISDIR(st.st_mode):
+                    # Start empty; the queued rescan fills it in and propagates
+                    self._dirs[rel_path] = {}
+                    self._totals[rel_path] = [0, 0, 0]
+                    self._watch_dir(rel_path)
+                    added_dirs.append(rel_path)
+                contribution = self._contribution(self._totals, rel_path, st)
+                for i in range(3):
+                    delta[i] += contribution[i]
+
+            self._dirs[rel_dir] = new_entries
+            if any(delta):
+                ancestor: str | None = rel_dir
+                while ancestor is not None:
+                    totals = self._totals[ancestor]
+                    for i in range(3):
+                        totals[i] += delta[i]
+                    ancestor = _parent(ancestor)
+            self._last_update = time.time()
+
+        for rel_path in added_dirs:
+            self._rescan(rel_path)
+
+    def _remove_subtree(self, rel_dir: str) -> None:
+        """Drop a directory and everything below it (lock held)."""
+        prefix = rel_dir + os.sep
+        for key in [d for d in self._dirs if d == rel_dir or d.startswith(prefix)]:
+            del self._dirs[key]
+            self._totals.pop(key, None)
+            watch = self._watches.pop(key, None)
+            if watch is not None:
+                self._watcher.unwatch(watch)
+
+
+# Shared indexes by root directory
+_file_indexes: dict[Path, FileIndex] = {}
+_file_indexes_lock = threading.Lock()
+
+
+def get_file_index(root: str | Path) -> FileIndex:
+    """
+    Get the shared index for a directory, starting it on first use.
+
+    Args:
+        root: Directory to index
+
+    Returns:
+        FileIndex for the directory (possibly still building)
+    """
+    root = Path(root).resolve()
+    with _file_indexes_lock:
+        index = _file_indexes.get(root)
+        if index is None:
+            index = FileIndex(root)
+            index.start()
+            _file_indexes[root] = index
+        return index
+
+
+def find_file_index(path: str | Path, sizes: bool = False) -> FileIndex | None:
+    """
+    Get a ready shared index whose root contains path, if there is one.
+
+    Args:
+        path: Path the index must cover
+        sizes: Only return an index whose sizes are current
+
+    Returns:
+        Matching FileIndex, or None
+    """
+    with _file_indexes_lock:
+        indexes = list(_file_indexes.values())
+    for index in indexes:
+        if index.ready and index.relative(path) is not None:
+            if sizes and not index.sizes_current:
+                continue
+            return index
+    return None
@@ -6,17 +6,27 @@ Aetherius文件管理系统
 """
 
 import hashlib
+import heapq
 import logging
 import mimetypes
+import os
 import shutil
+import sqlite3
+import stat as stat_module
+import tarfile
 import tempfile
+import threading
 import zipfile
+from collections.abc import Iterator
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, BinaryIO, Optional, Union
 
+from .archive_writer import HAS_ZSTD, ProgressCallback, write_archive
+from .file_index import FileIndex, directory_size, get_file_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +72,77 @@ class UploadInfo:
         return data
 
 
+class FileHashCache:
+    """
+    持久化的文件哈希缓存
+
+    以 (设备, inode) 为键保存文件的大小、修改时间和MD5，只有当文件的
+    大小或修改时间变化时才需要重新读取文件计算哈希。文件重命名不会
+    使缓存失效。缓存保存在SQLite数据库中，按需打开。
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS file_hashes (
+                    device INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    md5 TEXT NOT NULL,
+                    PRIMARY KEY (device, inode)
+                )"""
+            )
+        return self._conn
+
+    def get(self, st: os.stat_result) -> Optional[str]:
+        """获取与stat结果匹配的缓存哈希，文件已变化时返回None"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT size, mtime_ns, md5 FROM file_hashes WHERE device = ? AND inode = ?",
+                (st.st_dev, st.st_ino),
+            ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            self.hits += 1
+            return row[2]
+        self.misses += 1
+        return None
+
+    def put(self, st: os.stat_result, md5: str) -> None:
+        """保存文件哈希"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)",
+                    (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, md5),
+                )
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计"""
+        return {"path": str(self.db_path), "hits": self.hits, "misses": self.misses}
+
+
 class FileManager:
     """文件管理器"""
 
@@ -82,16 +163,29 @@ class FileManager:
     # 最大文件大小（字节）
     MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 
-    def __init__(self, base_directory: Optional[str | Path] = None):
+    def __init__(
+        self,
+        base_directory: Optional[str | Path] = None,
+        hash_cache_path: Optional[str | Path] = None,
+        use_index: bool = True,
+    ):
         """
         初始化文件管理器
 
         Args:
             base_directory: 基础目录，所有操作限制在此目录内
+            hash_cache_path: 文件哈希缓存数据库路径，默认为 <基础目录>/data/file_manager/file_hashes.db
+            use_index: 是否使用后台文件索引回答搜索和磁盘占用查询
         """
         self.base_dir = Path(base_directory) if base_directory else Path.cwd()
         self.base_dir = self.base_dir.resolve()  # 获取绝对路径
 
+        # 哈希仅在显式请求时计算，并按 (inode, 大小, 修改时间) 持久化缓存
+        self._hash_cache = FileHashCache(
+            hash_cache_path or self.base_dir / "data" / "file_manager" / "file_hashes.db"
+        )
+        self._use_index = use_index
+
         # 确保基础目录存在
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
@@ -185,12 +279,47 @@ class FileManager:
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
-    def get_file_info(self, path: Union[str, Path]) -> Optional[FileInfo]:
+    def get_file_hash(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        获取文件MD5哈希值
+
+        优先使用持久化缓存，只有文件内容可能变化时才重新计算。
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            MD5哈希值，不是文件或读取失败时返回None
+        """
+        try:
+            file_path = self._validate_path(path)
+            st = file_path.stat()
+            if not stat_module.S_ISREG(st.st_mode):
+                return None
+
+            cached = self._hash_cache.get(st)
+            if cached is not None:
+                return cached
+
+            hash_md5 = self._calculate_md5(file_path)
+            # 计算期间文件被修改时不缓存
+            if file_path.stat().st_mtime_ns == st.st_mtime_ns:
+                self._hash_cache.put(st, hash_md5)
+            return hash_md5
+
+        except Exception as e:
+            logger.warning(f"Failed to calculate MD5 for {path}: {e}")
+            return None
+
+    def get_file_info(
+        self, path: Union[str, Path], compute_hash: bool = False
+    ) -> Optional[FileInfo]:
         """
         获取文件或目录信息
 
         Args:
             path: 文件路径
+            compute_hash: 是否计算文件MD5（使用哈希缓存）
 
         Returns:
             文件信息对象或None
@@ -201,53 +330,123 @@ class FileManager:
             if not file_path.exists():
                 return None
 
-            stat = file_path.stat()
-
-            # 获取MIME类型
-            mime_type = None
-            if file_path.is_file():
-                mime_type, _ = mimetypes.guess_type(str(file_path))
-
-            # 获取权限
-            permissions = oct(stat.st_mode)[-3:]
-
-            # 计算MD5（仅对小文件）
-            hash_md5 = None
-            if file_path.is_file() and stat.st_size < 10 * 1024 * 1024:  # 10MB以下
-                try:
-                    hash_md5 = self._calculate_md5(file_path)
-                except Exception as e:
-                    logger.warning(f"Failed to calculate MD5 for {file_path}: {e}")
-
-            return FileInfo(
-                name=file_path.name,
-                path=str(file_path.relative_to(self.base_dir)),
-                size=stat.st_size,
-                modified=datetime.fromtimestamp(stat.st_mtime),
-                created=datetime.fromtimestamp(stat.st_ctime),
-                is_directory=file_path.is_dir(),
-                mime_type=mime_type,
-                permissions=permissions,
-                hash_md5=hash_md5,
+            info = self._make_file_info(
+                file_path.name,
+                str(file_path.relative_to(self.base_dir)),
+                file_path.stat(),
             )
+            if compute_hash and not info.is_directory:
+                info.hash_md5 = self.get_file_hash(file_path)
+            return info
 
         except Exception as e:
             logger.error(f"Error getting file info for {path}: {e}")
             return None
 
+    @staticmethod
+    def _make_file_info(name: str, rel_path: str, st: os.stat_result) -> FileInfo:
+        """根据stat结果构建文件信息（不读取文件内容）"""
+        is_directory = stat_module.S_ISDIR(st.st_mode)
+        mime_type = None
+        if not is_directory:
+            mime_type, _ = mimetypes.guess_type(name)
+
+        return FileInfo(
+            name=name,
+            path=rel_path,
+            size=st.st_size,
+            modified=datetime.fromtimestamp(st.st_mtime),
+            created=datetime.fromtimestamp(st.st_ctime),
+            is_directory=is_directory,
+            mime_type=mime_type,
+            permissions=oct(st.st_mode)[-3:],
+        )
+
+    def _scan(
+        self, dir_path: Path, recursive: bool, include_hidden: bool
+    ) -> Iterator[tuple[os.DirEntry, str]]:
+        """
+        使用os.scandir遍历目录
+
+        Yields:
+            (目录项, 相对于基础目录的路径)
+        """
+        rel_root = dir_path.relative_to(self.base_dir)
+        pending = [(str(dir_path), "" if rel_root == Path(".") else f"{rel_root}{os.sep}")]
+
+        while pending:
+            current, rel_prefix = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.warning(f"Cannot scan directory {current}: {e}")
+                continue
+
+            for entry in entries:
+                # 跳过隐藏文件（除非明确包含）
+                if not include_hidden and entry.name.startswith("."):
+                    continue
+                rel_path = rel_prefix + entry.name
+                yield entry, rel_path
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, rel_path + os.sep))
+
+    def _entry_info(self, entry: os.DirEntry, rel_path: str) -> Optional[FileInfo]:
+        try:
+            return self._make_file_info(entry.name, rel_path, entry.stat())
+        except OSError:
+            # 列出期间被删除或失效的符号链接
+            return None
+
+    def iter_directory(
+        self,
+        path: Union[str, Path] = "",
+        recursive: bool = False,
+        include_hidden: bool = False,
+    ) -> Iterator[FileInfo]:
+        """
+        流式遍历目录内容（不排序）
+
+        适合超大目录，每个条目只产生一次stat调用。
+
+        Args:
+            path: 目录路径（相对于基础目录）
+            recursive: 是否递归列出
+            include_hidden: 是否包含隐藏文件
+
+        Yields:
+            文件信息
+        """
+        dir_path = self._validate_path(path)
+        if not dir_path.is_dir():
+            return
+
+        for entry, rel_path in self._scan(dir_path, recursive, include_hidden):
+            file_info = self._entry_info(entry, rel_path)
+            if file_info:
+                yield file_info
+
     def list_directory(
         self,
         path: Union[str, Path] = "",
         recursive: bool = False,
         include_hidden: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> list[FileInfo]:
         """
         列出目录内容
 
+        排序只使用目录项自带的类型信息，只有返回的分页条目才会调用stat，
+        因此分页浏览大目录（如 world/region）的开销与页面大小成正比。
+
         Args:
             path: 目录路径（相对于基础目录）
             recursive: 是否递归列出
             include_hidden: 是否包含隐藏文件
+            offset: 分页起始位置
+            limit: 返回的最大条目数，None表示全部
 
         Returns:
             文件信息列表
@@ -261,25 +460,21 @@ class FileManager:
                 )
                 return []
 
-            files = []
+            entries = list(self._scan(dir_path, recursive, include_hidden))
 
-            if recursive:
-                pattern = "**/*"
-            else:
-                pattern = "*"
+            # 按名称排序，目录在前
+            entries.sort(key=lambda item: (not item[0].is_dir(), item[0].name.lower()))
 
-            for item in dir_path.glob(pattern):
-                # 跳过隐藏文件（除非明确包含）
-                if not include_hidden and item.name.startswith("."):
-                    continue
+            if offset or limit is not None:
+                end = None if limit is None else offset + max(0, limit)
+                entries = entries[offset:end]
 
-                file_info = self.get_file_info(item)
+            files = []
+            for entry, rel_path in entries:
+                file_info = self._entry_info(entry, rel_path)
                 if file_info:
                     files.append(file_info)
 
-            # 按名称排序，目录在前
-            files.sort(key=lambda x: (not x.is_directory, x.name.lower()))
-
             return files
 
         except Exception as e:
@@ -606,14 +801,23 @@ class FileManager:
         source_path: Union[str, Path],
         archive_path: Union[str, Path],
         format: str = "zip",
+        level: int = 6,
+        workers: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> bool:
         """
         创建压缩包
 
+        zip、tar、gztar 与 zsttar 由 archive_writer 流式写出，按块在线程池中
+        并行压缩；区域文件等已压缩的内容直接存储。
+
         Args:
             source_path: 源路径
             archive_path: 压缩包路径
-            format: 压缩格式 ('zip', 'tar', 'gztar')
+            format: 压缩格式 ('zip', 'tar', 'gztar', 'zsttar', 'bztar', 'xztar')
+            level: 压缩级别 0-9（zsttar 作为 zstd 级别使用；bztar、xztar 忽略）
+            workers: 压缩线程数，默认为 CPU 核心数
+            progress_callback: 进度回调 (已完成文件数, 总文件数, 已完成字节数, 总字节数)
 
         Returns:
             是否成功
@@ -629,22 +833,28 @@ class FileManager:
             # 创建目标目录
             archive_path.parent.mkdir(parents=True, exist_ok=True)
 
-            if format == "zip":
-                with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                    if src_path.is_file():
-                        zipf.write(src_path, src_path.name)
-                    else:
-                        for file_path in src_path.rglob("*"):
-                            if file_path.is_file():
-                                arcname = file_path.relative_to(src_path.parent)
-                                zipf.write(file_path, arcname)
-            else:
-                shutil.make_archive(
-                    str(archive_path.with_suffix("")),
+            if format in ("zip", "tar", "gztar", "zsttar"):
+                stats = write_archive(
+                    src_path,
+                    archive_path,
                     format,
-                    str(src_path.parent),
-                    str(src_path.name),
+                    level=level,
+                    workers=workers,
+                    progress=progress_callback,
+                )
+                logger.info(
+                    f"Archive created successfully: {archive_path} "
+                    f"({stats.files} files, {stats.input_bytes} -> {stats.output_bytes} bytes, "
+                    f"{stats.duration:.2f}s, {stats.workers} workers)"
                 )
+                return True
+
+            shutil.make_archive(
+                str(archive_path.with_suffix("")),
+                format,
+                str(src_path.parent),
+                str(src_path.name),
+            )
 
             logger.info(f"Archive created successfully: {archive_path}")
             return True
@@ -680,6 +890,16 @@ class FileManager:
             if archive_path.suffix.lower() == ".zip":
                 with zipfile.ZipFile(archive_path, "r") as zipf:
                     zipf.extractall(dest_path)
+            elif archive_path.name.lower().endswith((".tar.zst", ".tzst")):
+                if not HAS_ZSTD:
+                    logger.error("Extracting .tar.zst archives requires the zstandard package")
+                    return False
+                import zstandard
+
+                with open(archive_path, "rb") as f:
+                    reader = zstandard.ZstdDecompressor().stream_reader(f)
+                    with tarfile.open(fileobj=reader, mode="r|") as tar:
+                        tar.extractall(dest_path, filter="data")
             else:
                 shutil.unpack_archive(str(archive_path), str(dest_path))
 
@@ -708,6 +928,25 @@ class FileManager:
             else self._upload_history
         )
 
+    def _ready_index(self, sizes: bool = False) -> Optional[FileIndex]:
+        """
+        获取基础目录的共享文件索引
+
+        首次调用时在后台构建索引，构建完成前返回None，调用方回退到直接遍历。
+
+        Args:
+            sizes: 需要准确的大小；目录监视回退到轮询时索引中的大小可能过期，此时返回None
+        """
+        if not self._use_index:
+            return None
+        index = get_file_index(self.base_dir)
+        if not index.ready or (sizes and not index.sizes_current):
+            return None
+        return index
+
+    def _index_file_info(self, rel_path: str, st: os.stat_result) -> FileInfo:
+        return self._make_file_info(os.path.basename(rel_path), rel_path, st)
+
     def get_disk_usage(self, path: Union[str, Path] = "") -> dict[str, int]:
         """
         获取磁盘使用情况
@@ -721,29 +960,24 @@ class FileManager:
         try:
             dir_path = self._validate_path(path)
 
-            total_size = 0
-            file_count = 0
-            dir_count = 0
-
-            for item in dir_path.rglob("*"):
-                if item.is_file():
-                    total_size += item.stat().st_size
-                    file_count += 1
-                elif item.is_dir():
-                    dir_count += 1
+            index = self._ready_index(sizes=True)
+            if index:
+                usage = index.usage(index.relative(dir_path))
+                if usage is not None:
+                    return usage
 
-            return {
-                "total_size": total_size,
-                "file_count": file_count,
-                "directory_count": dir_count,
-            }
+            return directory_size(dir_path)
 
         except Exception as e:
             logger.error(f"Error getting disk usage for {path}: {e}")
             return {"total_size": 0, "file_count": 0, "directory_count": 0}
 
     def search_files(
-        self, pattern: str, path: Union[str, Path] = "", case_sensitive: bool = False
+        self,
+        pattern: str,
+        path: Union[str, Path] = "",
+        case_sensitive: bool = False,
+        limit: Optional[int] = None,
     ) -> list[FileInfo]:
         """
         搜索文件
@@ -752,6 +986,7 @@ class FileManager:
             pattern: 搜索模式
             path: 搜索路径
             case_sensitive: 是否区分大小写
+            limit: 返回的最大结果数
 
         Returns:
             匹配的文件列表
@@ -759,17 +994,35 @@ class FileManager:
         try:
             search_path = self._validate_path(path)
 
+            index = self._ready_index()
+            if index:
+                sizes_current = index.sizes_current
+                matches = []
+                for rel_path, st in index.search(
+                    pattern, index.relative(search_path), case_sensitive, limit
+                ):
+                    if not sizes_current:
+                        # 名称是最新的，但轮询的目录中大小可能已过期
+                        try:
+                            st = os.stat(index.root / rel_path, follow_symlinks=False)
+                        except OSError:
+                            continue
+                    matches.append(self._index_file_info(rel_path, st))
+                return matches
+
             if not case_sensitive:
                 pattern = pattern.lower()
 
             matches = []
-            for item in search_path.rglob("*"):
-                item_name = item.name if case_sensitive else item.name.lower()
+            for entry, rel_path in self._scan(search_path, True, True):
+                item_name = entry.name if case_sensitive else entry.name.lower()
 
                 if pattern in item_name:
-                    file_info = self.get_file_info(item)
+                    file_info = self._entry_info(entry, rel_path)
                     if file_info:
                         matches.append(file_info)
+                        if limit is not None and len(matches) >= limit:
+                            break
 
             return matches
 
@@ -777,6 +1030,44 @@ class FileManager:
             logger.error(f"Error searching files with pattern '{pattern}': {e}")
             return []
 
+    def get_largest_files(
+        self, count: int = 10, path: Union[str, Path] = ""
+    ) -> list[FileInfo]:
+        """
+        获取最大的文件
+
+        Args:
+            count: 返回的文件数
+            path: 搜索路径
+
+        Returns:
+            按大小降序排列的文件列表
+        """
+        try:
+            search_path = self._validate_path(path)
+
+            index = self._ready_index(sizes=True)
+            if index:
+                return [
+                    self._index_file_info(rel_path, st)
+                    for rel_path, st in index.largest_files(
+                        count, index.relative(search_path)
+                    )
+                ]
+
+            files = (
+                info
+                for entry, rel_path in self._scan(search_path, True, True)
+                if entry.is_file(follow_symlinks=False)
+                for info in [self._entry_info(entry, rel_path)]
+                if info
+            )
+            return heapq.nlargest(count, files, key=lambda info: info.size)
+
+        except Exception as e:
+            logger.error(f"Error finding largest files in {path}: {e}")
+            return []
+
     def set_safe_mode(self, enabled: bool):
         """
         设置安全模式
@@ -817,5 +1108,6 @@ class FileManager:
             "allowed_extensions": dict(self.ALLOWED_EXTENSIONS),
             "forbidden_extensions": self.FORBIDDEN_EXTENSIONS,
             "upload_history_count": len(self._upload_history),
+            "hash_cache": self._hash_cache.get_stats(),
             "disk_usage": self.get_disk_usage(),
         }
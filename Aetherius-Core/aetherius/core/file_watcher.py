@@ -0,0 +1,520 @@
+"""Shared file change watcher backed by inotify, with an adaptive polling fallback."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal ctypes binding for the Linux inotify API."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Read pending events as (wd, mask, name) tuples."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatch:
+    """A subscription to changes of one path, returned by FileWatcher.watch()."""
+
+    def __init__(
+        self,
+        path: Path,
+        callback: Callable[[Path], Any],
+        debounce: float,
+        loop: asyncio.AbstractEventLoop | None,
+    ):
+        self.path = path
+        self.callback = callback
+        self.debounce = debounce
+        self.loop = loop
+        self.active = True
+
+        # Directories watched with inotify on behalf of this subscription
+        self._dirs: list[Path] = []
+        # Pending debounced notification (monotonic deadline)
+        self._deadline: float | None = None
+        # Last (mtime_ns, size, inode) seen by the polling fallback
+        self._signature: tuple[int, int, int] | None = None
+
+
+class FileWatcher:
+    """
+    Delivers path change notifications to subscribers from one shared thread.
+
+    On Linux the watcher uses inotify on the parent directory of each watched
+    path, so atomic replaces and re-created files are seen immediately and an
+    idle watcher never wakes up. Paths that inotify cannot watch, or every
+    path on other platforms, are polled by stat() signature instead; the poll
+    interval starts at min_poll_interval after a change and backs off towards
+    max_poll_interval while nothing changes. A polled directory only reports
+    entries being added, removed or renamed, since writing to a file inside it
+    does not change the directory's own stat(); see is_polled().
+
+    Notifications are debounced per subscription: a burst of events produces
+    a single callback once the path has been quiet for the debounce delay.
+    Callbacks run on the watcher thread, or on the subscription's event loop
+    when one is given (coroutine functions are scheduled as tasks).
+    """
+
+    def __init__(
+        self,
+        min_poll_interval: float = 0.1,
+        max_poll_interval: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            min_poll_interval: Polling interval right after a change, in seconds
+            max_poll_interval: Longest polling interval while idle, in seconds
+            use_inotify: Use inotify when the platform supports it
+        """
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+
+        self._inotify: _Inotify | None = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, falling back to polling: {e}")
+
+        self._lock = threading.Lock()
+        self._by_path: dict[Path, list[FileWatch]] = {}
+        self._pending: set[FileWatch] = set()
+        self._polled: set[FileWatch] = set()
+        # inotify watch descriptor <-> watched directory, with subscriber counts
+        self._wd_dirs: dict[int, Path] = {}
+        self._dir_wds: dict[Path, int] = {}
+        self._dir_refs: dict[Path, int] = {}
+
+        self._poll_interval = min_poll_interval
+        self._next_poll = 0.0
+        # inotify_add_watch failures by errno; only the first of each is a warning
+        self._watch_errors: dict[int, int] = {}
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+        # Statistics
+        self._wakeups = 0
+        self._events = 0
+        self._polls = 0
+        self._notifications = 0
+
+    @property
+    def backend(self) -> str:
+        """Name of the active backend: "inotify" or "polling"."""
+        return "inotify" if self._inotify else "polling"
+
+    def watch(
+        self,
+        path: str | Path,
+        callback: Callable[[Path], Any],
+        debounce: float = 0.1,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> FileWatch:
+        """
+        Subscribe to changes of a file or directory.
+
+        The path does not need to exist yet; creating it counts as a change.
+        For a directory, changes to its direct entries are reported too
+        (while polled, only entries added, removed or renamed).
+
+        Args:
+            path: File or directory to watch
+            callback: Called with the watched path after it changes
+            debounce: Quiet period in seconds before the callback fires
+            loop: Event loop to run the callback on; None runs it on the
+                watcher thread, or on the running loop for coroutine functions
+
+        Returns:
+            Subscription handle for unwatch()
+        """
+        if self._stopped:
+            raise RuntimeError("File watcher is stopped")
+        if loop is None and asyncio.iscoroutinefunction(callback):
+            loop = asyncio.get_running_loop()
+
+        watch = FileWatch(Path(path).absolute(), callback, max(0.0, debounce), loop)
+        watch._signature = self._stat_signature(watch.path)
+
+        with self._lock:
+            self._by_path.setdefault(watch.path, []).append(watch)
+            if not self._add_inotify_watches(watch):
+                self._start_polling(watch, time.monotonic() + self.min_poll_interval)
+            self._ensure_thread()
+
+        self._wake()
+        logger.debug(f"Watching {watch.path} ({'polling' if watch in self._polled else self.backend})")
+        return watch
+
+    def is_polled(self, watch: FileWatch) -> bool:
+        """Whether a subscription currently falls back to polling."""
+        with self._lock:
+            return watch in self._polled
+
+    def unwatch(self, watch: FileWatch) -> None:
+        """Cancel a subscription. Pending notifications are dropped."""
+        watch.active = False
+        with self._lock:
+            watches = self._by_path.get(watch.path, [])
+            if watch in watches:
+                watches.remove(watch)
+                if not watches:
+                    del self._by_path[watch.path]
+            self._pending.discard(watch)
+            self._polled.discard(watch)
+            self._release_dirs(watch)
+
+    def stop(self) -> None:
+        """Stop the watcher thread and drop all subscriptions."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        with self._lock:
+            for watches in self._by_path.values():
+                for watch in watches:
+                    watch.active = False
+            self._by_path.clear()
+            self._pending.clear()
+            self._polled.clear()
+        if self._inotify:
+            self._inotify.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get watcher statistics.
+
+        Returns:
+            Dictionary with backend, subscription counts and wakeup counters
+        """
+        with self._lock:
+            polled = len(self._polled)
+            return {
+                "backend": self.backend,
+                "watches": sum(len(watches) for watches in self._by_path.values()),
+                "polled_watches": polled,
+                "inotify_dirs": len(self._dir_wds),
+                "inotify_watch_errors": sum(self._watch_errors.values()),
+                "poll_interval": self._poll_interval if polled else None,
+                "wakeups": self._wakeups,
+                "events": self._events,
+                "polls": self._polls,
+                "notifications": self._notifications,
+            }
+
+    @staticmethod
+    def _dirs_for(path: Path) -> list[Path]:
+        """Directories whose inotify events can affect a watched path."""
+        return [path.parent, path] if path.is_dir() else [path.parent]
+
+    @staticmethod
+    def _stat_signature(path: Path) -> tuple[int, int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _add_inotify_watches(self, watch: FileWatch) -> bool:
+        """Watch the directories for a subscription; False means it must be polled."""
+        if not self._inotify:
+            return False
+        for dir_path in self._dirs_for(watch.path):
+            if dir_path not in self._dir_wds:
+                try:
+                    wd = self._inotify.add_watch(dir_path)
+                except OSError as e:
+                    if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                        self._log_watch_error(dir_path, e)
+                    self._release_dirs(watch)
+                    return False
+                self._wd_dirs[wd] = dir_path
+                self._dir_wds[dir_path] = wd
+            self._dir_refs[dir_path] = self._dir_refs.get(dir_path, 0) + 1
+            watch._dirs.append(dir_path)
+        return True
+
+    def _log_watch_error(self, dir_path: Path, error: OSError) -> None:
+        """Warn once per errno; a large tree hitting the watch limit would flood the log."""
+        count = self._watch_errors.get(error.errno, 0)
+        self._watch_errors[error.errno] = count + 1
+        if count:
+            logger.debug(f"Cannot watch {dir_path} with inotify: {error}")
+            return
+        hint = " (raise fs.inotify.max_user_watches)" if error.errno == errno.ENOSPC else ""
+        logger.warning(
+            f"Cannot watch {dir_path} with inotify: {error}{hint}; polling it and "
+            f"any further paths that fail the same way"
+        )
+
+    def _release_dirs(self, watch: FileWatch) -> None:
+        """Drop a subscription's directory references, removing unused watches."""
+        for dir_path in watch._dirs:
+            refs = self._dir_refs.get(dir_path, 0) - 1
+            if refs > 0:
+                self._dir_refs[dir_path] = refs
+                continue
+            self._dir_refs.pop(dir_path, None)
+            wd = self._dir_wds.pop(dir_path, None)
+            if wd is not None:
+                self._wd_dirs.pop(wd, None)
+                self._inotify.rm_watch(wd)
+        watch._dirs = []
+
+    def _start_polling(self, watch: FileWatch, next_poll: float) -> None:
+        self._next_poll = min(self._next_poll, next_poll) if self._polled else next_poll
+        self._polled.add(watch)
+        self._poll_interval = self.min_poll_interval
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="aetherius-file-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while not self._stopped:
+            timeout = self._next_timeout()
+            readers = [self._wake_r]
+            if self._inotify:
+                readers.append(self._inotify.fd)
+            try:
+                ready, _, _ = select.select(readers, [], [], timeout)
+            except (OSError, ValueError):
+                break
+            if self._stopped:
+                break
+            self._wakeups += 1
+
+            if self._wake_r in ready:
+                os.read(self._wake_r, 4096)
+            if self._inotify and self._inotify.fd in ready:
+                self._handle_inotify_events()
+            if time.monotonic() >= self._next_poll:
+                self._poll()
+            self._fire_due()
+
+    def _next_timeout(self) -> float | None:
+        """Seconds until the next poll or debounced notification, None if idle."""
+        with self._lock:
+            deadlines = [w._deadline for w in self._pending]
+            if self._polled:
+                deadlines.append(self._next_poll)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _handle_inotify_events(self) -> None:
+        try:
+            events = self._inotify.read_events()
+        except OSError as e:
+            logger.error(f"Error reading inotify events: {e}")
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            for wd, mask, name in events:
+                self._events += 1
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost; treat everything as changed
+                    for watches in self._by_path.values():
+                        for watch in watches:
+                            self._mark(watch, now)
+                    continue
+                if mask & IN_IGNORED:
+                    dir_path = self._wd_dirs.pop(wd, None)
+                    if dir_path is not None:
+                        self._dir_wds.pop(dir_path, None)
+                        self._dir_refs.pop(dir_path, None)
+                        # The directory went away; poll until it returns
+                        for path in (dir_path, *self._children_of(dir_path)):
+                            for watch in self._by_path.get(path, ()):
+                                if dir_path in watch._dirs:
+                                    watch._dirs.remove(dir_path)
+                                    self._release_dirs(watch)
+                                    self._start_polling(watch, now)
+                    continue
+
+                dir_path = self._wd_dirs.get(wd)
+                if dir_path is None:
+                    continue
+                for watch in self._by_path.get(dir_path, ()):
+                    self._mark(watch, now)
+                if name:
+                    for watch in self._by_path.get(dir_path / name, ()):
+                        self._mark(watch, now)
+
+    def _poll(self) -> None:
+        """Check stat() signatures of polled paths and adapt the interval."""
+        now = time.monotonic()
+        changed_any = False
+        with self._lock:
+            polled = list(self._polled)
+        if not polled:
+            return
+        for watch in polled:
+            signature = self._stat_signature(watch.path)
+            if signature != watch._signature:
+                watch._signature = signature
+                changed_any = True
+                with self._lock:
+                    self._mark(watch, now)
+                    # Switch back to inotify once the parent exists again
+                    if watch.active and self._add_inotify_watches(watch):
+                        self._polled.discard(watch)
+        self._polls += 1
+
+        if changed_any:
+            self._poll_interval = self.min_poll_interval
+        else:
+            self._poll_interval = min(self._poll_interval * 1.5, self.max_poll_interval)
+        self._next_poll = now + self._poll_interval
+
+    def _children_of(self, dir_path: Path) -> list[Path]:
+        """Watched paths directly inside a directory."""
+        return [path for path in self._by_path if path.parent == dir_path]
+
+    def _mark(self, watch: FileWatch, now: float) -> None:
+        if watch.active:
+            watch._deadline = now + watch.debounce
+            self._pending.add(watch)
+
+    def _fire_due(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [w for w in self._pending if w._deadline <= now]
+            for watch in due:
+                watch._deadline = None
+                self._pending.discard(watch)
+        for watch in due:
+            self._dispatch(watch)
+
+    def _dispatch(self, watch: FileWatch) -> None:
+        if not watch.active:
+            return
+        self._notifications += 1
+        if watch.loop is None:
+            self._invoke(watch)
+            return
+        try:
+            watch.loop.call_soon_threadsafe(self._invoke, watch)
+        except RuntimeError:
+            # The subscriber's loop is closed
+            watch.active = False
+
+    @staticmethod
+    def _invoke(watch: FileWatch) -> None:
+        if not watch.active:
+            return
+        try:
+            result = watch.callback(watch.path)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            logger.error(f"Error in file watch callback for {watch.path}: {e}")
+
+
+# Global file watcher instance
+_file_watcher: FileWatcher | None = None
+
+
+def get_file_watcher() -> FileWatcher:
+    """Get the global file watcher instance."""
+    global _file_watcher
+    if _file_watcher is None:
+        _file_watcher = FileWatcher()
+    return _file_watcher
@@ -0,0 +1,426 @@
+"""JVM heap, GC and thread telemetry for the managed server process."""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import psutil
+
+from .file_watcher import FileWatch, get_file_watcher
+from .monitoring.collectors import InMemoryMetricsCollector
+
+logger = logging.getLogger(__name__)
+
+# Unified logging GC pause line, e.g.
+# [12.345s][info][gc] GC(12) Pause Young (Normal) (G1 Evacuation Pause) 120M->40M(512M) 5.123ms
+_GC_PAUSE_PATTERN = re.compile(
+    r"GC\((\d+)\) (Pause .*?)\s*"
+    r"(?:(\d+)([KMG])->(\d+)([KMG])\((\d+)([KMG])\)\s*)?"
+    r"([\d.]+)ms\s*$"
+)
+_UNIT_MB = {"K": 1 / 1024, "M": 1.0, "G": 1024.0}
+
+# `java -version` banner, e.g. openjdk version "17.0.8" / java version "1.8.0_392"
+_JAVA_VERSION_PATTERN = re.compile(r'version "(\d+)(?:\.(\d+))?')
+_java_versions: dict[str, int | None] = {}
+
+HEAP_USED = "jvm.heap.used_mb"
+HEAP_COMMITTED = "jvm.heap.committed_mb"
+HEAP_AFTER_GC = "jvm.heap.after_gc_mb"
+METASPACE_USED = "jvm.metaspace.used_mb"
+THREADS = "jvm.threads"
+GC_PAUSE = "jvm.gc.pause_ms"
+GC_COUNT = "jvm.gc.count"
+GC_TIME = "jvm.gc.time_ms"
+
+
+def gc_log_args(log_path: str) -> list[str]:
+    """
+    JVM arguments that write GC pauses to log_path (relative paths avoid ':' in -Xlog).
+
+    Unified logging (-Xlog) needs Java 9 or later; Java 8 refuses to start with it.
+    """
+    return [f"-Xlog:gc:file={log_path}:uptime,level,tags:filecount=5,filesize=10m"]
+
+
+def parse_java_version(banner: str) -> int | None:
+    """Major version from `java -version` output (1.8 -> 8), None if unrecognised."""
+    match = _JAVA_VERSION_PATTERN.search(banner)
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        major = int(match.group(2))
+    return major
+
+
+async def java_major_version(java: str = "java") -> int | None:
+    """Major version of the given java executable, probed once per executable."""
+    if java in _java_versions:
+        return _java_versions[java]
+    version = None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            java, "-version",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=10.0)
+        version = parse_java_version(stderr.decode(errors="replace") + stdout.decode(errors="replace"))
+    except (TimeoutError, OSError) as e:
+        logger.warning(f"Could not determine Java version of {java}: {e}")
+    _java_versions[java] = version
+    return version
+
+
+def has_gc_logging(jvm_args: list[str]) -> bool:
+    """Whether the user already configured GC logging."""
+    return any(arg.startswith(("-Xlog:gc", "-Xloggc", "-verbose:gc")) for arg in jvm_args)
+
+
+def pause_kind(description: str) -> str:
+    """Classify a GC pause description into young/mixed/full/remark/cleanup/other."""
+    if "Full" in description:
+        return "full"
+    if "Mixed" in description:
+        return "mixed"
+    if "Young" in description:
+        return "young"
+    if "Remark" in description:
+        return "remark"
+    if "Cleanup" in description:
+        return "cleanup"
+    return "other"
+
+
+def _summary(values: list[float]) -> dict[str, Any]:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        "count": count,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "avg": sum(ordered) / count,
+        "p50": ordered[int(count * 0.5)],
+        "p95": ordered[min(count - 1, int(count * 0.95))],
+        "p99": ordered[min(count - 1, int(count * 0.99))],
+    }
+
+
+def _slope_per_minute(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of (timestamp, value) points, in units per minute."""
+    # Shorter spans are dominated by the sawtooth between collections
+    if len(points) < 2 or points[-1][0] - points[0][0] < 60.0:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if var_t == 0:
+        return None
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var_t * 60.0
+
+
+class JvmTelemetry:
+    """
+    Collects JVM telemetry for one server process into a metrics collector.
+
+    GC pauses are read from the -Xlog:gc file the controller configures, as
+    the JVM writes it. Heap and metaspace occupancy are polled with jstat
+    when a JDK is available; otherwise heap figures come from the GC log.
+    Thread count is read from the process. All series are stored in the
+    metrics collector, and trend analysis works over its retained window.
+    """
+
+    def __init__(
+        self,
+        pid: int,
+        gc_log_path: Path | None = None,
+        metrics: InMemoryMetricsCollector | None = None,
+        poll_interval: float = 10.0,
+        started_at: float | None = None,
+    ):
+        """
+        Args:
+            pid: JVM process id
+            gc_log_path: GC log written by -Xlog:gc, if enabled
+            metrics: Metrics store (a private InMemoryMetricsCollector if None)
+            poll_interval: Seconds between jstat/thread polls
+            started_at: Process launch time; older GC log content is skipped
+        """
+        self.pid = pid
+        self.gc_log_path = gc_log_path
+        self.metrics = metrics or InMemoryMetricsCollector()
+        self.poll_interval = poll_interval
+        self._jstat = shutil.which("jstat")
+        self._process: psutil.Process | None = None
+        self._task: asyncio.Task | None = None
+        self._watch: FileWatch | None = None
+        self._log_offset = 0
+        self._log_inode: int | None = None
+        self._partial = b""
+        self._started_at = started_at if started_at is not None else time.time()
+        self._latest: dict[str, Any] = {}
+        self.gc_events = 0
+
+    async def start(self) -> None:
+        """Start polling and following the GC log."""
+        try:
+            self._process = psutil.Process(self.pid)
+        except psutil.NoSuchProcess:
+            logger.warning(f"JVM process {self.pid} not found; telemetry disabled")
+            return
+
+        if self.gc_log_path is not None:
+            # Parse on the event loop so _latest and the read offset have a single owner
+            self._watch = get_file_watcher().watch(
+                self.gc_log_path, self._on_gc_log_changed, debounce=0.2,
+                loop=asyncio.get_running_loop(),
+            )
+            self._read_gc_log()
+        self._task = asyncio.create_task(self._poll_loop())
+        logger.info(
+            f"JVM telemetry attached to PID {self.pid} "
+            f"(gc log: {self.gc_log_path or 'off'}, jstat: {'yes' if self._jstat else 'no'})"
+        )
+
+    async def stop(self) -> None:
+        """Stop collecting."""
+        if self._watch is not None:
+            get_file_watcher().unwatch(self._watch)
+            self._watch = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # GC log
+
+    def _on_gc_log_changed(self, path: Path) -> None:
+        try:
+            self._read_gc_log()
+        except Exception as e:
+            logger.error(f"Error reading GC log {path}: {e}")
+
+    def _read_gc_log(self) -> None:
+        """Parse lines appended to the GC log since the last read."""
+        try:
+            st = os.stat(self.gc_log_path)
+        except FileNotFoundError:
+            return
+        # Rotation replaces the file; truncation shrinks it
+        if st.st_ino != self._log_inode or st.st_size < self._log_offset:
+            self._log_inode = st.st_ino
+            self._partial = b""
+            # A log left over from the previous run until the JVM rotates it
+            self._log_offset = st.st_size if st.st_mtime < self._started_at else 0
+        if st.st_size == self._log_offset:
+            return
+
+        with open(self.gc_log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read(st.st_size - self._log_offset)
+        self._log_offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.process_gc_line(line.decode("utf-8", errors="replace"))
+
+    def process_gc_line(self, line: str) -> bool:
+        """
+        Record one GC log line.
+
+        Returns:
+            True if the line was a GC pause
+        """
+        match = _GC_PAUSE_PATTERN.search(line)
+        if not match:
+            return False
+
+        description = match.group(2).strip()
+        pause_ms = float(match.group(9))
+        labels = {"type": pause_kind(description)}
+        self.metrics.record_histogram(GC_PAUSE, pause_ms, labels)
+        self.metrics.increment(GC_COUNT, 1.0, labels)
+        self.metrics.increment(GC_TIME, pause_ms)
+        self.gc_events += 1
+
+        if match.group(3):
+            after = float(match.group(5)) * _UNIT_MB[match.group(6)]
+            committed = float(match.group(7)) * _UNIT_MB[match.group(8)]
+            self.metrics.set_gauge(HEAP_AFTER_GC, after)
+            if not self._jstat:
+                self.metrics.set_gauge(HEAP_USED, after)
+                self.metrics.set_gauge(HEAP_COMMITTED, committed)
+                self._latest.update(heap_used_mb=after, heap_committed_mb=committed)
+            self._latest["heap_after_gc_mb"] = after
+
+        self._latest["last_gc"] = {
+            "id": int(match.group(1)),
+            "type": labels["type"],
+            "cause": description,
+            "pause_ms": pause_ms,
+            "timestamp": time.time(),
+        }
+        return True
+
+    # Polling
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except psutil.NoSuchProcess:
+                break
+            except Exception as e:
+                logger.error(f"Error polling JVM telemetry: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll(self) -> None:
+        """Sample heap (jstat) and thread count once."""
+        if self._process is not None:
+            threads = self._process.num_threads()
+            self.metrics.set_gauge(THREADS, threads)
+            self._latest["threads"] = threads
+
+        if self._jstat:
+            stats = await self._run_jstat()
+            if stats:
+                used = (stats["S0U"] + stats["S1U"] + stats["EU"] + stats["OU"]) / 1024
+                committed = (stats["S0C"] + stats["S1C"] + stats["EC"] + stats["OC"]) / 1024
+                self.metrics.set_gauge(HEAP_USED, used)
+                self.metrics.set_gauge(HEAP_COMMITTED, committed)
+                self._latest.update(
+                    heap_used_mb=used,
+                    heap_committed_mb=committed,
+                    old_gen_used_mb=stats["OU"] / 1024,
+                    young_gc_count=int(stats.get("YGC", 0)),
+                    full_gc_count=int(stats.get("FGC", 0)),
+                    gc_time_total_s=stats.get("GCT", 0.0),
+                )
+                if "MU" in stats:
+                    self.metrics.set_gauge(METASPACE_USED, stats["MU"] / 1024)
+                    self._latest["metaspace_used_mb"] = stats["MU"] / 1024
+        self._latest["sampled_at"] = time.time()
+
+    async def _run_jstat(self) -> dict[str, float] | None:
+        """Run `jstat -gc <pid>` and parse its single row (sizes in KB)."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self._jstat, "-gc", str(self.pid),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=5.0)
+        except (TimeoutError, OSError) as e:
+            logger.warning(f"jstat failed for PID {self.pid}, using GC log only: {e}")
+            self._jstat = None
+            return None
+
+        lines = stdout.decode(errors="replace").split("\n")
+        if process.returncode != 0 or len(lines) < 2:
+            return None
+        header, values = lines[0].split(), lines[1].split()
+        if len(header) != len(values):
+            return None
+        stats = {}
+        for key, value in zip(header, values, strict=True):
+            try:
+                stats[key] = float(value)
+            except ValueError:
+                continue
+        required = ("S0U", "S1U", "EU", "OU", "S0C", "S1C", "EC", "OC")
+        return stats if all(k in stats for k in required) else None
+
+    # Queries
+
+    def get_jvm_metrics(self) -> dict[str, Any]:
+        """Latest heap, GC and thread figures."""
+        pause_stats = {}
+        for kind in ("young", "mixed", "full", "remark", "cleanup", "other"):
+            stats = self.metrics.get_histogram_stats(GC_PAUSE, {"type": kind})
+            if stats:
+                pause_stats[kind] = stats
+        return {
+            "pid": self.pid,
+            **self._latest,
+            "gc_events": self.gc_events,
+            "gc_time_ms": self.metrics.get_counter_value(GC_TIME),
+            "gc_pauses": pause_stats,
+            "uptime_seconds": time.time() - self._started_at,
+            "sources": {
+                "gc_log": str(self.gc_log_path) if self.gc_log_path else None,
+                "jstat": bool(self._jstat),
+            },
+        }
+
+    def _series(self, name: str, since: float) -> list[tuple[float, float]]:
+        return self.metrics.get_series(name, since=since)
+
+    def analyze_trends(self, window_seconds: float = 3600.0) -> dict[str, Any]:
+        """
+        Compute statistics over the stored telemetry window.
+
+        Args:
+            window_seconds: How far back to look
+
+        Returns:
+            Heap, GC and thread statistics plus detected issues
+        """
+        now = time.time()
+        since = now - window_seconds
+        span = max(1.0, now - max(since, self._started_at))
+
+        heap = self._series(HEAP_USED, since)
+        after_gc = self._series(HEAP_AFTER_GC, since)
+        threads = self._series(THREADS, since)
+        pauses = [v for _, v in self._series(GC_PAUSE, since)]
+        committed = self.metrics.get_gauge_value(HEAP_COMMITTED)
+
+        gc_time = sum(pauses)
+        result = {
+            "window_seconds": window_seconds,
+            "heap": {
+                **_summary([v for _, v in heap]),
+                "committed_mb": committed,
+                "trend_mb_per_min": _slope_per_minute(heap),
+                "after_gc_trend_mb_per_min": _slope_per_minute(after_gc),
+            },
+            "gc": {
+                "pauses": _summary(pauses),
+                "per_minute": len(pauses) / span * 60.0,
+                "time_percent": gc_time / (span * 1000.0) * 100.0,
+                "total_pause_ms": gc_time,
+            },
+            "threads": {
+                **_summary([v for _, v in threads]),
+                "trend_per_min": _slope_per_minute(threads),
+            },
+        }
+
+        issues = []
+        after_slope = result["heap"]["after_gc_trend_mb_per_min"]
+        if after_slope is not None and len(after_gc) >= 5 and after_slope > 1.0:
+            issues.append(f"Heap after GC rising {after_slope:.1f} MB/min (possible leak)")
+        if result["gc"]["time_percent"] > 5.0:
+            issues.append(f"GC overhead {result['gc']['time_percent']:.1f}% of wall time")
+        if pauses and result["gc"]["pauses"]["p99"] > 200.0:
+            issues.append(f"GC pause p99 {result['gc']['pauses']['p99']:.0f} ms exceeds 200 ms")
+        if committed and heap and heap[-1][1] / committed > 0.9:
+            issues.append("Heap usage above 90% of committed heap")
+        result["issues"] = issues
+        return result
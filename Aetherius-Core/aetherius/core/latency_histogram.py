@@ -0,0 +1,210 @@
+"""Fixed-memory latency histograms with approximate percentiles."""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of durations in seconds.
+
+    Buckets grow geometrically from min_value and are stored sparsely, so
+    memory is bounded by the bucket layout no matter how many samples are
+    recorded, and percentiles are accurate to within the bucket growth
+    factor. Count, sum, min and max are exact.
+    """
+
+    __slots__ = (
+        "min_value",
+        "growth",
+        "_log_growth",
+        "_max_index",
+        "_buckets",
+        "count",
+        "total",
+        "min",
+        "max",
+    )
+
+    def __init__(
+        self, min_value: float = 1e-6, max_value: float = 1e3, growth: float = 1.05
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            min_value: Upper bound of the first bucket, in seconds
+            max_value: Values at or above this land in the last bucket
+            growth: Ratio between consecutive bucket bounds
+        """
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self._max_index = (
+            int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        )
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self._log_growth) + 1
+        return min(index, self._max_index)
+
+    def _bucket_value(self, index: int) -> float:
+        """Representative value of a bucket (geometric midpoint)."""
+        if index == 0:
+            return self.min_value
+        lower = self.min_value * self.growth ** (index - 1)
+        return lower * math.sqrt(self.growth)
+
+    def record(self, value: float) -> None:
+        """Record a single duration."""
+        index = self._index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of another histogram with the same layout."""
+        for index, bucket in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self._buckets.clear()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Approximate the q-th percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Approximate value, or None if no samples were recorded
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Clamp to the exact extremes so small samples stay sensible
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get a summary of the recorded samples."""
+        return {
+            "count": self.count,
+            "total_time": self.total,
+            "avg_time": self.total / self.count if self.count else 0.0,
+            "min_time": self.min,
+            "max_time": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class WindowedLatencyHistogram:
+    """
+    Lifetime latency histogram plus a rolling recent window.
+
+    The window is kept as a ring of per-slot histograms; summaries over the
+    last N seconds merge the slots that fall inside that span, so recent
+    latency can be reported alongside the lifetime figures.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        slot_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            window_seconds: Longest span that window summaries can cover
+            slot_seconds: Granularity of the rolling window
+            clock: Monotonic time source
+        """
+        self.window_seconds = window_seconds
+        self.slot_seconds = slot_seconds
+        self._clock = clock
+        self.lifetime = LatencyHistogram()
+        self._slots: deque[tuple[int, LatencyHistogram]] = deque()
+        self._max_slots = max(1, int(math.ceil(window_seconds / slot_seconds)))
+
+    @property
+    def count(self) -> int:
+        """Number of samples recorded over the lifetime."""
+        return self.lifetime.count
+
+    def record(self, value: float) -> None:
+        """Record a single duration."""
+        self.lifetime.record(value)
+
+        slot_id = int(self._clock() // self.slot_seconds)
+        if not self._slots or self._slots[-1][0] != slot_id:
+            self._slots.append((slot_id, LatencyHistogram()))
+            self._expire(slot_id)
+        self._slots[-1][1].record(value)
+
+    def _expire(self, current_slot: int) -> None:
+        oldest = current_slot - self._max_slots + 1
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.popleft()
+
+    def window(self, seconds: float) -> LatencyHistogram:
+        """
+        Merge the samples recorded during the last `seconds` seconds.
+
+        The span is rounded up to whole slots and capped at window_seconds.
+        """
+        current_slot = int(self._clock() // self.slot_seconds)
+        span = max(1, int(math.ceil(min(seconds, self.window_seconds) / self.slot_seconds)))
+        oldest = current_slot - span + 1
+
+        merged = LatencyHistogram()
+        for slot_id, histogram in reversed(self._slots):
+            if slot_id < oldest:
+                break
+            merged.merge(histogram)
+        return merged
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self.lifetime.reset()
+        self._slots.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Lifetime summary with one-minute and five-minute windows."""
+        summary = self.lifetime.snapshot()
+        summary["last_1m"] = self.window(60).snapshot()
+        summary["last_5m"] = self.window(300).snapshot()
+        return summary
@@ -0,0 +1,165 @@
+"""Bounded line buffer decoupling server output reading from event dispatch."""
+
+import asyncio
+import logging
+from collections import deque
+from enum import StrEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(StrEnum):
+    """What to do with new lines when the buffer is full."""
+
+    DROP = "drop"  # Discard the oldest buffered line
+    COALESCE = "coalesce"  # Fold the overflow into a single summary line
+
+
+class _CoalescedLines:
+    """Placeholder standing in for lines discarded while the buffer was full."""
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 1
+
+
+class LogLineBuffer:
+    """
+    Ring buffer of (level, line) pairs with batched consumption.
+
+    Producers call put_nowait(), which never blocks, so the server's pipes
+    are always drained promptly. A single consumer awaits get_batch() and
+    receives up to batch_size lines at a time. When the consumer falls
+    behind and the buffer fills up, lines are dropped or coalesced according
+    to the overflow policy instead of stalling the producer.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        batch_size: int = 256,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of buffered lines
+            batch_size: Maximum number of lines returned by get_batch()
+            policy: Overflow policy applied when the buffer is full
+        """
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.policy = OverflowPolicy(policy)
+
+        self._items: deque[tuple[str, str] | _CoalescedLines] = deque()
+        self._line_count = 0
+        self._not_empty = asyncio.Event()
+        self._closed = False
+
+        # Counters
+        self._received = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._lagged = 0
+        self._batches = 0
+        self._peak_backlog = 0
+
+    def put_nowait(self, level: str, line: str) -> None:
+        """
+        Add a line without blocking.
+
+        Args:
+            level: Log level of the line
+            line: Line content
+        """
+        if self._closed:
+            return
+
+        self._received += 1
+
+        if self._line_count >= self.capacity:
+            self._dropped += 1
+            if self.policy == OverflowPolicy.DROP:
+                self._discard_oldest()
+            else:
+                tail = self._items[-1] if self._items else None
+                if isinstance(tail, _CoalescedLines):
+                    tail.count += 1
+                else:
+                    self._items.append(_CoalescedLines())
+                self._not_empty.set()
+                return
+
+        self._items.append((level, line))
+        self._line_count += 1
+        if self._line_count > self._peak_backlog:
+            self._peak_backlog = self._line_count
+        self._not_empty.set()
+
+    def _discard_oldest(self) -> None:
+        """Remove the oldest buffered line."""
+        while self._items:
+            item = self._items.popleft()
+            if not isinstance(item, _CoalescedLines):
+                self._line_count -= 1
+                return
+
+    async def get_batch(self) -> list[tuple[str, str]]:
+        """
+        Wait for and return the next batch of lines.
+
+        Returns:
+            List of (level, line) pairs in arrival order. An empty list means
+            the buffer was closed and fully drained.
+        """
+        while not self._items:
+            if self._closed:
+                return []
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        behind = self._line_count > self.batch_size
+        batch: list[tuple[str, str]] = []
+        while self._items and len(batch) < self.batch_size:
+            item = self._items.popleft()
+            if isinstance(item, _CoalescedLines):
+                batch.append(
+                    ("WARN", f"[Aetherius] {item.count} log lines dropped under load")
+                )
+            else:
+                self._line_count -= 1
+                batch.append(item)
+
+        self._batches += 1
+        self._delivered += len(batch)
+        if behind:
+            self._lagged += len(batch)
+        return batch
+
+    def close(self) -> None:
+        """Stop accepting lines; get_batch() returns [] once drained."""
+        self._closed = True
+        self._not_empty.set()
+
+    @property
+    def backlog(self) -> int:
+        """Number of lines waiting to be consumed."""
+        return self._line_count
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get buffer counters."""
+        return {
+            "policy": self.policy.value,
+            "capacity": self.capacity,
+            "batch_size": self.batch_size,
+            "received": self._received,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "lagged": self._lagged,
+            "batches": self._batches,
+            "backlog": self._line_count,
+            "peak_backlog": self._peak_backlog,
+        }
@@ -2,7 +2,8 @@
 
 import logging
 import re
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import datetime, time
 from pathlib import Path
 from re import Pattern
 from typing import Optional, Union
@@ -26,6 +27,14 @@ from .events_base import (
 
 logger = logging.getLogger(__name__)
 
+# Vanilla/Paper line header: "[HH:MM:SS] [Thread name/LEVEL]: message".
+# Only the unambiguous form is matched here; anything else goes through the
+# generic timestamp/level/message extraction.
+_HEADER_PATTERN = re.compile(
+    r"\[([0-9]{2}):([0-9]{2}):([0-9]{2})\] \[[^/\[\]]+/[^\[\]]+\]"
+)
+_THREAD_PATTERN = re.compile(r"\[[^/]+/[^\]]+\]")
+
 
 class LogPattern:
     """Represents a log parsing pattern with associated event creation."""
@@ -37,6 +46,7 @@ class LogPattern:
         event_type: type[BaseEvent],
         field_mapping: Optional[dict[str, str]] = None,
         condition: Optional[str] = None,
+        keywords: Optional[Iterable[str]] = None,
     ):
         """
         Initialize a log pattern.
@@ -47,12 +57,44 @@ class LogPattern:
             event_type: Event type to create when pattern matches
             field_mapping: Mapping of regex groups to event fields
             condition: Optional condition to check before creating event
+            keywords: Literal substrings of which at least one must appear in
+                any line the regex can match. Used as a cheap prefilter so the
+                regex only runs on candidate lines; leave empty when the
+                pattern has no such literal.
         """
         self.name = name
         self.pattern = pattern if isinstance(pattern, Pattern) else re.compile(pattern)
         self.event_type = event_type
         self.field_mapping = field_mapping or {}
         self.condition = condition
+        self.keywords: tuple[str, ...] = tuple(k for k in (keywords or ()) if k)
+
+        # A single keyword uses a plain substring test; several are folded
+        # into one alternation so the line is scanned only once.
+        self._keyword: Optional[str] = None
+        self._keyword_pattern: Optional[Pattern] = None
+        if len(self.keywords) == 1:
+            self._keyword = self.keywords[0]
+        elif self.keywords:
+            self._keyword_pattern = re.compile(
+                "|".join(re.escape(k) for k in self.keywords)
+            )
+
+    def is_candidate(self, line: str) -> bool:
+        """
+        Check whether this pattern could possibly match a log line.
+
+        Args:
+            line: Log line to check
+
+        Returns:
+            bool: False only if the line cannot match this pattern
+        """
+        if self._keyword is not None:
+            return self._keyword in line
+        if self._keyword_pattern is not None:
+            return self._keyword_pattern.search(line) is not None
+        return True
 
     def try_parse(
         self, line: str, timestamp: Optional[datetime] = None
@@ -131,6 +173,9 @@ class LogPattern:
             except (ValueError, TypeError):
                 logger.warning(f"Could not convert tps '{event_data['tps']}' to float.")
                 return None
+            if "tick_time" not in event_data:
+                # TPS reports carry no tick time; use the average tick interval
+                event_data["tick_time"] = 1000.0 / event_data["tps"] if event_data["tps"] else 0.0
 
         # Add default values for missing required fields based on event type
         if self.event_type == PlayerDeathEvent:
@@ -197,6 +242,7 @@ class LogParser:
                 pattern=r"(\w+)\[/([0-9.]+):(\d+)\] logged in",
                 event_type=PlayerJoinEvent,
                 field_mapping={"1": "player_name", "2": "ip_address"},
+                keywords=("] logged in",),
             )
         )
 
@@ -206,6 +252,7 @@ class LogParser:
                 pattern=r"(\w+) joined the game",
                 event_type=PlayerJoinEvent,
                 field_mapping={"1": "player_name"},
+                keywords=(" joined the game",),
             )
         )
 
@@ -216,6 +263,7 @@ class LogParser:
                 pattern=r"(\w+) left the game",
                 event_type=PlayerLeaveEvent,
                 field_mapping={"1": "player_name"},
+                keywords=(" left the game",),
             )
         )
 
@@ -226,6 +274,7 @@ class LogParser:
                 pattern=r"<(\w+)> (.+)",
                 event_type=PlayerChatEvent,
                 field_mapping={"1": "player_name", "2": "message"},
+                keywords=("> ",),
             )
         )
 
@@ -236,6 +285,21 @@ class LogParser:
                 pattern=r"(\w+) (died|was killed|was slain|drowned|burned|fell|starved|suffocated|was blown up|hit the ground|went up in flames|walked into fire|was struck by lightning)",
                 event_type=PlayerDeathEvent,
                 field_mapping={"1": "player_name", "2": "death_message"},
+                keywords=(
+                    "died",
+                    "was killed",
+                    "was slain",
+                    "drowned",
+                    "burned",
+                    "fell",
+                    "starved",
+                    "suffocated",
+                    "was blown up",
+                    "hit the ground",
+                    "went up in flames",
+                    "walked into fire",
+                    "was struck by lightning",
+                ),
             )
         )
 
@@ -246,6 +310,7 @@ class LogParser:
                 pattern=r"(\w+) was (?:killed|slain) by (\w+)",
                 event_type=PlayerDeathEvent,
                 field_mapping={"1": "player_name", "2": "killer"},
+                keywords=("killed by ", "slain by "),
             )
         )
 
@@ -256,6 +321,7 @@ class LogParser:
                 pattern=r"(\w+) has made the advancement \[([^\]]+)\]",
                 event_type=PlayerAdvancementEvent,
                 field_mapping={"1": "player_name", "2": "advancement_title"},
+                keywords=(" has made the advancement [",),
             )
         )
 
@@ -266,6 +332,7 @@ class LogParser:
                 pattern=r"Done \(([0-9.]+)s\)! For help, type \"help\"",
                 event_type=ServerStartedEvent,
                 field_mapping={"1": "startup_time"},
+                keywords=('s)! For help, type "help"',),
             )
         )
 
@@ -275,6 +342,7 @@ class LogParser:
                 pattern=r"Stopping server",
                 event_type=ServerStoppingEvent,
                 field_mapping={},
+                keywords=("Stopping server",),
             )
         )
 
@@ -285,6 +353,7 @@ class LogParser:
                 pattern=r"Can't keep up! Is the server overloaded\? Running (\d+)ms or (\d+) ticks behind",
                 event_type=LagSpikeEvent,
                 field_mapping={"1": "duration", "2": "tick_count"},
+                keywords=("Can't keep up! Is the server overloaded?",),
             )
         )
 
@@ -292,9 +361,10 @@ class LogParser:
         self.add_pattern(
             LogPattern(
                 name="tps_report",
-                pattern=r"TPS from last 1m, 5m, 15m: ([0-9.]+), ([0-9.]+), ([0-9.]+)",
+                pattern=r"TPS from last 1m, 5m, 15m: \*?([0-9.]+), \*?([0-9.]+), \*?([0-9.]+)",
                 event_type=TickTimeEvent,
                 field_mapping={"1": "tps"},
+                keywords=("TPS from last 1m, 5m, 15m: ",),
             )
         )
 
@@ -326,6 +396,7 @@ class LogParser:
                         event_type=event_type,
                         field_mapping=pattern_data.get("field_mapping", {}),
                         condition=pattern_data.get("condition"),
+                        keywords=pattern_data.get("keywords"),
                     )
 
                     self.add_pattern(pattern)
@@ -365,25 +436,26 @@ class LogParser:
         """
         events = []
 
-        # Extract timestamp and log level
-        timestamp = self._extract_timestamp(line)
-        log_level = self._extract_log_level(line)
+        # Extract timestamp, log level and message, from a single header
+        # match when the line has the standard layout
+        timestamp, log_level, message = self._parse_header(line)
 
         # Create base log line event
         log_event = LogLineEvent(
             line=line,
             level=log_level or "INFO",
             timestamp=timestamp,
-            message=self._extract_message(line),
+            message=message,
         )
         events.append(log_event)
 
-        # Try to parse with each pattern
+        # Try to parse with each pattern, skipping those whose keywords are
+        # absent since their regex cannot match the line
         parsed = False
-        attempted_patterns = []
 
         for pattern in self.patterns:
-            attempted_patterns.append(pattern.name)
+            if not pattern.is_candidate(line):
+                continue
             try:
                 event = pattern.try_parse(line, timestamp)
                 if event:
@@ -399,12 +471,46 @@ class LogParser:
         # If no pattern matched, create an unknown log event
         if not parsed and line.strip():  # Don't create events for empty lines
             unknown_event = UnknownLogEvent(
-                raw_line=line, attempted_patterns=attempted_patterns
+                raw_line=line,
+                attempted_patterns=[pattern.name for pattern in self.patterns],
             )
             events.append(unknown_event)
 
         return events
 
+    def _parse_header(
+        self, line: str
+    ) -> tuple[Optional[datetime], Optional[str], str]:
+        """
+        Extract timestamp, log level and message from a log line.
+
+        Lines of the form "[HH:MM:SS] [Thread/LEVEL]: message" whose message
+        contains no further brackets are handled with one anchored match;
+        everything else falls back to the individual extractors, so the
+        result is the same either way.
+        """
+        match = _HEADER_PATTERN.match(line)
+        rest = line[match.end() :] if match else ""
+        if match is None or "[" in rest:
+            return (
+                self._extract_timestamp(line),
+                self._extract_log_level(line),
+                self._extract_message(line),
+            )
+
+        hour, minute, second = match.group(1, 2, 3)
+        try:
+            timestamp = datetime.combine(
+                datetime.now().date(), time(int(hour), int(minute), int(second))
+            )
+        except ValueError:
+            timestamp = None
+
+        # A "[Thread/LEVEL]" section never looks like a bare "[LEVEL]" tag,
+        # so the level pattern cannot match anywhere in such a line
+        message = rest.strip().lstrip(": ")
+        return timestamp, None, message or line
+
     def _extract_timestamp(self, line: str) -> Optional[datetime]:
         """Extract timestamp from log line."""
         match = self.timestamp_pattern.search(line)
@@ -444,7 +550,7 @@ class LogParser:
         message = self.log_level_pattern.sub("", message).strip()
 
         # Remove thread info like [Server thread/INFO]
-        message = re.sub(r"\[[^/]+/[^\]]+\]", "", message).strip()
+        message = _THREAD_PATTERN.sub("", message).strip()
 
         # Remove leading colons and spaces
         message = message.lstrip(": ")
@@ -5,10 +5,13 @@
 """
 
 import asyncio
+import bisect
+import math
 import time
 import threading
 import psutil
-from typing import Dict, List, Optional, Set, Callable, Any, Union
+from typing import Dict, List, Optional, Set, Callable, Any, Tuple, Union
+from array import array
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 import logging
@@ -18,19 +21,147 @@ from . import (
     Metric, MetricType, HealthCheck, HealthStatus, Alert, AlertLevel,
     Timer, Span, SystemMetrics, ApplicationMetrics, MinecraftMetrics
 )
+from .sampler import get_system_sampler
 
 logger = logging.getLogger(__name__)
 
 
+class _Series:
+    """
+    单个指标序列
+
+    历史值与时间戳存放在 array('d') 环形缓冲区中，写入只覆盖槽位，
+    不创建 Metric 对象；容量从较小的预分配开始，按倍数增长到上限后循环覆盖。
+    """
+    
+    __slots__ = ("name", "type", "labels", "capacity", "values", "timestamps",
+                 "head", "count", "value", "has_value", "lock")
+    
+    _INITIAL_CAPACITY = 256
+    
+    def __init__(self, name: str, metric_type: MetricType, labels: Dict[str, str], capacity: int):
+        self.name = name
+        self.type = metric_type
+        self.labels = labels
+        self.capacity = max(1, capacity)
+        size = min(self.capacity, self._INITIAL_CAPACITY)
+        self.values = array("d", bytes(8 * size))
+        self.timestamps = array("d", bytes(8 * size))
+        self.head = 0
+        self.count = 0
+        self.value = 0.0
+        self.has_value = False
+        self.lock = threading.Lock()
+    
+    def append(self, value: float, timestamp: float):
+        """写入一个样本（调用方持有 lock）"""
+        head = self.head
+        if head == len(self.values):
+            # 尚未写满上限：扩容，已有数据按顺序位于 [0, head)
+            grow = min(head, self.capacity - head)
+            self.values.frombytes(bytes(8 * grow))
+            self.timestamps.frombytes(bytes(8 * grow))
+        self.values[head] = value
+        self.timestamps[head] = timestamp
+        head += 1
+        self.head = 0 if head == self.capacity else head
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def recent(self, limit: int) -> List[Metric]:
+        """按时间顺序返回最近 limit 个样本（调用方持有 lock）"""
+        n = min(limit, self.count)
+        start = self.head - n
+        indices = range(start, self.head) if start >= 0 else \
+            list(range(self.capacity + start, self.capacity)) + list(range(self.head))
+        return [
+            Metric(
+                name=self.name,
+                type=self.type,
+                value=self.values[i],
+                timestamp=self.timestamps[i],
+                labels=dict(self.labels)
+            )
+            for i in indices
+        ]
+    
+    def points(self, since: Optional[float] = None) -> List[Tuple[float, float]]:
+        """按时间顺序返回 since 之后的 (时间戳, 值) 样本（调用方持有 lock）"""
+        if self.count < self.capacity:
+            indices = range(self.count)
+        else:
+            indices = list(range(self.head, self.capacity)) + list(range(self.head))
+        timestamps, values = self.timestamps, self.values
+        if since is None:
+            return [(timestamps[i], values[i]) for i in indices]
+        return [(timestamps[i], values[i]) for i in indices if timestamps[i] >= since]
+
+
+class _HistogramSeries(_Series):
+    """
+    直方图序列
+
+    最近 window 个观测值同时保存在环形窗口和有序数组中：新值二分插入，
+    被挤出的旧值二分删除，分位数直接按下标读取，无需每次排序。
+    """
+    
+    __slots__ = ("window", "window_head", "sorted_values", "total")
+    
+    def __init__(self, name: str, labels: Dict[str, str], capacity: int, window: int):
+        super().__init__(name, MetricType.HISTOGRAM, labels, capacity)
+        self.window = array("d", bytes(8 * max(1, window)))
+        self.window_head = 0
+        self.sorted_values = array("d")
+        self.total = 0.0
+    
+    def observe(self, value: float):
+        """加入一个观测值（调用方持有 lock）"""
+        if len(self.sorted_values) == len(self.window):
+            evicted = self.window[self.window_head]
+            del self.sorted_values[bisect.bisect_left(self.sorted_values, evicted)]
+            self.total -= evicted
+        self.window[self.window_head] = value
+        self.window_head = (self.window_head + 1) % len(self.window)
+        bisect.insort(self.sorted_values, value)
+        self.total += value
+        if self.window_head == 0:
+            # 每轮窗口重算一次总和，消除增减累积的浮点误差
+            self.total = math.fsum(self.sorted_values)
+
+
 class InMemoryMetricsCollector(IMetricsCollector):
-    """内存指标收集器"""
+    """
+    内存指标收集器
+
+    每个 (名称, 标签集) 对应一个预分配的环形缓冲区序列。标签集在首次出现时
+    规范化（排序）并驻留，之后相同的标签字典直接命中别名表，不再排序或格式化；
+    更新只持有该序列自己的锁，不同序列之间互不阻塞。
+
+    每个序列最多保留 max_metrics 个样本；同一名称最多 max_series_per_name 个
+    标签集，超出后的新标签集并入带 {"overflow": "true"} 标签的溢出序列，
+    因此内存不会随标签基数无限增长。
+    """
     
-    def __init__(self, max_metrics: int = 10000):
+    OVERFLOW_LABELS = (("overflow", "true"),)
+    
+    def __init__(self, max_metrics: int = 10000, histogram_window: int = 1000,
+                 max_series_per_name: int = 100):
         self.max_metrics = max_metrics
-        self._metrics: Dict[str, List[Metric]] = defaultdict(list)
-        self._counters: Dict[str, float] = defaultdict(float)
-        self._gauges: Dict[str, float] = {}
-        self._histograms: Dict[str, List[float]] = defaultdict(list)
+        self.histogram_window = histogram_window
+        self.max_series_per_name = max(1, max_series_per_name)
+        self.overflowed_writes = 0
+        # 每种类型: 规范键 -> 序列；别名表: (名称, 原始标签顺序) -> 序列
+        self._series: Dict[MetricType, Dict[tuple, _Series]] = {
+            MetricType.COUNTER: {},
+            MetricType.GAUGE: {},
+            MetricType.HISTOGRAM: {},
+        }
+        self._aliases: Dict[MetricType, Dict[tuple, _Series]] = {
+            metric_type: {} for metric_type in self._series
+        }
+        # 驻留的标签集，相同标签的序列共享同一个字典
+        self._label_sets: Dict[tuple, Dict[str, str]] = {}
+        self._by_name: Dict[str, List[_Series]] = defaultdict(list)
         self._lock = threading.RLock()
     
     def increment(self, 
@@ -38,61 +169,32 @@ class InMemoryMetricsCollector(IMetricsCollector):
                  value: float = 1.0, 
                  labels: Optional[Dict[str, str]] = None):
         """递增计数器"""
-        key = self._make_key(name, labels)
-        
-        with self._lock:
-            self._counters[key] += value
-            
-            metric = Metric(
-                name=name,
-                type=MetricType.COUNTER,
-                value=self._counters[key],
-                labels=labels or {}
-            )
-            
-            self._store_metric(name, metric)
+        series = self._get_series(MetricType.COUNTER, name, labels)
+        with series.lock:
+            series.value += value
+            series.has_value = True
+            series.append(series.value, time.time())
     
     def set_gauge(self, 
                  name: str, 
                  value: float, 
                  labels: Optional[Dict[str, str]] = None):
         """设置仪表值"""
-        key = self._make_key(name, labels)
-        
-        with self._lock:
-            self._gauges[key] = value
-            
-            metric = Metric(
-                name=name,
-                type=MetricType.GAUGE,
-                value=value,
-                labels=labels or {}
-            )
-            
-            self._store_metric(name, metric)
+        series = self._get_series(MetricType.GAUGE, name, labels)
+        with series.lock:
+            series.value = value
+            series.has_value = True
+            series.append(value, time.time())
     
     def record_histogram(self, 
                         name: str, 
                         value: float, 
                         labels: Optional[Dict[str, str]] = None):
         """记录直方图数据"""
-        key = self._make_key(name, labels)
-        
-        with self._lock:
-            self._histograms[key].append(value)
-            
-            # 限制历史数据大小
-            if len(self._histograms[key]) > 1000:
-                self._histograms[key] = self._histograms[key][-1000:]
-            
-            metric = Metric(
-                name=name,
-                type=MetricType.HISTOGRAM,
-                value=value,
-                labels=labels or {}
-            )
-            
-            self._store_metric(name, metric)
+        series = self._get_series(MetricType.HISTOGRAM, name, labels)
+        with series.lock:
+            series.observe(value)
+            series.append(value, time.time())
     
     def start_timer(self, 
                    name: str, 
@@ -104,64 +206,149 @@ class InMemoryMetricsCollector(IMetricsCollector):
                    name_pattern: Optional[str] = None) -> List[Metric]:
         """获取指标"""
         with self._lock:
-            all_metrics = []
-            
-            for metric_name, metrics in self._metrics.items():
-                if name_pattern is None or name_pattern in metric_name:
-                    all_metrics.extend(metrics[-100:])  # 返回最近100个指标
-            
-            return all_metrics
+            groups = [
+                list(series_list) for metric_name, series_list in self._by_name.items()
+                if name_pattern is None or name_pattern in metric_name
+            ]
+        
+        all_metrics = []
+        for series_list in groups:
+            metrics = []
+            for series in series_list:
+                with series.lock:
+                    metrics.extend(series.recent(100))
+            if len(series_list) > 1:
+                metrics.sort(key=lambda m: m.timestamp)
+            all_metrics.extend(metrics[-100:])  # 返回最近100个指标
+        
+        return all_metrics
     
     def get_counter_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
         """获取计数器值"""
-        key = self._make_key(name, labels)
-        with self._lock:
-            return self._counters.get(key, 0.0)
+        series = self._find_series(MetricType.COUNTER, name, labels)
+        return series.value if series is not None else 0.0
     
     def get_gauge_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[float]:
         """获取仪表值"""
-        key = self._make_key(name, labels)
-        with self._lock:
-            return self._gauges.get(key)
+        series = self._find_series(MetricType.GAUGE, name, labels)
+        if series is None or not series.has_value:
+            return None
+        return series.value
     
     def get_histogram_stats(self, name: str, labels: Optional[Dict[str, str]] = None) -> Dict[str, float]:
         """获取直方图统计"""
-        key = self._make_key(name, labels)
-        with self._lock:
-            values = self._histograms.get(key, [])
-            if not values:
-                return {}
-            
-            sorted_values = sorted(values)
+        series = self._find_series(MetricType.HISTOGRAM, name, labels)
+        if series is None:
+            return {}
+        
+        with series.lock:
+            sorted_values = series.sorted_values
             count = len(sorted_values)
+            if not count:
+                return {}
             
+            total = series.total
             return {
                 "count": count,
-                "sum": sum(sorted_values),
+                "sum": total,
                 "min": sorted_values[0],
                 "max": sorted_values[-1],
-                "avg": sum(sorted_values) / count,
+                "avg": total / count,
                 "p50": sorted_values[int(count * 0.5)],
                 "p90": sorted_values[int(count * 0.9)],
                 "p95": sorted_values[int(count * 0.95)],
                 "p99": sorted_values[int(count * 0.99)]
             }
     
-    def _make_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
-        """生成指标键"""
-        if not labels:
-            return name
-        
-        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
-        return f"{name}{{{label_str}}}"
-    
-    def _store_metric(self, name: str, metric: Metric):
-        """存储指标"""
-        self._metrics[name].append(metric)
+    def get_series(self,
+                   name: str,
+                   labels: Optional[Dict[str, str]] = None,
+                   since: Optional[float] = None) -> List[Tuple[float, float]]:
+        """
+        获取指标的历史样本
+
+        labels 为 None 时合并该名称下所有标签集的序列（按时间排序），
+        否则只返回对应标签集的序列。
+        """
+        if labels is not None:
+            candidates = [
+                series for series in (
+                    self._find_series(metric_type, name, labels) for metric_type in self._series
+                ) if series is not None
+            ]
+        else:
+            with self._lock:
+                candidates = list(self._by_name.get(name, ()))
+        
+        points = []
+        for series in candidates:
+            with series.lock:
+                points.extend(series.points(since))
+        if len(candidates) > 1:
+            points.sort()
+        return points
+    
+    def _alias_key(self, name: str, labels: Optional[Dict[str, str]]) -> Any:
+        """调用方给出的标签顺序即别名键，无标签时直接使用名称"""
+        return (name, *labels.items()) if labels else name
+    
+    def _find_series(self, metric_type: MetricType, name: str,
+                     labels: Optional[Dict[str, str]]) -> Optional[_Series]:
+        """查找已有序列，不存在时返回 None"""
+        series = self._aliases[metric_type].get(self._alias_key(name, labels))
+        if series is None and labels:
+            key = (name, *sorted(labels.items()))
+            series = self._series[metric_type].get(key)
+        return series
+    
+    def _get_series(self, metric_type: MetricType, name: str,
+                    labels: Optional[Dict[str, str]]) -> _Series:
+        """获取序列，首次出现时创建并驻留标签集"""
+        alias = self._alias_key(name, labels)
+        series = self._aliases[metric_type].get(alias)
+        if series is not None:
+            return series
         
-        # 限制指标数量
-        if len(self._metrics[name]) > self.max_metrics:
-            self._metrics[name] = self._metrics[name][-self.max_metrics:]
+        with self._lock:
+            label_items = tuple(sorted(labels.items())) if labels else ()
+            key = (name, *label_items)
+            table = self._series[metric_type]
+            series = table.get(key)
+            if series is None and len(self._by_name[name]) >= self.max_series_per_name:
+                # 标签基数超限：写入溢出序列，不缓存别名，避免别名表随基数增长
+                self.overflowed_writes += 1
+                return self._get_overflow_series(metric_type, name)
+            if series is None:
+                interned = self._label_sets.get(label_items)
+                if interned is None:
+                    interned = self._label_sets[label_items] = dict(label_items)
+                if metric_type == MetricType.HISTOGRAM:
+                    series = _HistogramSeries(name, interned, self.max_metrics, self.histogram_window)
+                else:
+                    series = _Series(name, metric_type, interned, self.max_metrics)
+                table[key] = series
+                self._by_name[name].append(series)
+            self._aliases[metric_type][alias] = series
+            return series
+    
+    def _get_overflow_series(self, metric_type: MetricType, name: str) -> _Series:
+        """获取名称的溢出序列（调用方持有 _lock）"""
+        key = (name, *self.OVERFLOW_LABELS)
+        table = self._series[metric_type]
+        series = table.get(key)
+        if series is None:
+            interned = self._label_sets.setdefault(self.OVERFLOW_LABELS, dict(self.OVERFLOW_LABELS))
+            if metric_type == MetricType.HISTOGRAM:
+                series = _HistogramSeries(name, interned, self.max_metrics, self.histogram_window)
+            else:
+                series = _Series(name, metric_type, interned, self.max_metrics)
+            table[key] = series
+            self._by_name[name].append(series)
+            logger.warning(
+                f"Metric {name} exceeded {self.max_series_per_name} label sets; "
+                f"further label sets are merged into {dict(self.OVERFLOW_LABELS)}"
+            )
+        return series
 
 
 class HealthCheckManager(IHealthChecker):
@@ -504,30 +691,28 @@ class SystemMetricsCollector:
     async def _collect_system_metrics(self):
         """收集系统指标"""
         try:
+            # 读取后台采样线程的快照，连接数等高开销项由其按较慢节奏更新
+            snapshot = get_system_sampler().snapshot()
+            
             # CPU指标
-            cpu_percent = psutil.cpu_percent(interval=None)
-            self.metrics.set_gauge(SystemMetrics.CPU_USAGE, cpu_percent)
+            self.metrics.set_gauge(SystemMetrics.CPU_USAGE, snapshot["cpu_percent"])
             
             # 内存指标
-            memory = psutil.virtual_memory()
-            self.metrics.set_gauge(SystemMetrics.MEMORY_USAGE, memory.percent)
-            self.metrics.set_gauge(SystemMetrics.MEMORY_AVAILABLE, memory.available / 1024 / 1024)  # MB
-            self.metrics.set_gauge(SystemMetrics.MEMORY_TOTAL, memory.total / 1024 / 1024)  # MB
+            self.metrics.set_gauge(SystemMetrics.MEMORY_USAGE, snapshot["memory_percent"])
+            self.metrics.set_gauge(SystemMetrics.MEMORY_AVAILABLE, snapshot["memory_available_mb"])  # MB
+            self.metrics.set_gauge(SystemMetrics.MEMORY_TOTAL, snapshot["memory_total_mb"])  # MB
             
             # 磁盘指标
-            disk = psutil.disk_usage('/')
-            disk_usage_percent = (disk.used / disk.total) * 100
-            self.metrics.set_gauge(SystemMetrics.DISK_USAGE, disk_usage_percent)
-            self.metrics.set_gauge(SystemMetrics.DISK_FREE, disk.free / 1024 / 1024 / 1024)  # GB
+            self.metrics.set_gauge(SystemMetrics.DISK_USAGE, snapshot["disk_percent"])
+            self.metrics.set_gauge(SystemMetrics.DISK_FREE, snapshot["disk_free_gb"])  # GB
             
             # 网络指标
-            net_io = psutil.net_io_counters()
-            self.metrics.set_gauge(SystemMetrics.NETWORK_IN, net_io.bytes_recv)
-            self.metrics.set_gauge(SystemMetrics.NETWORK_OUT, net_io.bytes_sent)
+            self.metrics.set_gauge(SystemMetrics.NETWORK_IN, snapshot["network_bytes_recv"])
+            self.metrics.set_gauge(SystemMetrics.NETWORK_OUT, snapshot["network_bytes_sent"])
             
             # 连接数
-            connections = len(psutil.net_connections())
-            self.metrics.set_gauge(SystemMetrics.NETWORK_CONNECTIONS, connections)
+            if snapshot["network_connections"] is not None:
+                self.metrics.set_gauge(SystemMetrics.NETWORK_CONNECTIONS, snapshot["network_connections"])
             
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
@@ -542,7 +727,8 @@ class SystemHealthChecks:
         """CPU使用率检查"""
         def check():
             try:
-                cpu_percent = psutil.cpu_percent(interval=1.0)
+                # 读取后台采样器的滚动值，不再阻塞 1 秒
+                cpu_percent = get_system_sampler().snapshot()["cpu_percent"]
                 
                 if cpu_percent > threshold:
                     return HealthCheck(
@@ -581,39 +767,40 @@ class SystemHealthChecks:
         """内存使用率检查"""
         def check():
             try:
-                memory = psutil.virtual_memory()
+                snapshot = get_system_sampler().snapshot()
+                memory_percent = snapshot["memory_percent"]
                 
-                if memory.percent > threshold:
+                if memory_percent > threshold:
                     return HealthCheck(
                         name="memory_usage",
                         status=HealthStatus.CRITICAL,
-                        message=f"High memory usage: {memory.percent:.1f}%",
+                        message=f"High memory usage: {memory_percent:.1f}%",
                         details={
-                            "memory_percent": memory.percent,
-                            "memory_used_gb": memory.used / 1024 / 1024 / 1024,
-                            "memory_total_gb": memory.total / 1024 / 1024 / 1024,
+                            "memory_percent": memory_percent,
+                            "memory_used_gb": snapshot["memory_used_mb"] / 1024,
+                            "memory_total_gb": snapshot["memory_total_mb"] / 1024,
                             "threshold": threshold
                         }
                     )
-                elif memory.percent > threshold * 0.8:
+                elif memory_percent > threshold * 0.8:
                     return HealthCheck(
                         name="memory_usage",
                         status=HealthStatus.WARNING,
-                        message=f"Elevated memory usage: {memory.percent:.1f}%",
+                        message=f"Elevated memory usage: {memory_percent:.1f}%",
                         details={
-                            "memory_percent": memory.percent,
-                            "memory_used_gb": memory.used / 1024 / 1024 / 1024,
-                            "memory_total_gb": memory.total / 1024 / 1024 / 1024
+                            "memory_percent": memory_percent,
+                            "memory_used_gb": snapshot["memory_used_mb"] / 1024,
+                            "memory_total_gb": snapshot["memory_total_mb"] / 1024
                         }
                     )
                 else:
                     return HealthCheck(
                         name="memory_usage",
                         status=HealthStatus.HEALTHY,
-                        message=f"Memory usage normal: {memory.percent:.1f}%",
+                        message=f"Memory usage normal: {memory_percent:.1f}%",
                         details={
-                            "memory_percent": memory.percent,
-                            "memory_available_gb": memory.available / 1024 / 1024 / 1024
+                            "memory_percent": memory_percent,
+                            "memory_available_gb": snapshot["memory_available_mb"] / 1024
                         }
                     )
             
@@ -680,4 +867,21 @@ class SystemHealthChecks:
                     details={"error": str(e), "path": path}
                 )
         
-        return check
\ No newline at end of file
+        return check
+
+# 全局指标收集器实例，应用初始化监控时注册自己的收集器
+_metrics_collector: Optional[InMemoryMetricsCollector] = None
+
+
+def get_metrics_collector() -> InMemoryMetricsCollector:
+    """获取全局指标收集器，尚未注册时创建默认实例"""
+    global _metrics_collector
+    if _metrics_collector is None:
+        _metrics_collector = InMemoryMetricsCollector()
+    return _metrics_collector
+
+
+def set_metrics_collector(collector: InMemoryMetricsCollector) -> None:
+    """注册应用的指标收集器，供服务器控制器等组件共享"""
+    global _metrics_collector
+    _metrics_collector = collector
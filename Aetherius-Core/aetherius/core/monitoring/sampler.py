@@ -0,0 +1,489 @@
+"""
+共享指标采样器
+
+SystemResourceSampler 在后台线程中滚动采集主机资源，读取方直接使用其快照；
+MetricsSampler 中每个指标族只由一个采样循环按订阅者要求的最短间隔采集，最新样本被缓存；
+订阅者按推送间隔分组，只收到自己关心的指标族中发生变化的字段。
+采样开销与订阅者数量无关。
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import psutil
+
+from ..stream_broadcast import OverflowPolicy, StreamBroadcaster
+
+logger = logging.getLogger(__name__)
+
+
+class SystemResourceSampler:
+    """
+    后台系统资源采样线程
+
+    快速项（CPU、内存、网络与磁盘 IO 速率）每 interval 秒采样一次；
+    磁盘空间、连接数和进程列表这类开销较大的调用各自按更慢的节奏采样。
+    每次采样生成新的快照字典并整体替换，读取方只取引用，耗时为微秒级，
+    不会阻塞事件循环。
+    """
+
+    def __init__(self,
+                 interval: float = 1.0,
+                 disk_interval: float = 10.0,
+                 slow_interval: float = 30.0,
+                 disk_path: str = '/',
+                 top_processes: int = 5):
+        """
+        Args:
+            interval: CPU/内存/网络采样间隔（秒）
+            disk_interval: 磁盘空间采样间隔（秒）
+            slow_interval: 连接数与进程列表采样间隔（秒）
+            disk_path: 统计磁盘空间的路径
+            top_processes: 快照中按内存排序保留的进程数
+        """
+        self.interval = interval
+        self.disk_interval = disk_interval
+        self.slow_interval = slow_interval
+        self.disk_path = disk_path
+        self.top_processes = top_processes
+        self._fast: dict[str, Any] = {}
+        self._disk: dict[str, Any] = {}
+        self._slow: dict[str, Any] = {
+            "network_connections": None,
+            "process_count": None,
+            "top_processes": [],
+        }
+        self._snapshot: dict[str, Any] = {}
+        self._last_counters: tuple[float, Any, Any] | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """启动采样线程；首个快照在返回前同步生成"""
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            # 预热 cpu_percent(interval=None) 的基准，随后的采样以间隔计算
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._sample_fast()
+            self._sample_disk()
+            self._publish()
+            self._thread = threading.Thread(
+                target=self._run, name="aetherius-system-sampler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """停止采样线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """最新快照（只读，勿修改）；采样线程未运行时会先启动"""
+        if not self.running:
+            self.start()
+        return self._snapshot
+
+    def _run(self):
+        now = time.monotonic()
+        disk_due = now + self.disk_interval
+        slow_due = now  # 连接数和进程列表在线程中首次采集
+        while not self._stop_event.wait(self.interval):
+            try:
+                now = time.monotonic()
+                self._sample_fast()
+                if now >= disk_due:
+                    self._sample_disk()
+                    disk_due = now + self.disk_interval
+                if now >= slow_due:
+                    self._sample_slow()
+                    slow_due = now + self.slow_interval
+                self._publish()
+            except Exception as e:
+                logger.error(f"Error sampling system resources: {e}")
+
+    def _publish(self):
+        self._snapshot = {**self._fast, **self._disk, **self._slow, "timestamp": time.time()}
+
+    def _sample_fast(self):
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        net_io = psutil.net_io_counters()
+        disk_io = psutil.disk_io_counters()
+        now = time.monotonic()
+
+        fast = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "cpu_per_core": psutil.cpu_percent(interval=None, percpu=True),
+            "cpu_count": psutil.cpu_count(),
+            "load_average": list(os.getloadavg()) if hasattr(os, "getloadavg") else None,
+            "memory_percent": memory.percent,
+            "memory_used_mb": memory.used / 1024 / 1024,
+            "memory_available_mb": memory.available / 1024 / 1024,
+            "memory_total_mb": memory.total / 1024 / 1024,
+            "swap_percent": swap.percent,
+            "network_bytes_sent": net_io.bytes_sent if net_io else 0,
+            "network_bytes_recv": net_io.bytes_recv if net_io else 0,
+            "network_sent_per_sec": 0.0,
+            "network_recv_per_sec": 0.0,
+            "disk_read_per_sec": 0.0,
+            "disk_write_per_sec": 0.0,
+        }
+
+        # 与上一次计数器的差值换算为每秒速率
+        if self._last_counters is not None:
+            last_time, last_net, last_disk = self._last_counters
+            elapsed = now - last_time
+            if elapsed > 0:
+                if net_io and last_net:
+                    fast["network_sent_per_sec"] = max(0, net_io.bytes_sent - last_net.bytes_sent) / elapsed
+                    fast["network_recv_per_sec"] = max(0, net_io.bytes_recv - last_net.bytes_recv) / elapsed
+                if disk_io and last_disk:
+                    fast["disk_read_per_sec"] = max(0, disk_io.read_bytes - last_disk.read_bytes) / elapsed
+                    fast["disk_write_per_sec"] = max(0, disk_io.write_bytes - last_disk.write_bytes) / elapsed
+        self._last_counters = (now, net_io, disk_io)
+        self._fast = fast
+
+    def _sample_disk(self):
+        disk = psutil.disk_usage(self.disk_path)
+        self._disk = {
+            "disk_path": self.disk_path,
+            "disk_percent": (disk.used / disk.total) * 100 if disk.total else 0.0,
+            "disk_free_gb": disk.free / 1024 / 1024 / 1024,
+            "disk_total_gb": disk.total / 1024 / 1024 / 1024,
+        }
+
+    def _sample_slow(self):
+        try:
+            connections = len(psutil.net_connections())
+        except (psutil.AccessDenied, OSError):
+            connections = None
+
+        processes = []
+        for process in psutil.process_iter(["pid", "name", "memory_info"]):
+            info = process.info
+            memory_info = info.get("memory_info")
+            processes.append((memory_info.rss if memory_info else 0, info["pid"], info.get("name")))
+        top = heapq.nlargest(self.top_processes, processes)
+
+        self._slow = {
+            "network_connections": connections,
+            "process_count": len(processes),
+            "top_processes": [
+                {"pid": pid, "name": name, "memory_mb": rss / 1024 / 1024}
+                for rss, pid, name in top
+            ],
+        }
+
+
+# 全局系统资源采样器
+_system_sampler: SystemResourceSampler | None = None
+
+
+def get_system_sampler() -> SystemResourceSampler:
+    """获取全局系统资源采样器（首次读取快照时启动）"""
+    global _system_sampler
+    if _system_sampler is None:
+        _system_sampler = SystemResourceSampler()
+    return _system_sampler
+
+
+_SYSTEM_FAMILY_FIELDS = (
+    "cpu_percent", "memory_percent", "memory_used_mb", "memory_total_mb",
+    "disk_percent", "disk_free_gb", "network_bytes_sent", "network_bytes_recv",
+    "network_sent_per_sec", "network_recv_per_sec", "network_connections",
+)
+
+
+def sample_system_metrics() -> dict[str, Any]:
+    """从后台采样器的快照中读取主机指标"""
+    snapshot = get_system_sampler().snapshot()
+    return {key: snapshot.get(key) for key in _SYSTEM_FAMILY_FIELDS}
+
+
+@dataclass
+class MetricFamily:
+    """指标族定义"""
+    name: str
+    sample: Callable[[], Any]           # 返回扁平字典，可以是协程函数
+    in_thread: bool = False             # 同步采样函数是否放到线程中执行
+    samples: int = 0
+    errors: int = 0
+    last_duration: float = 0.0
+
+
+@dataclass
+class SamplerSubscription:
+    """订阅句柄"""
+    callback: Callable
+    families: set[str] | None        # None 表示全部指标族
+    interval: float
+    deltas: bool = True
+    # 每个指标族上次推送给该订阅者的值，用于计算增量
+    sent: dict[str, dict[str, Any]] = field(default_factory=dict)
+    broadcaster: StreamBroadcaster | None = None
+
+    def wants(self, family: str) -> bool:
+        return self.families is None or family in self.families
+
+
+class MetricsSampler:
+    """共享指标采样服务"""
+
+    def __init__(self, min_interval: float = 0.5):
+        """
+        Args:
+            min_interval: 允许的最短采样/推送间隔（秒）
+        """
+        self.min_interval = min_interval
+        self._families: dict[str, MetricFamily] = {}
+        self._subscriptions: list[SamplerSubscription] = []
+        self._latest: dict[str, tuple[dict[str, Any], float]] = {}
+        # 下次到期时间: 指标族采样 / 推送间隔组
+        self._family_due: dict[str, float] = {}
+        self._group_due: dict[float, float] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._pushes = 0
+
+    def register_family(self,
+                        name: str,
+                        sample: Callable[[], Any],
+                        in_thread: bool = False):
+        """注册指标族"""
+        self._families[name] = MetricFamily(name=name, sample=sample, in_thread=in_thread)
+        self._family_due.pop(name, None)
+        self._notify()
+
+    def unregister_family(self, name: str):
+        """注销指标族"""
+        self._families.pop(name, None)
+        self._latest.pop(name, None)
+        self._family_due.pop(name, None)
+
+    def subscribe(self,
+                  callback: Callable,
+                  families: Iterable[str] | None = None,
+                  interval: float = 5.0,
+                  deltas: bool = True) -> SamplerSubscription:
+        """
+        订阅指标推送
+
+        Args:
+            callback: 接收推送的回调（同步或异步），参数为
+                {"timestamp", "full", "families": {指标族: {字段: 值}}}
+            families: 关心的指标族，None 表示全部
+            interval: 推送间隔（秒），也是这些指标族的最长采样间隔
+            deltas: 首次推送完整样本后只推送变化的字段
+
+        Returns:
+            订阅句柄，传给 unsubscribe() 取消
+        """
+        subscription = SamplerSubscription(
+            callback=callback,
+            families=set(families) if families is not None else None,
+            interval=max(self.min_interval, interval),
+            deltas=deltas,
+            # 慢订阅者只丢弃旧的推送，不会拖慢采样循环
+            broadcaster=StreamBroadcaster(policy=OverflowPolicy.DROP_OLDEST, max_queue=8),
+        )
+        subscription.broadcaster.subscribe(callback)
+        self._subscriptions.append(subscription)
+        self._ensure_running()
+        self._notify()
+        return subscription
+
+    def unsubscribe(self, subscription: SamplerSubscription):
+        """取消订阅"""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            subscription.broadcaster.close()
+            self._notify()
+
+    def latest(self, family: str) -> tuple[dict[str, Any], float] | None:
+        """获取指标族的缓存样本及其采样时间（time.time()），未采样时返回 None"""
+        return self._latest.get(family)
+
+    async def sample_now(self, family: str) -> dict[str, Any]:
+        """立即采集一次指标族并更新缓存"""
+        await self._sample(self._families[family])
+        return self._latest[family][0]
+
+    def family_intervals(self) -> dict[str, float]:
+        """每个指标族当前的采样间隔（所有订阅者要求的最小值）"""
+        intervals: dict[str, float] = {}
+        for subscription in self._subscriptions:
+            for name in self._families:
+                if subscription.wants(name):
+                    current = intervals.get(name)
+                    if current is None or subscription.interval < current:
+                        intervals[name] = subscription.interval
+        return intervals
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # 没有事件循环时，在下次 start() 时启动
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        """启动采样循环（subscribe() 在事件循环中调用时会自动启动）"""
+        self._ensure_running()
+
+    async def stop(self):
+        """停止采样循环并关闭所有推送队列"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in self._subscriptions:
+            subscription.broadcaster.close()
+
+    async def _run(self):
+        """采样与推送循环"""
+        while True:
+            try:
+                self._wakeup.clear()
+                now = time.monotonic()
+                intervals = self.family_intervals()
+                groups = {s.interval for s in self._subscriptions}
+
+                # 清理不再需要的调度项，新出现的立即到期
+                for name in list(self._family_due):
+                    if name not in intervals:
+                        del self._family_due[name]
+                for interval in list(self._group_due):
+                    if interval not in groups:
+                        del self._group_due[interval]
+
+                due_families = [
+                    name for name in intervals
+                    if self._family_due.get(name, now) <= now
+                ]
+                for name in due_families:
+                    await self._sample(self._families[name])
+                    self._family_due[name] = now + intervals[name]
+
+                due_groups = [
+                    interval for interval in groups
+                    if self._group_due.get(interval, now) <= now
+                ]
+                for interval in due_groups:
+                    self._push(interval)
+                    self._group_due[interval] = now + interval
+
+                deadlines = list(self._family_due.values()) + list(self._group_due.values())
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in metrics sampler loop: {e}")
+                await asyncio.sleep(self.min_interval)
+
+    async def _sample(self, family: MetricFamily):
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(family.sample):
+                values = await family.sample()
+            elif family.in_thread:
+                values = await asyncio.to_thread(family.sample)
+            else:
+                values = family.sample()
+            self._latest[family.name] = (values or {}, time.time())
+            family.samples += 1
+        except Exception as e:
+            family.errors += 1
+            logger.error(f"Error sampling metric family {family.name}: {e}")
+        family.last_duration = time.perf_counter() - start
+
+    def _push(self, interval: float):
+        """向同一间隔组的订阅者推送各自关心的增量"""
+        for subscription in self._subscriptions:
+            if subscription.interval != interval:
+                continue
+
+            full = not subscription.sent
+            payload: dict[str, dict[str, Any]] = {}
+            for name, (values, _) in self._latest.items():
+                if not subscription.wants(name):
+                    continue
+                previous = subscription.sent.get(name)
+                if subscription.deltas and previous is not None:
+                    changed = {k: v for k, v in values.items() if previous.get(k) != v}
+                else:
+                    changed = dict(values)
+                if changed:
+                    payload[name] = changed
+                    subscription.sent[name] = values
+
+            if payload:
+                subscription.broadcaster.publish({
+                    "timestamp": time.time(),
+                    "full": full or not subscription.deltas,
+                    "families": payload,
+                })
+                self._pushes += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """采样器统计"""
+        intervals = self.family_intervals()
+        groups: dict[float, int] = {}
+        for subscription in self._subscriptions:
+            groups[subscription.interval] = groups.get(subscription.interval, 0) + 1
+        return {
+            "subscriptions": len(self._subscriptions),
+            "interval_groups": {str(k): v for k, v in sorted(groups.items())},
+            "pushes": self._pushes,
+            "families": {
+                name: {
+                    "interval": intervals.get(name),
+                    "samples": family.samples,
+                    "errors": family.errors,
+                    "last_duration": family.last_duration,
+                }
+                for name, family in self._families.items()
+            },
+        }
+
+
+# 全局采样器实例
+_metrics_sampler: MetricsSampler | None = None
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """获取全局指标采样器，默认注册 system 指标族"""
+    global _metrics_sampler
+    if _metrics_sampler is None:
+        _metrics_sampler = MetricsSampler()
+        _metrics_sampler.register_family("system", sample_system_metrics)
+    return _metrics_sampler
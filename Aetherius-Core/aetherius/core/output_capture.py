@@ -1,9 +1,13 @@
 """Output capture system for command feedback."""
 
+import asyncio
 import logging
 import re
 import time
-from dataclasses import dataclass
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from re import Pattern
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -32,11 +36,36 @@ class CommandOutput:
         return time.time() - self.start_time > max_age_seconds
 
 
+@dataclass
+class PendingCommand:
+    """A command awaiting its response lines."""
+
+    output: CommandOutput
+    base_command: str
+    future: asyncio.Future
+    idle_gap: float
+    known: bool
+    window_end: float  # loop time after which unknown commands take no new lines
+    idle_handle: Optional[asyncio.TimerHandle] = field(default=None, repr=False)
+
+
 class OutputCapture:
     """Captures server output for specific commands."""
 
-    def __init__(self):
+    def __init__(self, idle_gap: float = 0.25, response_window: float = 1.0):
+        """
+        Initialize the output capture.
+
+        Args:
+            idle_gap: Seconds without new output after which a command that
+                has no known response signature is considered finished
+            response_window: Seconds after a command with no known response
+                signature is registered during which unmatched output lines
+                are attributed to it; later lines are left alone
+        """
         self.active_captures: dict[str, CommandOutput] = {}
+        self.idle_gap = idle_gap
+        self.response_window = response_window
         self.command_patterns = {
             # Basic commands that typically produce immediate output
             "list": [
@@ -63,9 +92,22 @@ class OutputCapture:
                 r"Player .+ not found",
                 r"Invalid game mode",
             ],
-            "time": [r"Set the time to", r"Added \d+ to the time"],
-            "weather": [r"Set the weather to", r"Weather set to"],
-            "difficulty": [r"Set the difficulty to", r"Difficulty set to"],
+            "time": [r"Set the time to", r"Added \d+ to the time", r"The time is"],
+            "weather": [r"Set the weather to", r"Weather set to", r"Changing to"],
+            "difficulty": [
+                r"Set the difficulty to",
+                r"Difficulty set to",
+                r"The difficulty is",
+            ],
+            "save-all": [r"Saved the game"],
+            "save-off": [
+                r"Automatic saving is now disabled",
+                r"Saving is already turned off",
+            ],
+            "save-on": [
+                r"Automatic saving is now enabled",
+                r"Saving is already turned on",
+            ],
         }
 
         # Generic patterns that might apply to any command
@@ -78,6 +120,24 @@ class OutputCapture:
             r"Usage:",
         ]
 
+        self._compiled_patterns: dict[str, list[Pattern]] = {}
+        self._compiled_generic: list[Pattern] = []
+        self.compile_patterns()
+
+        # Commands awaiting a response, oldest first per base command
+        self._pending: dict[str, deque[PendingCommand]] = {}
+        self._pending_order: deque[PendingCommand] = deque()
+
+    def compile_patterns(self) -> None:
+        """Compile command_patterns and generic_patterns; call after editing them."""
+        self._compiled_patterns = {
+            command: [re.compile(p, re.IGNORECASE) for p in patterns]
+            for command, patterns in self.command_patterns.items()
+        }
+        self._compiled_generic = [
+            re.compile(p, re.IGNORECASE) for p in self.generic_patterns
+        ]
+
     def start_capture(self, command_id: str, command: str) -> None:
         """Start capturing output for a command."""
         # Clean up expired captures
@@ -92,9 +152,96 @@ class OutputCapture:
             f"Started output capture for command: {command} (ID: {command_id})"
         )
 
+    def expect(
+        self,
+        command: str,
+        command_id: Optional[str] = None,
+        idle_gap: Optional[float] = None,
+    ) -> PendingCommand:
+        """
+        Register a command whose response should be awaited.
+
+        Call this before the command is written to the server so that no
+        response line can slip past. Commands with a known response signature
+        complete as soon as a matching line arrives; concurrent commands of
+        the same kind are matched in the order they were registered. Other
+        commands take unmatched lines arriving within `response_window`
+        seconds and complete after `idle_gap` seconds without new output.
+
+        Args:
+            command: The command about to be sent
+            command_id: Optional ID for the capture
+            idle_gap: Override for the idle gap of unknown commands
+
+        Returns:
+            PendingCommand: Handle to pass to wait() or cancel()
+        """
+        base_command = command.split()[0].lower().lstrip("/") if command.strip() else ""
+        loop = asyncio.get_running_loop()
+        pending = PendingCommand(
+            output=CommandOutput(
+                command_id=command_id or str(uuid.uuid4()),
+                command=command,
+                lines=[],
+                start_time=time.time(),
+            ),
+            base_command=base_command,
+            future=loop.create_future(),
+            idle_gap=self.idle_gap if idle_gap is None else idle_gap,
+            known=base_command in self._compiled_patterns,
+            window_end=loop.time() + self.response_window,
+        )
+
+        self._pending.setdefault(base_command, deque()).append(pending)
+        self._pending_order.append(pending)
+        if not pending.known:
+            self._arm_idle_timer(pending)
+        return pending
+
+    async def wait(
+        self, pending: PendingCommand, timeout: float = 5.0
+    ) -> Optional[str]:
+        """
+        Wait for a registered command's output.
+
+        Args:
+            pending: Handle returned by expect()
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Captured output, or None if nothing relevant was captured or the
+            command was cancelled
+        """
+        try:
+            if pending.future.cancelled():
+                return None
+            return await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+        except asyncio.TimeoutError:
+            # Return whatever was captured so far
+            self._complete(pending)
+            if pending.future.cancelled():
+                return None
+            return pending.future.result()
+        except asyncio.CancelledError:
+            # cancel() from elsewhere ends the wait; our own cancellation propagates
+            if pending.future.cancelled() and not asyncio.current_task().cancelling():
+                return None
+            raise
+        finally:
+            self._discard(pending)
+
+    def cancel(self, pending: PendingCommand) -> None:
+        """Stop waiting for a registered command, e.g. when sending failed."""
+        if pending.idle_handle is not None:
+            pending.idle_handle.cancel()
+            pending.idle_handle = None
+        self._discard(pending)
+        if not pending.future.done():
+            pending.future.cancel()
+
     def process_line(self, line: str) -> None:
         """Process a server output line and match it to active captures."""
-        if not self.active_captures:
+        if not self.active_captures and not self._pending_order:
             return
 
         # Remove color codes and formatting
@@ -108,6 +255,68 @@ class OutputCapture:
                     f"Captured line for command {capture.command}: {clean_line}"
                 )
 
+        if self._pending_order:
+            self._match_pending(clean_line)
+
+    def _match_pending(self, line: str) -> None:
+        """Attribute a line to the oldest pending command it belongs to."""
+        # A response signature completes the oldest command of that kind
+        for base_command, queue in self._pending.items():
+            patterns = self._compiled_patterns.get(base_command)
+            if queue and patterns and any(p.search(line) for p in patterns):
+                pending = queue[0]
+                pending.output.add_line(line)
+                self._complete(pending)
+                return
+
+        # Generic errors complete the oldest command of any kind
+        if any(p.search(line) for p in self._compiled_generic):
+            pending = self._pending_order[0]
+            pending.output.add_line(line)
+            self._complete(pending)
+            return
+
+        # Unknown commands take other output shortly after they were sent,
+        # until they go idle; unrelated server output later on is left alone
+        now = asyncio.get_running_loop().time()
+        for pending in self._pending_order:
+            if not pending.known and now <= pending.window_end:
+                pending.output.add_line(line)
+                self._arm_idle_timer(pending)
+                return
+
+    def _arm_idle_timer(self, pending: PendingCommand) -> None:
+        if pending.idle_handle is not None:
+            pending.idle_handle.cancel()
+        pending.idle_handle = asyncio.get_running_loop().call_later(
+            pending.idle_gap, self._complete, pending
+        )
+
+    def _complete(self, pending: PendingCommand) -> None:
+        """Resolve a pending command with the lines captured so far."""
+        if pending.idle_handle is not None:
+            pending.idle_handle.cancel()
+            pending.idle_handle = None
+        self._discard(pending)
+        if not pending.future.done():
+            pending.output.end_time = time.time()
+            output = pending.output.get_output()
+            pending.future.set_result(output if output.strip() else None)
+
+    def _discard(self, pending: PendingCommand) -> None:
+        queue = self._pending.get(pending.base_command)
+        if queue is not None:
+            try:
+                queue.remove(pending)
+            except ValueError:
+                pass
+            if not queue:
+                del self._pending[pending.base_command]
+        try:
+            self._pending_order.remove(pending)
+        except ValueError:
+            pass
+
     def finish_capture(self, command_id: str) -> Optional[str]:
         """Finish capturing and return the captured output."""
         if command_id not in self.active_captures:
@@ -141,7 +350,7 @@ class OutputCapture:
         # Remove server thread indicators
         line = re.sub(r"\[Server thread/[^\]]+\]", "", line)
 
-        return line.strip()
+        return line.strip().lstrip(": ")
 
     def _is_line_relevant(self, command: str, line: str) -> bool:
         """Check if a line is relevant to a specific command."""
@@ -149,14 +358,14 @@ class OutputCapture:
         base_command = command.split()[0].lower()
 
         # Check command-specific patterns
-        if base_command in self.command_patterns:
-            for pattern in self.command_patterns[base_command]:
-                if re.search(pattern, line, re.IGNORECASE):
+        if base_command in self._compiled_patterns:
+            for pattern in self._compiled_patterns[base_command]:
+                if pattern.search(line):
                     return True
 
         # Check generic error patterns
-        for pattern in self.generic_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+        for pattern in self._compiled_generic:
+            if pattern.search(line):
                 return True
 
         # For 'list' command, also capture player names
@@ -11,29 +11,179 @@ import logging
 import os
 import signal
 import socket
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from .output_capture import OutputCapture
 
 logger = logging.getLogger(__name__)
 
+
+class ConsoleClientConnection:
+    """
+    已连接客户端的发送端
+
+    每个客户端拥有独立的有界发送队列和写入任务，慢客户端只会拖慢自己，
+    不会阻塞日志广播或其他客户端。队列满时按策略处理：
+    - "skip": 丢弃最旧的日志并向客户端发送滞后通知
+    - "disconnect": 断开该客户端
+    命令响应走独立队列，不会被丢弃。
+    """
+
+    def __init__(
+        self,
+        writer: asyncio.StreamWriter,
+        max_queue: int = 1000,
+        policy: str = "skip",
+        stall_timeout: float = 30.0,
+    ):
+        self.writer = writer
+        self.max_queue = max(1, max_queue)
+        self.policy = policy
+        self.stall_timeout = stall_timeout
+        self.connected_at = time.time()
+
+        self._logs: deque[bytes] = deque()
+        self._responses: deque[bytes] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.disconnected_as_slow = False
+
+        # 统计
+        self.sent = 0
+        self.dropped = 0
+        self.lag_notices = 0
+        self.peak_queue = 0
+        self._dropped_since_notice = 0
+
+    def start(self) -> None:
+        """启动写入任务"""
+        self._task = asyncio.create_task(self._write_loop())
+
+    def send_log(self, data: bytes) -> bool:
+        """排队一条日志消息，返回客户端是否仍然连接"""
+        if self.closed:
+            return False
+
+        if len(self._logs) >= self.max_queue:
+            if self.policy == "disconnect":
+                logger.warning("客户端发送队列已满，断开慢客户端")
+                self.disconnected_as_slow = True
+                self.close()
+                return False
+            self._logs.popleft()
+            self.dropped += 1
+            self._dropped_since_notice += 1
+
+        self._logs.append(data)
+        if len(self._logs) > self.peak_queue:
+            self.peak_queue = len(self._logs)
+        self._wakeup.set()
+        return True
+
+    def send_response(self, data: bytes) -> None:
+        """排队一条命令响应（不受队列上限影响）"""
+        if self.closed:
+            return
+        self._responses.append(data)
+        self._wakeup.set()
+
+    async def _write_loop(self) -> None:
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while not self.closed and (self._responses or self._logs):
+                    if self._responses:
+                        data = self._responses.popleft()
+                    elif self._dropped_since_notice:
+                        data = self._lag_notice()
+                    else:
+                        data = self._logs.popleft()
+
+                    self.writer.write(data)
+                    await asyncio.wait_for(self.writer.drain(), self.stall_timeout)
+                    self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning(f"客户端 {self.stall_timeout}s 内未接收数据，断开连接")
+            self.disconnected_as_slow = True
+            self.close()
+        except Exception:
+            self.close()
+
+    def _lag_notice(self) -> bytes:
+        """生成滞后通知，告知客户端跳过了多少条日志"""
+        message = {
+            "type": "lag",
+            "dropped": self._dropped_since_notice,
+            "timestamp": asyncio.get_event_loop().time(),
+        }
+        self._dropped_since_notice = 0
+        self.lag_notices += 1
+        return (json.dumps(message) + "\n").encode()
+
+    def close(self) -> None:
+        """关闭连接并停止写入任务"""
+        if self.closed:
+            return
+        self.closed = True
+        self._wakeup.set()
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取客户端发送统计"""
+        return {
+            "connected_seconds": time.time() - self.connected_at,
+            "queued": len(self._logs),
+            "peak_queue": self.peak_queue,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "lag_notices": self.lag_notices,
+        }
+
 class PersistentConsoleDaemon:
     """持久化控制台守护进程 - 作为服务器的父进程"""
 
-    def __init__(self, server_jar_path: str, server_dir: str):
+    def __init__(
+        self,
+        server_jar_path: str,
+        server_dir: str,
+        client_queue_size: int = 1000,
+        slow_client_policy: str = "skip",
+    ):
         self.server_jar_path = server_jar_path
         self.server_dir = Path(server_dir)
 
         # Unix socket服务器
         self.socket_path = str(Path("data/console/console.sock").absolute())
         self.server_socket: Optional[socket.socket] = None
-        self.clients = []
+        self.clients: list[ConsoleClientConnection] = []
+
+        # 慢客户端处理：每个客户端的队列上限及策略（"skip" 或 "disconnect"）
+        if slow_client_policy not in ("skip", "disconnect"):
+            raise ValueError(f"Unknown slow client policy: {slow_client_policy!r}")
+        if client_queue_size < 1:
+            raise ValueError("client_queue_size must be at least 1")
+        self.client_queue_size = client_queue_size
+        self.slow_client_policy = slow_client_policy
+        self.disconnected_slow_clients = 0
 
         # 服务器进程管理
         self.server_process: Optional[asyncio.subprocess.Process] = None
 
-        # 命令响应缓存
-        self.command_responses: dict[str, str] = {}
-        self.recent_commands: dict[str, float] = {}
+        # 命令响应捕获
+        self.output_capture = OutputCapture()
 
         # 监控任务
         self.stdout_monitor_task: Optional[asyncio.Task] = None
@@ -162,12 +312,12 @@ class PersistentConsoleDaemon:
                 if line_str:
                     logger.info(f"服务器输出: {line_str}")
 
+                    # 检查命令响应
+                    self.output_capture.process_line(line_str)
+
                     # 广播给所有客户端
                     await self._broadcast_log(line_str)
 
-                    # 检查命令响应
-                    await self._check_command_response(line_str)
-
         except Exception as e:
             logger.error(f"监控stdout时出错: {e}")
 
@@ -192,52 +342,6 @@ class PersistentConsoleDaemon:
         except Exception as e:
             logger.error(f"监控stderr时出错: {e}")
 
-    async def _check_command_response(self, line: str) -> None:
-        """检查是否是命令响应"""
-        current_time = asyncio.get_event_loop().time()
-
-        # 检查最近发送的命令
-        for command, send_time in list(self.recent_commands.items()):
-            # 只匹配最近10秒内发送的命令
-            if current_time - send_time > 10.0:
-                del self.recent_commands[command]
-                continue
-
-            # 检查是否匹配命令输出
-            if self._is_command_response(command, line):
-                self.command_responses[command] = line
-                logger.info(f"匹配到命令 '{command}' 的响应: {line}")
-                break
-
-    def _is_command_response(self, command: str, line: str) -> bool:
-        """检查日志行是否是指定命令的响应"""
-        command_lower = command.lower().strip()
-        line_lower = line.lower()
-
-        # 常见命令的响应模式
-        patterns = {
-            "list": ["players online", "there are"],
-            "time": ["the time is"],
-            "difficulty": ["difficulty"],
-            "weather": ["weather", "changing"],
-            "help": ["help", "available commands"],
-            "stop": ["stopping", "server"],
-        }
-
-        for cmd_pattern, response_patterns in patterns.items():
-            if cmd_pattern in command_lower:
-                for pattern in response_patterns:
-                    if pattern in line_lower:
-                        return True
-
-        # 检查错误响应
-        error_patterns = ["unknown command", "incorrect", "cannot", "failed", "error"]
-        for pattern in error_patterns:
-            if pattern in line_lower:
-                return True
-
-        return False
-
     async def _accept_clients(self) -> None:
         """接受客户端连接"""
         logger.info("开始接受客户端连接...")
@@ -253,20 +357,28 @@ class PersistentConsoleDaemon:
                 reader, writer = await asyncio.open_connection(sock=client_socket)
 
                 # 添加到客户端列表
-                self.clients.append(writer)
+                client = ConsoleClientConnection(
+                    writer,
+                    max_queue=self.client_queue_size,
+                    policy=self.slow_client_policy,
+                )
+                client.start()
+                self.clients.append(client)
 
                 # 处理客户端
-                asyncio.create_task(self._handle_client(reader, writer))
+                asyncio.create_task(self._handle_client(reader, client))
 
                 logger.info(f"客户端已连接，当前连接数: {len(self.clients)}")
 
         except Exception as e:
             logger.error(f"接受客户端连接时出错: {e}")
 
-    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, client: ConsoleClientConnection
+    ) -> None:
         """处理单个客户端"""
         try:
-            while True:
+            while not client.closed:
                 # 读取客户端消息
                 data = await reader.readline()
                 if not data:
@@ -287,8 +399,7 @@ class PersistentConsoleDaemon:
 
                         # 发送响应
                         response_data = json.dumps(response) + '\n'
-                        writer.write(response_data.encode())
-                        await writer.drain()
+                        client.send_response(response_data.encode())
 
                 except json.JSONDecodeError:
                     logger.error(f"无法解析客户端消息: {data}")
@@ -299,13 +410,9 @@ class PersistentConsoleDaemon:
             logger.error(f"处理客户端时出错: {e}")
         finally:
             # 移除客户端
-            if writer in self.clients:
-                self.clients.remove(writer)
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+            if client in self.clients:
+                self.clients.remove(client)
+            client.close()
 
     async def _execute_command(self, command: str) -> dict:
         """执行命令 - 支持Minecraft命令和组件指令"""
@@ -327,10 +434,10 @@ class PersistentConsoleDaemon:
                 "output": ""
             }
 
-        try:
-            # 记录命令发送时间
-            self.recent_commands[command] = asyncio.get_event_loop().time()
+        # 先登记再发送，避免响应行先于登记到达
+        pending = self.output_capture.expect(command)
 
+        try:
             # 发送命令到服务器stdin
             command_line = f"{command.strip()}\n"
             self.server_process.stdin.write(command_line.encode())
@@ -338,16 +445,17 @@ class PersistentConsoleDaemon:
 
             logger.info(f"通过stdin发送命令: {command}")
 
-            # 等待响应
-            response = await self._wait_for_response(command, timeout=5.0)
+            # 等待响应：匹配到响应行即返回，未知命令在输出空闲后返回
+            response = await self.output_capture.wait(pending, timeout=5.0)
 
             return {
                 "success": True,
                 "error": None,
-                "output": response
+                "output": response or f"命令 '{command}' 已发送（未捕获到响应）"
             }
 
         except Exception as e:
+            self.output_capture.cancel(pending)
             logger.error(f"执行命令失败: {e}")
             return {
                 "success": False,
@@ -355,26 +463,6 @@ class PersistentConsoleDaemon:
                 "output": ""
             }
 
-    async def _wait_for_response(self, command: str, timeout: float = 5.0) -> str:
-        """等待命令响应"""
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            if command in self.command_responses:
-                response = self.command_responses[command]
-                del self.command_responses[command]
-                if command in self.recent_commands:
-                    del self.recent_commands[command]
-                return response
-
-            await asyncio.sleep(0.1)
-
-        # 超时清理
-        if command in self.recent_commands:
-            del self.recent_commands[command]
-
-        return f"命令 '{command}' 已发送（未捕获到响应）"
-
     async def _broadcast_log(self, line: str, is_error: bool = False) -> None:
         """向所有客户端广播日志"""
         if not self.clients:
@@ -387,21 +475,15 @@ class PersistentConsoleDaemon:
             "timestamp": asyncio.get_event_loop().time()
         }
 
-        message_data = json.dumps(message) + '\n'
+        message_data = (json.dumps(message) + '\n').encode()
 
-        # 移除已断开的客户端
+        # 只入队不等待，慢客户端由各自的写入任务处理
         active_clients = []
         for client in self.clients:
-            try:
-                client.write(message_data.encode())
-                await client.drain()
+            if client.send_log(message_data):
                 active_clients.append(client)
-            except Exception:
-                try:
-                    client.close()
-                    await client.wait_closed()
-                except Exception:
-                    pass
+            elif client.disconnected_as_slow:
+                self.disconnected_slow_clients += 1
 
         self.clients = active_clients
 
@@ -436,11 +518,7 @@ class PersistentConsoleDaemon:
 
         # 关闭所有客户端
         for client in self.clients:
-            try:
-                client.close()
-                await client.wait_closed()
-            except Exception:
-                pass
+            client.close()
 
         # 关闭socket
         if self.server_socket:
@@ -1173,6 +1251,20 @@ class PersistentConsoleDaemon:
             total_memory_gb = memory.total / 1024 / 1024 / 1024
             output_lines.append(f"  系统总内存: {total_memory_gb:.1f} GB")
 
+            # 客户端发送队列
+            output_lines.append(
+                f"  客户端: {len(self.clients)} 个 "
+                f"(策略: {self.slow_client_policy}, 队列上限: {self.client_queue_size}, "
+                f"已断开慢客户端: {self.disconnected_slow_clients})"
+            )
+            for index, client in enumerate(self.clients, 1):
+                stats = client.get_stats()
+                output_lines.append(
+                    f"    #{index}: 排队 {stats['queued']} (峰值 {stats['peak_queue']}), "
+                    f"已发送 {stats['sent']}, 丢弃 {stats['dropped']}, "
+                    f"滞后通知 {stats['lag_notices']}"
+                )
+
             return {
                 "success": True,
                 "error": None,
@@ -1224,7 +1316,12 @@ class PersistentConsoleDaemon:
             }
 
 
-async def start_persistent_console(server_jar_path: str, server_dir: str) -> None:
+async def start_persistent_console(
+    server_jar_path: str,
+    server_dir: str,
+    client_queue_size: int = 1000,
+    slow_client_policy: str = "skip",
+) -> None:
     """启动持久化控制台守护进程"""
     # 配置日志
     logging.basicConfig(
@@ -1233,7 +1330,12 @@ async def start_persistent_console(server_jar_path: str, server_dir: str) -> Non
     )
 
     # 创建并启动守护进程
-    daemon = PersistentConsoleDaemon(server_jar_path, server_dir)
+    daemon = PersistentConsoleDaemon(
+        server_jar_path,
+        server_dir,
+        client_queue_size=client_queue_size,
+        slow_client_policy=slow_client_policy,
+    )
 
     try:
         await daemon.start()
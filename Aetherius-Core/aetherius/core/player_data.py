@@ -1,13 +1,17 @@
 """Player data management and structured player information API."""
 
+import asyncio
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Any, Optional
 
 from .config import get_config_manager
 from .event_manager import fire_event, get_event_manager
 from .events_base import BaseEvent
+from .file_watcher import FileWatch, get_file_watcher
+from .latency_histogram import LatencyHistogram
 from .player_data_models import PlayerData, PlayerLocation, PlayerStats, PlayerInventory
 from .player_data_repository import PlayerDataRepository
 
@@ -31,11 +35,23 @@ class PlayerDataManager:
     This manager provides a unified API for accessing detailed player information
     that goes beyond what can be parsed from server logs. It supports integration
     with helper plugins (like AetheriusHelper.jar) that can provide deep game data.
+
+    Updates are persisted write-behind: changed players are marked dirty and
+    written together every `flush_interval` seconds by a background task, off
+    the event loop. Call shutdown() (or flush()) to write pending changes.
     """
 
-    def __init__(self, data_dir: Optional[Path] = None):
-        """Initialize player data manager."""
+    def __init__(self, data_dir: Optional[Path] = None, flush_interval: float = 5.0):
+        """
+        Initialize player data manager.
+
+        Args:
+            data_dir: Directory holding one JSON file per player
+            flush_interval: Seconds between write-behind flushes; overridden by
+                the `player_data.flush_interval` config key
+        """
         self.data_dir = data_dir or Path("data/players")
+        self.flush_interval = flush_interval
 
         self.config_manager = get_config_manager()
         self.event_manager = get_event_manager()
@@ -49,6 +65,18 @@ class PlayerDataManager:
         self._helper_enabled = False
         self._helper_data_file = Path("data/aetherius_helper.json")
         self._last_helper_update = 0.0
+        self._helper_watch: Optional[FileWatch] = None
+
+        # Write-behind persistence
+        self._dirty_players: set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_latency = LatencyHistogram()
+        self._flush_count = 0
+        self._players_written = 0
+        self._flush_errors = 0
+        self._peak_dirty = 0
+        self._last_flush: Optional[float] = None
 
         # Load existing player data
         self._load_player_data()
@@ -56,6 +84,8 @@ class PlayerDataManager:
         # Check for helper plugin
         self._check_helper_plugin()
 
+        self._load_persistence_config()
+
     def _check_helper_plugin(self) -> None:
         """Check if AetheriusHelper plugin is available and enabled."""
         config = self.config_manager.get_config()
@@ -75,9 +105,42 @@ class PlayerDataManager:
 
         if self._helper_enabled:
             logger.info("AetheriusHelper plugin integration enabled")
+            self._watch_helper_data()
         else:
             logger.info("AetheriusHelper plugin integration disabled")
 
+    def _watch_helper_data(self) -> None:
+        """
+        Reload helper plugin data whenever its data file changes.
+
+        The subscription needs a running event loop; without one it is set up
+        on the next update_from_helper_plugin() call instead.
+        """
+        if self._helper_watch is not None or not self._helper_enabled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._helper_watch = get_file_watcher().watch(
+            self._helper_data_file,
+            lambda path: self.update_from_helper_plugin(),
+            debounce=0.1,
+            loop=loop,
+        )
+
+    def _unwatch_helper_data(self) -> None:
+        """Cancel the helper data file subscription."""
+        if self._helper_watch is not None:
+            get_file_watcher().unwatch(self._helper_watch)
+            self._helper_watch = None
+
+    def _load_persistence_config(self) -> None:
+        """Apply write-behind settings from the configuration."""
+        self.flush_interval = float(
+            self.config_manager.get("player_data.flush_interval", self.flush_interval)
+        )
+
     def _load_player_data(self) -> None:
         """Load existing player data from files."""
         try:
@@ -90,19 +153,118 @@ class PlayerDataManager:
             logger.error(f"Error loading player data from repository: {e}")
 
     def _save_player_data(self, player_name: str) -> None:
-        """Save player data to file."""
+        """Mark player data as changed so the next flush writes it."""
         if player_name not in self._player_cache:
             return
 
-        self.repository.save_player_data(self._player_cache[player_name])
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to flush from, write through
+            self.repository.save_player_data(self._player_cache[player_name])
+            return
+
+        self._dirty_players.add(player_name)
+        if len(self._dirty_players) > self._peak_dirty:
+            self._peak_dirty = len(self._dirty_players)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Periodically write dirty players until shutdown."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+
+    async def flush(self) -> int:
+        """
+        Write all dirty players to disk.
+
+        Players are serialized on the event loop so each file is a consistent
+        snapshot; the file writes themselves run in a worker thread.
+
+        Returns:
+            Number of player files written
+        """
+        async with self._flush_lock:
+            if not self._dirty_players:
+                return 0
+
+            dirty, self._dirty_players = self._dirty_players, set()
+            payloads = []
+            for player_name in dirty:
+                player_data = self._player_cache.get(player_name)
+                if player_data is not None:
+                    payloads.append(
+                        (player_name, self.repository.serialize(player_data))
+                    )
+
+            start = time.perf_counter()
+            try:
+                failed = await asyncio.to_thread(
+                    self.repository.write_serialized, payloads
+                )
+            except Exception as e:
+                logger.error(f"Error flushing player data: {e}")
+                failed = [player_name for player_name, _ in payloads]
+            self._flush_latency.record(time.perf_counter() - start)
+            self._last_flush = time.time()
+            self._flush_count += 1
+
+            if failed:
+                # Retry on the next flush
+                self._flush_errors += len(failed)
+                self._dirty_players.update(failed)
+
+            written = len(payloads) - len(failed)
+            self._players_written += written
+            logger.debug(f"Flushed {written} players ({len(failed)} failed)")
+            return written
+
+    async def shutdown(self) -> None:
+        """Stop the background flusher and write any pending changes."""
+        self._unwatch_helper_data()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def get_persistence_stats(self) -> dict[str, Any]:
+        """
+        Get write-behind persistence metrics.
+
+        Returns:
+            Dictionary with dirty-set size, flush counts and flush latency
+        """
+        return {
+            "flush_interval": self.flush_interval,
+            "dirty_players": len(self._dirty_players),
+            "peak_dirty_players": self._peak_dirty,
+            "flushes": self._flush_count,
+            "players_written": self._players_written,
+            "write_errors": self._flush_errors,
+            "last_flush": self._last_flush,
+            "flush_latency": self._flush_latency.snapshot(),
+        }
 
     async def update_from_helper_plugin(self) -> bool:
         """
         Update player data from helper plugin data file.
 
+        Runs automatically when the file changes (see _watch_helper_data).
+
         Returns:
             True if data was updated, False otherwise
         """
+        self._watch_helper_data()
         if not self._helper_enabled or not self._helper_data_file.exists():
             return False
 
@@ -417,6 +579,8 @@ class PlayerDataManager:
         self._helper_enabled = True
         if data_file_path:
             self._helper_data_file = Path(data_file_path)
+            self._unwatch_helper_data()
+        self._watch_helper_data()
 
         config = self.config_manager.get_config()
         helper_config = None
@@ -442,6 +606,7 @@ class PlayerDataManager:
         """
         Disable helper plugin integration."""
         self._helper_enabled = False
+        self._unwatch_helper_data()
         config = self.config_manager.get_config()
         for component in config.components:
             if component.name == "helper":
@@ -4,10 +4,12 @@ Repository for handling persistence of player data.
 
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from .player_data_models import PlayerData, PlayerLocation, PlayerStats, PlayerInventory
+from .player_data_models import PlayerData
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,10 @@ class PlayerDataRepository:
     """
     Manages the loading and saving of PlayerData objects to/from persistent storage (JSON files).
     This class is solely responsible for I/O operations related to player data files.
+
+    Every file is written atomically: the data goes to a temporary file in the same
+    directory which then replaces the player's file, so a crash mid-write never
+    leaves a truncated JSON file behind.
     """
 
     def __init__(self, data_dir: Optional[Path] = None):
@@ -31,7 +37,7 @@ class PlayerDataRepository:
                 try:
                     with open(player_file, 'r', encoding='utf-8') as f:
                         data = json.load(f)
-                    player_data = self._dict_to_player_data(data)
+                    player_data = PlayerData.from_dict(data)
                     players_data[player_name] = player_data
                     logger.debug(f"Loaded player data for {player_name}")
                 except Exception as e:
@@ -40,67 +46,61 @@ class PlayerDataRepository:
             logger.error(f"Error scanning player data directory {self.data_dir}: {e}")
         return players_data
 
+    def serialize(self, player_data: PlayerData) -> str:
+        """Serialize a PlayerData object to the JSON text stored on disk."""
+        return json.dumps(player_data.to_dict(), indent=2, ensure_ascii=False)
+
     def save_player_data(self, player_data: PlayerData) -> bool:
         """Save a single PlayerData object to its corresponding file."""
-        if not player_data.name:
+        if not player_data.username:
             logger.error("Cannot save player data: Player name is missing.")
             return False
 
         try:
-            player_file = self.data_dir / f"{player_data.name}.json"
-            data = self._player_data_to_dict(player_data)
-            with open(player_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Saved player data for {player_data.name}")
+            self._write_atomic(player_data.username, self.serialize(player_data))
+            logger.debug(f"Saved player data for {player_data.username}")
             return True
         except Exception as e:
-            logger.error(f"Error saving player data for {player_data.name}: {e}")
+            logger.error(f"Error saving player data for {player_data.username}: {e}")
             return False
 
-    def _dict_to_player_data(self, data: Dict[str, Any]) -> PlayerData:
-        """Convert dictionary to PlayerData object."""
-        location = PlayerLocation(**data['location']) if 'location' in data else None
-        stats = PlayerStats(**data['stats']) if 'stats' in data else None
-        inventory = PlayerInventory(**data['inventory']) if 'inventory' in data else None
+    def write_serialized(self, payloads: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        Write already serialized player data files.
 
-        return PlayerData(
-            name=data['name'],
-            uuid=data.get('uuid'),
-            display_name=data.get('display_name'),
-            online=data.get('online', False),
-            last_seen=data.get('last_seen'),
-            first_join=data.get('first_join'),
-            play_time=data.get('play_time', 0.0),
-            location=location,
-            stats=stats,
-            inventory=inventory,
-            ip_address=data.get('ip_address'),
-            permissions=data.get('permissions', []),
-            groups=data.get('groups', []),
-            custom_data=data.get('custom_data', {})
-        )
+        This does no work on PlayerData objects, so it is safe to run in a worker
+        thread while the event loop keeps modifying the in-memory data.
 
-    def _player_data_to_dict(self, player_data: PlayerData) -> Dict[str, Any]:
-        """Convert PlayerData object to dictionary."""
-        data = {
-            'name': player_data.name,
-            'uuid': player_data.uuid,
-            'display_name': player_data.display_name,
-            'online': player_data.online,
-            'last_seen': player_data.last_seen,
-            'first_join': player_data.first_join,
-            'play_time': player_data.play_time,
-            'ip_address': player_data.ip_address,
-            'permissions': player_data.permissions,
-            'groups': player_data.groups,
-            'custom_data': player_data.custom_data
-        }
+        Args:
+            payloads: (player name, JSON text) pairs
 
-        if player_data.location:
-            data['location'] = player_data.location.__dict__
-        if player_data.stats:
-            data['stats'] = player_data.stats.__dict__
-        if player_data.inventory:
-            data['inventory'] = player_data.inventory.__dict__
+        Returns:
+            Names of the players whose files could not be written
+        """
+        failed = []
+        for player_name, payload in payloads:
+            try:
+                self._write_atomic(player_name, payload)
+            except Exception as e:
+                logger.error(f"Error saving player data for {player_name}: {e}")
+                failed.append(player_name)
+        return failed
 
-        return data
+    def _write_atomic(self, player_name: str, payload: str) -> None:
+        """Write a player's file via a temporary file and an atomic rename."""
+        player_file = self.data_dir / f"{player_name}.json"
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.data_dir, prefix=f".{player_name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, player_file)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
@@ -5,15 +5,18 @@ Aetherius玩家数据管理扩展
 为Web组件提供的增强玩家数据管理功能
 """
 
+import asyncio
 import json
 import logging
 import sqlite3
 import time
+from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
+from .database_executor import DatabaseExecutor
 from .player_data import PlayerDataManager, PlayerInventory, PlayerLocation, PlayerStats
 
 logger = logging.getLogger(__name__)
@@ -109,7 +112,10 @@ class PlayerManagerExtensions:
     """玩家管理器扩展类"""
 
     def __init__(
-        self, player_data_manager: PlayerDataManager, database_path: str = None
+        self,
+        player_data_manager: PlayerDataManager,
+        database_path: str = None,
+        pool_size: int = 2,
     ):
         """
         初始化玩家管理器扩展
@@ -117,6 +123,7 @@ class PlayerManagerExtensions:
         Args:
             player_data_manager: 基础玩家数据管理器
             database_path: 数据库路径
+            pool_size: 数据库连接池大小（每个连接占用一个工作线程）
         """
         self.player_manager = player_data_manager
         self.db_path = database_path or "data/players.db"
@@ -135,12 +142,17 @@ class PlayerManagerExtensions:
 
         # 统计追踪
         self._player_statistics: dict[str, dict[str, int]] = {}
-        self._action_history: list[PlayerAction] = []
         self._max_action_history = 10000
+        self._action_history: deque[PlayerAction] = deque(
+            maxlen=self._max_action_history
+        )
 
         # 初始化数据库
         self._init_database()
 
+        # 数据库访问在工作线程的长连接上执行，不阻塞事件循环
+        self._db = DatabaseExecutor(self.db_path, pool_size=pool_size)
+
         logger.info("Player manager extensions initialized")
 
     def _init_database(self):
@@ -259,95 +271,163 @@ class PlayerManagerExtensions:
             扩展玩家信息或None
         """
         # 检查缓存
-        if use_cache and player_identifier in self._player_cache:
-            cache_time = self._cache_timestamps.get(player_identifier)
-            if (
-                cache_time
-                and (datetime.now() - cache_time).total_seconds() < self._cache_ttl
-            ):
-                return self._player_cache[player_identifier]
+        if use_cache:
+            cached = self._get_cached(player_identifier)
+            if cached:
+                return cached
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # 查询玩家基础信息
+            if len(player_identifier) == 36 and "-" in player_identifier:
+                # UUID格式
+                clause = "WHERE uuid = ?"
+            else:
+                # 玩家名格式
+                clause = "WHERE name = ?"
 
-                # 查询玩家基础信息
-                if len(player_identifier) == 36 and "-" in player_identifier:
-                    # UUID格式
-                    cursor.execute(
-                        "SELECT * FROM players WHERE uuid = ?", (player_identifier,)
-                    )
-                else:
-                    # 玩家名格式
-                    cursor.execute(
-                        "SELECT * FROM players WHERE name = ?", (player_identifier,)
-                    )
+            rows = await self._db.run(self._fetch_players, clause, (player_identifier,))
+            if not rows:
+                return None
 
-                row = cursor.fetchone()
-                if not row:
-                    return None
+            player_info = self._build_player_info(*rows[0])
 
-                # 获取列名
-                columns = [description[0] for description in cursor.description]
-                player_data = dict(zip(columns, row, strict=False))
+            # 更新缓存
+            self._cache_player_info(player_info, player_identifier)
 
-                # 获取基础玩家数据
-                basic_data = await self.player_manager.get_player_data(
-                    player_data["uuid"]
-                )
-
-                # 构建扩展玩家信息
-                player_info = ExtendedPlayerInfo(
-                    name=player_data["name"],
-                    uuid=player_data["uuid"],
-                    display_name=player_data["display_name"] or player_data["name"],
-                    ip_address=player_data["ip_address"] or "",
-                    first_join=datetime.fromisoformat(player_data["first_join"])
-                    if player_data["first_join"]
-                    else datetime.now(),
-                    last_join=datetime.fromisoformat(player_data["last_join"])
-                    if player_data["last_join"]
-                    else datetime.now(),
-                    last_quit=datetime.fromisoformat(player_data["last_quit"])
-                    if player_data["last_quit"]
-                    else datetime.now(),
-                    total_playtime=player_data["total_playtime"] or 0,
-                    session_playtime=self._calculate_session_playtime(
-                        player_data["uuid"]
-                    ),
-                    location=basic_data.location
-                    if basic_data
-                    else PlayerLocation(0, 0, 0, "overworld"),
-                    stats=basic_data.stats if basic_data else PlayerStats(),
-                    inventory=basic_data.inventory if basic_data else PlayerInventory(),
-                    achievements=basic_data.achievements if basic_data else [],
-                    advancements=basic_data.advancements if basic_data else {},
-                    statistics=self._get_player_statistics(player_data["uuid"]),
-                    is_online=player_data["uuid"] in self._online_players,
-                    is_banned=bool(player_data["is_banned"]),
-                    is_whitelisted=bool(player_data["is_whitelisted"]),
-                    is_op=bool(player_data["is_op"]),
-                    permission_groups=json.loads(
-                        player_data["permission_groups"] or "[]"
-                    ),
-                    friends=json.loads(player_data["friends"] or "[]"),
-                    ignored_players=json.loads(player_data["ignored_players"] or "[]"),
-                    last_message=player_data["last_message"] or "",
-                    message_count=player_data["message_count"] or 0,
-                )
-
-                # 更新缓存
-                self._player_cache[player_identifier] = player_info
-                self._player_cache[player_info.uuid] = player_info
-                self._player_cache[player_info.name] = player_info
-                self._cache_timestamps[player_identifier] = datetime.now()
-
-                return player_info
+            return player_info
 
         except Exception as e:
             logger.error(f"Error getting player info for {player_identifier}: {e}")
             return None
 
+    async def get_players_info(
+        self, player_uuids: list[str], use_cache: bool = True
+    ) -> list[ExtendedPlayerInfo]:
+        """
+        批量获取扩展的玩家信息，未缓存的玩家通过一次查询获取
+
+        Args:
+            player_uuids: 玩家UUID列表
+            use_cache: 是否使用缓存
+
+        Returns:
+            扩展玩家信息列表（按输入顺序，忽略不存在的玩家）
+        """
+        found: dict[str, ExtendedPlayerInfo] = {}
+        missing = []
+        for player_uuid in player_uuids:
+            cached = self._get_cached(player_uuid) if use_cache else None
+            if cached:
+                found[player_uuid] = cached
+            else:
+                missing.append(player_uuid)
+
+        if missing:
+            try:
+                placeholders = ",".join("?" for _ in missing)
+                rows = await self._db.run(
+                    self._fetch_players, f"WHERE uuid IN ({placeholders})", missing
+                )
+                for row, statistics in rows:
+                    player_info = self._build_player_info(row, statistics)
+                    self._cache_player_info(player_info)
+                    found[player_info.uuid] = player_info
+            except Exception as e:
+                logger.error(f"Error getting player info: {e}")
+
+        return [found[uuid] for uuid in player_uuids if uuid in found]
+
+    @staticmethod
+    def _fetch_players(
+        conn: sqlite3.Connection, clause: str, params
+    ) -> list[tuple[dict[str, Any], dict[str, int]]]:
+        """查询玩家行及其统计数据（在数据库线程中执行，共两次查询）"""
+        rows = conn.execute(f"SELECT * FROM players {clause}", params).fetchall()
+        if not rows:
+            return []
+
+        uuids = [row["uuid"] for row in rows]
+        statistics: dict[str, dict[str, int]] = {uuid: {} for uuid in uuids}
+        placeholders = ",".join("?" for _ in uuids)
+        for stat in conn.execute(
+            "SELECT player_uuid, stat_name, stat_value FROM player_stats "
+            f"WHERE player_uuid IN ({placeholders})",
+            uuids,
+        ):
+            statistics[stat[0]][stat[1]] = stat[2]
+
+        return [(dict(row), statistics[row["uuid"]]) for row in rows]
+
+    def _build_player_info(
+        self, player_data: dict[str, Any], statistics: dict[str, int]
+    ) -> ExtendedPlayerInfo:
+        """由数据库行构建扩展玩家信息"""
+        # 获取基础玩家数据
+        basic_data = (
+            self.player_manager.get_player_data(player_data["name"])
+            if self.player_manager
+            else None
+        )
+
+        return ExtendedPlayerInfo(
+            name=player_data["name"],
+            uuid=player_data["uuid"],
+            display_name=player_data["display_name"] or player_data["name"],
+            ip_address=player_data["ip_address"] or "",
+            first_join=datetime.fromisoformat(player_data["first_join"])
+            if player_data["first_join"]
+            else datetime.now(),
+            last_join=datetime.fromisoformat(player_data["last_join"])
+            if player_data["last_join"]
+            else datetime.now(),
+            last_quit=datetime.fromisoformat(player_data["last_quit"])
+            if player_data["last_quit"]
+            else datetime.now(),
+            total_playtime=player_data["total_playtime"] or 0,
+            session_playtime=self._calculate_session_playtime(player_data["uuid"]),
+            location=basic_data.location
+            if basic_data and basic_data.location
+            else PlayerLocation(0, 0, 0, "overworld"),
+            stats=basic_data.stats if basic_data else PlayerStats(),
+            inventory=basic_data.inventory if basic_data else PlayerInventory(),
+            achievements=basic_data.metadata.get("achievements", [])
+            if basic_data
+            else [],
+            advancements=basic_data.metadata.get("advancements", {})
+            if basic_data
+            else {},
+            statistics=statistics,
+            is_online=player_data["uuid"] in self._player_sessions,
+            is_banned=bool(player_data["is_banned"]),
+            is_whitelisted=bool(player_data["is_whitelisted"]),
+            is_op=bool(player_data["is_op"]),
+            permission_groups=json.loads(player_data["permission_groups"] or "[]"),
+            friends=json.loads(player_data["friends"] or "[]"),
+            ignored_players=json.loads(player_data["ignored_players"] or "[]"),
+            last_message=player_data["last_message"] or "",
+            message_count=player_data["message_count"] or 0,
+        )
+
+    def _get_cached(self, key: str) -> Optional[ExtendedPlayerInfo]:
+        """获取未过期的缓存玩家信息"""
+        if key in self._player_cache:
+            cache_time = self._cache_timestamps.get(key)
+            if (
+                cache_time
+                and (datetime.now() - cache_time).total_seconds() < self._cache_ttl
+            ):
+                return self._player_cache[key]
+        return None
+
+    def _cache_player_info(
+        self, player_info: ExtendedPlayerInfo, identifier: Optional[str] = None
+    ):
+        """缓存玩家信息"""
+        now = datetime.now()
+        for key in {identifier or player_info.uuid, player_info.uuid, player_info.name}:
+            self._player_cache[key] = player_info
+            self._cache_timestamps[key] = now
+
     def _calculate_session_playtime(self, player_uuid: str) -> int:
         """计算当前会话游戏时间"""
         session = self._player_sessions.get(player_uuid)
@@ -355,26 +435,6 @@ class PlayerManagerExtensions:
             return int((datetime.now() - session.join_time).total_seconds())
         return 0
 
-    def _get_player_statistics(self, player_uuid: str) -> dict[str, int]:
-        """获取玩家统计数据"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT stat_name, stat_value FROM player_stats WHERE player_uuid = ?",
-                    (player_uuid,),
-                )
-
-                stats = {}
-                for row in cursor.fetchall():
-                    stats[row[0]] = row[1]
-
-                return stats
-
-        except Exception as e:
-            logger.error(f"Error getting player statistics: {e}")
-            return {}
-
     async def record_player_join(
         self, player_name: str, player_uuid: str, ip_address: str
     ) -> bool:
@@ -405,11 +465,15 @@ class PlayerManagerExtensions:
 
             self._player_sessions[player_uuid] = session
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            action = self._new_action(
+                player_uuid,
+                "join",
+                {"ip_address": ip_address, "session_id": session_id},
+            )
 
+            def write(conn: sqlite3.Connection):
                 # 更新或插入玩家基础信息
-                cursor.execute(
+                conn.execute(
                     """
                     INSERT OR REPLACE INTO players
                     (uuid, name, ip_address, first_join, last_join, updated_at)
@@ -429,7 +493,7 @@ class PlayerManagerExtensions:
                 )
 
                 # 插入会话记录
-                cursor.execute(
+                conn.execute(
                     """
                     INSERT INTO player_sessions
                     (player_uuid, session_id, join_time, ip_address)
@@ -438,14 +502,10 @@ class PlayerManagerExtensions:
                     (player_uuid, session_id, join_time, ip_address),
                 )
 
-                conn.commit()
+                # 记录行为
+                self._insert_action(conn, action)
 
-            # 记录行为
-            await self._record_action(
-                player_uuid,
-                "join",
-                {"ip_address": ip_address, "session_id": session_id},
-            )
+            await self._db.run(write)
 
             # 清除缓存
             self._clear_player_cache(player_uuid, player_name)
@@ -470,17 +530,13 @@ class PlayerManagerExtensions:
         """
         try:
             quit_time = datetime.now()
-            session = self._player_sessions.get(player_uuid)
-
-            if session:
-                session.quit_time = quit_time
-                session.duration = int((quit_time - session.join_time).total_seconds())
-
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.cursor()
+            session = self._player_sessions.pop(player_uuid, None)
+            action = self._new_action(player_uuid, "quit", {})
 
+            def write(conn: sqlite3.Connection):
+                if session:
                     # 更新会话记录
-                    cursor.execute(
+                    conn.execute(
                         """
                         UPDATE player_sessions
                         SET quit_time = ?, duration = ?
@@ -490,7 +546,7 @@ class PlayerManagerExtensions:
                     )
 
                     # 更新玩家总游戏时间
-                    cursor.execute(
+                    conn.execute(
                         """
                         UPDATE players
                         SET last_quit = ?,
@@ -501,13 +557,14 @@ class PlayerManagerExtensions:
                         (quit_time, session.duration, quit_time, player_uuid),
                     )
 
-                    conn.commit()
+                # 记录行为
+                self._insert_action(conn, action)
 
-                # 移除会话
-                del self._player_sessions[player_uuid]
+            if session:
+                session.quit_time = quit_time
+                session.duration = int((quit_time - session.join_time).total_seconds())
 
-            # 记录行为
-            await self._record_action(player_uuid, "quit", {})
+            await self._db.run(write)
 
             # 清除缓存
             self._clear_player_cache(player_uuid, player_name)
@@ -528,60 +585,68 @@ class PlayerManagerExtensions:
     ):
         """记录玩家行为"""
         try:
-            action = PlayerAction(
-                player_uuid=player_uuid,
-                action_type=action_type,
-                timestamp=datetime.now(),
-                details=details,
-                location=location,
-            )
-
-            self._action_history.append(action)
-
-            # 限制历史记录大小
-            if len(self._action_history) > self._max_action_history:
-                self._action_history.pop(0)
+            action = self._new_action(player_uuid, action_type, details, location)
 
             # 保存到数据库
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO player_actions
-                    (player_uuid, action_type, timestamp, details,
-                     location_x, location_y, location_z, location_dimension)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        player_uuid,
-                        action_type,
-                        action.timestamp,
-                        json.dumps(details),
-                        location.x if location else None,
-                        location.y if location else None,
-                        location.z if location else None,
-                        location.dimension if location else None,
-                    ),
-                )
-                conn.commit()
+            await self._db.run(self._insert_action, action)
 
         except Exception as e:
             logger.error(f"Error recording action: {e}")
 
+    def _new_action(
+        self,
+        player_uuid: str,
+        action_type: str,
+        details: dict[str, Any],
+        location: PlayerLocation = None,
+    ) -> PlayerAction:
+        """创建行为记录并加入内存历史（超出上限时自动丢弃最旧的记录）"""
+        action = PlayerAction(
+            player_uuid=player_uuid,
+            action_type=action_type,
+            timestamp=datetime.now(),
+            details=details,
+            location=location,
+        )
+        self._action_history.append(action)
+        return action
+
+    @staticmethod
+    def _insert_action(conn: sqlite3.Connection, action: PlayerAction):
+        """写入行为记录（在数据库线程中执行）"""
+        location = action.location
+        conn.execute(
+            """
+            INSERT INTO player_actions
+            (player_uuid, action_type, timestamp, details,
+             location_x, location_y, location_z, location_dimension)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                action.player_uuid,
+                action.action_type,
+                action.timestamp,
+                json.dumps(action.details),
+                location.x if location else None,
+                location.y if location else None,
+                location.z if location else None,
+                location.dimension if location else None,
+            ),
+        )
+
     def _clear_player_cache(self, player_uuid: str, player_name: str):
         """清除玩家缓存"""
-        for key in [player_uuid, player_name]:
+        cached = self._player_cache.get(player_uuid)
+        keys = {player_uuid, player_name}
+        if cached:
+            keys.add(cached.name)
+        for key in keys:
             self._player_cache.pop(key, None)
             self._cache_timestamps.pop(key, None)
 
     async def get_online_players(self) -> list[ExtendedPlayerInfo]:
         """获取在线玩家列表"""
-        online_players = []
-        for player_uuid in self._player_sessions:
-            player_info = await self.get_player_info(player_uuid)
-            if player_info:
-                online_players.append(player_info)
-        return online_players
+        return await self.get_players_info(list(self._player_sessions))
 
     async def get_player_history(
         self,
@@ -605,113 +670,120 @@ class PlayerManagerExtensions:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                query = """
-                    SELECT player_uuid, action_type, timestamp, details,
-                           location_x, location_y, location_z, location_dimension
-                    FROM player_actions
-                    WHERE player_uuid = ? AND timestamp >= ?
-                """
-                params = [player_uuid, cutoff_date]
-
-                if action_types:
-                    placeholders = ",".join(["?" for _ in action_types])
-                    query += f" AND action_type IN ({placeholders})"
-                    params.extend(action_types)
-
-                query += " ORDER BY timestamp DESC LIMIT ?"
-                params.append(limit)
-
-                cursor.execute(query, params)
-
-                actions = []
-                for row in cursor.fetchall():
-                    location = None
-                    if row[4] is not None:  # location_x
-                        location = PlayerLocation(
-                            x=row[4], y=row[5], z=row[6], dimension=row[7]
-                        )
-
-                    action = PlayerAction(
-                        player_uuid=row[0],
-                        action_type=row[1],
-                        timestamp=datetime.fromisoformat(row[2]),
-                        details=json.loads(row[3]) if row[3] else {},
-                        location=location,
+            query = """
+                SELECT player_uuid, action_type, timestamp, details,
+                       location_x, location_y, location_z, location_dimension
+                FROM player_actions
+                WHERE player_uuid = ? AND timestamp >= ?
+            """
+            params = [player_uuid, cutoff_date]
+
+            if action_types:
+                placeholders = ",".join(["?" for _ in action_types])
+                query += f" AND action_type IN ({placeholders})"
+                params.extend(action_types)
+
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(limit)
+
+            actions = []
+            for row in await self._db.fetchall(query, params):
+                location = None
+                if row[4] is not None:  # location_x
+                    location = PlayerLocation(
+                        x=row[4], y=row[5], z=row[6], dimension=row[7]
                     )
-                    actions.append(action)
 
-                return actions
+                action = PlayerAction(
+                    player_uuid=row[0],
+                    action_type=row[1],
+                    timestamp=datetime.fromisoformat(row[2]),
+                    details=json.loads(row[3]) if row[3] else {},
+                    location=location,
+                )
+                actions.append(action)
+
+            return actions
 
         except Exception as e:
             logger.error(f"Error getting player history: {e}")
             return []
 
+    @staticmethod
+    def _query_server_statistics(conn: sqlite3.Connection) -> dict[str, Any]:
+        """查询服务器统计数据（在数据库线程中执行）"""
+        # 总玩家数
+        total_players = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+        # 今日加入的玩家数
+        today = datetime.now().date()
+        new_players_today = conn.execute(
+            "SELECT COUNT(*) FROM players WHERE DATE(first_join) = ?", (today,)
+        ).fetchone()[0]
+
+        # 本周活跃玩家数
+        week_ago = datetime.now() - timedelta(days=7)
+        active_players_week = conn.execute(
+            "SELECT COUNT(*) FROM players WHERE last_join >= ?", (week_ago,)
+        ).fetchone()[0]
+
+        # 平均游戏时间
+        avg_playtime = (
+            conn.execute(
+                "SELECT AVG(total_playtime) FROM players WHERE total_playtime > 0"
+            ).fetchone()[0]
+            or 0
+        )
+
+        # 最受欢迎的游戏模式
+        popular_gamemode_row = conn.execute(
+            """
+            SELECT details, COUNT(*) as count
+            FROM player_actions
+            WHERE action_type = 'gamemode_change'
+            GROUP BY details
+            ORDER BY count DESC
+            LIMIT 1
+        """
+        ).fetchone()
+
+        return {
+            "total_players": total_players,
+            "new_players_today": new_players_today,
+            "active_players_week": active_players_week,
+            "avg_playtime": avg_playtime,
+            "popular_gamemode_details": popular_gamemode_row[0]
+            if popular_gamemode_row
+            else None,
+        }
+
     async def get_server_statistics(self) -> dict[str, Any]:
         """获取服务器统计信息"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # 总玩家数
-                cursor.execute("SELECT COUNT(*) FROM players")
-                total_players = cursor.fetchone()[0]
-
-                # 今日加入的玩家数
-                today = datetime.now().date()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM players WHERE DATE(first_join) = ?", (today,)
-                )
-                new_players_today = cursor.fetchone()[0]
-
-                # 本周活跃玩家数
-                week_ago = datetime.now() - timedelta(days=7)
-                cursor.execute(
-                    "SELECT COUNT(*) FROM players WHERE last_join >= ?", (week_ago,)
-                )
-                active_players_week = cursor.fetchone()[0]
-
-                # 平均游戏时间
-                cursor.execute(
-                    "SELECT AVG(total_playtime) FROM players WHERE total_playtime > 0"
-                )
-                avg_playtime = cursor.fetchone()[0] or 0
-
-                # 当前在线玩家数
-                online_count = len(self._player_sessions)
-
-                # 最受欢迎的游戏模式
-                cursor.execute(
-                    """
-                    SELECT details, COUNT(*) as count
-                    FROM player_actions
-                    WHERE action_type = 'gamemode_change'
-                    GROUP BY details
-                    ORDER BY count DESC
-                    LIMIT 1
-                """
-                )
-                popular_gamemode_row = cursor.fetchone()
-                popular_gamemode = "survival"  # 默认值
-                if popular_gamemode_row:
-                    try:
-                        details = json.loads(popular_gamemode_row[0])
-                        popular_gamemode = details.get("gamemode", "survival")
-                    except Exception:
-                        pass
-
-                return {
-                    "total_players": total_players,
-                    "new_players_today": new_players_today,
-                    "active_players_week": active_players_week,
-                    "online_players": online_count,
-                    "avg_playtime_hours": avg_playtime / 3600 if avg_playtime else 0,
-                    "popular_gamemode": popular_gamemode,
-                    "total_sessions": len(self._action_history),
-                    "last_updated": datetime.now().isoformat(),
-                }
+            result = await self._db.run(self._query_server_statistics)
+
+            # 当前在线玩家数
+            online_count = len(self._player_sessions)
+
+            popular_gamemode = "survival"  # 默认值
+            if result["popular_gamemode_details"]:
+                try:
+                    details = json.loads(result["popular_gamemode_details"])
+                    popular_gamemode = details.get("gamemode", "survival")
+                except Exception:
+                    pass
+
+            avg_playtime = result["avg_playtime"]
+            return {
+                "total_players": result["total_players"],
+                "new_players_today": result["new_players_today"],
+                "active_players_week": result["active_players_week"],
+                "online_players": online_count,
+                "avg_playtime_hours": avg_playtime / 3600 if avg_playtime else 0,
+                "popular_gamemode": popular_gamemode,
+                "total_sessions": len(self._action_history),
+                "last_updated": datetime.now().isoformat(),
+            }
 
         except Exception as e:
             logger.error(f"Error getting server statistics: {e}")
@@ -732,36 +804,31 @@ class PlayerManagerExtensions:
             匹配的玩家列表
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            clause = "WHERE (name LIKE ? OR display_name LIKE ?)"
+            params = [f"%{query}%", f"%{query}%"]
 
-                sql_query = """
-                    SELECT uuid FROM players
-                    WHERE name LIKE ? OR display_name LIKE ?
-                """
-                params = [f"%{query}%", f"%{query}%"]
-
-                if online_only:
-                    online_uuids = list(self._player_sessions.keys())
-                    if not online_uuids:
-                        return []
-
-                    placeholders = ",".join(["?" for _ in online_uuids])
-                    sql_query += f" AND uuid IN ({placeholders})"
-                    params.extend(online_uuids)
+            if online_only:
+                online_uuids = list(self._player_sessions.keys())
+                if not online_uuids:
+                    return []
 
-                sql_query += " ORDER BY last_join DESC LIMIT ?"
-                params.append(limit)
+                placeholders = ",".join(["?" for _ in online_uuids])
+                clause += f" AND uuid IN ({placeholders})"
+                params.extend(online_uuids)
 
-                cursor.execute(sql_query, params)
+            clause += " ORDER BY last_join DESC LIMIT ?"
+            params.append(limit)
 
-                players = []
-                for row in cursor.fetchall():
-                    player_info = await self.get_player_info(row[0])
-                    if player_info:
-                        players.append(player_info)
+            # 玩家行与统计数据在同一次数据库调用中批量获取
+            players = []
+            for row, statistics in await self._db.run(
+                self._fetch_players, clause, params
+            ):
+                player_info = self._build_player_info(row, statistics)
+                self._cache_player_info(player_info)
+                players.append(player_info)
 
-                return players
+            return players
 
         except Exception as e:
             logger.error(f"Error searching players: {e}")
@@ -776,20 +843,17 @@ class PlayerManagerExtensions:
             stats: 统计数据字典
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                for stat_name, stat_value in stats.items():
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO player_stats
-                        (player_uuid, stat_name, stat_value)
-                        VALUES (?, ?, ?)
-                    """,
-                        (player_uuid, stat_name, stat_value),
-                    )
-
-                conn.commit()
+            await self._db.executemany(
+                """
+                INSERT OR REPLACE INTO player_stats
+                (player_uuid, stat_name, stat_value)
+                VALUES (?, ?, ?)
+            """,
+                [
+                    (player_uuid, stat_name, stat_value)
+                    for stat_name, stat_value in stats.items()
+                ],
+            )
 
             # 清除缓存
             self._clear_player_cache(player_uuid, "")
@@ -802,17 +866,14 @@ class PlayerManagerExtensions:
     ):
         """封禁玩家"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    UPDATE players
-                    SET is_banned = 1, updated_at = ?
-                    WHERE uuid = ?
-                """,
-                    (datetime.now(), player_uuid),
-                )
-                conn.commit()
+            await self._db.execute(
+                """
+                UPDATE players
+                SET is_banned = 1, updated_at = ?
+                WHERE uuid = ?
+            """,
+                (datetime.now(), player_uuid),
+            )
 
             await self._record_action(
                 player_uuid, "ban", {"reason": reason, "admin_uuid": admin_uuid}
@@ -826,17 +887,14 @@ class PlayerManagerExtensions:
     async def unban_player(self, player_uuid: str, admin_uuid: str = ""):
         """解封玩家"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    UPDATE players
-                    SET is_banned = 0, updated_at = ?
-                    WHERE uuid = ?
-                """,
-                    (datetime.now(), player_uuid),
-                )
-                conn.commit()
+            await self._db.execute(
+                """
+                UPDATE players
+                SET is_banned = 0, updated_at = ?
+                WHERE uuid = ?
+            """,
+                (datetime.now(), player_uuid),
+            )
 
             await self._record_action(player_uuid, "unban", {"admin_uuid": admin_uuid})
 
@@ -845,6 +903,10 @@ class PlayerManagerExtensions:
         except Exception as e:
             logger.error(f"Error unbanning player: {e}")
 
+    async def close(self):
+        """等待未完成的数据库操作并关闭连接池"""
+        await asyncio.to_thread(self._db.close)
+
     def get_cache_statistics(self) -> dict[str, Any]:
         """获取缓存统计信息"""
         return {
@@ -853,4 +915,5 @@ class PlayerManagerExtensions:
             "action_history_size": len(self._action_history),
             "cache_ttl_seconds": self._cache_ttl,
             "max_action_history": self._max_action_history,
+            "database": self._db.get_stats(),
         }
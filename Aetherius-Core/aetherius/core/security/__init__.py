@@ -14,8 +14,13 @@ from typing import Any, Dict, List, Optional, Set, Union, Protocol, TypeVar, Tup
 from abc import ABC, abstractmethod
 from enum import Enum, Flag, auto
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import hashlib
+import hmac
+import os
 import secrets
+import threading
 import time
 from datetime import datetime, timedelta
 
@@ -104,6 +109,59 @@ class Permission:
         return True
 
 
+class PermissionIndex:
+    """编译后的权限索引
+
+    按 (资源类型, 权限类型) 分桶，每个桶内预先展开作用域和资源ID的通配键，
+    检查权限只需常数次字典/集合查找，结果与逐个调用 Permission.matches 一致。
+    只有带条件的权限请求才会回退到扫描桶内带条件的权限。
+    """
+
+    _ANY = object()  # 请求未限定作用域/资源ID时匹配任意值
+
+    def __init__(self, permissions: Set[Permission]):
+        self.permissions = frozenset(permissions)
+        self._keys: Dict[Tuple[ResourceType, PermissionType], Set[Tuple[Any, Any]]] = {}
+        self._conditional: Dict[Tuple[ResourceType, PermissionType], List[Permission]] = {}
+
+        for permission in self.permissions:
+            bucket = (permission.resource_type, permission.permission_type)
+            keys = self._keys.setdefault(bucket, set())
+            # 空资源ID与None一样视为适用于所有资源
+            scope, resource_id = permission.scope, permission.resource_id or None
+            keys.update((
+                (scope, resource_id),
+                (scope, self._ANY),
+                (self._ANY, resource_id),
+                (self._ANY, self._ANY),
+            ))
+            if permission.conditions:
+                self._conditional.setdefault(bucket, []).append(permission)
+
+    def allows(self, required_permission: Permission) -> bool:
+        """检查索引中是否有权限匹配所需权限"""
+        bucket = (required_permission.resource_type, required_permission.permission_type)
+
+        if required_permission.conditions:
+            # 只有带条件的权限才可能满足带条件的请求
+            return any(permission.matches(required_permission)
+                       for permission in self._conditional.get(bucket, ()))
+
+        keys = self._keys.get(bucket)
+        if not keys:
+            return False
+
+        scope = required_permission.scope or self._ANY
+        resource_id = required_permission.resource_id
+        if not resource_id:
+            return (scope, self._ANY) in keys
+        # 未限定资源ID的权限适用于所有资源
+        return (scope, resource_id) in keys or (scope, None) in keys
+
+    def __len__(self) -> int:
+        return len(self.permissions)
+
+
 @dataclass
 class Role:
     """角色定义"""
@@ -481,41 +539,106 @@ def secure(security_level: SecurityLevel = SecurityLevel.AUTHENTICATED):
 # 密码工具
 
 class PasswordUtils:
-    """密码工具类"""
-    
+    """密码工具类
+
+    哈希格式为 ``pbkdf2_<算法>$<迭代次数>$<盐>$<密钥>``，记录了算法和迭代次数，
+    参数调整后旧哈希可在登录成功时透明升级（见 needs_rehash）。
+    也兼容旧格式：64位盐直接拼接密钥（sha256，100,000次迭代）。
+
+    PBKDF2计算耗时数十毫秒，异步代码应使用 hash_password_async /
+    verify_password_async，在有界线程池中执行而不阻塞事件循环
+    （hashlib.pbkdf2_hmac 计算期间会释放GIL）。
+    """
+
+    algorithm = 'sha256'
+    iterations = 100000
+    max_workers = min(4, os.cpu_count() or 1)
+
+    _LEGACY_ITERATIONS = 100000
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
     @staticmethod
-    def hash_password(password: str, salt: Optional[str] = None) -> Tuple[str, str]:
+    def _derive(password: str, salt: str, algorithm: str, iterations: int) -> str:
+        return hashlib.pbkdf2_hmac(algorithm,
+                                   password.encode('utf-8'),
+                                   salt.encode('utf-8'),
+                                   iterations).hex()
+
+    @classmethod
+    def _parse_hash(cls, hashed_password: str) -> Optional[Tuple[str, int, str, str]]:
+        """解析哈希，返回 (算法, 迭代次数, 盐, 密钥)"""
+        if hashed_password.startswith('pbkdf2_'):
+            scheme, iterations, salt, key = hashed_password.split('$')
+            return scheme[len('pbkdf2_'):], int(iterations), salt, key
+        if len(hashed_password) > 64:
+            return 'sha256', cls._LEGACY_ITERATIONS, hashed_password[:64], hashed_password[64:]
+        return None
+
+    @classmethod
+    def hash_password(cls, password: str, salt: Optional[str] = None) -> Tuple[str, str]:
         """哈希密码"""
         if salt is None:
             salt = secrets.token_hex(32)
-        
+
         # 使用PBKDF2算法
-        key = hashlib.pbkdf2_hmac('sha256', 
-                                password.encode('utf-8'), 
-                                salt.encode('utf-8'), 
-                                100000)  # 100,000 iterations
-        
-        return salt + key.hex(), salt
-    
-    @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool:
+        key = cls._derive(password, salt, cls.algorithm, cls.iterations)
+
+        return f"pbkdf2_{cls.algorithm}${cls.iterations}${salt}${key}", salt
+
+    @classmethod
+    def verify_password(cls, password: str, hashed_password: str) -> bool:
         """验证密码"""
         try:
-            if len(hashed_password) < 64:
+            parsed = cls._parse_hash(hashed_password)
+            if parsed is None:
                 return False
-            
-            salt = hashed_password[:64]
-            stored_key = hashed_password[64:]
-            
-            key = hashlib.pbkdf2_hmac('sha256',
-                                    password.encode('utf-8'),
-                                    salt.encode('utf-8'),
-                                    100000)
-            
-            return key.hex() == stored_key
+
+            algorithm, iterations, salt, stored_key = parsed
+            key = cls._derive(password, salt, algorithm, iterations)
+
+            return hmac.compare_digest(key, stored_key)
         except Exception:
             return False
-    
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        """检查哈希是否使用了旧格式或旧参数，需要在登录成功后升级"""
+        if not hashed_password.startswith('pbkdf2_'):
+            return True
+        try:
+            parsed = cls._parse_hash(hashed_password)
+        except ValueError:
+            return True
+        if parsed is None:
+            return True
+        algorithm, iterations, _, _ = parsed
+        return algorithm != cls.algorithm or iterations < cls.iterations
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.max_workers,
+                    thread_name_prefix="aetherius-password"
+                )
+            return cls._executor
+
+    @classmethod
+    async def hash_password_async(cls, password: str, salt: Optional[str] = None) -> Tuple[str, str]:
+        """在线程池中哈希密码"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._get_executor(), cls.hash_password, password, salt)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, hashed_password: str) -> bool:
+        """在线程池中验证密码"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            cls._get_executor(), cls.verify_password, password, hashed_password
+        )
+
     @staticmethod
     def generate_password(length: int = 12) -> str:
         """生成随机密码"""
@@ -7,7 +7,7 @@
 import asyncio
 import time
 import threading
-from typing import Dict, List, Optional, Set, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 import logging
@@ -15,7 +15,7 @@ import json
 import weakref
 
 from . import (
-    SecurityLevel, Permission, Role, User, SecurityContext,
+    SecurityLevel, Permission, PermissionIndex, Role, User, SecurityContext,
     IAuthenticationProvider, IAuthorizationProvider, ISecurityAuditor,
     SecurityError, AuthenticationError, AuthorizationError,
     BuiltinPermissions, BuiltinRoles, PasswordUtils, TokenUtils
@@ -41,8 +41,10 @@ class SecurityManager:
         self._sessions: Dict[str, SecurityContext] = {}
         self._session_lock = threading.RLock()
         
-        # 权限缓存
-        self._permission_cache: Dict[str, Set[Permission]] = {}
+        # 权限缓存（每个用户编译后的权限索引）
+        self._permission_cache: Dict[str, PermissionIndex] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
         self._cache_lock = threading.RLock()
         self._cache_ttl = self.config.get('permission_cache_ttl', 300)  # 5分钟
         self._cache_timestamps: Dict[str, float] = {}
@@ -225,14 +227,11 @@ class SecurityManager:
                 await self._log_authorization(user.username, permission, True, context)
                 return True
             
-            # 获取用户所有权限
-            user_permissions = await self._get_user_permissions_cached(user)
-            
-            # 检查直接权限
-            for user_perm in user_permissions:
-                if user_perm.matches(permission):
-                    await self._log_authorization(user.username, permission, True, context)
-                    return True
+            # 在编译后的权限索引中检查（直接权限及角色继承的全部权限）
+            permission_index = await self._get_permission_index_cached(user)
+            if permission_index.allows(permission):
+                await self._log_authorization(user.username, permission, True, context)
+                return True
             
             # 使用授权提供者进行额外检查
             result = await self.authz_provider.check_permission(user, permission, context)
@@ -306,7 +305,7 @@ class SecurityManager:
             raise SecurityError("Password does not meet policy requirements")
         
         # 创建用户对象
-        password_hash, _ = PasswordUtils.hash_password(password)
+        password_hash, _ = await PasswordUtils.hash_password_async(password)
         
         user = User(
             username=username,
@@ -343,7 +342,7 @@ class SecurityManager:
             return False
         
         # 更新密码
-        user.password_hash, _ = PasswordUtils.hash_password(new_password)
+        user.password_hash, _ = await PasswordUtils.hash_password_async(new_password)
         user.updated_at = datetime.utcnow()
         
         result = await self.auth_provider.update_user(user)
@@ -541,8 +540,8 @@ class SecurityManager:
                 await self.authz_provider.create_role(role)
                 logger.info(f"Created builtin role: {role.name}")
     
-    async def _get_user_permissions_cached(self, user: User) -> Set[Permission]:
-        """获取用户权限（带缓存）"""
+    async def _get_permission_index_cached(self, user: User) -> PermissionIndex:
+        """获取用户编译后的权限索引（带缓存）"""
         cache_key = user.username
         current_time = time.time()
         
@@ -551,16 +550,31 @@ class SecurityManager:
             if (cache_key in self._permission_cache and 
                 cache_key in self._cache_timestamps and
                 current_time - self._cache_timestamps[cache_key] < self._cache_ttl):
+                self._cache_hits += 1
                 return self._permission_cache[cache_key]
+            self._cache_misses += 1
         
-        # 重新加载权限
+        # 重新加载权限并编译索引
         permissions = await self.authz_provider.get_user_permissions(user)
+        permission_index = PermissionIndex(permissions)
         
         with self._cache_lock:
-            self._permission_cache[cache_key] = permissions
+            self._permission_cache[cache_key] = permission_index
             self._cache_timestamps[cache_key] = current_time
         
-        return permissions
+        return permission_index
+    
+    def get_permission_cache_stats(self) -> Dict[str, Any]:
+        """获取权限缓存统计"""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'cached_users': len(self._permission_cache),
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'hit_rate': self._cache_hits / lookups if lookups else 0.0,
+                'ttl_seconds': self._cache_ttl,
+            }
     
     def _clear_permission_cache(self, username: str):
         """清理权限缓存"""
@@ -570,6 +584,11 @@ class SecurityManager:
     
     def _clear_role_permission_cache(self, role_name: str):
         """清理角色相关的权限缓存"""
+        # 角色权限变化会影响所有继承该角色的角色，重新计算闭包
+        invalidate_closures = getattr(self.authz_provider, 'invalidate_role_closures', None)
+        if invalidate_closures:
+            invalidate_closures()
+        
         # 简单实现：清理所有缓存
         with self._cache_lock:
             self._permission_cache.clear()
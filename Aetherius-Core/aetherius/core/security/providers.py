@@ -7,7 +7,7 @@
 import asyncio
 import sqlite3
 import json
-from typing import Optional, Set, Dict, Any, List
+from typing import Optional, Set, Dict, Any, List, FrozenSet
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -124,10 +124,20 @@ class DatabaseAuthenticationProvider(IAuthenticationProvider):
                 if not row:
                     return None
                 
-                # 验证密码
-                if not PasswordUtils.verify_password(password, row['password_hash']):
+                # 验证密码（在线程池中执行，不阻塞事件循环）
+                password_hash = row['password_hash']
+                if not await PasswordUtils.verify_password_async(password, password_hash):
                     return None
                 
+                # 旧格式或旧参数的哈希在登录成功时升级
+                if PasswordUtils.needs_rehash(password_hash):
+                    password_hash, _ = await PasswordUtils.hash_password_async(password)
+                    conn.execute(
+                        "UPDATE users SET password_hash = ? WHERE username = ?",
+                        (password_hash, username)
+                    )
+                    logger.info(f"Upgraded password hash for user {username}")
+                
                 # 获取角色
                 cursor = conn.execute(
                     "SELECT role_name FROM user_roles WHERE username = ?",
@@ -161,7 +171,7 @@ class DatabaseAuthenticationProvider(IAuthenticationProvider):
                     username=row['username'],
                     display_name=row['display_name'],
                     email=row['email'],
-                    password_hash=row['password_hash'],
+                    password_hash=password_hash,
                     roles=roles,
                     permissions=permissions,
                     is_active=bool(row['is_active']),
@@ -356,10 +366,17 @@ class DatabaseAuthenticationProvider(IAuthenticationProvider):
 
 
 class DatabaseAuthorizationProvider(IAuthorizationProvider):
-    """基于数据库的授权提供者"""
+    """基于数据库的授权提供者
+
+    角色权限闭包（角色自身及所有继承角色的权限）一次性从数据库加载并预先计算，
+    角色被创建、更新或删除时失效。
+    """
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        self._role_closures: Optional[Dict[str, FrozenSet[Permission]]] = None
+        self._closure_generation = 0
+        self.closure_builds = 0
         self._init_database()
     
     def _init_database(self):
@@ -411,16 +428,13 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
         if user.has_permission(permission):
             return True
         
-        # 然后检查角色权限
+        # 然后检查角色权限（包括继承的）
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for role_name in user.roles:
-                    # 获取角色的所有权限（包括继承的）
-                    role_permissions = await self._get_role_permissions_recursive(role_name, conn)
-                    
-                    for role_permission in role_permissions:
-                        if role_permission.matches(permission):
-                            return True
+            closures = await self._get_role_closures()
+            for role_name in user.roles:
+                for role_permission in closures.get(role_name, ()):
+                    if role_permission.matches(permission):
+                        return True
             
             return False
         
@@ -433,10 +447,9 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
         permissions = set(user.permissions)  # 直接权限
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for role_name in user.roles:
-                    role_permissions = await self._get_role_permissions_recursive(role_name, conn)
-                    permissions.update(role_permissions)
+            closures = await self._get_role_closures()
+            for role_name in user.roles:
+                permissions.update(closures.get(role_name, ()))
             
             return permissions
         
@@ -444,6 +457,11 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
             logger.error(f"Error getting permissions for user {user.username}: {e}")
             return permissions
     
+    def invalidate_role_closures(self):
+        """使预计算的角色权限闭包失效"""
+        self._role_closures = None
+        self._closure_generation += 1
+    
     async def get_role(self, role_name: str) -> Optional[Role]:
         """获取角色信息"""
         try:
@@ -460,21 +478,7 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
                     "SELECT * FROM role_permissions WHERE role_name = ?",
                     (role_name,)
                 )
-                permissions = set()
-                for perm_row in cursor.fetchall():
-                    # 正确处理条件字段：从JSON字典转换为元组的元组
-                    conditions_dict = json.loads(perm_row['conditions'] or '{}')
-                    conditions_tuple = tuple(conditions_dict.items()) if conditions_dict else ()
-                    
-                    permission = Permission(
-                        name=perm_row['permission_name'],
-                        resource_type=ResourceType(perm_row['resource_type']),
-                        permission_type=PermissionType(perm_row['permission_type']),
-                        resource_id=perm_row['resource_id'],
-                        scope=perm_row['scope'],
-                        conditions=conditions_tuple
-                    )
-                    permissions.add(permission)
+                permissions = {_row_to_permission(perm_row) for perm_row in cursor.fetchall()}
                 
                 # 获取父角色
                 cursor = conn.execute(
@@ -543,6 +547,7 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
                         (role.name, parent_role)
                     )
                 
+                self.invalidate_role_closures()
                 return True
         
         except Exception as e:
@@ -591,6 +596,7 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
                         (role.name, parent_role)
                     )
                 
+                self.invalidate_role_closures()
                 return True
         
         except Exception as e:
@@ -602,49 +608,71 @@ class DatabaseAuthorizationProvider(IAuthorizationProvider):
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.execute("DELETE FROM roles WHERE name = ?", (role_name,))
+                self.invalidate_role_closures()
                 return True
         
         except Exception as e:
             logger.error(f"Error deleting role {role_name}: {e}")
             return False
     
-    async def _get_role_permissions_recursive(self, role_name: str, conn) -> Set[Permission]:
-        """递归获取角色权限（包括继承的）"""
-        permissions = set()
-        visited = set()
-        
-        def _collect_permissions(current_role: str):
-            if current_role in visited:
-                return  # 避免循环
-            
-            visited.add(current_role)
-            
-            # 获取当前角色的直接权限
-            cursor = conn.execute(
-                "SELECT * FROM role_permissions WHERE role_name = ?",
-                (current_role,)
-            )
-            for perm_row in cursor.fetchall():
-                permission = Permission(
-                    name=perm_row['permission_name'],
-                    resource_type=perm_row['resource_type'],
-                    permission_type=perm_row['permission_type'],
-                    resource_id=perm_row['resource_id'],
-                    scope=perm_row['scope'],
-                    conditions=json.loads(perm_row['conditions'] or '{}')
-                )
-                permissions.add(permission)
+    async def _get_role_closures(self) -> Dict[str, FrozenSet[Permission]]:
+        """获取所有角色的权限闭包，必要时在线程中重新计算"""
+        closures = self._role_closures
+        if closures is None:
+            generation = self._closure_generation
+            closures = await asyncio.to_thread(self._build_role_closures)
+            # 计算期间角色发生变化时不缓存过期结果
+            if generation == self._closure_generation:
+                self._role_closures = closures
+        return closures
+    
+    def _build_role_closures(self) -> Dict[str, FrozenSet[Permission]]:
+        """用两次查询加载全部角色权限和继承关系，计算每个角色的权限闭包"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            direct: Dict[str, Set[Permission]] = {}
+            for perm_row in conn.execute("SELECT * FROM role_permissions"):
+                direct.setdefault(perm_row['role_name'], set()).add(_row_to_permission(perm_row))
             
-            # 递归获取父角色权限
-            cursor = conn.execute(
-                "SELECT parent_role FROM role_hierarchy WHERE role_name = ?",
-                (current_role,)
-            )
-            for parent_row in cursor.fetchall():
-                _collect_permissions(parent_row[0])
+            parents: Dict[str, Set[str]] = {}
+            for row in conn.execute("SELECT role_name, parent_role FROM role_hierarchy"):
+                parents.setdefault(row['role_name'], set()).add(row['parent_role'])
         
-        _collect_permissions(role_name)
-        return permissions
+        closures: Dict[str, FrozenSet[Permission]] = {}
+        for role_name in set(direct) | set(parents):
+            permissions: Set[Permission] = set()
+            visited = set()
+            stack = [role_name]
+            while stack:
+                current_role = stack.pop()
+                if current_role in visited:
+                    continue  # 避免循环
+                visited.add(current_role)
+                permissions.update(direct.get(current_role, ()))
+                stack.extend(parents.get(current_role, ()))
+            closures[role_name] = frozenset(permissions)
+        
+        self.closure_builds += 1
+        return closures
+
+
+def _row_to_permission(perm_row: sqlite3.Row) -> Permission:
+    """由数据库行构建权限对象"""
+    # 正确处理条件字段：可能是JSON字典，也可能是元组序列化成的列表
+    conditions = json.loads(perm_row['conditions'] or '{}')
+    if isinstance(conditions, dict):
+        conditions_tuple = tuple(conditions.items())
+    else:
+        conditions_tuple = tuple(tuple(item) for item in conditions)
+    
+    return Permission(
+        name=perm_row['permission_name'],
+        resource_type=ResourceType(perm_row['resource_type']),
+        permission_type=PermissionType(perm_row['permission_type']),
+        resource_id=perm_row['resource_id'],
+        scope=perm_row['scope'],
+        conditions=conditions_tuple
+    )
 
 
 class FileSecurityAuditor(ISecurityAuditor):
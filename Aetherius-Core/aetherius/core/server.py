@@ -4,6 +4,7 @@ Server process controller for managing Minecraft server instances with a robust
 
 import asyncio
 import logging
+import time
 from enum import Enum, auto
 from pathlib import Path
 from typing import Any, Optional
@@ -13,12 +14,18 @@ import psutil
 from .config_models import ServerConfig
 from .event_manager import fire_event, get_event_manager
 from .events_base import (
+    PerformanceEvent,
     ServerCrashEvent,
     ServerLogEvent,
     ServerStartedEvent,
     ServerStateChangedEvent,
     ServerStoppedEvent,
 )
+from .jvm_telemetry import JvmTelemetry, gc_log_args, has_gc_logging, java_major_version
+from .log_buffer import LogLineBuffer
+from .log_parser import LogParser
+from .monitoring.collectors import InMemoryMetricsCollector
+from .output_capture import OutputCapture
 from .server_state import get_server_state
 
 logger = logging.getLogger(__name__)
@@ -40,8 +47,10 @@ class ServerController:
     This class handles starting, stopping, I/O, and health monitoring.
     """
 
-    def __init__(self, config: ServerConfig):
+    def __init__(self, config: ServerConfig, metrics: Optional[InMemoryMetricsCollector] = None):
         self.config = config
+        # Metrics store for JVM telemetry (the application's collector when given)
+        self.metrics = metrics
         self.process: Optional[asyncio.subprocess.Process] = None
         self._state: ServerState = ServerState.STOPPED
         self._tasks: list[asyncio.Task] = []
@@ -49,12 +58,31 @@ class ServerController:
         self.event_manager = get_event_manager()
         self.persistent_state = get_server_state()
         self._start_time: Optional[float] = None
+        self._log_buffer: Optional[LogLineBuffer] = None
+        self._open_log_streams = 0
+        self.output_capture = OutputCapture()
+        self.jvm_telemetry: Optional[JvmTelemetry] = None
+        # Log patterns for TPS reports and lag warnings, fired as performance events
+        self._performance_patterns = [
+            pattern for pattern in LogParser().patterns
+            if issubclass(pattern.event_type, PerformanceEvent)
+        ]
 
     @property
     def state(self) -> ServerState:
         """Get the current state of the server."""
         return self._state
 
+    @property
+    def is_alive(self) -> bool:
+        """Whether the server process is running."""
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def start_time(self) -> Optional[float]:
+        """Unix time the server process was started, if running."""
+        return self._start_time
+
     def _change_state(self, new_state: ServerState):
         """Atomically change the server state and fire an event."""
         if self._state == new_state:
@@ -83,14 +111,30 @@ class ServerController:
             self._change_state(ServerState.STOPPED)
             return False
 
+        work_dir = jar_path.parent
+        jvm_args = list(self.config.jvm_args)
+        gc_log_path: Optional[Path] = None
+        if self.config.jvm_telemetry and not has_gc_logging(jvm_args):
+            java_version = await java_major_version("java")
+            if java_version is not None and java_version >= 9:
+                # Relative to the server directory: -Xlog treats ':' as a separator
+                gc_log = Path("logs") / "aetherius-gc.log"
+                (work_dir / gc_log.parent).mkdir(parents=True, exist_ok=True)
+                jvm_args += gc_log_args(gc_log.as_posix())
+                gc_log_path = work_dir / gc_log
+            else:
+                logger.info(
+                    f"Java {java_version or 'version unknown'}: GC pause logging needs Java 9+, "
+                    "GC telemetry will come from jstat only"
+                )
+
         cmd = [
             "java",
-            *self.config.jvm_args,
+            *jvm_args,
             "-jar",
             str(jar_path.resolve()),
             "--nogui",
         ]
-        work_dir = jar_path.parent
 
         try:
             import time
@@ -130,6 +174,16 @@ class ServerController:
             self._psutil_process = psutil.Process(self.process.pid)
             logger.info(f"Server process started with PID: {self.process.pid}")
 
+            if self.config.jvm_telemetry:
+                self.jvm_telemetry = JvmTelemetry(
+                    self.process.pid,
+                    gc_log_path=gc_log_path,
+                    metrics=self.metrics,
+                    poll_interval=self.config.jvm_telemetry_interval,
+                    started_at=self._start_time,
+                )
+                await self.jvm_telemetry.start()
+
             # Record server start in persistent state
             self.persistent_state.set_server_started(
                 pid=self.process.pid,
@@ -137,8 +191,15 @@ class ServerController:
                 working_directory=str(work_dir.resolve())
             )
 
+            self._log_buffer = LogLineBuffer(
+                capacity=self.config.log_buffer_size,
+                batch_size=self.config.log_batch_size,
+                policy=self.config.log_overflow_policy,
+            )
+            self._open_log_streams = 2
             self._tasks.append(asyncio.create_task(self._read_stdout()))
             self._tasks.append(asyncio.create_task(self._read_stderr()))
+            self._tasks.append(asyncio.create_task(self._dispatch_log_lines()))
             self._tasks.append(asyncio.create_task(self._monitor_process()))
             self._tasks.append(asyncio.create_task(self._process_command_queue()))
 
@@ -268,56 +329,32 @@ class ServerController:
             }
 
     async def _execute_with_log_monitoring(self, command: str, timeout: float, start_time: float) -> dict:
-        """通过IO管道发送命令并监控日志获取输出"""
-        import asyncio
-        
-        # 设置日志监控
-        command_output = []
-        command_sent_time = None
-        
-        def log_handler(event):
-            nonlocal command_output, command_sent_time
-            if command_sent_time and hasattr(event, 'message'):
-                # 捕获命令执行后的日志输出
-                if time.time() - command_sent_time < 5.0:  # 5秒内的日志
-                    command_output.append(event.message)
-        
-        # 注册临时日志监听器
-        self.event_manager.register_listener("ServerLogEvent", log_handler)
-        
-        try:
-            # 发送命令
-            command_sent_time = time.time()
-            success = await self.send_command(command)
-            
-            if not success:
-                return {
-                    "success": False,
-                    "error": "Failed to send command to server",
-                    "output": "",
-                    "execution_time": time.time() - start_time,
-                }
-            
-            # 等待日志输出
-            await asyncio.sleep(2.0)  # 等待2秒收集日志
-            
-            # 处理收集到的日志
-            output = self._parse_command_output(command, command_output)
-            execution_time = time.time() - start_time
-            
+        """通过IO管道发送命令，并在匹配到响应行时立即返回输出"""
+        # 先登记再发送，避免响应行先于登记到达
+        pending = self.output_capture.expect(command)
+
+        success = await self.send_command(command)
+        if not success:
+            self.output_capture.cancel(pending)
             return {
-                "success": True,
-                "error": None,
-                "output": output if output else f"命令 '{command}' 已发送至服务器",
-                "execution_time": execution_time,
+                "success": False,
+                "error": "Failed to send command to server",
+                "output": "",
+                "execution_time": time.time() - start_time,
             }
-            
-        finally:
-            # 清理日志监听器
-            try:
-                self.event_manager.unregister_listener("ServerLogEvent", log_handler)
-            except:
-                pass
+
+        # Commands with a response signature (e.g. "save-all flush") may take
+        # longer than the idle cap; they return as soon as the line arrives
+        wait_timeout = timeout if pending.known else min(timeout, 5.0)
+        output = await self.output_capture.wait(pending, timeout=wait_timeout)
+        execution_time = time.time() - start_time
+
+        return {
+            "success": True,
+            "error": None,
+            "output": output if output else f"命令 '{command}' 已发送至服务器",
+            "execution_time": execution_time,
+        }
 
     async def _execute_cross_process_command(self, command: str, timeout: float, start_time: float) -> dict:
         """跨进程命令执行"""
@@ -325,8 +362,7 @@ class ServerController:
             from .command_queue import get_command_queue
             
             command_queue = get_command_queue()
-            command_id = command_queue.add_command(command)
-            result = await command_queue.wait_for_completion(command_id, timeout)
+            result = await command_queue.submit(command, timeout)
             
             execution_time = time.time() - start_time
             
@@ -345,68 +381,73 @@ class ServerController:
                 "execution_time": execution_time,
             }
 
-    def _parse_command_output(self, command: str, log_lines: list) -> str:
-        """解析命令输出日志"""
-        if not log_lines:
-            return ""
-        
-        # 根据命令类型解析相应的输出
-        if command == "list":
-            # 查找玩家列表输出
-            for line in log_lines:
-                if "players online:" in line.lower():
-                    return line.strip()
-        elif command.startswith("time query"):
-            # 查找时间查询输出
-            for line in log_lines:
-                if "time is" in line.lower() or "daytime" in line.lower():
-                    return line.strip()
-        elif command == "difficulty":
-            # 查找难度输出
-            for line in log_lines:
-                if "difficulty" in line.lower():
-                    return line.strip()
-        elif command.startswith("weather"):
-            # 查找天气输出
-            for line in log_lines:
-                if "weather" in line.lower() or "clear" in line.lower() or "rain" in line.lower():
-                    return line.strip()
-        
-        # 返回最后几行相关的日志
-        relevant_lines = [line for line in log_lines if line.strip()]
-        return "\n".join(relevant_lines[-3:]) if relevant_lines else ""
-
     async def _read_stdout(self):
-        """Continuously read and process stdout from the server."""
-        while self.process and self.process.stdout and not self.process.stdout.at_eof():
-            try:
-                line_bytes = await self.process.stdout.readline()
-                if not line_bytes:
-                    break
-                line = line_bytes.decode("utf-8", errors="replace").strip()
-                if line:
-                    await fire_event(ServerLogEvent(level="INFO", message=line, line=line))
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error reading stdout: {e}")
-                break
+        """Continuously drain stdout from the server into the log buffer."""
+        await self._read_stream(self.process.stdout if self.process else None, "INFO")
 
     async def _read_stderr(self):
-        """Continuously read and process stderr from the server."""
-        while self.process and self.process.stderr and not self.process.stderr.at_eof():
+        """Continuously drain stderr from the server into the log buffer."""
+        await self._read_stream(self.process.stderr if self.process else None, "ERROR")
+
+    async def _read_stream(
+        self, stream: Optional[asyncio.StreamReader], level: str
+    ) -> None:
+        """
+        Read lines from a process stream into the log buffer.
+
+        Buffering never blocks, so the pipe is drained as fast as the server
+        writes to it regardless of how slow event listeners are.
+        """
+        buffer = self._log_buffer
+        try:
+            while stream and buffer and not stream.at_eof():
+                try:
+                    line_bytes = await stream.readline()
+                    if not line_bytes:
+                        break
+                    line = line_bytes.decode("utf-8", errors="replace").strip()
+                    if line:
+                        # Command responses are matched here rather than in
+                        # the dispatcher so they never wait behind listeners
+                        self.output_capture.process_line(line)
+                        buffer.put_nowait(level, line)
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Error reading {level.lower()} stream: {e}")
+                    break
+        finally:
+            self._open_log_streams -= 1
+            if buffer and self._open_log_streams <= 0:
+                buffer.close()
+
+    async def _dispatch_log_lines(self):
+        """
+        Fire ServerLogEvent for buffered output lines, one batch at a time.
+
+        Lines matching a performance pattern (TPS reports, "Can't keep up!")
+        also fire the parsed TickTimeEvent or LagSpikeEvent.
+        """
+        buffer = self._log_buffer
+        if not buffer:
+            return
+        while True:
             try:
-                line_bytes = await self.process.stderr.readline()
-                if not line_bytes:
+                batch = await buffer.get_batch()
+                if not batch:
                     break
-                line = line_bytes.decode("utf-8", errors="replace").strip()
-                if line:
-                    await fire_event(ServerLogEvent(level="ERROR", message=line, line=line))
+                for level, line in batch:
+                    await fire_event(ServerLogEvent(level=level, message=line, line=line))
+                    for pattern in self._performance_patterns:
+                        if pattern.is_candidate(line):
+                            event = pattern.try_parse(line)
+                            if event:
+                                await fire_event(event)
+                                break
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error reading stderr: {e}")
-                break
+                logger.error(f"Error dispatching server log lines: {e}")
 
     async def _monitor_process(self):
         """Wait for the process to exit and handle the result."""
@@ -436,6 +477,9 @@ class ServerController:
 
     async def _cleanup_tasks(self):
         """Cancel and clean up all background tasks."""
+        if self.jvm_telemetry is not None:
+            await self.jvm_telemetry.stop()
+
         # Get current task to avoid cancelling ourselves
         current_task = asyncio.current_task()
         
@@ -453,12 +497,12 @@ class ServerController:
         self._tasks.clear()
 
     def get_performance_metrics(self) -> dict[str, Any]:
-        """Get performance metrics using psutil."""
+        """Get performance metrics using psutil, plus log pipeline counters."""
         if not self._psutil_process or not self._psutil_process.is_running():
             return {}
         try:
             with self._psutil_process.oneshot():
-                return {
+                metrics = {
                     "cpu_percent": self._psutil_process.cpu_percent(),
                     "memory_mb": self._psutil_process.memory_info().rss / (1024 * 1024),
                     "threads": self._psutil_process.num_threads(),
@@ -466,63 +510,48 @@ class ServerController:
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return {}
 
+        if self._log_buffer:
+            metrics["log_pipeline"] = self._log_buffer.get_stats()
+        if self.jvm_telemetry:
+            metrics["jvm"] = self.jvm_telemetry.get_jvm_metrics()
+        return metrics
+
+    async def _execute_queued_command(self, command: str, timeout: float) -> dict[str, Any]:
+        """Execute a command received from another process and capture its output."""
+        return await self._execute_with_log_monitoring(command, timeout, time.time())
+
     async def _process_command_queue(self):
-        """处理命令队列中的命令"""
+        """处理跨进程命令：优先使用命令套接字，文件队列作为后备"""
         try:
             from .command_queue import get_command_queue
-            
+
             command_queue = get_command_queue()
-            
-            while self.state == ServerState.RUNNING:
-                try:
-                    # 检查待处理的命令
-                    pending_commands = command_queue.get_pending_commands()
-                    
-                    for command_data in pending_commands:
-                        command_id = command_data["id"]
-                        command = command_data["command"]
-                        
-                        logger.info(f"处理队列命令: {command} (ID: {command_id})")
-                        
-                        try:
-                            # 通过IO管道发送命令
-                            success = await self.send_command(command)
-                            
-                            if success:
-                                # 等待一段时间收集日志输出
-                                await asyncio.sleep(1.0)
-                                
-                                # 标记命令完成（简化版本，实际的输出会通过日志事件处理）
-                                command_queue.mark_command_completed(
-                                    command_id,
-                                    success=True,
-                                    output=f"命令 '{command}' 已通过IO管道执行"
-                                )
-                            else:
-                                command_queue.mark_command_completed(
-                                    command_id,
-                                    success=False,
-                                    error="命令发送失败"
-                                )
-                                
-                        except Exception as e:
-                            logger.error(f"执行队列命令 {command} 失败: {e}")
-                            command_queue.mark_command_completed(
-                                command_id,
-                                success=False,
-                                error=str(e)
+
+            try:
+                await command_queue.start_server(self._execute_queued_command)
+            except OSError as e:
+                logger.warning(f"无法启动命令套接字，仅使用文件队列: {e}")
+
+            try:
+                while self.state in (ServerState.STARTING, ServerState.RUNNING):
+                    try:
+                        if self.state == ServerState.RUNNING:
+                            await command_queue.process_pending(
+                                self._execute_queued_command
                             )
-                    
-                    # 清理旧文件
-                    command_queue.cleanup_old_files(max_age_seconds=300)
-                    
-                    # 短暂等待后继续检查队列
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"命令队列处理错误: {e}")
-                    await asyncio.sleep(1.0)
-                    
+
+                            # 清理旧文件
+                            command_queue.cleanup_old_files(max_age_seconds=300)
+
+                        # 短暂等待后继续检查队列
+                        await asyncio.sleep(0.5)
+
+                    except Exception as e:
+                        logger.error(f"命令队列处理错误: {e}")
+                        await asyncio.sleep(1.0)
+            finally:
+                await command_queue.stop_server()
+
         except ImportError:
             logger.warning("命令队列模块不可用，跳过队列处理")
         except asyncio.CancelledError:
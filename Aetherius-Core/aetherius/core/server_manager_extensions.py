@@ -10,16 +10,37 @@ import logging
 import time
 from collections.abc import Callable
 from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
 import psutil
 
-from .server import ServerProcessWrapper
+from .backup_store import get_backup_store
+from .event_manager import get_event_manager
+from .events_base import TickTimeEvent
+from .file_index import directory_size, find_file_index
+from .server import ServerController, ServerState
+from .timeseries_store import TimeSeriesStore
+from .world_capture import get_world_capture
 
 logger = logging.getLogger(__name__)
 
+# 持久化到时序存储的性能指标列
+PERFORMANCE_COLUMNS = (
+    "tps",
+    "player_count",
+    "cpu_percent",
+    "memory_mb",
+    "memory_percent",
+    "disk_usage_mb",
+    "network_sent_mb",
+    "network_recv_mb",
+    "thread_count",
+    "file_descriptors",
+    "uptime_seconds",
+)
+
 
 @dataclass
 class ServerPerformanceMetrics:
@@ -35,6 +56,8 @@ class ServerPerformanceMetrics:
     thread_count: int
     file_descriptors: int
     uptime_seconds: float
+    tps: Optional[float] = None  # 服务器最近一次 TPS 报告（如 Paper 的 tps 命令），未报告时为 None
+    player_count: int = 0
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典格式"""
@@ -42,6 +65,10 @@ class ServerPerformanceMetrics:
         data["timestamp"] = self.timestamp.isoformat()
         return data
 
+    def to_values(self) -> dict[str, Optional[float]]:
+        """时序存储的列值"""
+        return {name: getattr(self, name) for name in PERFORMANCE_COLUMNS}
+
 
 @dataclass
 class ServerStatus:
@@ -95,21 +122,29 @@ class PlayerInfo:
 class ServerManagerExtensions:
     """服务器管理器扩展类"""
 
-    def __init__(self, server_wrapper: ServerProcessWrapper):
+    def __init__(self, server_wrapper: ServerController):
         """
         初始化服务器管理扩展
 
         Args:
-            server_wrapper: 服务器进程包装器
+            server_wrapper: 服务器控制器
         """
         self.server_wrapper = server_wrapper
         self.config = server_wrapper.config
-
-        # 性能监控
-        self._performance_history: list[ServerPerformanceMetrics] = []
-        self._max_history_entries = 1000
+        # 服务器目录即服务器 jar 所在目录（与 ServerController 的工作目录一致）
+        self.server_directory = Path(self.config.jar_path).parent
+
+        # 性能监控：样本写入磁盘上的时序存储，按 10 秒 / 1 分钟 / 10 分钟汇总，
+        # 各层按保留期清理，重启后历史仍可查询
+        self._performance_store = TimeSeriesStore(
+            self.server_directory / "data" / "performance.db",
+            PERFORMANCE_COLUMNS,
+        )
         self._monitoring_interval = 30  # 秒
         self._monitoring_task: Optional[asyncio.Task] = None
+        # 最近一次从服务器输出解析到的 TPS
+        self._last_tps: Optional[float] = None
+        self._tps_listener = None
 
         # 状态缓存
         self._cached_status: Optional[ServerStatus] = None
@@ -132,6 +167,12 @@ class ServerManagerExtensions:
         self._backup_enabled = False
         self._backup_interval = 3600  # 1小时
         self._backup_task: Optional[asyncio.Task] = None
+        self._backup_keep_last: Optional[int] = None
+        # 内容寻址的增量备份存储，未变化的数据块只保存一次
+        # 备份读取的世界镜像，仅在同步镜像期间暂停自动保存
+        # 两者按服务器目录共享，管理 API 创建的快照在这里同样可见
+        self._backup_store = get_backup_store(self.server_directory)
+        self._world_capture = get_world_capture(self.server_directory)
 
         logger.info("Server manager extensions initialized")
 
@@ -141,9 +182,16 @@ class ServerManagerExtensions:
             logger.warning("Monitoring already running")
             return
 
+        self._tps_listener = get_event_manager().register_listener(
+            TickTimeEvent, self._on_tick_time
+        )
         self._monitoring_task = asyncio.create_task(self._monitoring_loop())
         logger.info("Performance monitoring started")
 
+    def _on_tick_time(self, event: TickTimeEvent):
+        """记录服务器报告的 TPS"""
+        self._last_tps = event.tps
+
     async def stop_monitoring(self):
         """停止性能监控"""
         if self._monitoring_task:
@@ -153,9 +201,18 @@ class ServerManagerExtensions:
             except asyncio.CancelledError:
                 pass
             self._monitoring_task = None
+        if self._tps_listener:
+            get_event_manager().unregister_listener(self._tps_listener)
+            self._tps_listener = None
 
         logger.info("Performance monitoring stopped")
 
+    async def close(self):
+        """停止监控与自动备份，并关闭性能历史数据库"""
+        await self.stop_monitoring()
+        await self.disable_auto_backup()
+        await asyncio.to_thread(self._performance_store.close)
+
     async def _monitoring_loop(self):
         """监控循环"""
         while True:
@@ -163,11 +220,9 @@ class ServerManagerExtensions:
                 if self.server_wrapper.is_alive:
                     metrics = await self._collect_performance_metrics()
                     if metrics:
-                        self._performance_history.append(metrics)
-
-                        # 限制历史记录大小
-                        if len(self._performance_history) > self._max_history_entries:
-                            self._performance_history.pop(0)
+                        await self._performance_store.append(
+                            metrics.timestamp.timestamp(), metrics.to_values()
+                        )
 
                         # 通知回调函数
                         for callback in self._performance_callbacks:
@@ -199,13 +254,15 @@ class ServerManagerExtensions:
             memory_mb = memory_info.rss / 1024 / 1024
             memory_percent = process.memory_percent()
 
-            # 磁盘使用（服务器目录）
-            server_dir = Path(self.config.server_directory)
+            # 磁盘使用（服务器目录）：优先读取文件索引，否则在线程中遍历
+            server_dir = self.server_directory
             disk_usage = 0
             if server_dir.exists():
-                for file_path in server_dir.rglob("*"):
-                    if file_path.is_file():
-                        disk_usage += file_path.stat().st_size
+                index = find_file_index(server_dir, sizes=True)
+                usage = index.usage(index.relative(server_dir)) if index else None
+                if usage is None:
+                    usage = await asyncio.to_thread(directory_size, server_dir)
+                disk_usage = usage["total_size"]
             disk_usage_mb = disk_usage / 1024 / 1024
 
             # 网络信息
@@ -231,6 +288,8 @@ class ServerManagerExtensions:
                 thread_count=thread_count,
                 file_descriptors=file_descriptors,
                 uptime_seconds=uptime_seconds,
+                tps=self._last_tps,
+                player_count=len(self._online_players),
             )
 
         except Exception as e:
@@ -261,14 +320,8 @@ class ServerManagerExtensions:
         try:
             # 基本状态
             is_running = self.server_wrapper.is_alive
-            is_starting = (
-                hasattr(self.server_wrapper, "_starting")
-                and self.server_wrapper._starting
-            )
-            is_stopping = (
-                hasattr(self.server_wrapper, "_stopping")
-                and self.server_wrapper._stopping
-            )
+            is_starting = self.server_wrapper.state == ServerState.STARTING
+            is_stopping = self.server_wrapper.state == ServerState.STOPPING
 
             start_time = None
             uptime_seconds = 0
@@ -333,7 +386,7 @@ class ServerManagerExtensions:
     async def _read_server_properties(self) -> dict[str, str]:
         """读取服务器属性文件"""
         try:
-            properties_file = Path(self.config.server_directory) / "server.properties"
+            properties_file = self.server_directory / "server.properties"
             if not properties_file.exists():
                 return {}
 
@@ -375,10 +428,9 @@ class ServerManagerExtensions:
         start_time = time.time()
 
         try:
-            # 通过命令队列执行命令
-            command_id = self.server_wrapper.command_queue.add_command(command)
-            result = await self.server_wrapper.command_queue.wait_for_completion(
-                command_id, timeout
+            # 由服务器控制器执行：直接写入标准输入，或经命令队列发往服务器进程
+            result = await self.server_wrapper.execute_command_with_result(
+                command, timeout
             )
 
             execution_time = time.time() - start_time
@@ -396,9 +448,9 @@ class ServerManagerExtensions:
                 self._command_history.pop(0)
 
             return {
-                "success": result.get("status") == "completed",
+                "success": bool(result.get("success")),
                 "error": result.get("error"),
-                "output": result.get("output", ""),
+                "output": result.get("output") or "",
                 "execution_time": execution_time,
             }
 
@@ -451,6 +503,35 @@ class ServerManagerExtensions:
             logger.error(f"Error getting online players: {e}")
             return []
 
+    async def get_performance_series(
+        self,
+        hours: float = 24,
+        metrics: Optional[list[str]] = None,
+        max_points: int = 1000,
+        extremes: bool = False,
+    ) -> dict[str, Any]:
+        """
+        获取性能历史的列数组，供图表直接使用
+
+        根据时间范围和 max_points 自动选择原始样本或 10 秒 / 1 分钟 / 10 分钟汇总；
+        汇总数据的值为桶内平均值，时间戳为桶起点（Unix 时间）。
+
+        Args:
+            hours: 获取多少小时的数据
+            metrics: 指标列名列表，None 表示全部
+            max_points: 返回点数的目标上限
+            extremes: 是否同时返回每个桶的 <列>_min / <列>_max
+
+        Returns:
+            {"resolution", "timestamp": [...], <列>: [...], ...}
+        """
+        return await self._performance_store.query(
+            time.time() - hours * 3600,
+            columns=metrics,
+            max_points=max_points,
+            extremes=extremes,
+        )
+
     async def get_performance_history(
         self, hours: int = 24, metric: str = None
     ) -> list[dict[str, Any]]:
@@ -462,23 +543,19 @@ class ServerManagerExtensions:
             metric: 指定指标类型
 
         Returns:
-            性能数据列表
+            性能数据列表（长时间范围返回汇总后的平均值）
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-
-        history = []
-        for metrics in self._performance_history:
-            if metrics.timestamp >= cutoff_time:
-                data = metrics.to_dict()
-                if metric and metric in data:
-                    # 只返回指定指标
-                    history.append(
-                        {"timestamp": data["timestamp"], metric: data[metric]}
-                    )
-                else:
-                    history.append(data)
-
-        return history
+        columns = [metric] if metric in PERFORMANCE_COLUMNS else None
+        series = await self.get_performance_series(hours, columns)
+
+        names = columns or list(PERFORMANCE_COLUMNS)
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(row[0]).isoformat(),
+                **dict(zip(names, row[1:], strict=True)),
+            }
+            for row in zip(series["timestamp"], *(series[name] for name in names), strict=True)
+        ]
 
     async def get_command_history(self, limit: int = 100) -> list[dict[str, Any]]:
         """
@@ -500,6 +577,10 @@ class ServerManagerExtensions:
         """
         创建服务器备份
 
+        备份以快照形式写入内容寻址存储：世界文件被切分为数据块，只有新的
+        数据块会被写入，大小和修改时间未变的文件直接复用上一个快照。
+        快照取自世界镜像，自动保存只在同步镜像的几秒内暂停。
+
         Args:
             backup_name: 备份名称
 
@@ -510,21 +591,7 @@ class ServerManagerExtensions:
             if not backup_name:
                 backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-            # 执行保存命令
-            save_result = await self.execute_command_with_result("save-all")
-            if not save_result["success"]:
-                return {
-                    "success": False,
-                    "error": "Failed to save world before backup",
-                    "backup_name": backup_name,
-                }
-
-            # 创建备份目录
-            backups_dir = Path(self.config.server_directory) / "backups"
-            backups_dir.mkdir(exist_ok=True)
-
-            backup_path = backups_dir / f"{backup_name}.zip"
-            world_path = Path(self.config.server_directory) / "world"
+            world_path = self.server_directory / "world"
 
             if not world_path.exists():
                 return {
@@ -533,28 +600,33 @@ class ServerManagerExtensions:
                     "backup_name": backup_name,
                 }
 
-            # 使用文件管理器创建压缩包
-            from .file_manager import FileManager
-
-            file_manager = FileManager(self.config.server_directory)
+            async with self._world_capture.lock:
+                # save-off、save-all flush 并等待 "Saved the game"，同步镜像后立即 save-on
+                if self.server_wrapper.is_alive:
+                    capture = await self._world_capture.capture_frozen(self, world_path)
+                else:
+                    capture = await asyncio.to_thread(self._world_capture.capture, world_path)
 
-            success = file_manager.create_archive(world_path, backup_path, "zip")
+                # 在工作线程中对冻结的镜像分块、哈希并写入新数据块
+                info = await asyncio.to_thread(
+                    self._backup_store.create_snapshot,
+                    self._world_capture.staging_path(world_path),
+                    backup_name,
+                )
 
-            if success:
-                backup_size = backup_path.stat().st_size
-                return {
-                    "success": True,
-                    "backup_name": backup_name,
-                    "backup_path": str(backup_path),
-                    "backup_size": backup_size,
-                    "created_at": datetime.now().isoformat(),
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "Failed to create backup archive",
-                    "backup_name": backup_name,
-                }
+            return {
+                "success": True,
+                "backup_name": backup_name,
+                "backup_path": str(self._backup_store.root),
+                "backup_size": info.stats.bytes_written,
+                "world_size": info.stats.total_size,
+                "changed_files": info.stats.files - info.stats.unchanged_files,
+                "new_chunks": info.stats.new_chunks,
+                "duration": info.stats.duration,
+                "save_paused_seconds": capture.frozen_seconds,
+                "save_confirmed": capture.save_confirmed,
+                "created_at": info.created_at,
+            }
 
         except Exception as e:
             logger.error(f"Error creating backup: {e}")
@@ -565,27 +637,38 @@ class ServerManagerExtensions:
             }
 
     async def list_backups(self) -> list[dict[str, Any]]:
-        """列出所有备份"""
+        """列出所有备份（增量快照和旧的zip备份）"""
         try:
-            backups_dir = Path(self.config.server_directory) / "backups"
-            if not backups_dir.exists():
-                return []
-
             backups = []
-            for backup_file in backups_dir.glob("*.zip"):
-                stat = backup_file.stat()
+            for info in await asyncio.to_thread(self._backup_store.list_snapshots):
                 backups.append(
                     {
-                        "name": backup_file.stem,
-                        "filename": backup_file.name,
-                        "size": stat.st_size,
-                        "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        "modified_at": datetime.fromtimestamp(
-                            stat.st_mtime
-                        ).isoformat(),
+                        "name": info.name,
+                        "type": "snapshot",
+                        "size": info.stats.bytes_written,
+                        "world_size": info.stats.total_size,
+                        "files": info.stats.files,
+                        "created_at": info.created_at,
                     }
                 )
 
+            backups_dir = self.server_directory / "backups"
+            if backups_dir.exists():
+                for backup_file in backups_dir.glob("*.zip"):
+                    stat = backup_file.stat()
+                    backups.append(
+                        {
+                            "name": backup_file.stem,
+                            "type": "zip",
+                            "filename": backup_file.name,
+                            "size": stat.st_size,
+                            "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                            "modified_at": datetime.fromtimestamp(
+                                stat.st_mtime
+                            ).isoformat(),
+                        }
+                    )
+
             # 按创建时间排序（最新的在前）
             backups.sort(key=lambda x: x["created_at"], reverse=True)
             return backups
@@ -612,25 +695,32 @@ class ServerManagerExtensions:
                     "error": "Cannot restore backup while server is running",
                 }
 
-            backups_dir = Path(self.config.server_directory) / "backups"
+            backups_dir = self.server_directory / "backups"
             backup_path = backups_dir / f"{backup_name}.zip"
+            is_snapshot = self._backup_store.has_snapshot(backup_name)
 
-            if not backup_path.exists():
+            if not is_snapshot and not backup_path.exists():
                 return {"success": False, "error": f"Backup {backup_name} not found"}
 
-            world_path = Path(self.config.server_directory) / "world"
+            world_path = self.server_directory / "world"
 
             # 备份当前世界（如果存在）
             if world_path.exists():
                 backup_current = world_path.parent / f"world_backup_{int(time.time())}"
                 world_path.rename(backup_current)
 
-            # 使用文件管理器解压备份
-            from .file_manager import FileManager
+            if is_snapshot:
+                await asyncio.to_thread(
+                    self._backup_store.restore_snapshot, backup_name, world_path
+                )
+                success = True
+            else:
+                # 使用文件管理器解压旧的zip备份
+                from .file_manager import FileManager
 
-            file_manager = FileManager(self.config.server_directory)
+                file_manager = FileManager(self.server_directory)
 
-            success = file_manager.extract_archive(backup_path, world_path.parent)
+                success = file_manager.extract_archive(backup_path, world_path.parent)
 
             if success:
                 return {
@@ -645,6 +735,44 @@ class ServerManagerExtensions:
             logger.error(f"Error restoring backup {backup_name}: {e}")
             return {"success": False, "error": str(e)}
 
+    async def delete_backup(self, backup_name: str) -> dict[str, Any]:
+        """
+        删除备份快照并回收不再被引用的数据块
+
+        Args:
+            backup_name: 备份名称
+
+        Returns:
+            删除结果
+        """
+        try:
+            if not await asyncio.to_thread(self._backup_store.delete_snapshot, backup_name):
+                return {"success": False, "error": f"Backup {backup_name} not found"}
+            gc_result = await asyncio.to_thread(self._backup_store.garbage_collect)
+            return {"success": True, "backup_name": backup_name, **gc_result}
+
+        except Exception as e:
+            logger.error(f"Error deleting backup {backup_name}: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def prune_backups(self, keep_last: int) -> dict[str, Any]:
+        """
+        只保留最新的若干个快照，并回收不再被引用的数据块
+
+        Args:
+            keep_last: 保留的快照数量
+
+        Returns:
+            清理结果
+        """
+        try:
+            deleted = await asyncio.to_thread(self._backup_store.prune, keep_last)
+            return {"success": True, "deleted": deleted}
+
+        except Exception as e:
+            logger.error(f"Error pruning backups: {e}")
+            return {"success": False, "error": str(e)}
+
     def add_status_change_callback(self, callback: Callable):
         """添加状态变更回调函数"""
         self._status_change_callbacks.append(callback)
@@ -663,15 +791,19 @@ class ServerManagerExtensions:
         if callback in self._performance_callbacks:
             self._performance_callbacks.remove(callback)
 
-    async def enable_auto_backup(self, interval_hours: int = 1):
+    async def enable_auto_backup(
+        self, interval_hours: int = 1, keep_last: Optional[int] = None
+    ):
         """
         启用自动备份
 
         Args:
             interval_hours: 备份间隔（小时）
+            keep_last: 每次备份后保留的快照数量，None表示全部保留
         """
         self._backup_enabled = True
         self._backup_interval = interval_hours * 3600  # 转换为秒
+        self._backup_keep_last = keep_last
 
         if self._backup_task and not self._backup_task.done():
             self._backup_task.cancel()
@@ -705,6 +837,8 @@ class ServerManagerExtensions:
 
                     if result["success"]:
                         logger.info(f"Auto backup created: {backup_name}")
+                        if self._backup_keep_last is not None:
+                            await self.prune_backups(self._backup_keep_last)
                     else:
                         logger.error(f"Auto backup failed: {result.get('error')}")
 
@@ -719,13 +853,14 @@ class ServerManagerExtensions:
     def get_statistics(self) -> dict[str, Any]:
         """获取扩展统计信息"""
         return {
-            "performance_entries": len(self._performance_history),
+            "performance_store": self._performance_store.get_stats(),
             "command_history_entries": len(self._command_history),
             "online_players": len(self._online_players),
             "monitoring_enabled": self._monitoring_task is not None
             and not self._monitoring_task.done(),
             "auto_backup_enabled": self._backup_enabled,
             "backup_interval_hours": self._backup_interval / 3600,
+            "backup_keep_last": self._backup_keep_last,
             "status_callbacks": len(self._status_change_callbacks),
             "performance_callbacks": len(self._performance_callbacks),
         }
@@ -0,0 +1,294 @@
+"""Fan-out of stream messages to subscribers through bounded per-subscriber queues."""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+from .latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """What happens when a subscriber's queue is full."""
+
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message (console/log traffic)
+    # Tolerate a full queue for up to stall_timeout, discarding the oldest
+    # message per publish like DROP_OLDEST (counted in "dropped"), then
+    # disconnect the subscriber
+    DISCONNECT = "disconnect"
+
+
+class _Message:
+    __slots__ = ("data", "encoded", "published_at")
+
+    def __init__(self, data: Any, encoded: str | None, published_at: float):
+        self.data = data
+        self.encoded = encoded
+        self.published_at = published_at
+
+
+class StreamSubscriber:
+    """
+    One subscriber with its own bounded queue and writer task.
+
+    The writer delivers queued messages to the callback in order, so a slow
+    callback only delays its own queue, never the publisher or other
+    subscribers.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        encoded: bool,
+        policy: OverflowPolicy,
+        max_queue: int,
+        stall_timeout: float,
+        on_disconnect: Callable[["StreamSubscriber"], None],
+    ):
+        self.callback = callback
+        self.encoded = encoded
+        self.policy = policy
+        self.max_queue = max_queue
+        self.stall_timeout = stall_timeout
+        self._on_disconnect = on_disconnect
+        self._is_coroutine = asyncio.iscoroutinefunction(callback)
+        self._queue: deque[_Message] = deque()
+        self._ready: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._full_since: float | None = None
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency = LatencyHistogram()
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be delivered."""
+        return len(self._queue)
+
+    def offer(self, message: _Message) -> None:
+        """
+        Queue a message without blocking; applies the overflow policy.
+
+        A full queue always loses its oldest message. Under DISCONNECT this
+        continues only until the queue has been full for stall_timeout, at
+        which point the subscriber is closed and removed.
+        """
+        if self.closed:
+            return
+        if self._task is None:
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._writer())
+
+        if len(self._queue) >= self.max_queue:
+            now = time.monotonic()
+            if self.policy is OverflowPolicy.DISCONNECT:
+                if self._full_since is None:
+                    self._full_since = now
+                elif now - self._full_since >= self.stall_timeout:
+                    logger.warning(
+                        f"Disconnecting stream subscriber {self.callback!r}: "
+                        f"queue full for {now - self._full_since:.1f}s"
+                    )
+                    self.close()
+                    self._on_disconnect(self)
+                    return
+            self._queue.popleft()
+            self.dropped += 1
+        else:
+            self._full_since = None
+
+        self._queue.append(message)
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        self._ready.set()
+
+    async def _writer(self) -> None:
+        while not self.closed:
+            if not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            message = self._queue.popleft()
+            payload = message.encoded if self.encoded else message.data
+            try:
+                if self._is_coroutine:
+                    await self.callback(payload)
+                else:
+                    self.callback(payload)
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error in stream callback: {e}")
+            self.latency.record(time.monotonic() - message.published_at)
+            if len(self._queue) < self.max_queue:
+                self._full_since = None
+
+    def close(self) -> None:
+        """Stop the writer and discard queued messages."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Queue and delivery counters of this subscriber."""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class StreamBroadcaster:
+    """
+    Publishes messages of one stream to all of its subscribers.
+
+    publish() only appends to subscriber queues, so it never waits on a
+    callback. Subscribers registered with encoded=True receive the message
+    as a JSON string that is built once per publish and shared by all of
+    them.
+    """
+
+    def __init__(
+        self,
+        policy: OverflowPolicy = OverflowPolicy.DISCONNECT,
+        max_queue: int = 256,
+        stall_timeout: float = 30.0,
+        encoder: Callable[[Any], str] = lambda data: json.dumps(data, default=str),
+    ):
+        """
+        Args:
+            policy: Default overflow policy for new subscribers
+            max_queue: Messages buffered per subscriber
+            stall_timeout: Seconds a DISCONNECT subscriber may stay full,
+                losing its oldest messages, before it is disconnected
+            encoder: Serializer used for encoded subscribers
+        """
+        self.policy = policy
+        self.max_queue = max_queue
+        self.stall_timeout = stall_timeout
+        self.encoder = encoder
+        self._subscribers: list[StreamSubscriber] = []
+        self.published = 0
+        self.encoded_frames = 0
+        self.disconnected = 0
+        self.publish_latency = LatencyHistogram()
+
+    def subscribe(
+        self,
+        callback: Callable,
+        encoded: bool = False,
+        policy: OverflowPolicy | None = None,
+    ) -> StreamSubscriber:
+        """
+        Add a subscriber.
+
+        Args:
+            callback: Sync or async callable receiving each message
+            encoded: Deliver the shared JSON string instead of the raw data
+            policy: Overflow policy (the broadcaster's default if omitted)
+
+        Returns:
+            The subscriber handle
+        """
+        subscriber = StreamSubscriber(
+            callback,
+            encoded,
+            policy or self.policy,
+            self.max_queue,
+            self.stall_timeout,
+            self._drop_subscriber,
+        )
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, callback: Callable) -> bool:
+        """Remove every subscription of callback; returns whether one existed."""
+        removed = False
+        for subscriber in [s for s in self._subscribers if s.callback == callback]:
+            subscriber.close()
+            self._subscribers.remove(subscriber)
+            removed = True
+        return removed
+
+    def _drop_subscriber(self, subscriber: StreamSubscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            self.disconnected += 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, data: Any) -> int:
+        """
+        Queue data for every subscriber. Must be called from the event loop.
+
+        Returns:
+            Number of subscribers the message was queued for
+        """
+        if not self._subscribers:
+            return 0
+
+        start = time.monotonic()
+        encoded = None
+        if any(s.encoded for s in self._subscribers):
+            encoded = self.encoder(data)
+            self.encoded_frames += 1
+
+        message = _Message(data, encoded, start)
+        subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(message)
+
+        self.published += 1
+        self.publish_latency.record(time.monotonic() - start)
+        return len(subscribers)
+
+    def close(self) -> None:
+        """Stop all writer tasks."""
+        for subscriber in self._subscribers:
+            subscriber.close()
+        self._subscribers.clear()
+
+    async def aclose(self) -> None:
+        """Stop all writer tasks and wait for them to finish."""
+        tasks = [s._task for s in self._subscribers if s._task is not None]
+        self.close()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Broadcast latency, queue depth and drop counters."""
+        depths = [s.depth for s in self._subscribers]
+        delivery = LatencyHistogram()
+        for subscriber in self._subscribers:
+            delivery.merge(subscriber.latency)
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "encoded_frames": self.encoded_frames,
+            "disconnected": self.disconnected,
+            "dropped": sum(s.dropped for s in self._subscribers),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "publish_latency": self.publish_latency.snapshot(),
+            "delivery_latency": delivery.snapshot(),
+        }
@@ -0,0 +1,338 @@
+"""Append-only SQLite time-series store with rollup tiers and retention."""
+
+import logging
+import re
+import sqlite3
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .database_executor import DatabaseExecutor
+
+logger = logging.getLogger(__name__)
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class RollupTier:
+    """A downsampled copy of the series at a fixed bucket width."""
+
+    resolution: int  # bucket width in seconds
+    retention: float  # seconds of buckets kept
+
+
+DEFAULT_RAW_RETENTION = 24 * 3600
+DEFAULT_TIERS = (
+    RollupTier(10, 3 * 86400),
+    RollupTier(60, 30 * 86400),
+    RollupTier(600, 400 * 86400),
+)
+
+
+class TimeSeriesStore:
+    """
+    Stores numeric samples for a fixed set of columns in SQLite.
+
+    Every sample is written to a raw table keyed by its timestamp and folded
+    into one rollup table per tier in the same transaction. Rollup rows keep
+    count, sum, min and max per column, so a bucket is updated in place with
+    an upsert and averages stay exact as samples arrive. Missing values
+    (None) are stored as NULL and excluded from rollups.
+
+    Each table is pruned to its own retention. Range queries pick the finest
+    table that still covers the start of the range and fits within
+    max_points, and return one list per column, ready for charting.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        columns: Sequence[str],
+        tiers: Sequence[RollupTier] = DEFAULT_TIERS,
+        raw_retention: float = DEFAULT_RAW_RETENTION,
+        retention_interval: float = 300.0,
+    ):
+        """
+        Open (or create) a store.
+
+        Args:
+            db_path: SQLite database file
+            columns: Column names; columns added later are migrated in place
+            tiers: Rollup tiers, any order
+            raw_retention: Seconds of raw samples kept
+            retention_interval: Minimum seconds between retention passes
+        """
+        for name in columns:
+            if not _NAME_PATTERN.match(name):
+                raise ValueError(f"Invalid column name: {name!r}")
+
+        self.db_path = Path(db_path)
+        self.columns = tuple(columns)
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.resolution))
+        self.raw_retention = raw_retention
+        self.retention_interval = retention_interval
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+        self._db = DatabaseExecutor(self.db_path, pool_size=2)
+
+        placeholders = ", ".join("?" * (len(self.columns) + 1))
+        self._insert_raw = (
+            f"INSERT OR REPLACE INTO samples (ts, {', '.join(self.columns)}) "
+            f"VALUES ({placeholders})"
+        )
+        self._upsert_rollup = {tier.resolution: self._rollup_sql(tier) for tier in self.tiers}
+
+        self._last_retention = 0.0
+        self._appended = 0
+        self._queries = 0
+        self._last_query_time = 0.0
+        self._pruned_rows = 0
+
+    # Schema
+
+    def _rollup_columns(self) -> list[str]:
+        return [
+            f"{name}_{field}"
+            for name in self.columns
+            for field in ("n", "sum", "min", "max")
+        ]
+
+    def _init_schema(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._ensure_table(conn, "samples", "ts INTEGER PRIMARY KEY", list(self.columns))
+            for tier in self.tiers:
+                self._ensure_table(
+                    conn, f"rollup_{tier.resolution}", "bucket INTEGER PRIMARY KEY",
+                    self._rollup_columns(),
+                )
+
+    @staticmethod
+    def _ensure_table(conn: sqlite3.Connection, table: str, key: str, columns: list[str]) -> None:
+        """Create the table, or add columns it is missing."""
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({key})")
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name in columns:
+            if name not in existing:
+                default = " NOT NULL DEFAULT 0" if name.endswith(("_n", "_sum")) else ""
+                kind = "INTEGER" if name.endswith("_n") else "REAL"
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}{default}")
+
+    def _rollup_sql(self, tier: RollupTier) -> str:
+        names = self._rollup_columns()
+        updates = []
+        for name in self.columns:
+            updates += [
+                f"{name}_n = {name}_n + excluded.{name}_n",
+                f"{name}_sum = {name}_sum + excluded.{name}_sum",
+                f"{name}_min = coalesce(min({name}_min, excluded.{name}_min), {name}_min, excluded.{name}_min)",
+                f"{name}_max = coalesce(max({name}_max, excluded.{name}_max), {name}_max, excluded.{name}_max)",
+            ]
+        return (
+            f"INSERT INTO rollup_{tier.resolution} (bucket, {', '.join(names)}) "
+            f"VALUES ({', '.join('?' * (len(names) + 1))}) "
+            f"ON CONFLICT(bucket) DO UPDATE SET {', '.join(updates)}"
+        )
+
+    # Writes
+
+    async def append(self, timestamp: float, values: Mapping[str, float | None]) -> None:
+        """
+        Append one sample.
+
+        Args:
+            timestamp: Unix time of the sample
+            values: Column values; missing or None columns are stored as NULL
+        """
+        await self.append_many([(timestamp, values)])
+
+    async def append_many(
+        self, samples: Sequence[tuple[float, Mapping[str, float | None]]]
+    ) -> None:
+        """Append several samples in one transaction."""
+        raw_rows = []
+        rollup_rows: dict[int, list[tuple]] = {tier.resolution: [] for tier in self.tiers}
+        for timestamp, values in samples:
+            row = [values.get(name) for name in self.columns]
+            raw_rows.append((int(timestamp * 1000), *row))
+            aggregates = []
+            for value in row:
+                if value is None:
+                    aggregates += (0, 0.0, None, None)
+                else:
+                    aggregates += (1, value, value, value)
+            for resolution, rows in rollup_rows.items():
+                rows.append((int(timestamp // resolution) * resolution, *aggregates))
+
+        now = time.time()
+        prune = now - self._last_retention >= self.retention_interval
+        if prune:
+            self._last_retention = now
+        pruned = await self._db.run(self._write, raw_rows, rollup_rows, now if prune else None)
+        self._appended += len(raw_rows)
+        self._pruned_rows += pruned
+
+    def _write(
+        self,
+        conn: sqlite3.Connection,
+        raw_rows: list[tuple],
+        rollup_rows: dict[int, list[tuple]],
+        prune_at: float | None,
+    ) -> int:
+        conn.executemany(self._insert_raw, raw_rows)
+        for resolution, rows in rollup_rows.items():
+            conn.executemany(self._upsert_rollup[resolution], rows)
+        return self._prune(conn, prune_at) if prune_at is not None else 0
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> int:
+        deleted = conn.execute(
+            "DELETE FROM samples WHERE ts < ?", (int((now - self.raw_retention) * 1000),)
+        ).rowcount
+        for tier in self.tiers:
+            deleted += conn.execute(
+                f"DELETE FROM rollup_{tier.resolution} WHERE bucket < ?",
+                (int(now - tier.retention),),
+            ).rowcount
+        return deleted
+
+    async def apply_retention(self) -> int:
+        """
+        Drop samples and buckets older than their retention.
+
+        Returns:
+            Number of rows deleted
+        """
+        now = time.time()
+        self._last_retention = now
+        pruned = await self._db.run(self._prune, now)
+        self._pruned_rows += pruned
+        return pruned
+
+    # Reads
+
+    def _pick_resolution(
+        self, conn: sqlite3.Connection, start: float, end: float, max_points: int
+    ) -> int:
+        """Finest table covering start whose point count fits max_points (0 = raw)."""
+        now = time.time()
+        span = max(0.0, end - start)
+        if start >= now - self.raw_retention:
+            count = conn.execute(
+                "SELECT count(*) FROM samples WHERE ts >= ? AND ts <= ?",
+                (int(start * 1000), int(end * 1000)),
+            ).fetchone()[0]
+            if count <= max_points:
+                return 0
+        for tier in self.tiers:
+            if start >= now - tier.retention and span / tier.resolution <= max_points:
+                return tier.resolution
+        return self.tiers[-1].resolution if self.tiers else 0
+
+    def _query(
+        self,
+        conn: sqlite3.Connection,
+        start: float,
+        end: float,
+        columns: tuple[str, ...],
+        resolution: int | None,
+        max_points: int,
+        extremes: bool,
+    ) -> dict[str, Any]:
+        if resolution is None:
+            resolution = self._pick_resolution(conn, start, end, max_points)
+
+        keys = list(columns)
+        if resolution == 0:
+            cursor = conn.execute(
+                f"SELECT ts / 1000.0, {', '.join(columns)} FROM samples "
+                f"WHERE ts >= ? AND ts <= ? ORDER BY ts",
+                (int(start * 1000), int(end * 1000)),
+            )
+        else:
+            selects = [f"{name}_sum / nullif({name}_n, 0)" for name in columns]
+            if extremes:
+                for name in columns:
+                    selects += [f"{name}_min", f"{name}_max"]
+                    keys += [f"{name}_min", f"{name}_max"]
+            cursor = conn.execute(
+                f"SELECT bucket, {', '.join(selects)} FROM rollup_{resolution} "
+                f"WHERE bucket >= ? AND bucket <= ? ORDER BY bucket",
+                (int(start // resolution) * resolution, int(end)),
+            )
+
+        rows = cursor.fetchall()
+        arrays = [list(values) for values in zip(*rows, strict=True)] if rows else [[] for _ in range(len(keys) + 1)]
+        result: dict[str, Any] = {"resolution": resolution, "timestamp": arrays[0]}
+        result.update(zip(keys, arrays[1:], strict=True))
+        return result
+
+    async def query(
+        self,
+        start: float,
+        end: float | None = None,
+        columns: Sequence[str] | None = None,
+        resolution: int | None = None,
+        max_points: int = 1000,
+        extremes: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Read a time range as column arrays.
+
+        Args:
+            start: Range start (Unix time)
+            end: Range end (Unix time), now if None
+            columns: Columns to return, all if None
+            resolution: 0 for raw samples or a tier resolution; chosen
+                automatically from max_points and retention if None
+            max_points: Target upper bound on returned points
+            extremes: Also return <column>_min/<column>_max (rollups only)
+
+        Returns:
+            {"resolution", "timestamp": [...], <column>: [...], ...}; rollup
+            values are bucket averages and timestamps are bucket starts
+        """
+        columns = tuple(columns) if columns else self.columns
+        unknown = [name for name in columns if name not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        if resolution not in (None, 0) and resolution not in self._upsert_rollup:
+            raise ValueError(f"No rollup tier with resolution {resolution}")
+
+        began = time.perf_counter()
+        result = await self._db.run(
+            self._query, start, time.time() if end is None else end,
+            columns, resolution, max(1, max_points), extremes,
+        )
+        self._queries += 1
+        self._last_query_time = time.perf_counter() - began
+        return result
+
+    def close(self) -> None:
+        """Close the database connections."""
+        self._db.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with tier layout, write/query counters and executor stats
+        """
+        return {
+            "db_path": str(self.db_path),
+            "columns": list(self.columns),
+            "raw_retention": self.raw_retention,
+            "tiers": [
+                {"resolution": tier.resolution, "retention": tier.retention}
+                for tier in self.tiers
+            ],
+            "appended": self._appended,
+            "pruned_rows": self._pruned_rows,
+            "queries": self._queries,
+            "last_query_ms": self._last_query_time * 1000,
+            "executor": self._db.get_stats(),
+        }
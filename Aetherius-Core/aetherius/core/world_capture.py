@@ -0,0 +1,234 @@
+"""Point-in-time capture of a live world directory for backups."""
+
+import asyncio
+import errno
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+logger = logging.getLogger(__name__)
+
+# ioctl(dest_fd, FICLONE, src_fd): share extents copy-on-write (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+_REFLINK_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+
+@dataclass
+class CaptureStats:
+    """Result of one world capture."""
+
+    files: int = 0
+    unchanged_files: int = 0
+    cloned_files: int = 0
+    copied_files: int = 0
+    copied_bytes: int = 0
+    removed: int = 0
+    duration: float = 0.0
+    frozen_seconds: float = 0.0
+    save_confirmed: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class WorldCapture:
+    """
+    Mirror of a world directory that backups read instead of the live world.
+
+    Each capture brings the staging copy in line with the source: files whose
+    size and mtime are unchanged are left alone, changed files are reflinked
+    where the filesystem supports it and copied otherwise, and files gone
+    from the source are removed. Source mtimes are preserved, so BackupStore
+    still recognises unchanged files in the staging copy.
+
+    Hardlinks are deliberately not used: the server rewrites region files in
+    place, so a hardlinked "copy" would keep changing after save-on.
+    """
+
+    def __init__(self, staging_root: str | Path, use_reflink: bool = True):
+        """
+        Args:
+            staging_root: Directory holding one staging copy per world
+            use_reflink: Try copy-on-write clones before falling back to copying
+        """
+        self.staging_root = Path(staging_root)
+        self._reflink = use_reflink and HAS_FCNTL
+        self._thread_lock = threading.Lock()
+        # Held by callers across capture and the backup that reads the staging copy
+        self.lock = asyncio.Lock()
+
+    def staging_path(self, source: str | Path) -> Path:
+        """Staging copy of the given world directory."""
+        return self.staging_root / Path(source).name
+
+    def capture(self, source: str | Path) -> CaptureStats:
+        """
+        Synchronise the staging copy with source.
+
+        Args:
+            source: World directory
+
+        Returns:
+            Capture statistics
+        """
+        source = Path(source)
+        if not source.is_dir():
+            raise FileNotFoundError(f"World directory {source} does not exist")
+
+        with self._thread_lock:
+            start = time.perf_counter()
+            stats = CaptureStats()
+            self._sync_directory(source, self.staging_path(source), stats)
+            stats.duration = time.perf_counter() - start
+
+        logger.debug(
+            f"Captured {source}: {stats.copied_files + stats.cloned_files} changed "
+            f"of {stats.files} files in {stats.duration:.2f}s"
+        )
+        return stats
+
+    def _sync_directory(self, source: Path, target: Path, stats: CaptureStats) -> None:
+        if target.exists() and not target.is_dir():
+            target.unlink()
+        target.mkdir(parents=True, exist_ok=True)
+
+        existing = {}
+        with os.scandir(target) as it:
+            for entry in it:
+                existing[entry.name] = entry
+
+        with os.scandir(source) as it:
+            for entry in it:
+                staged = existing.pop(entry.name, None)
+                target_path = target / entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if staged is not None and not staged.is_dir(follow_symlinks=False):
+                        os.unlink(staged.path)
+                    self._sync_directory(Path(entry.path), target_path, stats)
+                elif entry.is_file(follow_symlinks=False):
+                    stats.files += 1
+                    st = entry.stat(follow_symlinks=False)
+                    if staged is not None and staged.is_dir(follow_symlinks=False):
+                        shutil.rmtree(staged.path)
+                        staged = None
+                    if staged is not None:
+                        staged_st = staged.stat(follow_symlinks=False)
+                        if (
+                            staged_st.st_size == st.st_size
+                            and staged_st.st_mtime_ns == st.st_mtime_ns
+                        ):
+                            stats.unchanged_files += 1
+                            continue
+                    self._copy_file(Path(entry.path), target_path, st, stats)
+
+        # Entries no longer present in the world
+        for entry in existing.values():
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+            stats.removed += 1
+
+    def _copy_file(self, source: Path, target: Path, st: os.stat_result, stats: CaptureStats) -> None:
+        tmp_path = target.with_name(f".{target.name}.capture")
+        try:
+            if self._clone(source, tmp_path):
+                stats.cloned_files += 1
+            else:
+                shutil.copyfile(source, tmp_path)
+                stats.copied_files += 1
+                stats.copied_bytes += st.st_size
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _clone(self, source: Path, target: Path) -> bool:
+        """Reflink source to target; False if the filesystem cannot."""
+        if not self._reflink:
+            return False
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError as e:
+                if e.errno not in _REFLINK_UNSUPPORTED:
+                    raise
+        # Remember for the rest of this capture's lifetime; copying from now on
+        self._reflink = False
+        logger.info(f"Reflink copies not supported for {self.staging_root}; copying changed files")
+        return False
+
+    async def capture_frozen(
+        self, server: Any, source: str | Path, save_timeout: float = 120.0
+    ) -> CaptureStats:
+        """
+        Capture a running server's world while autosave is off.
+
+        Sends save-off and "save-all flush", waits for the server to log
+        "Saved the game", captures the world and sends save-on straight
+        away, so saving is only paused for the capture itself. If the save
+        is not confirmed in time the world may still be being written, so
+        no capture is taken and RuntimeError is raised.
+
+        Args:
+            server: Object with execute_command_with_result(command, timeout)
+                returning a result dict with "success" and "output"
+            source: World directory
+            save_timeout: Seconds to wait for the save to be confirmed
+
+        Returns:
+            Capture statistics including how long saving was paused
+        """
+        frozen_at = time.perf_counter()
+        result = await server.execute_command_with_result("save-off", 10.0)
+        if not result.get("success"):
+            raise RuntimeError(f"Failed to disable autosave: {result.get('error')}")
+
+        try:
+            result = await server.execute_command_with_result("save-all flush", save_timeout)
+            if "Saved the game" not in (result.get("output") or ""):
+                raise RuntimeError(
+                    f"Save of {source} was not confirmed within {save_timeout}s; "
+                    "world not captured"
+                )
+            stats = await asyncio.to_thread(self.capture, source)
+            stats.save_confirmed = True
+        finally:
+            result = await server.execute_command_with_result("save-on", 10.0)
+            if not result.get("success"):
+                logger.error(f"Failed to re-enable autosave: {result.get('error')}")
+
+        stats.frozen_seconds = time.perf_counter() - frozen_at
+        logger.info(
+            f"World {source} captured in {stats.duration:.2f}s, "
+            f"autosave paused for {stats.frozen_seconds:.2f}s"
+        )
+        return stats
+
+
+# One staging mirror (and capture lock) per server directory
+_world_captures: dict[Path, WorldCapture] = {}
+
+
+def get_world_capture(server_directory: str | Path) -> WorldCapture:
+    """Get the world capture staged under <server_directory>/backups/staging."""
+    root = (Path(server_directory) / "backups" / "staging").resolve()
+    capture = _world_captures.get(root)
+    if capture is None:
+        capture = _world_captures[root] = WorldCapture(root)
+    return capture
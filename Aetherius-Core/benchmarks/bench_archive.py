@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Throughput of FileManager.create_archive against sequential zipfile/tarfile.
+
+Builds a synthetic world (random region files plus compressible NBT-like
+data and logs), archives it with the previous sequential implementation
+(zipfile ZIP_DEFLATED over rglob, shutil.make_archive for gztar) and with the
+parallel streaming writers at 1 and N worker threads, then verifies every
+archive reads back. Speedup scales with cores; on a single core the gain
+comes from storing already-compressed region files.
+
+Usage:
+    python benchmarks/bench_archive.py [--size-mb N] [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.archive_writer import default_workers  # noqa: E402
+from aetherius.core.file_manager import FileManager  # noqa: E402
+
+WORDS = [b"minecraft:stone", b"minecraft:air", b"Pos", b"Motion", b"Inventory",
+         b"[Server thread/INFO]", b"joined the game", b"Saving chunks"]
+
+
+def build_world(world: Path, size_mb: int) -> int:
+    (world / "region").mkdir(parents=True)
+    (world / "data").mkdir()
+    (world / "logs").mkdir()
+    region_bytes = size_mb * 1024 * 1024 * 3 // 4
+    for i in range(max(1, region_bytes // (4 * 1024 * 1024))):
+        (world / "region" / f"r.{i}.0.mca").write_bytes(os.urandom(4 * 1024 * 1024))
+    text_bytes = size_mb * 1024 * 1024 - region_bytes
+    rng = random.Random(0)
+    for i in range(max(1, text_bytes // (1024 * 1024))):
+        body = b" ".join(rng.choice(WORDS) for _ in range(80_000))[: 1024 * 1024]
+        target = world / ("logs" if i % 2 else "data") / f"part_{i}.{'log' if i % 2 else 'dat'}"
+        target.write_bytes(body)
+    return sum(p.stat().st_size for p in world.rglob("*") if p.is_file())
+
+
+def reference_zip(source: Path, archive: Path) -> None:
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for file_path in source.rglob("*"):
+            if file_path.is_file():
+                zipf.write(file_path, file_path.relative_to(source.parent))
+
+
+def reference_gztar(source: Path, archive: Path) -> None:
+    shutil.make_archive(str(archive).removesuffix(".tar.gz"), "gztar",
+                        str(source.parent), source.name)
+
+
+def verify(archive: Path) -> None:
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive) as zipf:
+            assert zipf.testzip() is None
+    else:
+        with tarfile.open(archive) as tar:
+            for member in tar:
+                if member.isfile():
+                    tar.extractfile(member).read()
+
+
+def timed(label: str, fn, archive: Path, input_bytes: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    verify(archive)
+    size = archive.stat().st_size
+    print(f"  {label:<28} {elapsed:7.2f} s  {input_bytes / 2**20 / elapsed:8.1f} MiB/s  "
+          f"-> {size / 2**20:7.1f} MiB")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size-mb", type=int, default=256)
+    arg_parser.add_argument("--workers", type=int, default=default_workers())
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "server"
+        input_bytes = build_world(root / "world", args.size_mb)
+        out = root / "archives"
+        out.mkdir()
+        print(f"World: {input_bytes / 2**20:.0f} MiB, {os.cpu_count()} CPUs, "
+              f"{args.workers} workers")
+
+        manager = FileManager(root, hash_cache_path=Path(tmp) / "hashes.db", use_index=False)
+        for fmt, suffix, reference in (("zip", ".zip", reference_zip),
+                                       ("gztar", ".tar.gz", reference_gztar)):
+            print(fmt)
+            timed("sequential (previous)",
+                  lambda reference=reference, suffix=suffix: reference(root / "world", out / f"ref{suffix}"),
+                  out / f"ref{suffix}", input_bytes)
+            for workers in sorted({1, args.workers}):
+                archive = out / f"w{workers}{suffix}"
+                timed(f"parallel, {workers} workers",
+                      lambda archive=archive, fmt=fmt, workers=workers:
+                          manager.create_archive("world", archive, fmt, workers=workers),
+                      archive, input_bytes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark of incremental world backups against full zip archives.
+
+Builds a synthetic world of region files, then takes a full zip backup via
+FileManager.create_archive (the previous approach), a first BackupStore
+snapshot, and a second snapshot after rewriting a fraction of the region
+sectors to mimic an hour of play. Reports time, bytes read and bytes
+written for each, then restores the last snapshot.
+
+Usage:
+    python benchmarks/bench_backup_store.py [--size-mb N] [--changed-percent P]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.backup_store import BackupStore  # noqa: E402
+from aetherius.core.file_manager import FileManager  # noqa: E402
+
+REGION_SIZE = 8 * 1024 * 1024
+SECTOR = 4096
+
+
+def build_world(world: Path, size_mb: int) -> list[Path]:
+    region_dir = world / "region"
+    region_dir.mkdir(parents=True)
+    (world / "playerdata").mkdir()
+    regions = []
+    for i in range(max(1, size_mb * 1024 * 1024 // REGION_SIZE)):
+        path = region_dir / f"r.{i // 16}.{i % 16}.mca"
+        path.write_bytes(os.urandom(REGION_SIZE))
+        regions.append(path)
+    for i in range(50):
+        (world / "playerdata" / f"{i:08x}.dat").write_bytes(os.urandom(4096))
+    (world / "level.dat").write_bytes(os.urandom(2048))
+    return regions
+
+
+def play(regions: list[Path], changed_percent: float) -> int:
+    """Rewrite random runs of sectors, as chunk saves do."""
+    changed = 0
+    target = sum(p.stat().st_size for p in regions) * changed_percent / 100
+    while changed < target:
+        path = random.choice(regions)
+        run = random.randint(1, 4) * SECTOR
+        with open(path, "r+b") as f:
+            f.seek(random.randrange(0, REGION_SIZE - run, SECTOR))
+            f.write(os.urandom(run))
+        changed += run
+    return changed
+
+
+def report(label: str, elapsed: float, read: int, written: int) -> None:
+    print(f"  {label:<26} {elapsed:8.2f} s  read {read / 2**20:9.1f} MiB  "
+          f"written {written / 2**20:9.1f} MiB")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size-mb", type=int, default=512)
+    arg_parser.add_argument("--changed-percent", type=float, default=1.0)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = Path(tmp) / "server"
+        regions = build_world(server / "world", args.size_mb)
+        world_size = sum(p.stat().st_size for p in (server / "world").rglob("*") if p.is_file())
+        print(f"World: {world_size / 2**20:.0f} MiB in {len(regions)} region files")
+
+        manager = FileManager(server, hash_cache_path=Path(tmp) / "hashes.db", use_index=False)
+        start = time.perf_counter()
+        manager.create_archive(server / "world", server / "backups" / "full.zip", "zip")
+        report("full zip", time.perf_counter() - start, world_size,
+               (server / "backups" / "full.zip").stat().st_size)
+
+        store = BackupStore(server / "backups" / "store")
+        first = store.create_snapshot(server / "world", "first")
+        report("first snapshot", first.stats.duration, first.stats.hashed_bytes,
+               first.stats.bytes_written)
+
+        time.sleep(0.01)
+        changed = play(regions, args.changed_percent)
+        print(f"Rewrote {changed / 2**20:.1f} MiB of region sectors")
+
+        start = time.perf_counter()
+        manager.create_archive(server / "world", server / "backups" / "full2.zip", "zip")
+        report("full zip again", time.perf_counter() - start, world_size,
+               (server / "backups" / "full2.zip").stat().st_size)
+
+        second = store.create_snapshot(server / "world", "second")
+        report("incremental snapshot", second.stats.duration, second.stats.hashed_bytes,
+               second.stats.bytes_written)
+
+        start = time.perf_counter()
+        store.restore_snapshot("second", Path(tmp) / "restored")
+        report("restore snapshot", time.perf_counter() - start,
+               sum(p.stat().st_size for p in store.chunks_dir.rglob("*") if p.is_file()),
+               world_size)
+        print(store.get_stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
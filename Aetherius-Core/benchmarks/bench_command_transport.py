@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for cross-process command transports.
+
+Runs a CommandQueue server side with an executor that answers immediately,
+then measures round-trip latency of submit() over the command socket and
+over the file queue fallback (polled every 0.5 s, as ServerController does).
+
+Usage:
+    python benchmarks/bench_command_transport.py [--commands N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.command_queue import CommandQueue  # noqa: E402
+
+FILE_POLL_INTERVAL = 0.5
+
+
+async def execute(command: str, timeout: float) -> dict:
+    return {"success": True, "output": f"executed {command}", "error": None}
+
+
+async def poll_file_queue(queue: CommandQueue) -> None:
+    while True:
+        await queue.process_pending(execute)
+        await asyncio.sleep(FILE_POLL_INTERVAL)
+
+
+async def measure(client: CommandQueue, commands: int) -> list[float]:
+    latencies = []
+    for i in range(commands):
+        start = time.perf_counter()
+        result = await client.submit(f"say {i}", timeout=10.0)
+        latencies.append(time.perf_counter() - start)
+        if not result.get("success"):
+            raise RuntimeError(f"Command failed: {result}")
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    ms = sorted(latency * 1000 for latency in latencies)
+    print(
+        f"{name:<7} n={len(ms):<4} mean={statistics.mean(ms):9.3f} ms  "
+        f"p50={ms[len(ms) // 2]:9.3f} ms  max={ms[-1]:9.3f} ms"
+    )
+
+
+async def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--commands", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_dir = Path(tmp) / "queue"
+        server = CommandQueue(queue_dir)
+        await server.start_server(execute)
+        poller = asyncio.create_task(poll_file_queue(server))
+
+        try:
+            socket_client = CommandQueue(queue_dir)
+            file_client = CommandQueue(queue_dir, socket_path=Path(tmp) / "missing.sock")
+
+            report("socket", await measure(socket_client, args.commands * 10))
+            report("file", await measure(file_client, args.commands))
+        finally:
+            poller.cancel()
+            await server.stop_server()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for ConfigManager.get().
+
+Loads a generated YAML file plus an environment source with a template engine
+and a validator, as AetheriusCore does, then measures get() calls per second
+for repeated keys (hits) and first reads of distinct keys (misses). The same
+workload runs against a reference implementation of the previous lookup path:
+re-parse sources on a miss, and render and validate on every call.
+
+Usage:
+    python benchmarks/bench_config_get.py [--keys N] [--calls N]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.config import (  # noqa: E402
+    ConfigManager,
+    ConfigPriority,
+    EnvironmentConfigSource,
+    FileConfigSource,
+    SchemaValidator,
+    SimpleTemplateEngine,
+)
+
+
+class ReferenceConfigManager(ConfigManager):
+    """Previous get(): per-key cache of raw values, source re-parse on a miss."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reference_cache: dict[str, Any] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._reference_cache:
+                value = self._reference_cache[key]
+            else:
+                value = None
+                for source in reversed(self._sources):
+                    config = source.load()
+                    value = config[key] if key in config else self._get_nested_value(config, key)
+                    if value is not None:
+                        break
+                if value is not None:
+                    self._reference_cache[key] = value
+
+            if value is None:
+                return default
+            if self._template_engine and isinstance(value, str):
+                value = self._template_engine.render(value, self._reference_cache)
+            return self._validate_value(key, value)
+
+
+def build(manager_class, config_file: Path) -> ConfigManager:
+    manager = manager_class(enable_watching=False, template_engine=SimpleTemplateEngine())
+    manager.add_source(FileConfigSource(config_file, ConfigPriority.FILE))
+    manager.add_source(EnvironmentConfigSource(prefix="AETHERIUS_BENCH_"))
+    manager.add_validator(r"section\d+\..*", SchemaValidator({}))
+    return manager
+
+
+def measure(manager: ConfigManager, keys: list[str], calls: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    for key in keys:
+        manager.get(key)
+    miss_rate = len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(calls):
+        manager.get(keys[i % len(keys)])
+    hit_rate = calls / (time.perf_counter() - start)
+    return miss_rate, hit_rate
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--keys", type=int, default=500)
+    arg_parser.add_argument("--calls", type=int, default=200000)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    sections = max(1, args.keys // 10)
+    config = {
+        f"section{s}": {
+            **{f"key{k}": f"value-{s}-{k}" for k in range(9)},
+            "url": f"http://${{section{s}.key0}}:8080",
+        }
+        for s in range(sections)
+    }
+    keys = [f"section{s}.{name}" for s in range(sections) for name in config[f"section{s}"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.yaml"
+        config_file.write_text(yaml.safe_dump(config), encoding="utf-8")
+
+        print(f"{len(keys)} keys, {args.calls} hit lookups")
+        for name, manager_class in (("snapshot", ConfigManager), ("reference", ReferenceConfigManager)):
+            miss_rate, hit_rate = measure(build(manager_class, config_file), keys, args.calls)
+            print(f"{name:<10} miss {miss_rate:12,.0f} gets/s   hit {hit_rate:12,.0f} gets/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
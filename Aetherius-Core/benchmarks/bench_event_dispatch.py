@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for EventManager.fire_event.
+
+Measures events per second with 1, 10 and 100 listeners spread over the
+event class, one of its parent classes and the global listener list, both
+with the cached dispatch table and with the cache dropped before every
+event (which reproduces the old per-event merge and sort).
+
+Usage:
+    python benchmarks/bench_event_dispatch.py [--events N]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.event_manager import EventManager  # noqa: E402
+from aetherius.core.events_base import (  # noqa: E402
+    EventPriority,
+    PlayerEvent,
+    PlayerJoinEvent,
+)
+
+PRIORITIES = list(EventPriority)
+
+
+def build_manager(listener_count: int) -> EventManager:
+    manager = EventManager()
+
+    def noop(event):
+        return None
+
+    for i in range(listener_count):
+        priority = PRIORITIES[i % len(PRIORITIES)]
+        if i % 3 == 0:
+            manager.register_listener(PlayerJoinEvent, noop, priority)
+        elif i % 3 == 1:
+            manager.register_listener(PlayerEvent, noop, priority)
+        else:
+            manager.register_global_listener(noop, priority)
+    return manager
+
+
+async def run(manager: EventManager, events: int, cached: bool) -> float:
+    event = PlayerJoinEvent(player_name="Steve")
+    start = time.perf_counter()
+    for _ in range(events):
+        if not cached:
+            manager._invalidate_dispatch_cache()
+        await manager.fire_event(event)
+    return events / (time.perf_counter() - start)
+
+
+async def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--events", type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    print(f"{'listeners':>9} {'uncached ev/s':>15} {'cached ev/s':>15} {'speedup':>8}")
+    for listener_count in (1, 10, 100):
+        manager = build_manager(listener_count)
+        uncached = await run(manager, args.events, cached=False)
+        cached = await run(manager, args.events, cached=True)
+        print(
+            f"{listener_count:>9} {uncached:>15,.0f} {cached:>15,.0f} "
+            f"{cached / uncached:>7.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
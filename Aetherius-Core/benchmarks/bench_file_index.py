@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Query latency of FileManager search and disk usage with the file index.
+
+Builds a synthetic server directory, waits for the shared FileIndex to
+finish its initial walk, then times name searches, directory usage and
+largest-file queries. The previous implementations run for comparison:
+rglob('*') per query (with a full MD5 of each small match for searches), and
+the time from a file change to the index reflecting it is measured too.
+
+Usage:
+    python benchmarks/bench_file_index.py [--files N]
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.file_index import get_file_index  # noqa: E402
+from aetherius.core.file_manager import FileManager  # noqa: E402
+
+FOLDERS = ("world/region", "world/entities", "world/poi", "world/playerdata",
+           "plugins/Essentials/userdata", "logs")
+
+
+def reference_search(root: Path, pattern: str) -> int:
+    matches = 0
+    for item in root.rglob("*"):
+        if pattern in item.name.lower():
+            st = item.stat()
+            if item.is_file() and st.st_size < 10 * 1024 * 1024:
+                hashlib.md5(item.read_bytes()).hexdigest()
+            matches += 1
+    return matches
+
+
+def reference_usage(root: Path) -> int:
+    return sum(f.stat().st_size for f in root.rglob("*") if f.is_file())
+
+
+def timed(label: str, fn, repeat: int = 1) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<30} {elapsed * 1000:10.2f} ms  -> {result}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--files", type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "server"
+        per_folder = args.files // len(FOLDERS)
+        for folder in FOLDERS:
+            directory = root / folder
+            directory.mkdir(parents=True)
+            for i in range(per_folder):
+                (directory / f"entry_{i}.dat").write_bytes(b"\0" * (64 + i % 4096))
+
+        manager = FileManager(root, hash_cache_path=Path(tmp) / "hashes.db")
+        start = time.perf_counter()
+        index = get_file_index(root)
+        index.wait_ready()
+        print(f"{args.files} files, initial index build {time.perf_counter() - start:.2f} s")
+
+        print("index")
+        timed("search 'entry_123'", lambda: len(manager.search_files("entry_123")), repeat=10)
+        timed("disk usage (root)", lambda: manager.get_disk_usage()["total_size"], repeat=10)
+        timed("disk usage (world/region)",
+              lambda: manager.get_disk_usage("world/region")["file_count"], repeat=10)
+        timed("largest 10 files", lambda: len(manager.get_largest_files(10)), repeat=10)
+
+        print("reference (rglob per query)")
+        timed("search 'entry_123'", lambda: reference_search(root, "entry_123"))
+        timed("disk usage (root)", lambda: reference_usage(root))
+
+        target = root / "world" / "region" / "entry_0.dat"
+        start = time.perf_counter()
+        target.write_bytes(b"\0" * 10_000_000)
+        while manager.get_largest_files(1)[0].size != 10_000_000:
+            time.sleep(0.001)
+        print(f"change visible in index after {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(debounce {index.debounce * 1000:.0f} ms)")
+        print(index.get_stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
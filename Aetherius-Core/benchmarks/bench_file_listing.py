@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark of FileManager directory listing on a synthetic world directory.
+
+Builds a world with region, entity, poi and playerdata folders holding the
+requested number of files, then times recursive listing, a full listing of
+world/region and its first page, and explicit hashing (cold and through the
+persistent hash cache). The same listings run against a reference
+implementation of the previous code path (glob plus a full MD5 of every
+file under 10 MB).
+
+Usage:
+    python benchmarks/bench_file_listing.py [--files N] [--file-size BYTES]
+"""
+
+import argparse
+import logging
+import mimetypes
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.file_manager import FileInfo, FileManager  # noqa: E402
+
+FOLDERS = ("region", "entities", "poi", "playerdata", "data", "stats")
+
+
+class ReferenceFileManager(FileManager):
+    """Previous listing: Path.glob() and get_file_info() with MD5 per file."""
+
+    def get_file_info(self, path, compute_hash=False):
+        file_path = self._validate_path(path)
+        st = file_path.stat()
+        mime_type = None
+        if file_path.is_file():
+            mime_type, _ = mimetypes.guess_type(str(file_path))
+        hash_md5 = None
+        if file_path.is_file() and st.st_size < 10 * 1024 * 1024:
+            hash_md5 = self._calculate_md5(file_path)
+        return FileInfo(
+            name=file_path.name,
+            path=str(file_path.relative_to(self.base_dir)),
+            size=st.st_size,
+            modified=datetime.fromtimestamp(st.st_mtime),
+            created=datetime.fromtimestamp(st.st_ctime),
+            is_directory=file_path.is_dir(),
+            mime_type=mime_type,
+            permissions=oct(st.st_mode)[-3:],
+            hash_md5=hash_md5,
+        )
+
+    def list_directory(self, path="", recursive=False, include_hidden=False,
+                       offset=0, limit=None):
+        dir_path = self._validate_path(path)
+        files = []
+        for item in dir_path.glob("**/*" if recursive else "*"):
+            if not include_hidden and item.name.startswith("."):
+                continue
+            files.append(self.get_file_info(item))
+        files.sort(key=lambda x: (not x.is_directory, x.name.lower()))
+        if offset or limit is not None:
+            files = files[offset:None if limit is None else offset + limit]
+        return files
+
+
+def build_world(root: Path, files: int, file_size: int) -> None:
+    payload = os.urandom(file_size)
+    per_folder = files // len(FOLDERS)
+    for folder in FOLDERS:
+        directory = root / "world" / folder
+        directory.mkdir(parents=True)
+        for i in range(per_folder):
+            (directory / f"r.{i // 32}.{i % 32}.mca").write_bytes(payload)
+
+
+def timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    count = len(result) if isinstance(result, list) else result
+    print(f"  {label:<28} {elapsed * 1000:10.1f} ms  ({count} entries)")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--files", type=int, default=50000)
+    arg_parser.add_argument("--file-size", type=int, default=4096)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        build_world(root / "server", args.files, args.file_size)
+        print(f"Built {args.files} files of {args.file_size} bytes "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        for name, manager_class in (("scandir", FileManager), ("reference", ReferenceFileManager)):
+            manager = manager_class(root / "server", hash_cache_path=root / f"{name}.db")
+            print(name)
+            timed("recursive listing", lambda manager=manager: manager.list_directory("world", recursive=True))
+            timed("world/region listing", lambda manager=manager: manager.list_directory("world/region"))
+            timed("world/region first page", lambda manager=manager: manager.list_directory("world/region", limit=100))
+
+        manager = FileManager(root / "server", hash_cache_path=root / "hashes.db")
+        region = root / "server" / "world" / "region"
+        names = sorted(os.listdir(region))
+        print("explicit hashing of world/region")
+        timed("cold", lambda: sum(1 for n in names if manager.get_file_hash(region / n)))
+        timed("cached", lambda: sum(1 for n in names if manager.get_file_hash(region / n)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
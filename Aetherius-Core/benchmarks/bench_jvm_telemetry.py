@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+GC log ingest throughput and trend analysis cost of JVM telemetry.
+
+Writes a synthetic unified -Xlog:gc file (young, mixed, remark, cleanup and
+full pauses plus non-pause lines) and measures how fast JvmTelemetry turns
+it into metrics, then fills a day of heap and thread samples at the default
+poll interval and times analyze_trends() over one hour and the full window.
+
+Usage:
+    python benchmarks/bench_jvm_telemetry.py [--lines N] [--hours H]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.jvm_telemetry import (  # noqa: E402
+    HEAP_USED,
+    THREADS,
+    JvmTelemetry,
+)
+from aetherius.core.monitoring import MetricType  # noqa: E402
+from aetherius.core.monitoring.collectors import InMemoryMetricsCollector  # noqa: E402
+
+PAUSES = [
+    "Pause Young (Normal) (G1 Evacuation Pause)",
+    "Pause Young (Mixed) (G1 Evacuation Pause)",
+    "Pause Young (Concurrent Start) (G1 Humongous Allocation)",
+    "Pause Remark",
+    "Pause Cleanup",
+    "Pause Full (G1 Compaction Pause)",
+]
+
+
+def write_gc_log(path: Path, lines: int) -> None:
+    rng = random.Random(1)
+    with open(path, "w") as f:
+        for i in range(lines):
+            uptime = i * 0.25
+            if i % 7 == 0:
+                f.write(f"[{uptime:.3f}s][info][gc] GC({i}) Concurrent Mark Cycle {rng.uniform(5, 50):.3f}ms\n")
+                continue
+            kind = PAUSES[0] if i % 11 else rng.choice(PAUSES)
+            before = rng.randint(512, 3800)
+            after = rng.randint(256, before)
+            f.write(
+                f"[{uptime:.3f}s][info][gc] GC({i}) {kind} "
+                f"{before}M->{after}M(4096M) {rng.uniform(1, 80):.3f}ms\n"
+            )
+
+
+def bench_ingest(lines: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "gc.log"
+        write_gc_log(log, lines)
+        size = log.stat().st_size
+
+        telemetry = JvmTelemetry(0, log, started_at=0.0)
+        telemetry._jstat = None
+        start = time.perf_counter()
+        telemetry._read_gc_log()
+        elapsed = time.perf_counter() - start
+
+    print(f"  ingest     {lines} lines ({size / 1024 / 1024:.1f} MiB) in {elapsed * 1000:.1f} ms  "
+          f"= {lines / elapsed:,.0f} lines/s, {telemetry.gc_events} pauses recorded")
+
+
+def bench_trends(hours: float) -> None:
+    interval = 10.0
+    samples = int(hours * 3600 / interval)
+    metrics = InMemoryMetricsCollector(max_metrics=samples + 1)
+    telemetry = JvmTelemetry(0, None, metrics=metrics, started_at=time.time() - hours * 3600)
+
+    rng = random.Random(2)
+    heap = 1024.0
+    now = time.time()
+    for _ in range(samples):
+        heap = max(512.0, heap + rng.uniform(-60, 64))
+        metrics.set_gauge(HEAP_USED, heap)
+        metrics.set_gauge(THREADS, 60 + rng.randint(0, 10))
+    # Spread the samples back over the window at the poll interval
+    for name in (HEAP_USED, THREADS):
+        series = metrics._find_series(MetricType.GAUGE, name, None)
+        for i in range(series.count):
+            series.timestamps[i] = now - (series.count - i) * interval
+
+    for window in (3600.0, hours * 3600):
+        start = time.perf_counter()
+        result = telemetry.analyze_trends(window)
+        elapsed = time.perf_counter() - start
+        print(f"  trends     {window / 3600:5.1f} h window, {result['heap']['count']:6d} heap samples "
+              f"in {elapsed * 1000:7.2f} ms  (trend {result['heap']['trend_mb_per_min']:+.2f} MB/min)")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--lines", type=int, default=200_000)
+    arg_parser.add_argument("--hours", type=float, default=24.0)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    bench_ingest(args.lines)
+    bench_trends(args.hours)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for LogParser.parse_line.
+
+Replays a recorded server log through the keyword-prefiltered parser and
+through a reference parser that tries every pattern on every line, checks
+that both produce the same events and reports lines per second.
+
+Usage:
+    python benchmarks/bench_log_parser.py [server/logs/latest.log] [--repeat N]
+"""
+
+import argparse
+import gzip
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.events_base import LogLineEvent, UnknownLogEvent  # noqa: E402
+from aetherius.core.log_parser import LogParser  # noqa: E402
+
+# Fields filled from datetime.now() at construction time
+VOLATILE_FIELDS = {"timestamp", "login_time"}
+
+
+class ReferenceLogParser(LogParser):
+    """Parser that tries every pattern on every line, as before the prefilter."""
+
+    def parse_line(self, line):
+        events = []
+        timestamp = self._extract_timestamp(line)
+        events.append(
+            LogLineEvent(
+                line=line,
+                level=self._extract_log_level(line) or "INFO",
+                timestamp=timestamp,
+                message=self._extract_message(line),
+            )
+        )
+
+        attempted_patterns = []
+        for pattern in self.patterns:
+            attempted_patterns.append(pattern.name)
+            try:
+                event = pattern.try_parse(line, timestamp)
+            except Exception:
+                continue
+            if event:
+                events.append(event)
+                return events
+
+        if line.strip():
+            events.append(
+                UnknownLogEvent(raw_line=line, attempted_patterns=attempted_patterns)
+            )
+        return events
+
+
+def read_lines(path: Path) -> list[str]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+def snapshot(parser: LogParser, line: str):
+    """Parse a line and return a comparable view of the outcome."""
+    try:
+        events = parser.parse_line(line)
+    except Exception as e:
+        # Lines without a timestamp are rejected by event validation
+        return type(e).__name__
+    return [
+        (type(event).__name__, event.model_dump(exclude=VOLATILE_FIELDS))
+        for event in events
+    ] + [events[0].timestamp]
+
+
+def run(parser: LogParser, lines: list[str]) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        try:
+            parser.parse_line(line)
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument(
+        "log_file", nargs="?", default=str(project_root / "server/logs/latest.log")
+    )
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    lines = [line for line in read_lines(Path(args.log_file)) if line]
+    if not lines:
+        print(f"No log lines found in {args.log_file}")
+        return 1
+
+    parser = LogParser()
+    reference = ReferenceLogParser()
+
+    for line in lines:
+        if snapshot(reference, line) != snapshot(parser, line):
+            print(f"Mismatch on line: {line!r}")
+            return 1
+
+    workload = lines * args.repeat
+    reference_time = run(reference, workload)
+    parser_time = run(parser, workload)
+
+    print(f"{len(lines)} distinct lines, {len(workload)} parsed per run")
+    print(f"reference : {len(workload) / reference_time:12,.0f} lines/s")
+    print(f"prefilter : {len(workload) / parser_time:12,.0f} lines/s")
+    print(f"speedup   : {reference_time / parser_time:12.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Multi-threaded throughput of InMemoryMetricsCollector updates and queries.
+
+Runs N threads that each issue counter increments, gauge sets and histogram
+records (with and without labels) against one collector, then times
+get_histogram_stats on a full window. The previous implementation (a Metric
+object per update, per-name lists trimmed by slicing, label keys sorted and
+formatted per call, one global RLock, sort per stats query) runs for
+comparison.
+
+Usage:
+    python benchmarks/bench_metrics_collector.py [--threads N] [--ops N]
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.monitoring import Metric, MetricType  # noqa: E402
+from aetherius.core.monitoring.collectors import InMemoryMetricsCollector  # noqa: E402
+
+
+class ReferenceCollector:
+    """The previous InMemoryMetricsCollector storage."""
+
+    def __init__(self, max_metrics: int = 10000):
+        self.max_metrics = max_metrics
+        self._metrics = defaultdict(list)
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._histograms = defaultdict(list)
+        self._lock = threading.RLock()
+
+    def _make_key(self, name, labels):
+        if not labels:
+            return name
+        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{label_str}}}"
+
+    def _store_metric(self, name, metric):
+        self._metrics[name].append(metric)
+        if len(self._metrics[name]) > self.max_metrics:
+            self._metrics[name] = self._metrics[name][-self.max_metrics:]
+
+    def increment(self, name, value=1.0, labels=None):
+        key = self._make_key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+            self._store_metric(name, Metric(name=name, type=MetricType.COUNTER,
+                                            value=self._counters[key], labels=labels or {}))
+
+    def set_gauge(self, name, value, labels=None):
+        key = self._make_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+            self._store_metric(name, Metric(name=name, type=MetricType.GAUGE,
+                                            value=value, labels=labels or {}))
+
+    def record_histogram(self, name, value, labels=None):
+        key = self._make_key(name, labels)
+        with self._lock:
+            self._histograms[key].append(value)
+            if len(self._histograms[key]) > 1000:
+                self._histograms[key] = self._histograms[key][-1000:]
+            self._store_metric(name, Metric(name=name, type=MetricType.HISTOGRAM,
+                                            value=value, labels=labels or {}))
+
+    def get_histogram_stats(self, name, labels=None):
+        key = self._make_key(name, labels)
+        with self._lock:
+            sorted_values = sorted(self._histograms.get(key, []))
+            count = len(sorted_values)
+            return {"count": count, "p50": sorted_values[int(count * 0.5)],
+                    "p99": sorted_values[int(count * 0.99)]}
+
+
+def worker(collector, ops: int, thread_id: int) -> None:
+    labels = {"status": "success", "handler": f"h{thread_id % 4}"}
+    for i in range(ops):
+        collector.increment("requests.calls", labels=labels)
+        collector.increment("ticks")
+        collector.set_gauge("server.players", i % 20)
+        collector.record_histogram("requests.duration", (i % 1000) / 1000, labels)
+
+
+def run(label: str, collector, threads: int, ops: int) -> None:
+    pool = [threading.Thread(target=worker, args=(collector, ops, t)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    updates = threads * ops * 4
+
+    labels = {"status": "success", "handler": "h0"}
+    query_start = time.perf_counter()
+    for _ in range(1000):
+        collector.get_histogram_stats("requests.duration", labels)
+    query = (time.perf_counter() - query_start) / 1000
+
+    print(f"  {label:<12} {updates / elapsed:12,.0f} updates/s   "
+          f"histogram stats {query * 1e6:8.1f} us")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--threads", type=int, default=8)
+    arg_parser.add_argument("--ops", type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.threads} threads x {args.ops} iterations (4 updates each)")
+    run("previous", ReferenceCollector(), args.threads, args.ops)
+    run("ring buffer", InMemoryMetricsCollector(), args.threads, args.ops)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
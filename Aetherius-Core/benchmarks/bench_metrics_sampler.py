@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Sampling cost of metric dashboards with per-viewer loops versus MetricsSampler.
+
+Simulates N viewers that each want system and server metrics every interval.
+The previous approach runs one loop per viewer that samples psutil itself;
+the shared sampler samples each family once per interval and fans deltas
+out. Reports sample calls and CPU time spent for both over the same period.
+
+Usage:
+    python benchmarks/bench_metrics_sampler.py [--viewers N] [--interval S] [--duration S]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.monitoring.sampler import MetricsSampler, sample_system_metrics  # noqa: E402
+
+process = psutil.Process()
+
+
+def make_server_sampler(counter: list):
+    def sample():
+        counter[0] += 1
+        with process.oneshot():
+            return {
+                "cpu_percent": process.cpu_percent(),
+                "memory_mb": process.memory_info().rss / (1024 * 1024),
+                "threads": process.num_threads(),
+            }
+    return sample
+
+
+def make_system_sampler(counter: list):
+    def sample():
+        counter[0] += 1
+        return sample_system_metrics()
+    return sample
+
+
+async def per_viewer(viewers: int, interval: float, duration: float) -> tuple[int, int]:
+    calls, received = [0], [0]
+    system, server = make_system_sampler(calls), make_server_sampler(calls)
+
+    async def viewer_loop():
+        while True:
+            data = {"system": system(), "server": server()}
+            received[0] += len(data) > 0
+            await asyncio.sleep(interval)
+
+    tasks = [asyncio.create_task(viewer_loop()) for _ in range(viewers)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return calls[0], received[0]
+
+
+async def shared(viewers: int, interval: float, duration: float) -> tuple[int, int]:
+    calls, received = [0], [0]
+    sampler = MetricsSampler()
+    sampler.register_family("system", make_system_sampler(calls))
+    sampler.register_family("server", make_server_sampler(calls))
+
+    async def on_update(update):
+        received[0] += 1
+
+    for _ in range(viewers):
+        sampler.subscribe(on_update, interval=interval)
+    await asyncio.sleep(duration)
+    await sampler.stop()
+    return calls[0], received[0]
+
+
+def measure(label: str, coro) -> None:
+    cpu_start = time.process_time()
+    calls, received = asyncio.run(coro)
+    cpu = time.process_time() - cpu_start
+    print(f"  {label:<18} {calls:6d} sample calls  {received:6d} updates delivered  "
+          f"CPU {cpu * 1000:8.1f} ms")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--viewers", type=int, default=10)
+    arg_parser.add_argument("--interval", type=float, default=0.5)
+    arg_parser.add_argument("--duration", type=float, default=5.0)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.viewers} viewers, {args.interval}s interval, {args.duration}s")
+    measure("per-viewer loops", per_viewer(args.viewers, args.interval, args.duration))
+    measure("shared sampler", shared(args.viewers, args.interval, args.duration))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark of concurrent logins against event loop latency.
+
+Runs a burst of concurrent DatabaseAuthenticationProvider.authenticate()
+calls (password hashing in the PasswordUtils thread pool) and the same burst
+with verification done inline on the event loop, as before. A heartbeat task
+ticking every 1 ms stands in for console streaming; its worst delay shows how
+long the loop was frozen.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--logins N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.security import PasswordUtils, User  # noqa: E402
+from aetherius.core.security.providers import DatabaseAuthenticationProvider  # noqa: E402
+
+USERNAME = "bench"
+PASSWORD = "correct horse battery staple"
+
+
+async def heartbeat(lags: list[float], interval: float = 0.001) -> None:
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+    while True:
+        await asyncio.sleep(interval)
+        now = loop.time()
+        lags.append(now - last - interval)
+        last = now
+
+
+async def burst(login, logins: int) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    beat = asyncio.create_task(heartbeat(lags))
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    # Let the heartbeat observe the end of a stall that lasted until now
+    await asyncio.sleep(0.005)
+    beat.cancel()
+
+    if not all(results):
+        raise RuntimeError("A login failed")
+    return elapsed, lags
+
+
+def report(name: str, logins: int, elapsed: float, lags: list[float]) -> None:
+    ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    print(
+        f"{name:<9} {logins} logins  {elapsed * 1000:8.1f} ms  "
+        f"{logins / elapsed:6.1f} logins/s  loop delay p99={ms[int(len(ms) * 0.99)]:8.2f} ms  "
+        f"max={ms[-1]:8.2f} ms"
+    )
+
+
+async def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--logins", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        provider = DatabaseAuthenticationProvider(Path(tmp) / "security.db")
+        password_hash, _ = PasswordUtils.hash_password(PASSWORD)
+        await provider.create_user(User(username=USERNAME, password_hash=password_hash), PASSWORD)
+
+        async def offloaded() -> bool:
+            return await provider.authenticate(USERNAME, PASSWORD) is not None
+
+        async def inline() -> bool:
+            return PasswordUtils.verify_password(PASSWORD, password_hash)
+
+        print(f"PBKDF2-{PasswordUtils.algorithm}, {PasswordUtils.iterations} iterations, "
+              f"{PasswordUtils.max_workers} hashing threads")
+        report("offloaded", args.logins, *await burst(offloaded, args.logins))
+        report("inline", args.logins, *await burst(inline, args.logins))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Performance history chart load time from the time-series store after a restart.
+
+Writes a week of performance samples at the monitoring interval into a fresh
+TimeSeriesStore, reopens it (as after a restart) and times chart queries
+over 1 hour, 24 hours and 7 days. The previous in-memory history (a list of
+ServerPerformanceMetrics scanned and converted to dicts per call) runs for
+comparison over the same samples; it was capped at 1000 entries and empty
+after a restart.
+
+Usage:
+    python benchmarks/bench_performance_store.py [--days N] [--interval S]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.timeseries_store import TimeSeriesStore  # noqa: E402
+
+COLUMNS = (
+    "tps",
+    "player_count",
+    "cpu_percent",
+    "memory_mb",
+    "memory_percent",
+    "disk_usage_mb",
+    "network_sent_mb",
+    "network_recv_mb",
+    "thread_count",
+    "file_descriptors",
+    "uptime_seconds",
+)
+
+
+@dataclass
+class Sample:
+    timestamp: datetime
+    tps: float
+    player_count: int
+    cpu_percent: float
+    memory_mb: float
+    memory_percent: float
+    disk_usage_mb: float
+    network_sent_mb: float
+    network_recv_mb: float
+    thread_count: int
+    file_descriptors: int
+    uptime_seconds: float
+
+    def to_dict(self):
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+
+def make_samples(days: float, interval: float) -> list[Sample]:
+    rng = random.Random(3)
+    now = time.time()
+    count = int(days * 86400 / interval)
+    return [
+        Sample(
+            timestamp=datetime.fromtimestamp(now - (count - i) * interval),
+            tps=min(20.0, rng.gauss(19.6, 0.5)),
+            player_count=rng.randint(0, 40),
+            cpu_percent=rng.uniform(5, 90),
+            memory_mb=rng.uniform(2000, 4000),
+            memory_percent=rng.uniform(20, 60),
+            disk_usage_mb=5000 + i * 0.01,
+            network_sent_mb=i * 0.5,
+            network_recv_mb=i * 0.3,
+            thread_count=rng.randint(60, 90),
+            file_descriptors=rng.randint(200, 400),
+            uptime_seconds=i * interval,
+        )
+        for i in range(count)
+    ]
+
+
+def reference_history(history: list[Sample], hours: float) -> list[dict]:
+    cutoff_time = datetime.now() - timedelta(hours=hours)
+    return [m.to_dict() for m in history if m.timestamp >= cutoff_time]
+
+
+async def run(days: float, interval: float) -> None:
+    samples = make_samples(days, interval)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "performance.db"
+        store = TimeSeriesStore(db_path, COLUMNS)
+        start = time.perf_counter()
+        rows = [(s.timestamp.timestamp(), {c: getattr(s, c) for c in COLUMNS}) for s in samples]
+        for i in range(0, len(rows), 1000):
+            await store.append_many(rows[i:i + 1000])
+        print(f"  wrote {len(samples)} samples ({days:g} days at {interval:g}s) "
+              f"in {time.perf_counter() - start:.2f} s")
+        store.close()
+
+        start = time.perf_counter()
+        store = TimeSeriesStore(db_path, COLUMNS)
+        print(f"  reopened in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        for hours in (1, 24, days * 24):
+            start = time.perf_counter()
+            series = await store.query(time.time() - hours * 3600)
+            elapsed = time.perf_counter() - start
+            resolution = f"{series['resolution']}s" if series["resolution"] else "raw"
+            print(f"  store      {hours:6.0f} h  {len(series['timestamp']):6d} points ({resolution:>4})  "
+                  f"{elapsed * 1000:8.2f} ms")
+        store.close()
+
+    for label, history in (("previous", samples[-1000:]), ("previous*", samples)):
+        for hours in (1, 24, days * 24):
+            start = time.perf_counter()
+            result = reference_history(history, hours)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<10} {hours:6.0f} h  {len(result):6d} points         "
+                  f"{elapsed * 1000:8.2f} ms")
+    print("  (previous = 1000-entry in-memory cap, empty after restart; "
+          "previous* = same scan if it had kept every sample)")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--days", type=float, default=7.0)
+    arg_parser.add_argument("--interval", type=float, default=30.0)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.days, args.interval))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Broadcast latency of information streams with many subscribers.
+
+Publishes a burst of console lines to N subscribers that forward an encoded
+JSON frame (as a WebSocket handler would), one of which is slow. The
+previous broadcast (serialize per subscriber, await each callback in turn)
+runs for comparison. Reports publisher time per message and how long the
+fast subscribers took to see the whole burst.
+
+Usage:
+    python benchmarks/bench_stream_broadcast.py [--subscribers N] [--messages N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.stream_broadcast import OverflowPolicy, StreamBroadcaster  # noqa: E402
+
+SLOW_DELAY = 0.005
+
+
+def make_line(i: int) -> dict:
+    return {
+        "type": "console_output",
+        "level": "INFO",
+        "message": f"[12:00:00] [Server thread/INFO]: Preparing spawn area: {i % 100}%",
+        "timestamp": time.time(),
+        "sequence": i,
+    }
+
+
+async def reference(subscribers: int, messages: int) -> tuple[float, float]:
+    received = [0] * subscribers
+
+    def make_callback(index: int):
+        async def callback(data):
+            frame = json.dumps(data, default=str)
+            if index == 0:
+                await asyncio.sleep(SLOW_DELAY)
+            received[index] += len(frame) > 0
+        return callback
+
+    callbacks = [make_callback(i) for i in range(subscribers)]
+    start = time.perf_counter()
+    for i in range(messages):
+        data = make_line(i)
+        for callback in callbacks:
+            await callback(data)
+    elapsed = time.perf_counter() - start
+    return elapsed / messages, elapsed
+
+
+async def queued(subscribers: int, messages: int) -> tuple[float, float, dict]:
+    broadcaster = StreamBroadcaster(policy=OverflowPolicy.DROP_OLDEST, max_queue=1024)
+    done = asyncio.Event()
+    received = [0] * subscribers
+
+    def make_callback(index: int):
+        async def callback(frame):
+            if index == 0:
+                await asyncio.sleep(SLOW_DELAY)
+            received[index] += 1
+            if index and all(received[1:]) and min(received[1:]) == messages:
+                done.set()
+        return callback
+
+    for i in range(subscribers):
+        broadcaster.subscribe(make_callback(i), encoded=True)
+
+    start = time.perf_counter()
+    for i in range(messages):
+        broadcaster.publish(make_line(i))
+        if i % 50 == 0:
+            await asyncio.sleep(0)
+    publish_time = time.perf_counter() - start
+    await done.wait()
+    fast_done = time.perf_counter() - start
+    stats = broadcaster.get_stats()
+    broadcaster.close()
+    return publish_time / messages, fast_done, stats
+
+
+async def run(args) -> None:
+    per_message, total = await reference(args.subscribers, args.messages)
+    print(f"  previous   publish {per_message * 1e6:9.1f} us/msg   "
+          f"all subscribers done after {total:.2f} s")
+    per_message, fast_done, stats = await queued(args.subscribers, args.messages)
+    print(f"  queued     publish {per_message * 1e6:9.1f} us/msg   "
+          f"fast subscribers done after {fast_done:.2f} s")
+    print(f"             encoded frames {stats['encoded_frames']}, "
+          f"max queue depth {stats['queue_depth_max']}, dropped {stats['dropped']}")
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--subscribers", type=int, default=30)
+    arg_parser.add_argument("--messages", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{args.subscribers} subscribers (1 slow, {SLOW_DELAY * 1000:.0f} ms/message), "
+          f"{args.messages} messages")
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
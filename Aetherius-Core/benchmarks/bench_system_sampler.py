@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Event-loop stall of system metric reads with and without the background sampler.
+
+Runs a heartbeat task that ticks every 10 ms while an async handler reads
+system metrics the previous way (psutil.cpu_percent(interval=1), a
+net_connections() count and a full process_iter walk per request) and then
+from SystemResourceSampler snapshots. Reports request latency and the
+longest heartbeat gap each caused.
+
+Usage:
+    python benchmarks/bench_system_sampler.py [--requests N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import psutil
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from aetherius.core.monitoring.sampler import get_system_sampler  # noqa: E402
+
+
+async def reference_request() -> dict:
+    try:
+        connections = len(psutil.net_connections())
+    except psutil.AccessDenied:
+        connections = None
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=1),
+        "memory_percent": psutil.virtual_memory().percent,
+        "connections": connections,
+        "processes": sum(1 for _ in psutil.process_iter(["name", "memory_info"])),
+    }
+
+
+async def snapshot_request() -> dict:
+    snapshot = get_system_sampler().snapshot()
+    return {
+        "cpu_percent": snapshot["cpu_percent"],
+        "memory_percent": snapshot["memory_percent"],
+        "connections": snapshot["network_connections"],
+        "processes": snapshot["process_count"],
+    }
+
+
+async def measure(label: str, request, count: int) -> None:
+    max_gap = 0.0
+    running = True
+
+    async def heartbeat():
+        nonlocal max_gap
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            max_gap = max(max_gap, now - last - 0.01)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    for _ in range(count):
+        await request()
+        await asyncio.sleep(0)
+    per_request = (time.perf_counter() - start) / count
+    running = False
+    await beat
+    print(f"  {label:<18} {per_request * 1000:10.3f} ms/request   "
+          f"max event-loop stall {max_gap * 1000:8.1f} ms")
+
+
+async def run(count: int) -> None:
+    await measure("previous (psutil)", reference_request, max(1, min(count, 3)))
+    get_system_sampler().start()
+    await measure("sampler snapshot", snapshot_request, count)
+    get_system_sampler().stop()
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--requests", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -221,6 +221,7 @@ async def main():
         # Cleanup
         if api._monitoring_enabled:
             await api.stop_performance_monitoring()
+        await api.close_streams()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""Shared helpers and fixtures for the test suite."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+WORLD_MTIME = 1_700_000_000
+
+
+def write(path: Path, data: bytes, mtime: int = WORLD_MTIME) -> None:
+    """Write a file (creating parents) with a fixed mtime."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+
+
+def read_tree(root: Path) -> dict[str, bytes]:
+    """Contents of every regular file below root, keyed by POSIX relative path."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+@pytest.fixture
+def world(tmp_path: Path) -> Path:
+    """A small world: level.dat, an incompressible and a zeroed region file, an empty dir."""
+    world = tmp_path / "world"
+    write(world / "level.dat", b"level data")
+    write(world / "region" / "r.0.0.mca", os.urandom(300_000))
+    write(world / "region" / "r.0.1.mca", bytes(200_000))
+    (world / "empty").mkdir()
+    return world
@@ -0,0 +1,123 @@
+"""Tests for the parallel zip and gzip archive writers."""
+
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from conftest import read_tree, write
+
+from aetherius.core.archive_writer import BLOCK_SIZE, ParallelGzipWriter, write_archive
+
+
+@pytest.fixture
+def world(world: Path) -> Path:
+    # Add a multi-block file, an empty file and compressible text to the shared world
+    write(world / "region" / "r.1.0.mca", os.urandom(3 * BLOCK_SIZE + 123))
+    write(world / "region" / "r.1.1.mca", b"")
+    write(world / "stats.json", b'{"kills": 1}\n' * 50_000)
+    return world
+
+
+def expected_files(world: Path) -> dict[str, bytes]:
+    return {f"{world.name}/{name}": data for name, data in read_tree(world).items()}
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_zip_round_trip(world: Path, tmp_path: Path, workers: int):
+    archive = tmp_path / "world.zip"
+    stats = write_archive(world, archive, "zip", workers=workers)
+
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        names = zf.namelist()
+        contents = {name: zf.read(name) for name in names if not name.endswith("/")}
+
+    assert contents == expected_files(world)
+    assert "world/empty/" in names
+    assert stats.files == 6
+    assert stats.stored_files == 4
+    assert stats.output_bytes == archive.stat().st_size
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_gztar_round_trip(world: Path, tmp_path: Path, workers: int):
+    archive = tmp_path / "world.tar.gz"
+    write_archive(world, archive, "gztar", workers=workers)
+
+    with tarfile.open(archive, "r:gz") as tf:
+        contents = {
+            member.name: tf.extractfile(member).read() for member in tf.getmembers() if member.isfile()
+        }
+        directories = {member.name for member in tf.getmembers() if member.isdir()}
+
+    assert contents == expected_files(world)
+    assert "world/empty" in directories
+
+
+def test_single_file_archive(world: Path, tmp_path: Path):
+    archive = tmp_path / "level.zip"
+    write_archive(world / "level.dat", archive, "zip")
+
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["level.dat"]
+        assert zf.read("level.dat") == b"level data"
+
+
+def test_progress_reports_every_file(world: Path, tmp_path: Path):
+    calls = []
+    write_archive(world, tmp_path / "world.zip", "zip", progress=lambda *args: calls.append(args))
+
+    assert len(calls) == 6
+    files_done, total_files, bytes_done, total_bytes = calls[-1]
+    assert files_done == total_files == 6
+    assert bytes_done == total_bytes
+
+
+def test_unsupported_format_leaves_no_file(world: Path, tmp_path: Path):
+    with pytest.raises(ValueError):
+        write_archive(world, tmp_path / "world.rar", "rar")
+    assert list(tmp_path.glob("*world.rar*")) == []
+
+
+@pytest.mark.parametrize("store_only_switches", [False, True])
+def test_gzip_writer_round_trip(store_only_switches: bool):
+    data = os.urandom(BLOCK_SIZE) + b"compressible " * 200_000 + os.urandom(1000)
+    out = io.BytesIO()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writer = ParallelGzipWriter(out, pool, level=6, max_pending=4)
+        for offset in range(0, len(data), 300_000):
+            if store_only_switches:
+                writer.store_only = not writer.store_only
+            writer.write(data[offset:offset + 300_000])
+        writer.close()
+
+    assert gzip.decompress(out.getvalue()) == data
+    assert writer.bytes_written == len(out.getvalue())
+
+
+@pytest.mark.parametrize(("level", "zstd_level"), [(0, 1), (1, 1), (9, 9)])
+def test_zsttar_round_trip_uses_level(
+    world: Path, tmp_path: Path, monkeypatch, level: int, zstd_level: int
+):
+    zstandard = pytest.importorskip("zstandard")
+    levels = []
+    compressor = zstandard.ZstdCompressor
+
+    def recording_compressor(**kwargs):
+        levels.append(kwargs["level"])
+        return compressor(**kwargs)
+
+    monkeypatch.setattr(zstandard, "ZstdCompressor", recording_compressor)
+    archive = tmp_path / "world.tar.zst"
+    write_archive(world, archive, "zsttar", level=level)
+
+    assert levels == [zstd_level]
+    with archive.open("rb") as f, \
+            tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(f), mode="r|") as tf:
+        contents = {member.name: tf.extractfile(member).read() for member in tf if member.isfile()}
+    assert contents == expected_files(world)
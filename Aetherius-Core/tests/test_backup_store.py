@@ -0,0 +1,149 @@
+"""Tests for the deduplicating backup store."""
+
+import os
+from pathlib import Path
+
+import pytest
+from conftest import read_tree, write
+
+from aetherius.core.backup_store import BackupStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> BackupStore:
+    return BackupStore(tmp_path / "store", max_workers=2)
+
+
+def test_restore_reproduces_snapshot(store: BackupStore, world: Path, tmp_path: Path):
+    info = store.create_snapshot(world, "first")
+
+    assert info.stats.files == 3
+    assert store.restore_snapshot("first", tmp_path / "restored") == 3
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+    assert (tmp_path / "restored" / "empty").is_dir()
+
+
+def test_unchanged_snapshot_writes_no_chunks(store: BackupStore, world: Path):
+    store.create_snapshot(world, "first")
+    second = store.create_snapshot(world, "second")
+
+    assert second.stats.new_chunks == 0
+    assert second.stats.unchanged_files == 3
+    assert second.stats.hashed_bytes == 0
+
+
+def test_changed_file_is_captured(store: BackupStore, world: Path, tmp_path: Path):
+    store.create_snapshot(world, "first")
+    write(world / "level.dat", b"level data v2", mtime=1_700_000_100)
+    second = store.create_snapshot(world, "second")
+
+    assert 0 < second.stats.new_chunks < second.stats.chunks
+    store.restore_snapshot("first", tmp_path / "first")
+    store.restore_snapshot("second", tmp_path / "second")
+    assert (tmp_path / "first" / "level.dat").read_bytes() == b"level data"
+    assert (tmp_path / "second" / "level.dat").read_bytes() == b"level data v2"
+
+
+def test_restore_refuses_existing_destination(store: BackupStore, world: Path, tmp_path: Path):
+    store.create_snapshot(world, "first")
+    (tmp_path / "occupied").mkdir()
+
+    with pytest.raises(FileExistsError):
+        store.restore_snapshot("first", tmp_path / "occupied")
+
+
+def test_list_snapshots_newest_first(store: BackupStore, world: Path):
+    store.create_snapshot(world, "first")
+    store.create_snapshot(world, "second")
+
+    assert [info.name for info in store.list_snapshots()] == ["second", "first"]
+
+
+def test_garbage_collect_removes_only_unreferenced_chunks(
+    store: BackupStore, world: Path, tmp_path: Path
+):
+    store.create_snapshot(world, "first")
+    write(world / "region" / "r.0.0.mca", os.urandom(300_000), mtime=1_700_000_100)
+    store.create_snapshot(world, "second")
+
+    assert store.garbage_collect()["removed_chunks"] == 0
+
+    store.delete_snapshot("first")
+    result = store.garbage_collect()
+
+    assert result["removed_chunks"] > 0
+    store.restore_snapshot("second", tmp_path / "restored")
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+
+
+def test_prune_keeps_newest(store: BackupStore, world: Path, tmp_path: Path):
+    for i, name in enumerate(("a", "b", "c")):
+        write(world / "level.dat", f"level {name}".encode(), mtime=1_700_000_000 + i)
+        store.create_snapshot(world, name)
+
+    assert sorted(store.prune(keep_last=1)) == ["a", "b"]
+    assert [info.name for info in store.list_snapshots()] == ["c"]
+    store.restore_snapshot("c", tmp_path / "restored")
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+
+
+def test_garbage_collect_keeps_chunks_of_snapshot_with_unreadable_summary(
+    store: BackupStore, world: Path, tmp_path: Path
+):
+    store.create_snapshot(world, "first")
+    (store.snapshots_dir / "first.json").write_text("{not json")
+
+    assert store.garbage_collect()["removed_chunks"] == 0
+    store.restore_snapshot("first", tmp_path / "restored")
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+
+
+def test_garbage_collect_aborts_on_unreadable_file_list(store: BackupStore, world: Path):
+    store.create_snapshot(world, "first")
+    store.delete_snapshot("first")
+    store.create_snapshot(world, "second")
+    (store.snapshots_dir / "second.files").write_bytes(b"\x1f\x8b truncated")
+    chunks_before = sorted(store.chunks_dir.rglob("*"))
+
+    with pytest.raises(RuntimeError):
+        store.garbage_collect()
+    assert sorted(store.chunks_dir.rglob("*")) == chunks_before
+
+
+def chunk_path_of(store: BackupStore, rel_path: str, snapshot: str) -> Path:
+    _, entries = store._read_files(snapshot)
+    digest = next(entry["chunks"][0] for entry in entries if entry["path"] == rel_path)
+    return store._chunk_path(digest)
+
+
+def test_torn_chunk_is_rewritten(store: BackupStore, world: Path, tmp_path: Path):
+    store.create_snapshot(world, "first")
+    chunk_path_of(store, "level.dat", "first").write_bytes(b"")
+    write(world / "copy.dat", b"level data")
+
+    second = store.create_snapshot(world, "second")
+
+    assert second.stats.new_chunks == 1
+    store.restore_snapshot("second", tmp_path / "restored")
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+
+
+def test_verify_rewrites_corrupt_chunk(store: BackupStore, world: Path, tmp_path: Path):
+    store.create_snapshot(world, "first")
+    chunk = chunk_path_of(store, "region/r.0.0.mca", "first")
+    payload = bytearray(chunk.read_bytes())
+    payload[-1] ^= 0xFF
+    chunk.write_bytes(payload)
+
+    unverified = store.create_snapshot(world, "second")
+    verified = store.create_snapshot(world, "third", verify=True)
+
+    assert unverified.stats.new_chunks == 0
+    assert verified.stats.new_chunks == 1
+    store.restore_snapshot("first", tmp_path / "restored")
+    assert read_tree(tmp_path / "restored") == read_tree(world)
+
+
+def test_invalid_snapshot_name_rejected(store: BackupStore, world: Path):
+    with pytest.raises(ValueError):
+        store.create_snapshot(world, "../escape")
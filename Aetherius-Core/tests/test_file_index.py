@@ -0,0 +1,182 @@
+"""Tests for the watched file index and the file manager queries it answers."""
+
+import errno
+import logging
+import os
+import shutil
+import stat
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from conftest import write
+
+from aetherius.core import file_index as file_index_module
+from aetherius.core.file_index import FileIndex, directory_size
+from aetherius.core.file_manager import FileManager
+from aetherius.core.file_watcher import FileWatcher
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def make_watcher(use_inotify: bool) -> FileWatcher:
+    watcher = FileWatcher(min_poll_interval=0.02, max_poll_interval=0.1, use_inotify=use_inotify)
+    if use_inotify and watcher.backend != "inotify":
+        watcher.stop()
+        pytest.skip("inotify is not available")
+    return watcher
+
+
+def files_by_size(root: Path) -> dict[str, int]:
+    return {
+        str(path.relative_to(root)): path.stat().st_size
+        for path in root.rglob("*")
+        if path.is_file() and not path.is_symlink()
+    }
+
+
+def index_matches_disk(index: FileIndex) -> bool:
+    largest = index.largest_files(count=1000)
+    return index.usage() == directory_size(index.root) and {
+        rel_path: st.st_size for rel_path, st in largest
+    } == files_by_size(index.root)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request):
+    watcher = make_watcher(request.param)
+    yield watcher
+    watcher.stop()
+
+
+@pytest.fixture
+def index(world: Path, watcher: FileWatcher):
+    index = FileIndex(world, watcher=watcher, debounce=0.02)
+    index.start()
+    assert index.wait_ready(5.0)
+    yield index
+    index.stop()
+
+
+def test_initial_build_matches_disk(index: FileIndex):
+    assert index_matches_disk(index)
+    assert index.usage("region") == directory_size(index.root / "region")
+    assert index.get_stats()["watched_directories"] == 3
+
+
+def test_names_follow_create_delete_rename(index: FileIndex):
+    root = index.root
+    write(root / "region" / "r.1.0.mca", b"x" * 4096)
+    (root / "level.dat").unlink()
+    os.rename(root / "region" / "r.0.1.mca", root / "region" / "r.0.2.mca")
+    write(root / "data" / "raids.dat", b"raids")
+
+    assert wait_for(lambda: index_matches_disk(index))
+    names = {os.path.basename(rel_path) for rel_path, _ in index.search("")}
+    assert names == {"region", "empty", "data", "r.0.0.mca", "r.0.2.mca", "r.1.0.mca", "raids.dat"}
+
+
+def test_type_changes_are_applied(index: FileIndex):
+    root = index.root
+    (root / "level.dat").unlink()
+    write(root / "level.dat" / "inner.dat", b"inner")
+    shutil.rmtree(root / "empty")
+    write(root / "empty", b"now a file")
+
+    assert wait_for(lambda: index_matches_disk(index))
+    assert stat.S_ISDIR(dict(index.search("level.dat"))["level.dat"].st_mode)
+    assert index.usage("level.dat") == {"total_size": 5, "file_count": 1, "directory_count": 0}
+    assert index.usage("empty") is None
+
+
+def test_subtree_removal_and_recreation(index: FileIndex):
+    root = index.root
+    shutil.rmtree(root / "region")
+    assert wait_for(lambda: index_matches_disk(index))
+    assert index.usage("region") is None
+
+    write(root / "region" / "nested" / "r.0.0.mca", b"x" * 8192)
+    assert wait_for(lambda: index_matches_disk(index))
+    assert index.usage("region")["file_count"] == 1
+
+
+def test_in_place_growth_seen_with_inotify(world: Path):
+    watcher = make_watcher(True)
+    index = FileIndex(world, watcher=watcher, debounce=0.02)
+    index.start()
+    try:
+        assert index.wait_ready(5.0)
+        assert index.sizes_current
+        with open(world / "region" / "r.0.0.mca", "ab") as f:
+            f.write(b"x" * 8192)
+        assert wait_for(lambda: index_matches_disk(index))
+    finally:
+        index.stop()
+        watcher.stop()
+
+
+def test_polled_index_reports_stale_sizes(world: Path):
+    watcher = make_watcher(False)
+    index = FileIndex(world, watcher=watcher, debounce=0.02)
+    index.start()
+    try:
+        assert index.wait_ready(5.0)
+        assert not index.sizes_current
+        assert index.get_stats()["polled_directories"] == 3
+    finally:
+        index.stop()
+        watcher.stop()
+
+
+@pytest.fixture
+def polled_manager(world: Path, monkeypatch):
+    """A FileManager whose shared index falls back to polling."""
+    watcher = make_watcher(False)
+    monkeypatch.setattr(file_index_module, "_file_indexes", {})
+    monkeypatch.setattr(file_index_module, "get_file_watcher", lambda: watcher)
+    manager = FileManager(world, hash_cache_path=world.parent / "hashes.db")
+    index = file_index_module.get_file_index(world)
+    assert index.wait_ready(5.0)
+    yield manager
+    index.stop()
+    watcher.stop()
+    manager._hash_cache.close()
+
+
+def test_file_manager_falls_back_when_index_is_polled(polled_manager: FileManager, world: Path):
+    region = world / "region" / "r.0.0.mca"
+    with open(region, "ab") as f:
+        f.write(b"x" * 8192)
+
+    assert polled_manager.get_disk_usage() == directory_size(world)
+    assert polled_manager.get_disk_usage("region")["total_size"] == 300_000 + 8192 + 200_000
+    assert polled_manager.get_largest_files(1)[0].size == 300_000 + 8192
+    assert polled_manager.search_files("r.0.0")[0].size == 300_000 + 8192
+    assert file_index_module.find_file_index(world, sizes=True) is None
+    assert file_index_module.find_file_index(world) is not None
+
+
+def test_watch_limit_warns_once(tmp_path: Path, monkeypatch, caplog):
+    watcher = make_watcher(True)
+    try:
+        def add_watch(path):
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), str(path))
+
+        monkeypatch.setattr(watcher._inotify, "add_watch", add_watch)
+        with caplog.at_level(logging.WARNING, logger="aetherius.core.file_watcher"):
+            watches = [watcher.watch(tmp_path / name, lambda path: None) for name in "abc"]
+
+        assert all(watcher.is_polled(watch) for watch in watches)
+        assert len(caplog.records) == 1
+        assert "max_user_watches" in caplog.records[0].getMessage()
+        assert watcher.get_stats()["inotify_watch_errors"] == 3
+    finally:
+        watcher.stop()
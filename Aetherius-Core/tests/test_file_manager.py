@@ -0,0 +1,84 @@
+"""Tests for the file manager's persistent hash cache."""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+from conftest import write
+
+from aetherius.core.file_manager import FileManager
+
+
+@pytest.fixture
+def manager(tmp_path: Path):
+    manager = FileManager(tmp_path / "server", use_index=False)
+    yield manager
+    manager._hash_cache.close()
+
+
+def cache_counts(manager: FileManager) -> tuple[int, int]:
+    stats = manager.get_status()["hash_cache"]
+    return stats["hits"], stats["misses"]
+
+
+def test_hash_cache_defaults_to_base_directory(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = FileManager(tmp_path / "server", use_index=False)
+    try:
+        write(manager.base_dir / "level.dat", b"level data")
+        manager.get_file_hash("level.dat")
+    finally:
+        manager._hash_cache.close()
+
+    assert (tmp_path / "server" / "data" / "file_manager" / "file_hashes.db").is_file()
+    assert not (tmp_path / "data").exists()
+
+
+def test_hash_is_cached_until_file_changes(manager: FileManager):
+    path = manager.base_dir / "level.dat"
+    write(path, b"level data")
+
+    assert manager.get_file_hash("level.dat") == hashlib.md5(b"level data").hexdigest()
+    assert cache_counts(manager) == (0, 1)
+    assert manager.get_file_hash("level.dat") == hashlib.md5(b"level data").hexdigest()
+    assert cache_counts(manager) == (1, 1)
+
+    # Same size, new mtime: the cached hash no longer applies
+    write(path, b"LEVEL DATA", mtime=1_700_000_100)
+    assert manager.get_file_hash("level.dat") == hashlib.md5(b"LEVEL DATA").hexdigest()
+    assert cache_counts(manager) == (1, 2)
+
+    os.utime(path, (1_700_000_200, 1_700_000_200))
+    manager.get_file_hash("level.dat")
+    assert cache_counts(manager) == (1, 3)
+
+
+def test_hash_cache_survives_rename(manager: FileManager):
+    write(manager.base_dir / "level.dat", b"level data")
+    digest = manager.get_file_hash("level.dat")
+
+    os.rename(manager.base_dir / "level.dat", manager.base_dir / "level.dat_old")
+
+    assert manager.get_file_hash("level.dat_old") == digest
+    assert cache_counts(manager) == (1, 1)
+
+
+def test_hash_cache_persists_across_instances(manager: FileManager, tmp_path: Path):
+    write(manager.base_dir / "level.dat", b"level data")
+    digest = manager.get_file_hash("level.dat")
+    manager._hash_cache.close()
+
+    reopened = FileManager(tmp_path / "server", use_index=False)
+    try:
+        assert reopened.get_file_hash("level.dat") == digest
+        assert cache_counts(reopened) == (1, 0)
+    finally:
+        reopened._hash_cache.close()
+
+
+def test_hash_of_directory_or_missing_file_is_none(manager: FileManager):
+    (manager.base_dir / "region").mkdir()
+
+    assert manager.get_file_hash("region") is None
+    assert manager.get_file_hash("missing.dat") is None
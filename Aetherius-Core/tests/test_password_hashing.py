@@ -0,0 +1,112 @@
+"""Tests for PBKDF2 password hashing and hash upgrades on login."""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from aetherius.core.security import PasswordUtils, User
+from aetherius.core.security.providers import DatabaseAuthenticationProvider
+
+LEGACY_SALT = "a" * 64
+
+
+def legacy_hash(password: str) -> str:
+    key = hashlib.pbkdf2_hmac("sha256", password.encode(), LEGACY_SALT.encode(), 100000).hex()
+    return LEGACY_SALT + key
+
+
+@pytest.fixture(autouse=True)
+def fast_iterations(monkeypatch):
+    monkeypatch.setattr(PasswordUtils, "iterations", 1000)
+
+
+def test_hash_records_parameters():
+    hashed, salt = PasswordUtils.hash_password("hunter2")
+
+    assert hashed.startswith(f"pbkdf2_sha256$1000${salt}$")
+    assert PasswordUtils.hash_password("hunter2", salt)[0] == hashed
+    assert PasswordUtils.hash_password("hunter2")[0] != hashed
+
+
+def test_verify_password():
+    hashed, _ = PasswordUtils.hash_password("hunter2")
+
+    assert PasswordUtils.verify_password("hunter2", hashed)
+    assert not PasswordUtils.verify_password("hunter3", hashed)
+
+
+def test_verify_uses_stored_iterations(monkeypatch):
+    hashed, _ = PasswordUtils.hash_password("hunter2")
+    monkeypatch.setattr(PasswordUtils, "iterations", 2000)
+
+    assert PasswordUtils.verify_password("hunter2", hashed)
+
+
+def test_verify_legacy_format():
+    assert PasswordUtils.verify_password("hunter2", legacy_hash("hunter2"))
+    assert not PasswordUtils.verify_password("hunter3", legacy_hash("hunter2"))
+
+
+@pytest.mark.parametrize("hashed", ["", "short", "pbkdf2_sha256$notanumber$salt$key", "pbkdf2_sha256$1"])
+def test_malformed_hashes_never_verify(hashed: str):
+    assert not PasswordUtils.verify_password("hunter2", hashed)
+    assert PasswordUtils.needs_rehash(hashed)
+
+
+def test_needs_rehash(monkeypatch):
+    current, _ = PasswordUtils.hash_password("hunter2")
+    assert not PasswordUtils.needs_rehash(current)
+    assert PasswordUtils.needs_rehash(legacy_hash("hunter2"))
+
+    monkeypatch.setattr(PasswordUtils, "iterations", 2000)
+    assert PasswordUtils.needs_rehash(current)
+
+    monkeypatch.setattr(PasswordUtils, "iterations", 500)
+    assert not PasswordUtils.needs_rehash(current)
+
+    monkeypatch.setattr(PasswordUtils, "algorithm", "sha512")
+    assert PasswordUtils.needs_rehash(current)
+
+
+async def test_async_helpers_match_sync():
+    hashed, salt = await PasswordUtils.hash_password_async("hunter2")
+
+    assert hashed == PasswordUtils.hash_password("hunter2", salt)[0]
+    assert await PasswordUtils.verify_password_async("hunter2", hashed)
+    assert not await PasswordUtils.verify_password_async("hunter3", hashed)
+
+
+def stored_hash(db_path: Path, username: str) -> str:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT password_hash FROM users WHERE username = ?", (username,)
+        ).fetchone()[0]
+
+
+async def test_login_upgrades_legacy_hash(tmp_path: Path):
+    db_path = tmp_path / "users.db"
+    provider = DatabaseAuthenticationProvider(db_path)
+    await provider.create_user(User("alice", password_hash=legacy_hash("hunter2")), "hunter2")
+
+    assert await provider.authenticate("alice", "hunter3") is None
+    assert stored_hash(db_path, "alice") == legacy_hash("hunter2")
+
+    user = await provider.authenticate("alice", "hunter2")
+
+    assert user is not None and user.username == "alice"
+    upgraded = stored_hash(db_path, "alice")
+    assert upgraded.startswith("pbkdf2_sha256$1000$")
+    assert not PasswordUtils.needs_rehash(upgraded)
+    assert await provider.authenticate("alice", "hunter2") is not None
+
+
+async def test_login_keeps_current_hash(tmp_path: Path):
+    db_path = tmp_path / "users.db"
+    provider = DatabaseAuthenticationProvider(db_path)
+    hashed, _ = PasswordUtils.hash_password("hunter2")
+    await provider.create_user(User("bob", password_hash=hashed), "hunter2")
+
+    assert await provider.authenticate("bob", "hunter2") is not None
+    assert stored_hash(db_path, "bob") == hashed
@@ -0,0 +1,118 @@
+"""Tests for the compiled permission index and its use by the security manager."""
+
+import itertools
+import random
+
+import pytest
+
+from aetherius.core.security import (
+    Permission,
+    PermissionIndex,
+    PermissionType,
+    ResourceType,
+    SecurityContext,
+    User,
+)
+from aetherius.core.security.manager import SecurityManager
+
+SCOPES = (None, "", "world", "nether")
+RESOURCE_IDS = (None, "", "alice", "bob")
+CONDITIONS = ((), (("online", True),), (("online", True), ("op", False)))
+
+
+def make_permission(resource_type, permission_type, scope, resource_id, conditions) -> Permission:
+    return Permission("p", resource_type, permission_type, resource_id, scope, conditions)
+
+
+ALL_PERMISSIONS = [
+    make_permission(resource_type, permission_type, scope, resource_id, conditions)
+    for resource_type, permission_type, scope, resource_id, conditions in itertools.product(
+        (ResourceType.PLAYER, ResourceType.FILE),
+        (PermissionType.READ, PermissionType.WRITE),
+        SCOPES,
+        RESOURCE_IDS,
+        CONDITIONS,
+    )
+]
+
+
+def linear_allows(permissions, required: Permission) -> bool:
+    return any(permission.matches(required) for permission in permissions)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_index_agrees_with_matches(seed: int):
+    rng = random.Random(seed)
+    granted = set(rng.sample(ALL_PERMISSIONS, rng.randint(0, 12)))
+    index = PermissionIndex(granted)
+
+    for required in ALL_PERMISSIONS:
+        assert index.allows(required) == linear_allows(granted, required), (granted, required)
+
+
+def test_empty_index_allows_nothing():
+    index = PermissionIndex(set())
+
+    assert len(index) == 0
+    assert not any(index.allows(required) for required in ALL_PERMISSIONS)
+
+
+def test_unscoped_resource_permission_covers_every_resource():
+    index = PermissionIndex({make_permission(ResourceType.PLAYER, PermissionType.READ, "world", None, ())})
+
+    assert index.allows(make_permission(ResourceType.PLAYER, PermissionType.READ, "world", "alice", ()))
+    assert index.allows(make_permission(ResourceType.PLAYER, PermissionType.READ, None, None, ()))
+    assert not index.allows(make_permission(ResourceType.PLAYER, PermissionType.READ, "nether", None, ()))
+    assert not index.allows(make_permission(ResourceType.PLAYER, PermissionType.WRITE, "world", None, ()))
+
+
+class FakeAuthorizationProvider:
+    """Grants a fixed permission set and answers the fallback check."""
+
+    def __init__(self, permissions: set[Permission], fallback: bool = False):
+        self.permissions = permissions
+        self.fallback = fallback
+        self.fallback_checks = 0
+
+    async def get_user_permissions(self, user: User) -> set[Permission]:
+        return self.permissions
+
+    async def check_permission(self, user, permission, context=None) -> bool:
+        self.fallback_checks += 1
+        return self.fallback
+
+
+READ_PLAYERS = make_permission(ResourceType.PLAYER, PermissionType.READ, None, None, ())
+WRITE_FILES = make_permission(ResourceType.FILE, PermissionType.WRITE, None, None, ())
+
+
+@pytest.fixture
+def context() -> SecurityContext:
+    return SecurityContext(user=User("alice"))
+
+
+async def test_manager_allows_from_index_without_fallback(context: SecurityContext):
+    provider = FakeAuthorizationProvider({READ_PLAYERS})
+    manager = SecurityManager(auth_provider=None, authz_provider=provider)
+
+    assert await manager.check_permission(context, READ_PLAYERS)
+    assert await manager.check_permission(context, READ_PLAYERS)
+    assert provider.fallback_checks == 0
+    assert manager.get_permission_cache_stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+async def test_manager_falls_back_to_provider(context: SecurityContext, fallback: bool):
+    provider = FakeAuthorizationProvider({READ_PLAYERS}, fallback=fallback)
+    manager = SecurityManager(auth_provider=None, authz_provider=provider)
+
+    assert await manager.check_permission(context, WRITE_FILES) is fallback
+    assert provider.fallback_checks == 1
+
+
+async def test_manager_denies_anonymous():
+    provider = FakeAuthorizationProvider({READ_PLAYERS}, fallback=True)
+    manager = SecurityManager(auth_provider=None, authz_provider=provider)
+
+    assert not await manager.check_permission(SecurityContext(), READ_PLAYERS)
+    assert provider.fallback_checks == 0
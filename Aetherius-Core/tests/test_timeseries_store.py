@@ -0,0 +1,148 @@
+"""Tests for the SQLite time-series store."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from aetherius.core.timeseries_store import RollupTier, TimeSeriesStore
+
+TIERS = (RollupTier(10, 3600), RollupTier(60, 86400))
+
+
+@pytest.fixture
+def base() -> int:
+    # Aligned to both tiers and well inside every retention window
+    return int(time.time()) // 600 * 600 - 1200
+
+
+@pytest.fixture
+async def store(tmp_path: Path):
+    store = TimeSeriesStore(tmp_path / "metrics.db", ["tps", "memory"], tiers=TIERS)
+    yield store
+    store.close()
+
+
+async def test_raw_query_returns_samples_in_order(store: TimeSeriesStore, base: int):
+    await store.append(base + 2, {"tps": 19.5, "memory": 512.0})
+    await store.append(base, {"tps": 20.0, "memory": 500.0})
+
+    result = await store.query(base, base + 10, resolution=0)
+
+    assert result["resolution"] == 0
+    assert result["timestamp"] == [base, base + 2]
+    assert result["tps"] == [20.0, 19.5]
+    assert result["memory"] == [500.0, 512.0]
+
+
+async def test_rollup_averages_and_extremes(store: TimeSeriesStore, base: int):
+    await store.append_many([(base + i, {"tps": float(10 + i), "memory": 100.0}) for i in range(20)])
+
+    ten = await store.query(base, base + 19, resolution=10, extremes=True)
+    assert ten["timestamp"] == [base, base + 10]
+    assert ten["tps"] == [14.5, 24.5]
+    assert ten["tps_min"] == [10.0, 20.0]
+    assert ten["tps_max"] == [19.0, 29.0]
+
+    minute = await store.query(base, base + 19, resolution=60)
+    assert minute["timestamp"] == [base]
+    assert minute["tps"] == [19.5]
+    assert "tps_min" not in minute
+
+
+async def test_rollups_accumulate_across_appends(store: TimeSeriesStore, base: int):
+    await store.append(base + 1, {"tps": 10.0})
+    await store.append(base + 2, {"tps": 30.0})
+
+    result = await store.query(base, base + 9, resolution=10, extremes=True)
+
+    assert result["tps"] == [20.0]
+    assert result["tps_min"] == [10.0]
+    assert result["tps_max"] == [30.0]
+
+
+async def test_missing_values_excluded_from_rollups(store: TimeSeriesStore, base: int):
+    await store.append(base, {"tps": 20.0})
+    await store.append(base + 1, {"tps": None, "memory": 256.0})
+
+    raw = await store.query(base, base + 1, resolution=0)
+    assert raw["tps"] == [20.0, None]
+    assert raw["memory"] == [None, 256.0]
+
+    rollup = await store.query(base, base + 9, resolution=10)
+    assert rollup["tps"] == [20.0]
+    assert rollup["memory"] == [256.0]
+
+
+async def test_resolution_follows_max_points(store: TimeSeriesStore, base: int):
+    await store.append_many([(base + i, {"tps": 20.0}) for i in range(120)])
+
+    assert (await store.query(base, base + 119))["resolution"] == 0
+    assert (await store.query(base, base + 119, max_points=12))["resolution"] == 10
+    assert (await store.query(base, base + 119, max_points=2))["resolution"] == 60
+
+
+async def test_resolution_falls_back_when_raw_expired(tmp_path: Path, base: int):
+    store = TimeSeriesStore(tmp_path / "metrics.db", ["tps"], tiers=TIERS, raw_retention=60)
+    try:
+        result = await store.query(base, base + 100)
+    finally:
+        store.close()
+
+    assert result["resolution"] == 10
+
+
+async def test_apply_retention_prunes_each_table(tmp_path: Path):
+    store = TimeSeriesStore(
+        tmp_path / "metrics.db", ["tps"], tiers=TIERS, raw_retention=60, retention_interval=3600
+    )
+    try:
+        now = time.time()
+        old = int(now) // 60 * 60 - 7200
+        # The first append runs a retention pass; the second is within the interval
+        await store.append(now, {"tps": 20.0})
+        await store.append(old, {"tps": 18.0})
+
+        assert await store.apply_retention() == 2
+
+        raw = await store.query(old, now + 1, resolution=0)
+        assert raw["tps"] == [20.0]
+        ten = await store.query(old, now + 1, resolution=10)
+        assert ten["tps"] == [20.0]
+        minute = await store.query(old, now + 1, resolution=60)
+        assert minute["tps"] == [18.0, 20.0]
+        assert store.get_stats()["pruned_rows"] == 2
+    finally:
+        store.close()
+
+
+async def test_new_columns_are_migrated(tmp_path: Path, base: int):
+    db_path = tmp_path / "metrics.db"
+    store = TimeSeriesStore(db_path, ["tps"], tiers=TIERS)
+    await store.append(base, {"tps": 20.0})
+    store.close()
+
+    store = TimeSeriesStore(db_path, ["tps", "players"], tiers=TIERS)
+    try:
+        await store.append(base + 1, {"tps": 19.0, "players": 3.0})
+
+        raw = await store.query(base, base + 1, resolution=0)
+        assert raw["tps"] == [20.0, 19.0]
+        assert raw["players"] == [None, 3.0]
+        rollup = await store.query(base, base + 9, resolution=10)
+        assert rollup["tps"] == [19.5]
+        assert rollup["players"] == [3.0]
+    finally:
+        store.close()
+
+
+async def test_invalid_queries_rejected(store: TimeSeriesStore, base: int):
+    with pytest.raises(ValueError):
+        await store.query(base, columns=["unknown"])
+    with pytest.raises(ValueError):
+        await store.query(base, resolution=30)
+
+
+def test_invalid_column_name_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        TimeSeriesStore(tmp_path / "metrics.db", ["tps; DROP TABLE samples"])
@@ -0,0 +1,114 @@
+"""Tests for the staging mirror used by backups."""
+
+from pathlib import Path
+
+import pytest
+from conftest import read_tree, write
+
+from aetherius.core.world_capture import WorldCapture, get_world_capture
+
+
+class FakeServer:
+    """Records console commands and answers them like a running server."""
+
+    def __init__(self, saved: bool = True):
+        self.saved = saved
+        self.commands: list[str] = []
+
+    async def execute_command_with_result(self, command: str, timeout: float) -> dict:
+        self.commands.append(command)
+        if command == "save-all flush":
+            return {"success": True, "output": "Saved the game" if self.saved else ""}
+        return {"success": True, "output": ""}
+
+
+@pytest.fixture
+def capture(tmp_path: Path) -> WorldCapture:
+    return WorldCapture(tmp_path / "staging")
+
+
+def test_first_capture_mirrors_world(capture: WorldCapture, world: Path):
+    stats = capture.capture(world)
+    staged = capture.staging_path(world)
+
+    assert staged == capture.staging_root / "world"
+    assert read_tree(staged) == read_tree(world)
+    assert (staged / "empty").is_dir()
+    assert stats.files == 3
+    assert stats.copied_files + stats.cloned_files == 3
+    assert (staged / "level.dat").stat().st_mtime_ns == (world / "level.dat").stat().st_mtime_ns
+
+
+def test_unchanged_files_are_skipped(capture: WorldCapture, world: Path):
+    capture.capture(world)
+    stats = capture.capture(world)
+
+    assert stats.unchanged_files == 3
+    assert stats.copied_files == stats.cloned_files == 0
+
+
+def test_changes_and_deletions_are_synced(capture: WorldCapture, world: Path):
+    capture.capture(world)
+    write(world / "level.dat", b"level data v2", mtime=1_700_000_100)
+    write(world / "data" / "raids.dat", b"raids")
+    (world / "region" / "r.0.0.mca").unlink()
+    (world / "empty").rmdir()
+
+    stats = capture.capture(world)
+    staged = capture.staging_path(world)
+
+    assert read_tree(staged) == read_tree(world)
+    assert not (staged / "empty").exists()
+    assert stats.copied_files + stats.cloned_files == 2
+    assert stats.removed == 2
+
+
+def test_file_replaced_by_directory(capture: WorldCapture, world: Path):
+    capture.capture(world)
+    (world / "level.dat").unlink()
+    write(world / "level.dat" / "inner", b"inner")
+
+    capture.capture(world)
+
+    assert read_tree(capture.staging_path(world)) == read_tree(world)
+
+
+def test_copy_fallback_without_reflink(tmp_path: Path, world: Path):
+    capture = WorldCapture(tmp_path / "staging", use_reflink=False)
+    stats = capture.capture(world)
+
+    assert stats.copied_files == 3
+    assert stats.cloned_files == 0
+    assert stats.copied_bytes == 300_000 + 200_000 + len(b"level data")
+
+
+def test_missing_source_rejected(capture: WorldCapture, tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        capture.capture(tmp_path / "missing")
+
+
+async def test_capture_frozen_pauses_autosave(capture: WorldCapture, world: Path):
+    server = FakeServer()
+    stats = await capture.capture_frozen(server, world)
+
+    assert server.commands == ["save-off", "save-all flush", "save-on"]
+    assert stats.save_confirmed
+    assert stats.frozen_seconds >= stats.duration
+    assert read_tree(capture.staging_path(world)) == read_tree(world)
+
+
+async def test_capture_frozen_requires_confirmed_save(capture: WorldCapture, world: Path):
+    server = FakeServer(saved=False)
+
+    with pytest.raises(RuntimeError):
+        await capture.capture_frozen(server, world)
+
+    assert server.commands[-1] == "save-on"
+    assert not capture.staging_path(world).exists()
+
+
+def test_world_capture_shared_per_server_directory(tmp_path: Path):
+    first = get_world_capture(tmp_path / "server")
+    assert get_world_capture(tmp_path / "server" / ".." / "server") is first
+    assert first.staging_root == (tmp_path / "server" / "backups" / "staging").resolve()
+    assert get_world_capture(tmp_path / "other") is not first